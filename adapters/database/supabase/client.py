@@ -2,6 +2,10 @@
 """
 Исправленный клиент для работы с Supabase
 Обертка с улучшенной обработкой ошибок, retry логикой и безопасностью
+
+Клиент supabase синхронный: каждый .execute() выполняется в пуле потоков
+(asyncio.to_thread), чтобы запросы не блокировали цикл событий и
+asyncio.gather над ними действительно шёл параллельно.
 """
 
 import asyncio
@@ -157,7 +161,7 @@ class SupabaseClient:
         """Тестирование соединения с БД"""
         try:
             # Простой тестовый запрос
-            result = self.client.table("users").select("user_id").limit(1).execute()
+            result = await asyncio.to_thread(self.client.table("users").select("user_id").limit(1).execute)
             logger.info("Тестовое соединение с Supabase успешно")
         except Exception as e:
             raise SupabaseConnectionError(f"Тест соединения провален: {e}")
@@ -230,10 +234,13 @@ class SupabaseClient:
             filters: Optional[Dict[str, Any]] = None,
             single: bool = False,
             limit: Optional[int] = None,
-            columns: Optional[List[str]] = None
+            columns: Optional[List[str]] = None,
+            order: Optional[str] = None,
+            on_conflict: Optional[str] = None
     ) -> Any:
         """
         Улучшенное выполнение запроса к Supabase с валидацией и безопасностью
+        on_conflict - колонки уникального ключа для upsert (через запятую)
         """
         if not self._initialized:
             await self.initialize()
@@ -256,7 +263,9 @@ class SupabaseClient:
             filters=filters,
             single=single,
             limit=limit,
-            columns=columns
+            columns=columns,
+            order=order,
+            on_conflict=on_conflict
         )
 
     async def _execute_single_query(
@@ -267,7 +276,9 @@ class SupabaseClient:
             filters: Optional[Dict[str, Any]] = None,
             single: bool = False,
             limit: Optional[int] = None,
-            columns: Optional[List[str]] = None
+            columns: Optional[List[str]] = None,
+            order: Optional[str] = None,
+            on_conflict: Optional[str] = None
     ) -> Any:
         """Внутренний метод для выполнения одного запроса"""
 
@@ -311,11 +322,15 @@ class SupabaseClient:
                         else:
                             query = query.eq(key, value)
 
+                # Сортировка: "column" по возрастанию, "-column" по убыванию
+                if order:
+                    query = query.order(order.lstrip("-"), desc=order.startswith("-"))
+
                 # Ограничение количества
                 if limit:
                     query = query.limit(limit)
 
-                result = query.execute()
+                result = await asyncio.to_thread(query.execute)
 
                 if single and result.data:
                     return result.data[0] if result.data else None
@@ -328,7 +343,7 @@ class SupabaseClient:
                 # Валидируем данные
                 self._validate_insert_data(data)
 
-                result = query.insert(data).execute()
+                result = await asyncio.to_thread(query.insert(data).execute)
 
                 if single and result.data:
                     return result.data[0] if result.data else None
@@ -350,14 +365,17 @@ class SupabaseClient:
                 else:
                     raise ValueError("Фильтры обязательны для операции update")
 
-                result = query.execute()
+                result = await asyncio.to_thread(query.execute)
                 return result.data or []
 
             elif operation == "upsert":
                 if not data:
                     raise ValueError("Данные для upsert не указаны")
 
-                result = query.upsert(data).execute()
+                if on_conflict:
+                    result = await asyncio.to_thread(query.upsert(data, on_conflict=on_conflict).execute)
+                else:
+                    result = await asyncio.to_thread(query.upsert(data).execute)
                 return result.data or []
 
             elif operation == "delete":
@@ -367,7 +385,7 @@ class SupabaseClient:
                 for key, value in filters.items():
                     query = query.eq(key, value)
 
-                result = query.delete().execute()
+                result = await asyncio.to_thread(query.delete().execute)
                 return result.data or []
 
             else:
@@ -443,6 +461,33 @@ class SupabaseClient:
 
         return results
 
+    @retry_on_failure(max_retries=3, delay=1.0, backoff=2.0)
+    async def execute_rpc(self, function: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        """
+        Вызов серверной функции (Postgres RPC) одним запросом.
+        Функция выполняется в одной транзакции на стороне БД.
+        """
+        if not self._initialized:
+            await self.initialize()
+
+        # Имя функции проверяется по тем же правилам, что и имя таблицы
+        self._validate_table_name(function)
+        self._check_rate_limit()
+
+        start_time = time.time()
+        try:
+            result = await asyncio.to_thread(self.client.rpc(function, params or {}).execute)
+            return result.data
+
+        except Exception as e:
+            logger.error(f"❌ Ошибка вызова функции {function}: {e}", exc_info=True)
+            raise SupabaseQueryError(f"Ошибка вызова {function}: {e}")
+
+        finally:
+            execution_time = time.time() - start_time
+            if execution_time > 5:
+                logger.warning(f"Медленный вызов {function}: {execution_time:.2f}s")
+
     async def count_records(self, table: str, filters: Optional[Dict[str, Any]] = None) -> int:
         """Подсчет количества записей в таблице с кешированием"""
         try:
@@ -456,7 +501,7 @@ class SupabaseClient:
                 for key, value in filters.items():
                     query = query.eq(key, value)
 
-            result = query.execute()
+            result = await asyncio.to_thread(query.execute)
             return result.count or 0
 
         except Exception as e:
@@ -0,0 +1,144 @@
+-- adapters/database/supabase/migrations/001_bank_swap.sql
+-- Атомарный обмен RBTC <-> рябаксы в игровом банке (services/swap_engine.py)
+--
+-- Котировка по x*y=k, обновление пулов, баланса игрока и запись в
+-- pool_transactions выполняются одной функцией в одной транзакции.
+-- Пул защищён оптимистичной версией: UPDATE пула проходит, только если
+-- version не изменилась с момента чтения резервов, иначе возвращается
+-- status = 'conflict' и клиент повторяет вызов.
+
+ALTER TABLE global_pools ADD COLUMN IF NOT EXISTS version BIGINT NOT NULL DEFAULT 0;
+
+CREATE OR REPLACE FUNCTION bank_swap(
+    p_user_id BIGINT,
+    p_side TEXT,                            -- 'buy' (RBTC за рябаксы) | 'sell'
+    p_rbtc_amount NUMERIC,
+    p_ryabucks_limit BIGINT DEFAULT NULL,   -- buy: не дороже, sell: не меньше
+    p_expected_version BIGINT DEFAULT NULL  -- версия пула, по которой считалась котировка
+) RETURNS JSONB
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_rbtc_pool NUMERIC;
+    v_ryabucks_pool NUMERIC;
+    v_version BIGINT;
+    v_ryabucks BIGINT;
+    v_new_rbtc_pool NUMERIC;
+    v_new_ryabucks_pool NUMERIC;
+    v_user_ryabucks BIGINT;
+    v_user_rbtc NUMERIC;
+    v_rate NUMERIC;
+BEGIN
+    IF p_side NOT IN ('buy', 'sell') THEN
+        RAISE EXCEPTION 'bank_swap: неизвестная сторона сделки %', p_side;
+    END IF;
+
+    IF p_rbtc_amount IS NULL OR p_rbtc_amount <= 0 THEN
+        RETURN jsonb_build_object('status', 'invalid_amount');
+    END IF;
+
+    SELECT rbtc_amount::NUMERIC, version INTO v_rbtc_pool, v_version
+    FROM global_pools WHERE pool_name = 'game_bank_rbtc';
+
+    SELECT ryabucks_amount::NUMERIC INTO v_ryabucks_pool
+    FROM global_pools WHERE pool_name = 'game_bank_ryabucks';
+
+    IF v_rbtc_pool IS NULL OR v_ryabucks_pool IS NULL OR v_rbtc_pool <= 0 OR v_ryabucks_pool <= 0 THEN
+        RETURN jsonb_build_object('status', 'pool_unavailable');
+    END IF;
+
+    IF p_expected_version IS NOT NULL AND p_expected_version <> v_version THEN
+        RETURN jsonb_build_object(
+            'status', 'conflict', 'version', v_version,
+            'rbtc_pool', v_rbtc_pool, 'ryabucks_pool', v_ryabucks_pool
+        );
+    END IF;
+
+    -- Котировка (как calculate_buy_rbtc_cost / calculate_sell_rbtc_reward)
+    IF p_side = 'buy' THEN
+        IF p_rbtc_amount >= v_rbtc_pool THEN
+            RETURN jsonb_build_object('status', 'insufficient_liquidity', 'rbtc_pool', v_rbtc_pool);
+        END IF;
+        v_new_rbtc_pool := v_rbtc_pool - p_rbtc_amount;
+        v_ryabucks := FLOOR(v_rbtc_pool * v_ryabucks_pool / v_new_rbtc_pool - v_ryabucks_pool);
+        v_new_ryabucks_pool := v_ryabucks_pool + v_ryabucks;
+        IF p_ryabucks_limit IS NOT NULL AND v_ryabucks > p_ryabucks_limit THEN
+            RETURN jsonb_build_object('status', 'slippage', 'ryabucks_amount', v_ryabucks);
+        END IF;
+    ELSE
+        v_new_rbtc_pool := v_rbtc_pool + p_rbtc_amount;
+        v_ryabucks := FLOOR(v_ryabucks_pool - v_rbtc_pool * v_ryabucks_pool / v_new_rbtc_pool);
+        v_new_ryabucks_pool := v_ryabucks_pool - v_ryabucks;
+        IF v_new_ryabucks_pool <= 0 THEN
+            RETURN jsonb_build_object('status', 'insufficient_liquidity', 'ryabucks_pool', v_ryabucks_pool);
+        END IF;
+        IF p_ryabucks_limit IS NOT NULL AND v_ryabucks < p_ryabucks_limit THEN
+            RETURN jsonb_build_object('status', 'slippage', 'ryabucks_amount', v_ryabucks);
+        END IF;
+    END IF;
+
+    -- Баланс игрока (строка блокируется до конца транзакции)
+    SELECT ryabucks, rbtc::NUMERIC INTO v_user_ryabucks, v_user_rbtc
+    FROM users WHERE user_id = p_user_id FOR UPDATE;
+
+    IF NOT FOUND THEN
+        RETURN jsonb_build_object('status', 'user_not_found');
+    END IF;
+
+    IF (p_side = 'buy' AND COALESCE(v_user_ryabucks, 0) < v_ryabucks)
+        OR (p_side = 'sell' AND COALESCE(v_user_rbtc, 0) < p_rbtc_amount) THEN
+        RETURN jsonb_build_object(
+            'status', 'insufficient_funds', 'ryabucks_amount', v_ryabucks,
+            'user_ryabucks', COALESCE(v_user_ryabucks, 0), 'user_rbtc', COALESCE(v_user_rbtc, 0)
+        );
+    END IF;
+
+    -- Оптимистичная проверка: пул не менялся с момента чтения
+    UPDATE global_pools
+    SET rbtc_amount = v_new_rbtc_pool, version = version + 1, updated_at = NOW()
+    WHERE pool_name = 'game_bank_rbtc' AND version = v_version;
+
+    IF NOT FOUND THEN
+        RETURN jsonb_build_object('status', 'conflict');
+    END IF;
+
+    UPDATE global_pools
+    SET ryabucks_amount = v_new_ryabucks_pool, updated_at = NOW()
+    WHERE pool_name = 'game_bank_ryabucks';
+
+    IF p_side = 'buy' THEN
+        v_user_ryabucks := v_user_ryabucks - v_ryabucks;
+        v_user_rbtc := COALESCE(v_user_rbtc, 0) + p_rbtc_amount;
+    ELSE
+        v_user_ryabucks := COALESCE(v_user_ryabucks, 0) + v_ryabucks;
+        v_user_rbtc := v_user_rbtc - p_rbtc_amount;
+    END IF;
+
+    UPDATE users SET ryabucks = v_user_ryabucks, rbtc = v_user_rbtc WHERE user_id = p_user_id;
+
+    v_rate := v_new_ryabucks_pool / v_new_rbtc_pool;
+
+    INSERT INTO pool_transactions (pool_name, transaction_type, rbtc_amount, ryabucks_amount, user_id, description)
+    VALUES (
+        'game_bank_rbtc',
+        p_side || '_rbtc',
+        p_rbtc_amount,
+        v_ryabucks,
+        p_user_id,
+        CASE WHEN p_side = 'buy' THEN 'Куплено ' ELSE 'Продано ' END
+            || TO_CHAR(p_rbtc_amount, 'FM999999990.0000') || ' RBTC по курсу ' || TO_CHAR(v_rate, 'FM999999990.00')
+    );
+
+    RETURN jsonb_build_object(
+        'status', 'ok',
+        'ryabucks_amount', v_ryabucks,
+        'price', v_ryabucks / p_rbtc_amount,
+        'rate_after', v_rate,
+        'rbtc_pool', v_new_rbtc_pool,
+        'ryabucks_pool', v_new_ryabucks_pool,
+        'version', v_version + 1,
+        'user_ryabucks', v_user_ryabucks,
+        'user_rbtc', v_user_rbtc
+    );
+END;
+$$;
@@ -0,0 +1,112 @@
+-- adapters/database/supabase/migrations/002_bank_batch_swap.sql
+-- Применение пакета сделок банка (services/batch_auction.py)
+--
+-- Клиринг (единая цена, неттинг встречных заявок) считается в Python;
+-- функция атомарно применяет результат: проверяет версию пула и балансы
+-- всех участников, обновляет балансы, делает ОДНУ запись в каждый пул
+-- и пишет строку pool_transactions на каждое исполнение.
+-- Требует 001_bank_swap.sql (колонка global_pools.version).
+--
+-- p_fills: [{"user_id": 1, "side": "buy", "rbtc_amount": "1.5", "ryabucks_amount": 151}, ...]
+
+CREATE OR REPLACE FUNCTION bank_batch_swap(
+    p_fills JSONB,
+    p_expected_version BIGINT,
+    p_rbtc_pool_delta NUMERIC,       -- изменение RBTC пула (отрицательное при нетто-покупке)
+    p_ryabucks_pool_delta BIGINT,    -- изменение пула рябаксов
+    p_price NUMERIC                  -- цена клиринга (для журнала)
+) RETURNS JSONB
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_rbtc_pool NUMERIC;
+    v_ryabucks_pool NUMERIC;
+    v_version BIGINT;
+    v_fill JSONB;
+    v_user RECORD;
+    v_rejected BIGINT[] := ARRAY[]::BIGINT[];
+BEGIN
+    SELECT rbtc_amount::NUMERIC, version INTO v_rbtc_pool, v_version
+    FROM global_pools WHERE pool_name = 'game_bank_rbtc' FOR UPDATE;
+
+    SELECT ryabucks_amount::NUMERIC INTO v_ryabucks_pool
+    FROM global_pools WHERE pool_name = 'game_bank_ryabucks' FOR UPDATE;
+
+    IF v_rbtc_pool IS NULL OR v_ryabucks_pool IS NULL THEN
+        RETURN jsonb_build_object('status', 'pool_unavailable');
+    END IF;
+
+    IF p_expected_version IS NULL OR v_version <> p_expected_version THEN
+        RETURN jsonb_build_object(
+            'status', 'conflict', 'version', v_version,
+            'rbtc_pool', v_rbtc_pool, 'ryabucks_pool', v_ryabucks_pool
+        );
+    END IF;
+
+    IF v_rbtc_pool + p_rbtc_pool_delta <= 0 OR v_ryabucks_pool + p_ryabucks_pool_delta <= 0 THEN
+        RETURN jsonb_build_object('status', 'insufficient_liquidity');
+    END IF;
+
+    -- Проход 1: блокируем участников (по возрастанию user_id) и проверяем балансы
+    FOR v_fill IN
+        SELECT value FROM jsonb_array_elements(p_fills) ORDER BY (value->>'user_id')::BIGINT
+    LOOP
+        SELECT ryabucks, rbtc::NUMERIC AS rbtc INTO v_user
+        FROM users WHERE user_id = (v_fill->>'user_id')::BIGINT FOR UPDATE;
+
+        IF NOT FOUND
+            OR (v_fill->>'side' = 'buy' AND COALESCE(v_user.ryabucks, 0) < (v_fill->>'ryabucks_amount')::BIGINT)
+            OR (v_fill->>'side' = 'sell' AND COALESCE(v_user.rbtc, 0) < (v_fill->>'rbtc_amount')::NUMERIC) THEN
+            v_rejected := v_rejected || (v_fill->>'user_id')::BIGINT;
+        END IF;
+    END LOOP;
+
+    IF array_length(v_rejected, 1) IS NOT NULL THEN
+        RETURN jsonb_build_object('status', 'rejected', 'user_ids', to_jsonb(v_rejected));
+    END IF;
+
+    -- Проход 2: балансы и журнал
+    FOR v_fill IN SELECT value FROM jsonb_array_elements(p_fills)
+    LOOP
+        IF v_fill->>'side' = 'buy' THEN
+            UPDATE users
+            SET ryabucks = ryabucks - (v_fill->>'ryabucks_amount')::BIGINT,
+                rbtc = COALESCE(rbtc, 0) + (v_fill->>'rbtc_amount')::NUMERIC
+            WHERE user_id = (v_fill->>'user_id')::BIGINT;
+        ELSE
+            UPDATE users
+            SET ryabucks = COALESCE(ryabucks, 0) + (v_fill->>'ryabucks_amount')::BIGINT,
+                rbtc = rbtc - (v_fill->>'rbtc_amount')::NUMERIC
+            WHERE user_id = (v_fill->>'user_id')::BIGINT;
+        END IF;
+
+        INSERT INTO pool_transactions (pool_name, transaction_type, rbtc_amount, ryabucks_amount, user_id, description)
+        VALUES (
+            'game_bank_rbtc',
+            (v_fill->>'side') || '_rbtc',
+            (v_fill->>'rbtc_amount')::NUMERIC,
+            (v_fill->>'ryabucks_amount')::BIGINT,
+            (v_fill->>'user_id')::BIGINT,
+            CASE WHEN v_fill->>'side' = 'buy' THEN 'Куплено ' ELSE 'Продано ' END
+                || TO_CHAR((v_fill->>'rbtc_amount')::NUMERIC, 'FM999999990.0000')
+                || ' RBTC по цене аукциона ' || TO_CHAR(p_price, 'FM999999990.00')
+        );
+    END LOOP;
+
+    -- Одна запись в каждый пул на весь пакет
+    UPDATE global_pools
+    SET rbtc_amount = v_rbtc_pool + p_rbtc_pool_delta, version = version + 1, updated_at = NOW()
+    WHERE pool_name = 'game_bank_rbtc';
+
+    UPDATE global_pools
+    SET ryabucks_amount = v_ryabucks_pool + p_ryabucks_pool_delta, updated_at = NOW()
+    WHERE pool_name = 'game_bank_ryabucks';
+
+    RETURN jsonb_build_object(
+        'status', 'ok',
+        'rbtc_pool', v_rbtc_pool + p_rbtc_pool_delta,
+        'ryabucks_pool', v_ryabucks_pool + p_ryabucks_pool_delta,
+        'version', v_version + 1
+    );
+END;
+$$;
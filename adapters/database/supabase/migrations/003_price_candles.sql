@@ -0,0 +1,24 @@
+-- adapters/database/supabase/migrations/003_price_candles.sql
+-- Свечи курса RBTC (services/price_history.py)
+--
+-- OHLC и объём по интервалам 1m / 1h / 1d. Строки пишутся upsert'ом по
+-- (interval, bucket_start) из памяти процесса; история строится заново
+-- из pool_transactions командой /admin_candles_backfill.
+
+CREATE TABLE IF NOT EXISTS price_candles (
+    interval        TEXT        NOT NULL,        -- '1m' | '1h' | '1d'
+    bucket_start    TIMESTAMPTZ NOT NULL,
+    open            NUMERIC     NOT NULL,
+    high            NUMERIC     NOT NULL,
+    low             NUMERIC     NOT NULL,
+    close           NUMERIC     NOT NULL,
+    volume_rbtc     NUMERIC     NOT NULL DEFAULT 0,
+    volume_ryabucks BIGINT      NOT NULL DEFAULT 0,
+    trades          INTEGER     NOT NULL DEFAULT 0,
+    updated_at      TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (interval, bucket_start)
+);
+
+-- Потоковый обход журнала для backfill (keyset по id)
+CREATE INDEX IF NOT EXISTS idx_pool_transactions_type_id
+    ON pool_transactions (transaction_type, id);
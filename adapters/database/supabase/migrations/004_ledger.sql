@@ -0,0 +1,101 @@
+-- adapters/database/supabase/migrations/004_ledger.sql
+-- Пакетная запись журнала операций (services/ledger_writer.py)
+--
+-- Записи сначала попадают в локальный журнал процесса (append + fsync),
+-- затем пачкой передаются в ledger_apply_batch. Функция в одной
+-- транзакции вставляет строки pool_transactions / bank_transactions и
+-- ОДИН раз обновляет строку счётчиков pool_statistics суммой дельт пачки.
+-- Каждая запись имеет id; повторная отправка (после падения процесса
+-- между вставкой и очисткой журнала) не дублирует строки и счётчики.
+--
+-- p_entries: [{"id": "uuid", "table": "pool_transactions", "row": {...},
+--              "counters": {"total_rbtc_burned": "1.5"}}, ...]
+-- Счётчики: total_rbtc_burned, total_bank_ryabucks, rbtc_in_circulation,
+-- qpass_revenue_rbtc (как LEDGER_COUNTERS); запись с другим счётчиком
+-- отклоняет всю пачку.
+
+-- Строка счётчиков (одна на всю игру)
+ALTER TABLE pool_statistics
+    ADD COLUMN IF NOT EXISTS total_bank_ryabucks_added BIGINT NOT NULL DEFAULT 0,
+    ADD COLUMN IF NOT EXISTS rbtc_in_circulation NUMERIC NOT NULL DEFAULT 0,
+    ADD COLUMN IF NOT EXISTS qpass_revenue_rbtc NUMERIC NOT NULL DEFAULT 0,
+    ADD COLUMN IF NOT EXISTS ledger_entries BIGINT NOT NULL DEFAULT 0,
+    ADD COLUMN IF NOT EXISTS updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW();
+
+INSERT INTO pool_statistics (total_rbtc_burned)
+SELECT 0 WHERE NOT EXISTS (SELECT 1 FROM pool_statistics);
+
+-- Идентификаторы применённых записей (защита от повторного применения)
+CREATE TABLE IF NOT EXISTS ledger_applied (
+    entry_id    UUID        PRIMARY KEY,
+    applied_at  TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE OR REPLACE FUNCTION ledger_apply_batch(p_entries JSONB) RETURNS JSONB
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_entry JSONB;
+    v_applied INTEGER := 0;
+    v_skipped INTEGER := 0;
+    v_burned NUMERIC := 0;
+    v_circulation NUMERIC := 0;
+    v_qpass NUMERIC := 0;
+    v_bank_ryabucks BIGINT := 0;
+BEGIN
+    FOR v_entry IN SELECT value FROM jsonb_array_elements(p_entries)
+    LOOP
+        INSERT INTO ledger_applied (entry_id) VALUES ((v_entry->>'id')::UUID)
+        ON CONFLICT DO NOTHING;
+
+        IF NOT FOUND THEN
+            v_skipped := v_skipped + 1;
+            CONTINUE;
+        END IF;
+
+        IF v_entry->>'table' = 'pool_transactions' THEN
+            INSERT INTO pool_transactions (pool_name, transaction_type, rbtc_amount, ryabucks_amount, user_id, description)
+            SELECT r.pool_name, r.transaction_type, r.rbtc_amount, r.ryabucks_amount, r.user_id, r.description
+            FROM jsonb_populate_record(NULL::pool_transactions, v_entry->'row') r;
+        ELSIF v_entry->>'table' = 'bank_transactions' THEN
+            INSERT INTO bank_transactions (user_id, transaction_type, amount_from, amount_to, currency_from, currency_to, exchange_rate)
+            SELECT r.user_id, r.transaction_type, r.amount_from, r.amount_to, r.currency_from, r.currency_to, r.exchange_rate
+            FROM jsonb_populate_record(NULL::bank_transactions, v_entry->'row') r;
+        ELSIF v_entry->>'table' IS NOT NULL THEN
+            RAISE EXCEPTION 'ledger_apply_batch: недопустимая таблица %', v_entry->>'table';
+        END IF;
+
+        -- Только известные счётчики: неизвестный не должен теряться молча
+        IF EXISTS (
+            SELECT 1 FROM jsonb_object_keys(COALESCE(v_entry->'counters', '{}'::JSONB)) AS k(name)
+            WHERE k.name NOT IN ('total_rbtc_burned', 'total_bank_ryabucks', 'rbtc_in_circulation', 'qpass_revenue_rbtc')
+        ) THEN
+            RAISE EXCEPTION 'ledger_apply_batch: недопустимый счётчик в записи %', v_entry->>'id';
+        END IF;
+
+        v_burned := v_burned + COALESCE((v_entry->'counters'->>'total_rbtc_burned')::NUMERIC, 0);
+        v_circulation := v_circulation + COALESCE((v_entry->'counters'->>'rbtc_in_circulation')::NUMERIC, 0);
+        v_qpass := v_qpass + COALESCE((v_entry->'counters'->>'qpass_revenue_rbtc')::NUMERIC, 0);
+        v_bank_ryabucks := v_bank_ryabucks + COALESCE((v_entry->'counters'->>'total_bank_ryabucks')::BIGINT, 0);
+        v_applied := v_applied + 1;
+    END LOOP;
+
+    IF v_applied > 0 THEN
+        UPDATE pool_statistics SET
+            total_rbtc_burned = COALESCE(total_rbtc_burned, 0) + v_burned,
+            rbtc_in_circulation = rbtc_in_circulation + v_circulation,
+            qpass_revenue_rbtc = qpass_revenue_rbtc + v_qpass,
+            total_bank_ryabucks_added = total_bank_ryabucks_added + v_bank_ryabucks,
+            ledger_entries = ledger_entries + v_applied,
+            updated_at = NOW();
+    END IF;
+
+    IF v_bank_ryabucks <> 0 THEN
+        UPDATE global_pools
+        SET ryabucks_amount = ryabucks_amount + v_bank_ryabucks, updated_at = NOW()
+        WHERE pool_name = 'total_bank_ryabucks';
+    END IF;
+
+    RETURN jsonb_build_object('status', 'ok', 'applied', v_applied, 'skipped', v_skipped);
+END;
+$$;
@@ -0,0 +1,117 @@
+-- adapters/database/supabase/migrations/005_economy_counters.sql
+-- Счётчики экономики (services/economy_counters.py)
+--
+-- Строка pool_statistics хранит сожжённые RBTC, RBTC у игроков и выручку
+-- Quantum Pass; общий банк рябаксов остаётся в global_pools. Счётчики
+-- увеличиваются атомарно в ledger_apply_batch вместе со строками журнала.
+-- Сверка читает снимок счётчиков вместе с границами журнала
+-- (economy_counters_snapshot), пересчитывает журнал до этих границ и
+-- применяет разницу приращением (economy_counters_adjust), не теряя
+-- пакетов, пришедших во время пересчёта.
+-- Требует 004_ledger.sql.
+
+ALTER TABLE pool_statistics
+    ADD COLUMN IF NOT EXISTS rbtc_in_circulation NUMERIC NOT NULL DEFAULT 0,
+    ADD COLUMN IF NOT EXISTS qpass_revenue_rbtc NUMERIC NOT NULL DEFAULT 0;
+
+-- Потоковый обход сожжений для сверки (keyset по id)
+CREATE INDEX IF NOT EXISTS idx_bank_transactions_currency_to_id
+    ON bank_transactions (currency_to, id);
+
+CREATE OR REPLACE FUNCTION ledger_apply_batch(p_entries JSONB) RETURNS JSONB
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_entry JSONB;
+    v_applied INTEGER := 0;
+    v_skipped INTEGER := 0;
+    v_burned NUMERIC := 0;
+    v_circulation NUMERIC := 0;
+    v_qpass NUMERIC := 0;
+    v_bank_ryabucks BIGINT := 0;
+BEGIN
+    FOR v_entry IN SELECT value FROM jsonb_array_elements(p_entries)
+    LOOP
+        INSERT INTO ledger_applied (entry_id) VALUES ((v_entry->>'id')::UUID)
+        ON CONFLICT DO NOTHING;
+
+        IF NOT FOUND THEN
+            v_skipped := v_skipped + 1;
+            CONTINUE;
+        END IF;
+
+        IF v_entry->>'table' = 'pool_transactions' THEN
+            INSERT INTO pool_transactions (pool_name, transaction_type, rbtc_amount, ryabucks_amount, user_id, description)
+            SELECT r.pool_name, r.transaction_type, r.rbtc_amount, r.ryabucks_amount, r.user_id, r.description
+            FROM jsonb_populate_record(NULL::pool_transactions, v_entry->'row') r;
+        ELSIF v_entry->>'table' = 'bank_transactions' THEN
+            INSERT INTO bank_transactions (user_id, transaction_type, amount_from, amount_to, currency_from, currency_to, exchange_rate)
+            SELECT r.user_id, r.transaction_type, r.amount_from, r.amount_to, r.currency_from, r.currency_to, r.exchange_rate
+            FROM jsonb_populate_record(NULL::bank_transactions, v_entry->'row') r;
+        ELSIF v_entry->>'table' IS NOT NULL THEN
+            RAISE EXCEPTION 'ledger_apply_batch: недопустимая таблица %', v_entry->>'table';
+        END IF;
+
+        -- Только известные счётчики: неизвестный не должен теряться молча
+        IF EXISTS (
+            SELECT 1 FROM jsonb_object_keys(COALESCE(v_entry->'counters', '{}'::JSONB)) AS k(name)
+            WHERE k.name NOT IN ('total_rbtc_burned', 'total_bank_ryabucks', 'rbtc_in_circulation', 'qpass_revenue_rbtc')
+        ) THEN
+            RAISE EXCEPTION 'ledger_apply_batch: недопустимый счётчик в записи %', v_entry->>'id';
+        END IF;
+
+        v_burned := v_burned + COALESCE((v_entry->'counters'->>'total_rbtc_burned')::NUMERIC, 0);
+        v_circulation := v_circulation + COALESCE((v_entry->'counters'->>'rbtc_in_circulation')::NUMERIC, 0);
+        v_qpass := v_qpass + COALESCE((v_entry->'counters'->>'qpass_revenue_rbtc')::NUMERIC, 0);
+        v_bank_ryabucks := v_bank_ryabucks + COALESCE((v_entry->'counters'->>'total_bank_ryabucks')::BIGINT, 0);
+        v_applied := v_applied + 1;
+    END LOOP;
+
+    IF v_applied > 0 THEN
+        UPDATE pool_statistics SET
+            total_rbtc_burned = COALESCE(total_rbtc_burned, 0) + v_burned,
+            rbtc_in_circulation = rbtc_in_circulation + v_circulation,
+            qpass_revenue_rbtc = qpass_revenue_rbtc + v_qpass,
+            total_bank_ryabucks_added = total_bank_ryabucks_added + v_bank_ryabucks,
+            ledger_entries = ledger_entries + v_applied,
+            updated_at = NOW();
+    END IF;
+
+    IF v_bank_ryabucks <> 0 THEN
+        UPDATE global_pools
+        SET ryabucks_amount = ryabucks_amount + v_bank_ryabucks, updated_at = NOW()
+        WHERE pool_name = 'total_bank_ryabucks';
+    END IF;
+
+    RETURN jsonb_build_object('status', 'ok', 'applied', v_applied, 'skipped', v_skipped);
+END;
+$$;
+
+-- Счётчики и границы журнала одним согласованным снимком
+CREATE OR REPLACE FUNCTION economy_counters_snapshot() RETURNS JSONB
+LANGUAGE sql STABLE
+AS $$
+    SELECT jsonb_build_object(
+        'total_rbtc_burned',   COALESCE(s.total_rbtc_burned, 0),
+        'rbtc_in_circulation', COALESCE(s.rbtc_in_circulation, 0),
+        'qpass_revenue_rbtc',  COALESCE(s.qpass_revenue_rbtc, 0),
+        'total_bank_ryabucks', (SELECT ryabucks_amount FROM global_pools WHERE pool_name = 'total_bank_ryabucks'),
+        'bank_transactions_max_id', (SELECT COALESCE(MAX(id), 0) FROM bank_transactions)
+    )
+    FROM (SELECT * FROM pool_statistics LIMIT 1) s;
+$$;
+
+-- Поправка счётчиков приращением (итог сверки)
+CREATE OR REPLACE FUNCTION economy_counters_adjust(p_deltas JSONB) RETURNS JSONB
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    UPDATE pool_statistics SET
+        total_rbtc_burned = COALESCE(total_rbtc_burned, 0) + COALESCE((p_deltas->>'total_rbtc_burned')::NUMERIC, 0),
+        rbtc_in_circulation = rbtc_in_circulation + COALESCE((p_deltas->>'rbtc_in_circulation')::NUMERIC, 0),
+        qpass_revenue_rbtc = qpass_revenue_rbtc + COALESCE((p_deltas->>'qpass_revenue_rbtc')::NUMERIC, 0),
+        updated_at = NOW();
+
+    RETURN jsonb_build_object('status', 'ok');
+END;
+$$;
@@ -0,0 +1,90 @@
+-- adapters/database/supabase/migrations/006_hire_specialist.sql
+-- Найм специалиста одной транзакцией (services/specialist_service.py)
+--
+-- Цены, лицензии и характеристики специалиста считаются в Python из
+-- памяти процесса; функция под блокировкой строки игрока проверяет
+-- энергию (с регенерацией), валюту, жидкий опыт и лимит специалистов,
+-- списывает всё одним UPDATE и вставляет специалиста.
+--
+-- p_specialist: строка user_specialists без id (см. _build_specialist_row)
+
+CREATE OR REPLACE FUNCTION hire_specialist(
+    p_user_id BIGINT,
+    p_currency TEXT,                 -- 'ryabucks' | 'rbtc'
+    p_ryabucks_cost BIGINT,
+    p_rbtc_cost NUMERIC,
+    p_experience_cost INTEGER,
+    p_energy_cost INTEGER,
+    p_max_specialists INTEGER,
+    p_energy_max INTEGER,
+    p_energy_regen_minutes INTEGER,
+    p_specialist JSONB
+) RETURNS JSONB
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_user RECORD;
+    v_energy INTEGER;
+    v_count INTEGER;
+    v_id BIGINT;
+BEGIN
+    SELECT ryabucks, rbtc::NUMERIC AS rbtc, liquid_experience, energy, energy_last_update INTO v_user
+    FROM users WHERE user_id = p_user_id FOR UPDATE;
+
+    IF NOT FOUND THEN
+        RETURN jsonb_build_object('status', 'user_not_found');
+    END IF;
+
+    -- Регенерация как в EnergyService: +1 за каждый полный интервал
+    v_energy := COALESCE(v_user.energy, 0);
+    IF v_energy < p_energy_max AND v_user.energy_last_update IS NOT NULL THEN
+        v_energy := LEAST(
+            p_energy_max,
+            v_energy + FLOOR(EXTRACT(EPOCH FROM (NOW() - v_user.energy_last_update)) / 60 / p_energy_regen_minutes)::INTEGER
+        );
+    END IF;
+
+    IF v_energy < p_energy_cost THEN
+        RETURN jsonb_build_object('status', 'insufficient_energy', 'energy', v_energy);
+    END IF;
+
+    IF p_currency = 'ryabucks' AND COALESCE(v_user.ryabucks, 0) < p_ryabucks_cost THEN
+        RETURN jsonb_build_object('status', 'insufficient_funds', 'user_ryabucks', COALESCE(v_user.ryabucks, 0));
+    END IF;
+
+    IF p_currency = 'rbtc' AND COALESCE(v_user.rbtc, 0) < p_rbtc_cost THEN
+        RETURN jsonb_build_object('status', 'insufficient_funds', 'user_rbtc', COALESCE(v_user.rbtc, 0));
+    END IF;
+
+    IF COALESCE(v_user.liquid_experience, 0) < p_experience_cost THEN
+        RETURN jsonb_build_object('status', 'insufficient_experience', 'liquid_experience', COALESCE(v_user.liquid_experience, 0));
+    END IF;
+
+    SELECT COUNT(*) INTO v_count FROM user_specialists
+    WHERE user_id = p_user_id AND status IN ('available', 'working', 'training', 'injured');
+
+    IF v_count >= p_max_specialists THEN
+        RETURN jsonb_build_object('status', 'limit_reached', 'count', v_count);
+    END IF;
+
+    UPDATE users SET
+        ryabucks = ryabucks - CASE WHEN p_currency = 'ryabucks' THEN p_ryabucks_cost ELSE 0 END,
+        rbtc = rbtc - CASE WHEN p_currency = 'rbtc' THEN p_rbtc_cost ELSE 0 END,
+        liquid_experience = liquid_experience - p_experience_cost,
+        energy = v_energy - p_energy_cost,
+        energy_last_update = NOW(),
+        last_active = NOW()
+    WHERE user_id = p_user_id;
+
+    INSERT INTO user_specialists (
+        user_id, specialist_type, name, efficiency, loyalty, experience, current_hp, max_hp,
+        combat_stats, hired_at, status, last_work_at, healing_cost, healing_time_hours
+    )
+    SELECT p_user_id, r.specialist_type, r.name, r.efficiency, r.loyalty, r.experience, r.current_hp, r.max_hp,
+           r.combat_stats, r.hired_at, r.status, r.last_work_at, r.healing_cost, r.healing_time_hours
+    FROM jsonb_populate_record(NULL::user_specialists, p_specialist) r
+    RETURNING id INTO v_id;
+
+    RETURN jsonb_build_object('status', 'ok', 'specialist_id', v_id, 'energy', v_energy - p_energy_cost);
+END;
+$$;
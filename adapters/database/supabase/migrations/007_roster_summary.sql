@@ -0,0 +1,189 @@
+-- adapters/database/supabase/migrations/007_roster_summary.sql
+-- Сводка команды игрока (services/roster_summary.py)
+--
+-- user_roster_summary - одна строка на игрока: количество специалистов
+-- по типу и статусу ({"laborer": {"available": 2, "injured": 1}, ...})
+-- и число живых (active, все статусы кроме dead). Строка ведётся
+-- триггером на user_specialists, поэтому найм, обучение, лечение и гибель
+-- обновляют её в той же транзакции, каким бы путём ни шла запись.
+-- Лимит специалистов в hire_specialist читает active вместо COUNT(*).
+-- Требует 006_hire_specialist.sql.
+
+CREATE TABLE IF NOT EXISTS user_roster_summary (
+    user_id BIGINT PRIMARY KEY,
+    counts JSONB NOT NULL DEFAULT '{}'::JSONB,
+    active INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE OR REPLACE FUNCTION roster_summary_bump(
+    p_user_id BIGINT,
+    p_specialist_type TEXT,
+    p_status TEXT,
+    p_delta INTEGER
+) RETURNS VOID
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    INSERT INTO user_roster_summary (user_id) VALUES (p_user_id)
+    ON CONFLICT (user_id) DO NOTHING;
+
+    UPDATE user_roster_summary SET
+        counts = jsonb_set(
+            counts,
+            ARRAY[p_specialist_type],
+            COALESCE(counts -> p_specialist_type, '{}'::JSONB) || jsonb_build_object(
+                p_status,
+                COALESCE((counts -> p_specialist_type ->> p_status)::INTEGER, 0) + p_delta
+            )
+        ),
+        active = active + CASE WHEN p_status = 'dead' THEN 0 ELSE p_delta END,
+        updated_at = NOW()
+    WHERE user_id = p_user_id;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION user_specialists_roster_summary() RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM roster_summary_bump(OLD.user_id, OLD.specialist_type, OLD.status, -1);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM roster_summary_bump(NEW.user_id, NEW.specialist_type, NEW.status, 1);
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+-- Заполнение по текущим данным без гонки с записями во время миграции
+LOCK TABLE user_specialists IN SHARE ROW EXCLUSIVE MODE;
+
+INSERT INTO user_roster_summary (user_id, counts, active)
+SELECT user_id, jsonb_object_agg(specialist_type, statuses), COALESCE(SUM(active), 0)
+FROM (
+    SELECT user_id, specialist_type,
+           jsonb_object_agg(status, n) AS statuses,
+           SUM(n) FILTER (WHERE status <> 'dead') AS active
+    FROM (
+        SELECT user_id, specialist_type, status, COUNT(*)::INTEGER AS n
+        FROM user_specialists
+        GROUP BY user_id, specialist_type, status
+    ) cells
+    GROUP BY user_id, specialist_type
+) types
+GROUP BY user_id
+ON CONFLICT (user_id) DO UPDATE SET
+    counts = EXCLUDED.counts,
+    active = EXCLUDED.active,
+    updated_at = NOW();
+
+DROP TRIGGER IF EXISTS trg_user_specialists_roster_summary ON user_specialists;
+CREATE TRIGGER trg_user_specialists_roster_summary
+    AFTER INSERT OR DELETE OR UPDATE OF user_id, specialist_type, status ON user_specialists
+    FOR EACH ROW EXECUTE FUNCTION user_specialists_roster_summary();
+
+-- Сводка по всем игрокам для админки (строка на игрока, без обхода user_specialists)
+CREATE OR REPLACE FUNCTION roster_summary_totals() RETURNS JSONB
+LANGUAGE sql STABLE
+AS $$
+    WITH cells AS (
+        SELECT s.key AS specialist_type, st.key AS status, SUM(st.value::INTEGER) AS n
+        FROM user_roster_summary r
+        CROSS JOIN LATERAL jsonb_each(r.counts) s
+        CROSS JOIN LATERAL jsonb_each_text(s.value) st
+        GROUP BY s.key, st.key
+    ), types AS (
+        SELECT specialist_type, jsonb_object_agg(status, n) AS statuses
+        FROM cells
+        GROUP BY specialist_type
+    )
+    SELECT jsonb_build_object(
+        'counts', COALESCE((SELECT jsonb_object_agg(specialist_type, statuses) FROM types), '{}'::JSONB),
+        'active', (SELECT COALESCE(SUM(active), 0) FROM user_roster_summary),
+        'users', (SELECT COUNT(*) FROM user_roster_summary WHERE active > 0)
+    );
+$$;
+
+-- Лимит специалистов по сводке (строка игрока уже под блокировкой users)
+CREATE OR REPLACE FUNCTION hire_specialist(
+    p_user_id BIGINT,
+    p_currency TEXT,                 -- 'ryabucks' | 'rbtc'
+    p_ryabucks_cost BIGINT,
+    p_rbtc_cost NUMERIC,
+    p_experience_cost INTEGER,
+    p_energy_cost INTEGER,
+    p_max_specialists INTEGER,
+    p_energy_max INTEGER,
+    p_energy_regen_minutes INTEGER,
+    p_specialist JSONB
+) RETURNS JSONB
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_user RECORD;
+    v_energy INTEGER;
+    v_count INTEGER;
+    v_id BIGINT;
+BEGIN
+    SELECT ryabucks, rbtc::NUMERIC AS rbtc, liquid_experience, energy, energy_last_update INTO v_user
+    FROM users WHERE user_id = p_user_id FOR UPDATE;
+
+    IF NOT FOUND THEN
+        RETURN jsonb_build_object('status', 'user_not_found');
+    END IF;
+
+    -- Регенерация как в EnergyService: +1 за каждый полный интервал
+    v_energy := COALESCE(v_user.energy, 0);
+    IF v_energy < p_energy_max AND v_user.energy_last_update IS NOT NULL THEN
+        v_energy := LEAST(
+            p_energy_max,
+            v_energy + FLOOR(EXTRACT(EPOCH FROM (NOW() - v_user.energy_last_update)) / 60 / p_energy_regen_minutes)::INTEGER
+        );
+    END IF;
+
+    IF v_energy < p_energy_cost THEN
+        RETURN jsonb_build_object('status', 'insufficient_energy', 'energy', v_energy);
+    END IF;
+
+    IF p_currency = 'ryabucks' AND COALESCE(v_user.ryabucks, 0) < p_ryabucks_cost THEN
+        RETURN jsonb_build_object('status', 'insufficient_funds', 'user_ryabucks', COALESCE(v_user.ryabucks, 0));
+    END IF;
+
+    IF p_currency = 'rbtc' AND COALESCE(v_user.rbtc, 0) < p_rbtc_cost THEN
+        RETURN jsonb_build_object('status', 'insufficient_funds', 'user_rbtc', COALESCE(v_user.rbtc, 0));
+    END IF;
+
+    IF COALESCE(v_user.liquid_experience, 0) < p_experience_cost THEN
+        RETURN jsonb_build_object('status', 'insufficient_experience', 'liquid_experience', COALESCE(v_user.liquid_experience, 0));
+    END IF;
+
+    SELECT COALESCE(MAX(active), 0) INTO v_count FROM user_roster_summary
+    WHERE user_id = p_user_id;
+
+    IF v_count >= p_max_specialists THEN
+        RETURN jsonb_build_object('status', 'limit_reached', 'count', v_count);
+    END IF;
+
+    UPDATE users SET
+        ryabucks = ryabucks - CASE WHEN p_currency = 'ryabucks' THEN p_ryabucks_cost ELSE 0 END,
+        rbtc = rbtc - CASE WHEN p_currency = 'rbtc' THEN p_rbtc_cost ELSE 0 END,
+        liquid_experience = liquid_experience - p_experience_cost,
+        energy = v_energy - p_energy_cost,
+        energy_last_update = NOW(),
+        last_active = NOW()
+    WHERE user_id = p_user_id;
+
+    INSERT INTO user_specialists (
+        user_id, specialist_type, name, efficiency, loyalty, experience, current_hp, max_hp,
+        combat_stats, hired_at, status, last_work_at, healing_cost, healing_time_hours
+    )
+    SELECT p_user_id, r.specialist_type, r.name, r.efficiency, r.loyalty, r.experience, r.current_hp, r.max_hp,
+           r.combat_stats, r.hired_at, r.status, r.last_work_at, r.healing_cost, r.healing_time_hours
+    FROM jsonb_populate_record(NULL::user_specialists, p_specialist) r
+    RETURNING id INTO v_id;
+
+    RETURN jsonb_build_object('status', 'ok', 'specialist_id', v_id, 'energy', v_energy - p_energy_cost);
+END;
+$$;
@@ -0,0 +1,72 @@
+-- adapters/database/supabase/migrations/008_heal_all.sql
+-- Лечение всех раненых специалистов одной транзакцией
+-- (SpecialistService.heal_all)
+--
+-- Раненые специалисты блокируются и суммируются одним запросом, затем
+-- одним UPDATE списываются рябаксы и одним UPDATE восстанавливается HP
+-- всех пациентов. Возвращает список вылеченных со стоимостью и HP до лечения.
+
+CREATE OR REPLACE FUNCTION heal_all_specialists(p_user_id BIGINT) RETURNS JSONB
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_ryabucks BIGINT;
+    v_ids BIGINT[];
+    v_patients JSONB;
+    v_total BIGINT;
+BEGIN
+    SELECT ryabucks INTO v_ryabucks FROM users WHERE user_id = p_user_id FOR UPDATE;
+
+    IF NOT FOUND THEN
+        RETURN jsonb_build_object('status', 'user_not_found');
+    END IF;
+
+    SELECT array_agg(id ORDER BY id),
+           jsonb_agg(jsonb_build_object(
+               'id', id,
+               'specialist_type', specialist_type,
+               'name', name,
+               'hp_before', current_hp,
+               'max_hp', max_hp,
+               'healing_cost', healing_cost
+           ) ORDER BY id),
+           COALESCE(SUM(healing_cost), 0)
+    INTO v_ids, v_patients, v_total
+    FROM (
+        SELECT id, specialist_type, name, current_hp, max_hp, COALESCE(healing_cost, 50) AS healing_cost
+        FROM user_specialists
+        WHERE user_id = p_user_id AND status = 'injured' AND current_hp < max_hp
+        FOR UPDATE
+    ) patients;
+
+    IF v_ids IS NULL THEN
+        RETURN jsonb_build_object('status', 'nothing_to_heal');
+    END IF;
+
+    IF COALESCE(v_ryabucks, 0) < v_total THEN
+        RETURN jsonb_build_object(
+            'status', 'insufficient_funds',
+            'total_cost', v_total,
+            'count', cardinality(v_ids),
+            'user_ryabucks', COALESCE(v_ryabucks, 0)
+        );
+    END IF;
+
+    UPDATE users SET
+        ryabucks = ryabucks - v_total,
+        last_active = NOW()
+    WHERE user_id = p_user_id;
+
+    UPDATE user_specialists SET
+        current_hp = max_hp,
+        status = 'available'
+    WHERE id = ANY(v_ids);
+
+    RETURN jsonb_build_object(
+        'status', 'ok',
+        'total_cost', v_total,
+        'count', cardinality(v_ids),
+        'healed', v_patients
+    );
+END;
+$$;
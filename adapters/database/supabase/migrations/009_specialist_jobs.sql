@@ -0,0 +1,147 @@
+-- adapters/database/supabase/migrations/009_specialist_jobs.sql
+-- Таймеры специалистов: обучение и работа (services/job_scheduler.py)
+--
+-- specialist_jobs - долговременная копия таймеров, которые процесс держит
+-- в колесе таймеров. Запуск задачи меняет статус специалиста и вставляет
+-- строку одной транзакцией; завершение - одним вызовом на тик для всех
+-- созревших задач (один UPDATE специалистов на пачку). При старте
+-- процесс загружает незавершённые задачи, таблица не опрашивается.
+-- Вид 'recovery' (восстановление после ранения) поддерживается функциями,
+-- но пока не запускается: ранения в экспедициях ещё не применяются.
+
+CREATE TABLE IF NOT EXISTS specialist_jobs (
+    id BIGSERIAL PRIMARY KEY,
+    user_id BIGINT NOT NULL,
+    specialist_id BIGINT NOT NULL,
+    kind TEXT NOT NULL,                 -- 'training' | 'work' | 'recovery'
+    due_at TIMESTAMPTZ NOT NULL,
+    payload JSONB NOT NULL DEFAULT '{}'::JSONB,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    finished_at TIMESTAMPTZ,
+    outcome TEXT                        -- 'completed' | 'skipped' | 'cancelled'
+);
+
+-- Загрузка незавершённых задач при старте (keyset по id)
+CREATE INDEX IF NOT EXISTS idx_specialist_jobs_pending
+    ON specialist_jobs (id) WHERE finished_at IS NULL;
+
+-- Не больше одной активной задачи на специалиста
+CREATE UNIQUE INDEX IF NOT EXISTS idx_specialist_jobs_active_specialist
+    ON specialist_jobs (specialist_id) WHERE finished_at IS NULL;
+
+-- p_durations: {тип специалиста: секунд}; тип без длительности не допускается
+CREATE OR REPLACE FUNCTION start_specialist_job(
+    p_user_id BIGINT,
+    p_specialist_id BIGINT,
+    p_kind TEXT,
+    p_from_status TEXT,
+    p_to_status TEXT,
+    p_durations JSONB,
+    p_payload JSONB DEFAULT '{}'::JSONB
+) RETURNS JSONB
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_spec RECORD;
+    v_seconds INTEGER;
+    v_job_id BIGINT;
+    v_due_at TIMESTAMPTZ;
+BEGIN
+    SELECT id, specialist_type, status INTO v_spec
+    FROM user_specialists
+    WHERE id = p_specialist_id AND user_id = p_user_id
+    FOR UPDATE;
+
+    IF NOT FOUND THEN
+        RETURN jsonb_build_object('status', 'not_found');
+    END IF;
+
+    IF v_spec.status <> p_from_status THEN
+        RETURN jsonb_build_object('status', 'wrong_status', 'current', v_spec.status);
+    END IF;
+
+    v_seconds := (p_durations ->> v_spec.specialist_type)::INTEGER;
+    IF v_seconds IS NULL THEN
+        RETURN jsonb_build_object('status', 'not_allowed', 'specialist_type', v_spec.specialist_type);
+    END IF;
+
+    -- Восстановление, потерявшее смысл после платного лечения
+    UPDATE specialist_jobs SET finished_at = NOW(), outcome = 'cancelled'
+    WHERE specialist_id = p_specialist_id AND finished_at IS NULL AND kind = 'recovery'
+      AND v_spec.status <> 'injured';
+
+    IF EXISTS (SELECT 1 FROM specialist_jobs WHERE specialist_id = p_specialist_id AND finished_at IS NULL) THEN
+        RETURN jsonb_build_object('status', 'busy');
+    END IF;
+
+    v_due_at := NOW() + make_interval(secs => v_seconds);
+
+    UPDATE user_specialists SET
+        status = p_to_status,
+        last_work_at = CASE WHEN p_to_status = 'working' THEN NOW() ELSE last_work_at END
+    WHERE id = p_specialist_id;
+
+    INSERT INTO specialist_jobs (user_id, specialist_id, kind, due_at, payload)
+    VALUES (p_user_id, p_specialist_id, p_kind, v_due_at, COALESCE(p_payload, '{}'::JSONB))
+    RETURNING id INTO v_job_id;
+
+    RETURN jsonb_build_object(
+        'status', 'ok',
+        'job_id', v_job_id,
+        'specialist_type', v_spec.specialist_type,
+        'due_at', v_due_at
+    );
+END;
+$$;
+
+-- Завершение пачки созревших задач. Специалист обновляется, только если
+-- всё ещё в статусе задачи (иначе задача помечается skipped).
+CREATE OR REPLACE FUNCTION complete_specialist_jobs(p_job_ids BIGINT[]) RETURNS JSONB
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_completed BIGINT[];
+    v_finished INTEGER;
+BEGIN
+    WITH jobs AS (
+        SELECT j.id, j.specialist_id, j.kind, j.payload
+        FROM specialist_jobs j
+        JOIN user_specialists s ON s.id = j.specialist_id
+        WHERE j.id = ANY(p_job_ids) AND j.finished_at IS NULL
+          AND s.status = CASE j.kind WHEN 'training' THEN 'training' WHEN 'work' THEN 'working' ELSE 'injured' END
+        FOR UPDATE OF j, s
+    ), done AS (
+        UPDATE user_specialists s SET
+            status = 'available',
+            current_hp = CASE WHEN d.kind = 'recovery' THEN s.max_hp ELSE s.current_hp END,
+            experience = s.experience + CASE
+                WHEN d.kind = 'training' THEN COALESCE((d.payload ->> 'experience')::INTEGER, 0)
+                ELSE 0
+            END
+        FROM jobs d
+        WHERE s.id = d.specialist_id
+        RETURNING d.id
+    )
+    SELECT COALESCE(array_agg(id), '{}') INTO v_completed FROM done;
+
+    UPDATE specialist_jobs SET
+        finished_at = NOW(),
+        outcome = CASE WHEN id = ANY(v_completed) THEN 'completed' ELSE 'skipped' END
+    WHERE id = ANY(p_job_ids) AND finished_at IS NULL;
+    GET DIAGNOSTICS v_finished = ROW_COUNT;
+
+    RETURN jsonb_build_object('finished', v_finished, 'completed', cardinality(v_completed));
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION cancel_specialist_jobs(p_specialist_ids BIGINT[], p_kind TEXT DEFAULT NULL) RETURNS INTEGER
+LANGUAGE sql
+AS $$
+    WITH cancelled AS (
+        UPDATE specialist_jobs SET finished_at = NOW(), outcome = 'cancelled'
+        WHERE specialist_id = ANY(p_specialist_ids) AND finished_at IS NULL
+          AND (p_kind IS NULL OR kind = p_kind)
+        RETURNING id
+    )
+    SELECT COUNT(*)::INTEGER FROM cancelled;
+$$;
@@ -0,0 +1,124 @@
+-- adapters/database/supabase/migrations/010_income_settlement.sql
+-- Пассивный доход специалистов на работе (services/income_settlement.py)
+--
+-- Доход начисляется за время рабочей смены (задача 'work' в
+-- specialist_jobs): от начала смены created_at (или от прошлого расчёта)
+-- до конца смены или момента расчёта. last_work_at специалиста не
+-- подходит - он сдвигается новой сменой, и неоплаченная прошлая смена
+-- потеряла бы своё окно. income_settled_until - курсор расчёта по
+-- смене. Страница для расчёта отдаётся колонками (массивы в одной
+-- строке JSONB), чтобы не упираться в лимит строк PostgREST.
+-- Начисление - один вызов на пачку смен: курсоры сдвигаются только если
+-- совпали с прочитанными (иначе откат всей пачки), затем одним UPDATE
+-- зачисляются суммы по игрокам. Повтор вызова с тем же run_id ничего
+-- не начисляет.
+-- Требует 009_specialist_jobs.sql.
+
+ALTER TABLE specialist_jobs
+    ADD COLUMN IF NOT EXISTS income_settled_until TIMESTAMPTZ;
+
+CREATE INDEX IF NOT EXISTS idx_specialist_jobs_unsettled_work
+    ON specialist_jobs (id)
+    WHERE kind = 'work' AND (income_settled_until IS NULL OR income_settled_until < due_at);
+
+CREATE TABLE IF NOT EXISTS income_settlement_runs (
+    run_id UUID PRIMARY KEY,
+    jobs INTEGER NOT NULL,
+    users INTEGER NOT NULL,
+    total BIGINT NOT NULL,
+    settled_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE OR REPLACE FUNCTION income_settlement_page(
+    p_cutoff TIMESTAMPTZ,
+    p_after_id BIGINT,
+    p_limit INTEGER
+) RETURNS JSONB
+LANGUAGE sql STABLE
+AS $$
+    WITH page AS (
+        SELECT j.id AS job_id,
+               j.user_id,
+               s.specialist_type,
+               COALESCE(s.efficiency, 100) AS efficiency,
+               COALESCE(s.loyalty, 100) AS loyalty,
+               j.income_settled_until AS settled_from,
+               COALESCE(j.income_settled_until, j.created_at) AS accrue_from,
+               -- Прерванная смена оплачивается до момента прерывания
+               LEAST(j.due_at, p_cutoff,
+                     CASE WHEN j.outcome IN ('skipped', 'cancelled') THEN j.finished_at END) AS accrue_to,
+               CASE
+                   WHEN j.outcome IN ('skipped', 'cancelled') OR j.due_at <= p_cutoff THEN j.due_at
+                   ELSE p_cutoff
+               END AS settle_to,
+               COALESCE(u.quantum_pass_until > p_cutoff, FALSE) AS quantum_pass
+        FROM specialist_jobs j
+        JOIN user_specialists s ON s.id = j.specialist_id
+        JOIN users u ON u.user_id = j.user_id
+        WHERE j.kind = 'work'
+          AND (j.income_settled_until IS NULL OR j.income_settled_until < j.due_at)
+          AND j.id > p_after_id
+        ORDER BY j.id
+        LIMIT p_limit
+    )
+    SELECT jsonb_build_object(
+        'job_id', COALESCE(jsonb_agg(job_id ORDER BY job_id), '[]'::JSONB),
+        'user_id', COALESCE(jsonb_agg(user_id ORDER BY job_id), '[]'::JSONB),
+        'specialist_type', COALESCE(jsonb_agg(specialist_type ORDER BY job_id), '[]'::JSONB),
+        'efficiency', COALESCE(jsonb_agg(efficiency ORDER BY job_id), '[]'::JSONB),
+        'loyalty', COALESCE(jsonb_agg(loyalty ORDER BY job_id), '[]'::JSONB),
+        'accrue_from', COALESCE(jsonb_agg(EXTRACT(EPOCH FROM accrue_from) ORDER BY job_id), '[]'::JSONB),
+        'accrue_to', COALESCE(jsonb_agg(EXTRACT(EPOCH FROM GREATEST(accrue_to, accrue_from)) ORDER BY job_id), '[]'::JSONB),
+        'settled_from', COALESCE(jsonb_agg(settled_from ORDER BY job_id), '[]'::JSONB),
+        'settle_to', COALESCE(jsonb_agg(settle_to ORDER BY job_id), '[]'::JSONB),
+        'quantum_pass', COALESCE(jsonb_agg(quantum_pass ORDER BY job_id), '[]'::JSONB)
+    )
+    FROM page;
+$$;
+
+CREATE OR REPLACE FUNCTION settle_specialist_income(
+    p_run_id UUID,
+    p_job_ids BIGINT[],
+    p_settled_from TEXT[],
+    p_settle_to TEXT[],
+    p_user_ids BIGINT[],
+    p_credits BIGINT[]
+) RETURNS JSONB
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_moved INTEGER;
+    v_total BIGINT;
+BEGIN
+    SELECT COALESCE(SUM(credit), 0) INTO v_total FROM unnest(p_credits) AS credit;
+
+    INSERT INTO income_settlement_runs (run_id, jobs, users, total)
+    VALUES (p_run_id, cardinality(p_job_ids), cardinality(p_user_ids), v_total)
+    ON CONFLICT (run_id) DO NOTHING;
+
+    IF NOT FOUND THEN
+        RETURN jsonb_build_object('status', 'duplicate');
+    END IF;
+
+    UPDATE specialist_jobs j SET income_settled_until = i.settle_to::TIMESTAMPTZ
+    FROM unnest(p_job_ids, p_settled_from, p_settle_to) AS i(id, settled_from, settle_to)
+    WHERE j.id = i.id
+      AND j.income_settled_until IS NOT DISTINCT FROM i.settled_from::TIMESTAMPTZ;
+    GET DIAGNOSTICS v_moved = ROW_COUNT;
+
+    IF v_moved <> cardinality(p_job_ids) THEN
+        RAISE EXCEPTION 'income_settlement_stale: % of % jobs moved', v_moved, cardinality(p_job_ids);
+    END IF;
+
+    UPDATE users u SET ryabucks = u.ryabucks + c.credit
+    FROM unnest(p_user_ids, p_credits) AS c(user_id, credit)
+    WHERE u.user_id = c.user_id AND c.credit > 0;
+
+    RETURN jsonb_build_object(
+        'status', 'ok',
+        'jobs', v_moved,
+        'users', cardinality(p_user_ids),
+        'total', v_total
+    );
+END;
+$$;
@@ -0,0 +1,124 @@
+-- adapters/database/supabase/migrations/011_tournaments.sql
+-- Турниры петушиных боёв и скачек (services/tournament_service.py)
+--
+-- Состояние турнира (посев, сетка или таблица, рейтинги) хранится одной
+-- строкой: сжатый npz в base64 (services/tournament_engine.py) и номер
+-- сыгранного раунда. Сохранение раунда проверяет номер раунда, поэтому
+-- два процесса не сыграют один раунд дважды.
+-- Призы выплачиваются одним вызовом tournament_payout: списание из пула
+-- турниров (global_pools), зачисление всем призёрам одним UPDATE users,
+-- строки журнала одним INSERT и приращение rbtc_in_circulation. Повторный
+-- вызов по тому же турниру ничего не выплачивает.
+-- Требует 005_economy_counters.sql.
+
+CREATE TABLE IF NOT EXISTS tournaments (
+    id          BIGSERIAL   PRIMARY KEY,
+    kind        TEXT        NOT NULL,
+    format      TEXT        NOT NULL,
+    status      TEXT        NOT NULL DEFAULT 'running',
+    entrants    INTEGER     NOT NULL,
+    round       INTEGER     NOT NULL DEFAULT 0,
+    total_rounds INTEGER    NOT NULL,
+    seed        BIGINT      NOT NULL,
+    prize_fund  NUMERIC     NOT NULL DEFAULT 0,
+    state       TEXT        NOT NULL,
+    created_at  TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    updated_at  TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    finished_at TIMESTAMPTZ,
+    paid_at     TIMESTAMPTZ
+);
+
+CREATE INDEX IF NOT EXISTS idx_tournaments_status ON tournaments (status, id);
+
+-- Пулы турниров (если ещё не заведены)
+INSERT INTO global_pools (pool_name, rbtc_amount)
+SELECT p.pool_name, p.rbtc_amount
+FROM (VALUES ('cockfights', 2100000.0000::NUMERIC), ('races', 1470000.0000::NUMERIC)) AS p(pool_name, rbtc_amount)
+WHERE NOT EXISTS (SELECT 1 FROM global_pools g WHERE g.pool_name = p.pool_name);
+
+CREATE OR REPLACE FUNCTION tournament_save_round(
+    p_tournament_id BIGINT,
+    p_expected_round INTEGER,
+    p_round INTEGER,
+    p_state TEXT,
+    p_finished BOOLEAN
+) RETURNS JSONB
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    UPDATE tournaments
+    SET round = p_round,
+        state = p_state,
+        status = CASE WHEN p_finished THEN 'finished' ELSE status END,
+        finished_at = CASE WHEN p_finished THEN NOW() ELSE finished_at END,
+        updated_at = NOW()
+    WHERE id = p_tournament_id AND round = p_expected_round AND status = 'running';
+
+    IF NOT FOUND THEN
+        RETURN jsonb_build_object('status', 'conflict');
+    END IF;
+    RETURN jsonb_build_object('status', 'ok', 'round', p_round);
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION tournament_payout(
+    p_tournament_id BIGINT,
+    p_pool_name TEXT,
+    p_user_ids BIGINT[],
+    p_amounts TEXT[]
+) RETURNS JSONB
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_status TEXT;
+    v_total NUMERIC;
+    v_pool NUMERIC;
+BEGIN
+    SELECT status INTO v_status FROM tournaments WHERE id = p_tournament_id FOR UPDATE;
+
+    IF NOT FOUND THEN
+        RETURN jsonb_build_object('status', 'not_found');
+    END IF;
+    IF v_status = 'paid' THEN
+        RETURN jsonb_build_object('status', 'duplicate');
+    END IF;
+    IF v_status <> 'finished' THEN
+        RETURN jsonb_build_object('status', 'not_finished');
+    END IF;
+
+    SELECT COALESCE(SUM(amount::NUMERIC), 0) INTO v_total FROM unnest(p_amounts) AS amount;
+
+    SELECT rbtc_amount::NUMERIC INTO v_pool
+    FROM global_pools WHERE pool_name = p_pool_name FOR UPDATE;
+
+    IF v_pool IS NULL OR v_pool < v_total THEN
+        RETURN jsonb_build_object('status', 'pool_exhausted', 'pool', v_pool, 'total', v_total);
+    END IF;
+
+    UPDATE global_pools
+    SET rbtc_amount = v_pool - v_total, updated_at = NOW()
+    WHERE pool_name = p_pool_name;
+
+    UPDATE users u SET rbtc = COALESCE(u.rbtc, 0) + p.amount::NUMERIC
+    FROM unnest(p_user_ids, p_amounts) AS p(user_id, amount)
+    WHERE u.user_id = p.user_id;
+
+    INSERT INTO pool_transactions (pool_name, transaction_type, rbtc_amount, ryabucks_amount, user_id, description)
+    SELECT p_pool_name, 'tournament_prize', p.amount::NUMERIC, 0, p.user_id,
+           'Приз турнира #' || p_tournament_id || ', место ' || p.place
+    FROM unnest(p_user_ids, p_amounts) WITH ORDINALITY AS p(user_id, amount, place);
+
+    UPDATE pool_statistics SET rbtc_in_circulation = rbtc_in_circulation + v_total, updated_at = NOW();
+
+    UPDATE tournaments
+    SET status = 'paid', prize_fund = v_total, paid_at = NOW(), updated_at = NOW()
+    WHERE id = p_tournament_id;
+
+    RETURN jsonb_build_object(
+        'status', 'ok',
+        'winners', cardinality(p_user_ids),
+        'total', v_total,
+        'pool', v_pool - v_total
+    );
+END;
+$$;
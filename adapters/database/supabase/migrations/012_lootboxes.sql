@@ -0,0 +1,144 @@
+-- adapters/database/supabase/migrations/012_lootboxes.sql
+-- Коробки и предметы рюкзака, открытие коробок (services/lootbox_service.py)
+--
+-- user_items - количества предметов игрока по имени поля рюкзака:
+-- коробки (free_boxes, rbtc_boxes ...), допуски, семена, ресурсы.
+-- Награды открытия разыгрываются в процессе (services/lootbox_engine.py)
+-- и записываются одним вызовом open_lootboxes независимо от числа
+-- коробок: списание коробок, рябаксы и RBTC одним UPDATE users,
+-- предметы одним INSERT ... ON CONFLICT, журнал пула и счётчик RBTC
+-- у игроков. RBTC выдаётся не больше остатка пула лутбоксов (пул
+-- блокируется на время вызова). Повторный вызов с тем же open_id
+-- возвращает сохранённый итог и ничего не начисляет.
+-- Требует 005_economy_counters.sql.
+
+CREATE TABLE IF NOT EXISTS user_items (
+    user_id     BIGINT      NOT NULL,
+    item        TEXT        NOT NULL,
+    quantity    BIGINT      NOT NULL DEFAULT 0 CHECK (quantity >= 0),
+    updated_at  TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (user_id, item)
+);
+
+CREATE TABLE IF NOT EXISTS lootbox_openings (
+    open_id     UUID        PRIMARY KEY,
+    user_id     BIGINT      NOT NULL,
+    box_item    TEXT        NOT NULL,
+    boxes       INTEGER     NOT NULL,
+    rewards     JSONB       NOT NULL,
+    rbtc        NUMERIC     NOT NULL DEFAULT 0,
+    rbtc_capped BOOLEAN     NOT NULL DEFAULT FALSE,
+    opened_at   TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_lootbox_openings_user ON lootbox_openings (user_id, opened_at DESC);
+
+-- Пул лутбоксов (если ещё не заведён)
+INSERT INTO global_pools (pool_name, rbtc_amount)
+SELECT 'lootboxes', 1260000.0000
+WHERE NOT EXISTS (SELECT 1 FROM global_pools WHERE pool_name = 'lootboxes');
+
+CREATE OR REPLACE FUNCTION grant_lootboxes(
+    p_user_id BIGINT,
+    p_box_item TEXT,
+    p_count INTEGER
+) RETURNS JSONB
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_quantity BIGINT;
+BEGIN
+    INSERT INTO user_items (user_id, item, quantity)
+    VALUES (p_user_id, p_box_item, p_count)
+    ON CONFLICT (user_id, item) DO UPDATE
+    SET quantity = user_items.quantity + EXCLUDED.quantity, updated_at = NOW()
+    RETURNING quantity INTO v_quantity;
+
+    RETURN jsonb_build_object('status', 'ok', 'quantity', v_quantity);
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION open_lootboxes(
+    p_open_id UUID,
+    p_user_id BIGINT,
+    p_box_item TEXT,
+    p_count INTEGER,
+    p_ryabucks BIGINT,
+    p_rbtc TEXT,
+    p_items JSONB
+) RETURNS JSONB
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_opening RECORD;
+    v_available BIGINT;
+    v_pool NUMERIC;
+    v_rbtc NUMERIC := 0;
+    v_requested NUMERIC := COALESCE(p_rbtc::NUMERIC, 0);
+BEGIN
+    SELECT rewards, rbtc, rbtc_capped INTO v_opening FROM lootbox_openings WHERE open_id = p_open_id;
+    IF FOUND THEN
+        RETURN jsonb_build_object(
+            'status', 'duplicate', 'rewards', v_opening.rewards,
+            'rbtc', v_opening.rbtc, 'rbtc_capped', v_opening.rbtc_capped
+        );
+    END IF;
+
+    PERFORM 1 FROM users WHERE user_id = p_user_id FOR UPDATE;
+    IF NOT FOUND THEN
+        RETURN jsonb_build_object('status', 'user_not_found');
+    END IF;
+
+    UPDATE user_items SET quantity = quantity - p_count, updated_at = NOW()
+    WHERE user_id = p_user_id AND item = p_box_item AND quantity >= p_count
+    RETURNING quantity INTO v_available;
+
+    IF NOT FOUND THEN
+        SELECT quantity INTO v_available FROM user_items WHERE user_id = p_user_id AND item = p_box_item;
+        RETURN jsonb_build_object('status', 'not_enough_boxes', 'available', COALESCE(v_available, 0));
+    END IF;
+
+    -- RBTC - не больше остатка пула
+    IF v_requested > 0 THEN
+        SELECT rbtc_amount::NUMERIC INTO v_pool
+        FROM global_pools WHERE pool_name = 'lootboxes' FOR UPDATE;
+
+        v_rbtc := LEAST(v_requested, GREATEST(COALESCE(v_pool, 0), 0));
+
+        IF v_rbtc > 0 THEN
+            UPDATE global_pools SET rbtc_amount = v_pool - v_rbtc, updated_at = NOW()
+            WHERE pool_name = 'lootboxes';
+
+            INSERT INTO pool_transactions (pool_name, transaction_type, rbtc_amount, ryabucks_amount, user_id, description)
+            VALUES ('lootboxes', 'lootbox_reward', v_rbtc, 0, p_user_id,
+                    'Открыто коробок: ' || p_count || ' (' || p_box_item || ')');
+
+            UPDATE pool_statistics SET rbtc_in_circulation = rbtc_in_circulation + v_rbtc, updated_at = NOW();
+        END IF;
+    END IF;
+
+    UPDATE users
+    SET ryabucks = COALESCE(ryabucks, 0) + COALESCE(p_ryabucks, 0),
+        rbtc = COALESCE(rbtc, 0) + v_rbtc
+    WHERE user_id = p_user_id;
+
+    INSERT INTO user_items (user_id, item, quantity)
+    SELECT p_user_id, i.key, i.value::BIGINT
+    FROM jsonb_each_text(COALESCE(p_items, '{}'::JSONB)) AS i
+    WHERE i.value::BIGINT > 0
+    ON CONFLICT (user_id, item) DO UPDATE
+    SET quantity = user_items.quantity + EXCLUDED.quantity, updated_at = NOW();
+
+    INSERT INTO lootbox_openings (open_id, user_id, box_item, boxes, rewards, rbtc, rbtc_capped)
+    VALUES (p_open_id, p_user_id, p_box_item, p_count,
+            COALESCE(p_items, '{}'::JSONB) || jsonb_build_object('ryabucks', COALESCE(p_ryabucks, 0)),
+            v_rbtc, v_rbtc < v_requested);
+
+    RETURN jsonb_build_object(
+        'status', 'ok',
+        'boxes_left', v_available,
+        'rbtc', v_rbtc,
+        'rbtc_capped', v_rbtc < v_requested
+    );
+END;
+$$;
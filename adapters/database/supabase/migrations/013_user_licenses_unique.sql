@@ -0,0 +1,16 @@
+-- adapters/database/supabase/migrations/013_user_licenses_unique.sql
+-- Одна строка лицензии на (user_id, license_type)
+--
+-- LicenseService.upgrade_license пишет уровень через upsert с
+-- on_conflict=user_id,license_type - для этого нужен уникальный ключ.
+-- Дубликаты, вставленные раньше (выбор insert/update по кэшу уровней),
+-- сворачиваются в строку с наибольшим уровнем.
+
+DELETE FROM user_licenses a
+USING user_licenses b
+WHERE a.user_id = b.user_id
+  AND a.license_type = b.license_type
+  AND (a.level < b.level OR (a.level = b.level AND a.ctid < b.ctid));
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_user_licenses_user_type
+    ON user_licenses (user_id, license_type);
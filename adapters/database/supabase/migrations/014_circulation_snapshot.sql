@@ -0,0 +1,19 @@
+-- adapters/database/supabase/migrations/014_circulation_snapshot.sql
+-- Сверка RBTC у игроков (EconomyCounters.reconcile)
+--
+-- Сумма users.rbtc и счётчик pool_statistics.rbtc_in_circulation
+-- читаются одним запросом - из одного снимка данных. Раньше сумма
+-- набиралась постраничным обходом users во время торговли и сравнивалась
+-- со счётчиком, прочитанным до обхода: RBTC, перемещённые за время
+-- обхода, превращались в ложную поправку.
+-- Требует 005_economy_counters.sql.
+
+CREATE OR REPLACE FUNCTION economy_circulation_snapshot() RETURNS JSONB
+LANGUAGE sql STABLE
+AS $$
+    SELECT jsonb_build_object(
+        'users_rbtc', (SELECT COALESCE(SUM(rbtc), 0) FROM users),
+        'rbtc_in_circulation', (SELECT COALESCE(rbtc_in_circulation, 0) FROM pool_statistics LIMIT 1),
+        'ledger_entries', (SELECT COALESCE(ledger_entries, 0) FROM pool_statistics LIMIT 1)
+    );
+$$;
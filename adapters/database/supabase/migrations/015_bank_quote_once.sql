@@ -0,0 +1,286 @@
+-- adapters/database/supabase/migrations/015_bank_quote_once.sql
+-- Подписанная котировка банка исполняется один раз (services/bank_quotes.py)
+--
+-- Котировка несёт quote_id внутри подписанной строки. bank_swap и
+-- bank_batch_swap пишут его в строку pool_transactions; уникальный индекс
+-- не даёт провести ту же котировку дважды, повтор возвращает
+-- status = 'duplicate' (в пакете - список duplicates при 'rejected').
+-- Сделки без котировки (quote_id = NULL) не ограничиваются.
+-- Обе функции меняют pool_statistics.rbtc_in_circulation в той же
+-- транзакции, что и балансы игроков (как tournament_payout и
+-- open_lootboxes), - отдельной записи журнала процесса не нужно.
+-- Требует 001_bank_swap.sql, 002_bank_batch_swap.sql и
+-- 005_economy_counters.sql.
+
+ALTER TABLE pool_transactions ADD COLUMN IF NOT EXISTS quote_id TEXT;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_pool_transactions_quote_id
+    ON pool_transactions (quote_id) WHERE quote_id IS NOT NULL;
+
+-- Новый параметр меняет сигнатуру - старая версия удаляется, чтобы вызов
+-- по именованным параметрам не был неоднозначным
+DROP FUNCTION IF EXISTS bank_swap(BIGINT, TEXT, NUMERIC, BIGINT, BIGINT);
+
+CREATE OR REPLACE FUNCTION bank_swap(
+    p_user_id BIGINT,
+    p_side TEXT,                            -- 'buy' (RBTC за рябаксы) | 'sell'
+    p_rbtc_amount NUMERIC,
+    p_ryabucks_limit BIGINT DEFAULT NULL,   -- buy: не дороже, sell: не меньше
+    p_expected_version BIGINT DEFAULT NULL, -- версия пула, по которой считалась котировка
+    p_quote_id TEXT DEFAULT NULL            -- id подписанной котировки (одно исполнение)
+) RETURNS JSONB
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_rbtc_pool NUMERIC;
+    v_ryabucks_pool NUMERIC;
+    v_version BIGINT;
+    v_ryabucks BIGINT;
+    v_new_rbtc_pool NUMERIC;
+    v_new_ryabucks_pool NUMERIC;
+    v_user_ryabucks BIGINT;
+    v_user_rbtc NUMERIC;
+    v_rate NUMERIC;
+BEGIN
+    IF p_side NOT IN ('buy', 'sell') THEN
+        RAISE EXCEPTION 'bank_swap: неизвестная сторона сделки %', p_side;
+    END IF;
+
+    IF p_rbtc_amount IS NULL OR p_rbtc_amount <= 0 THEN
+        RETURN jsonb_build_object('status', 'invalid_amount');
+    END IF;
+
+    SELECT rbtc_amount::NUMERIC, version INTO v_rbtc_pool, v_version
+    FROM global_pools WHERE pool_name = 'game_bank_rbtc';
+
+    SELECT ryabucks_amount::NUMERIC INTO v_ryabucks_pool
+    FROM global_pools WHERE pool_name = 'game_bank_ryabucks';
+
+    IF v_rbtc_pool IS NULL OR v_ryabucks_pool IS NULL OR v_rbtc_pool <= 0 OR v_ryabucks_pool <= 0 THEN
+        RETURN jsonb_build_object('status', 'pool_unavailable');
+    END IF;
+
+    IF p_expected_version IS NOT NULL AND p_expected_version <> v_version THEN
+        RETURN jsonb_build_object(
+            'status', 'conflict', 'version', v_version,
+            'rbtc_pool', v_rbtc_pool, 'ryabucks_pool', v_ryabucks_pool
+        );
+    END IF;
+
+    -- Котировка (как calculate_buy_rbtc_cost / calculate_sell_rbtc_reward)
+    IF p_side = 'buy' THEN
+        IF p_rbtc_amount >= v_rbtc_pool THEN
+            RETURN jsonb_build_object('status', 'insufficient_liquidity', 'rbtc_pool', v_rbtc_pool);
+        END IF;
+        v_new_rbtc_pool := v_rbtc_pool - p_rbtc_amount;
+        v_ryabucks := FLOOR(v_rbtc_pool * v_ryabucks_pool / v_new_rbtc_pool - v_ryabucks_pool);
+        v_new_ryabucks_pool := v_ryabucks_pool + v_ryabucks;
+        IF p_ryabucks_limit IS NOT NULL AND v_ryabucks > p_ryabucks_limit THEN
+            RETURN jsonb_build_object('status', 'slippage', 'ryabucks_amount', v_ryabucks);
+        END IF;
+    ELSE
+        v_new_rbtc_pool := v_rbtc_pool + p_rbtc_amount;
+        v_ryabucks := FLOOR(v_ryabucks_pool - v_rbtc_pool * v_ryabucks_pool / v_new_rbtc_pool);
+        v_new_ryabucks_pool := v_ryabucks_pool - v_ryabucks;
+        IF v_new_ryabucks_pool <= 0 THEN
+            RETURN jsonb_build_object('status', 'insufficient_liquidity', 'ryabucks_pool', v_ryabucks_pool);
+        END IF;
+        IF p_ryabucks_limit IS NOT NULL AND v_ryabucks < p_ryabucks_limit THEN
+            RETURN jsonb_build_object('status', 'slippage', 'ryabucks_amount', v_ryabucks);
+        END IF;
+    END IF;
+
+    -- Баланс игрока (строка блокируется до конца транзакции)
+    SELECT ryabucks, rbtc::NUMERIC INTO v_user_ryabucks, v_user_rbtc
+    FROM users WHERE user_id = p_user_id FOR UPDATE;
+
+    IF NOT FOUND THEN
+        RETURN jsonb_build_object('status', 'user_not_found');
+    END IF;
+
+    -- Повтор котировки: строка игрока заблокирована, проверка видит все
+    -- ранее зафиксированные исполнения
+    IF p_quote_id IS NOT NULL AND EXISTS (SELECT 1 FROM pool_transactions WHERE quote_id = p_quote_id) THEN
+        RETURN jsonb_build_object('status', 'duplicate');
+    END IF;
+
+    IF (p_side = 'buy' AND COALESCE(v_user_ryabucks, 0) < v_ryabucks)
+        OR (p_side = 'sell' AND COALESCE(v_user_rbtc, 0) < p_rbtc_amount) THEN
+        RETURN jsonb_build_object(
+            'status', 'insufficient_funds', 'ryabucks_amount', v_ryabucks,
+            'user_ryabucks', COALESCE(v_user_ryabucks, 0), 'user_rbtc', COALESCE(v_user_rbtc, 0)
+        );
+    END IF;
+
+    -- Оптимистичная проверка: пул не менялся с момента чтения
+    UPDATE global_pools
+    SET rbtc_amount = v_new_rbtc_pool, version = version + 1, updated_at = NOW()
+    WHERE pool_name = 'game_bank_rbtc' AND version = v_version;
+
+    IF NOT FOUND THEN
+        RETURN jsonb_build_object('status', 'conflict');
+    END IF;
+
+    UPDATE global_pools
+    SET ryabucks_amount = v_new_ryabucks_pool, updated_at = NOW()
+    WHERE pool_name = 'game_bank_ryabucks';
+
+    IF p_side = 'buy' THEN
+        v_user_ryabucks := v_user_ryabucks - v_ryabucks;
+        v_user_rbtc := COALESCE(v_user_rbtc, 0) + p_rbtc_amount;
+    ELSE
+        v_user_ryabucks := COALESCE(v_user_ryabucks, 0) + v_ryabucks;
+        v_user_rbtc := v_user_rbtc - p_rbtc_amount;
+    END IF;
+
+    UPDATE users SET ryabucks = v_user_ryabucks, rbtc = v_user_rbtc WHERE user_id = p_user_id;
+
+    UPDATE pool_statistics
+    SET rbtc_in_circulation = rbtc_in_circulation
+            + CASE WHEN p_side = 'buy' THEN p_rbtc_amount ELSE -p_rbtc_amount END,
+        updated_at = NOW();
+
+    v_rate := v_new_ryabucks_pool / v_new_rbtc_pool;
+
+    INSERT INTO pool_transactions (pool_name, transaction_type, rbtc_amount, ryabucks_amount, user_id, description, quote_id)
+    VALUES (
+        'game_bank_rbtc',
+        p_side || '_rbtc',
+        p_rbtc_amount,
+        v_ryabucks,
+        p_user_id,
+        CASE WHEN p_side = 'buy' THEN 'Куплено ' ELSE 'Продано ' END
+            || TO_CHAR(p_rbtc_amount, 'FM999999990.0000') || ' RBTC по курсу ' || TO_CHAR(v_rate, 'FM999999990.00'),
+        p_quote_id
+    );
+
+    RETURN jsonb_build_object(
+        'status', 'ok',
+        'ryabucks_amount', v_ryabucks,
+        'price', v_ryabucks / p_rbtc_amount,
+        'rate_after', v_rate,
+        'rbtc_pool', v_new_rbtc_pool,
+        'ryabucks_pool', v_new_ryabucks_pool,
+        'version', v_version + 1,
+        'user_ryabucks', v_user_ryabucks,
+        'user_rbtc', v_user_rbtc
+    );
+EXCEPTION WHEN unique_violation THEN
+    -- Та же котировка исполнена параллельно - всё выше откатывается
+    RETURN jsonb_build_object('status', 'duplicate');
+END;
+$$;
+
+-- p_fills: как в 002_bank_batch_swap.sql, плюс необязательный "quote_id"
+CREATE OR REPLACE FUNCTION bank_batch_swap(
+    p_fills JSONB,
+    p_expected_version BIGINT,
+    p_rbtc_pool_delta NUMERIC,       -- изменение RBTC пула (отрицательное при нетто-покупке)
+    p_ryabucks_pool_delta BIGINT,    -- изменение пула рябаксов
+    p_price NUMERIC                  -- цена клиринга (для журнала)
+) RETURNS JSONB
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_rbtc_pool NUMERIC;
+    v_ryabucks_pool NUMERIC;
+    v_version BIGINT;
+    v_fill JSONB;
+    v_user RECORD;
+    v_rejected BIGINT[] := ARRAY[]::BIGINT[];
+    v_duplicates BIGINT[] := ARRAY[]::BIGINT[];
+BEGIN
+    SELECT rbtc_amount::NUMERIC, version INTO v_rbtc_pool, v_version
+    FROM global_pools WHERE pool_name = 'game_bank_rbtc' FOR UPDATE;
+
+    SELECT ryabucks_amount::NUMERIC INTO v_ryabucks_pool
+    FROM global_pools WHERE pool_name = 'game_bank_ryabucks' FOR UPDATE;
+
+    IF v_rbtc_pool IS NULL OR v_ryabucks_pool IS NULL THEN
+        RETURN jsonb_build_object('status', 'pool_unavailable');
+    END IF;
+
+    IF p_expected_version IS NULL OR v_version <> p_expected_version THEN
+        RETURN jsonb_build_object(
+            'status', 'conflict', 'version', v_version,
+            'rbtc_pool', v_rbtc_pool, 'ryabucks_pool', v_ryabucks_pool
+        );
+    END IF;
+
+    IF v_rbtc_pool + p_rbtc_pool_delta <= 0 OR v_ryabucks_pool + p_ryabucks_pool_delta <= 0 THEN
+        RETURN jsonb_build_object('status', 'insufficient_liquidity');
+    END IF;
+
+    -- Проход 1: блокируем участников (по возрастанию user_id) и проверяем балансы
+    FOR v_fill IN
+        SELECT value FROM jsonb_array_elements(p_fills) ORDER BY (value->>'user_id')::BIGINT
+    LOOP
+        SELECT ryabucks, rbtc::NUMERIC AS rbtc INTO v_user
+        FROM users WHERE user_id = (v_fill->>'user_id')::BIGINT FOR UPDATE;
+
+        IF NOT FOUND
+            OR (v_fill->>'side' = 'buy' AND COALESCE(v_user.ryabucks, 0) < (v_fill->>'ryabucks_amount')::BIGINT)
+            OR (v_fill->>'side' = 'sell' AND COALESCE(v_user.rbtc, 0) < (v_fill->>'rbtc_amount')::NUMERIC) THEN
+            v_rejected := v_rejected || (v_fill->>'user_id')::BIGINT;
+        ELSIF v_fill->>'quote_id' IS NOT NULL
+            AND EXISTS (SELECT 1 FROM pool_transactions WHERE quote_id = v_fill->>'quote_id') THEN
+            v_duplicates := v_duplicates || (v_fill->>'user_id')::BIGINT;
+        END IF;
+    END LOOP;
+
+    IF array_length(v_rejected, 1) IS NOT NULL OR array_length(v_duplicates, 1) IS NOT NULL THEN
+        RETURN jsonb_build_object(
+            'status', 'rejected', 'user_ids', to_jsonb(v_rejected), 'duplicates', to_jsonb(v_duplicates)
+        );
+    END IF;
+
+    -- Проход 2: балансы и журнал
+    FOR v_fill IN SELECT value FROM jsonb_array_elements(p_fills)
+    LOOP
+        IF v_fill->>'side' = 'buy' THEN
+            UPDATE users
+            SET ryabucks = ryabucks - (v_fill->>'ryabucks_amount')::BIGINT,
+                rbtc = COALESCE(rbtc, 0) + (v_fill->>'rbtc_amount')::NUMERIC
+            WHERE user_id = (v_fill->>'user_id')::BIGINT;
+        ELSE
+            UPDATE users
+            SET ryabucks = COALESCE(ryabucks, 0) + (v_fill->>'ryabucks_amount')::BIGINT,
+                rbtc = rbtc - (v_fill->>'rbtc_amount')::NUMERIC
+            WHERE user_id = (v_fill->>'user_id')::BIGINT;
+        END IF;
+
+        INSERT INTO pool_transactions (pool_name, transaction_type, rbtc_amount, ryabucks_amount, user_id, description, quote_id)
+        VALUES (
+            'game_bank_rbtc',
+            (v_fill->>'side') || '_rbtc',
+            (v_fill->>'rbtc_amount')::NUMERIC,
+            (v_fill->>'ryabucks_amount')::BIGINT,
+            (v_fill->>'user_id')::BIGINT,
+            CASE WHEN v_fill->>'side' = 'buy' THEN 'Куплено ' ELSE 'Продано ' END
+                || TO_CHAR((v_fill->>'rbtc_amount')::NUMERIC, 'FM999999990.0000')
+                || ' RBTC по цене аукциона ' || TO_CHAR(p_price, 'FM999999990.00'),
+            v_fill->>'quote_id'
+        );
+    END LOOP;
+
+    -- RBTC у игроков меняется на нетто-объём пакета (обратный знак изменения пула)
+    UPDATE pool_statistics
+    SET rbtc_in_circulation = rbtc_in_circulation - p_rbtc_pool_delta, updated_at = NOW();
+
+    -- Одна запись в каждый пул на весь пакет
+    UPDATE global_pools
+    SET rbtc_amount = v_rbtc_pool + p_rbtc_pool_delta, version = version + 1, updated_at = NOW()
+    WHERE pool_name = 'game_bank_rbtc';
+
+    UPDATE global_pools
+    SET ryabucks_amount = v_ryabucks_pool + p_ryabucks_pool_delta, updated_at = NOW()
+    WHERE pool_name = 'game_bank_ryabucks';
+
+    RETURN jsonb_build_object(
+        'status', 'ok',
+        'rbtc_pool', v_rbtc_pool + p_rbtc_pool_delta,
+        'ryabucks_pool', v_ryabucks_pool + p_ryabucks_pool_delta,
+        'version', v_version + 1
+    );
+END;
+$$;
@@ -6,12 +6,12 @@
 
 import logging
 from datetime import datetime, timezone, timedelta
-from decimal import Decimal
 from typing import Optional, Dict, Any, List, Union
 from dataclasses import dataclass
 import asyncio
 
 from core.domain.entities import User, Resources, RBTC, Energy, UserStats
+from core.domain.money import Money, ZERO
 from core.ports.repositories import UserRepository
 from adapters.database.supabase.client import SupabaseClient
 
@@ -44,7 +44,7 @@ class ValidationError(UserRepositoryError):
 class UserUpdateData:
     """Валидированные данные для обновления пользователя"""
     ryabucks: Optional[int] = None
-    rbtc: Optional[Decimal] = None
+    rbtc: Optional[Money] = None
     energy: Optional[int] = None
     liquid_experience: Optional[int] = None
     golden_shards: Optional[int] = None
@@ -54,6 +54,8 @@ class UserUpdateData:
 
     def __post_init__(self):
         """Валидация данных после инициализации"""
+        if self.rbtc is not None:
+            self.rbtc = Money.of(self.rbtc)
         if self.ryabucks is not None and self.ryabucks < 0:
             raise ValidationError("Ryabucks не могут быть отрицательными")
         if self.rbtc is not None and self.rbtc < 0:
@@ -89,6 +91,10 @@ class SupabaseUserRepository(UserRepository):
         """Кеширование пользователя"""
         self._user_cache[user.user_id] = (user, datetime.now(timezone.utc))
 
+    def invalidate_cached(self, user_id: int) -> None:
+        """Сбросить кеш пользователя (запись прошла через RPC)"""
+        self._user_cache.pop(user_id, None)
+
     async def get_by_id(self, user_id: int) -> Optional[User]:
         """Получить пользователя по ID с кешированием и улучшенной обработкой ошибок"""
         try:
@@ -122,7 +128,7 @@ class SupabaseUserRepository(UserRepository):
             try:
                 resources = Resources(
                     ryabucks=max(0, user_data.get('ryabucks', 100)),
-                    rbtc=RBTC(Decimal(str(user_data.get('rbtc', '0.0000')))),
+                    rbtc=RBTC(Money.of(user_data.get('rbtc'))),
                     energy=Energy(
                         current=max(0, min(200, user_data.get('energy', 30))),
                         maximum=max(30, min(200, user_data.get('energy_max', 30))),
@@ -195,7 +201,7 @@ class SupabaseUserRepository(UserRepository):
                 "display_name": user.display_name,
                 "player_id": user.player_id,
                 "ryabucks": max(0, user.resources.ryabucks),
-                "rbtc": float(max(Decimal('0'), user.resources.rbtc.amount)),
+                "rbtc": str(max(ZERO, user.resources.rbtc.amount)),
                 "energy": max(0, min(200, user.resources.energy.current)),
                 "energy_max": max(30, min(200, user.resources.energy.maximum)),
                 "energy_updated_at": user.resources.energy.last_updated.isoformat(),
@@ -288,7 +294,7 @@ class SupabaseUserRepository(UserRepository):
                 update_data['ryabucks'] = validated_updates.ryabucks
 
             if validated_updates.rbtc is not None:
-                update_data['rbtc'] = float(validated_updates.rbtc)
+                update_data['rbtc'] = str(validated_updates.rbtc)
 
             if validated_updates.energy is not None:
                 update_data['energy'] = validated_updates.energy
@@ -414,9 +420,9 @@ class SupabaseUserRepository(UserRepository):
                 stat_value = stat['stat_value']
 
                 if hasattr(stats, stat_name):
-                    # Обрабатываем Decimal поля
+                    # Денежные поля
                     if stat_name in ['rbtc_found', 'rbtc_earned', 'rbtc_spent']:
-                        stat_value = Decimal(str(stat_value))
+                        stat_value = Money.of(stat_value)
 
                     setattr(stats, stat_name, stat_value)
 
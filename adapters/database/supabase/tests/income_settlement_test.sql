@@ -0,0 +1,74 @@
+-- adapters/database/supabase/tests/income_settlement_test.sql
+-- Проверка income_settlement_page (010_income_settlement.sql): две
+-- неоплаченные смены одного специалиста подряд - каждая оплачивается за
+-- своё окно, хотя last_work_at уже сдвинут второй сменой. С прежним
+-- accrue_from (через last_work_at) смена 1 получала окно 0 ч.
+--
+-- Таблицы подменяются временными (pg_temp первым в search_path), всё
+-- выполняется в транзакции с откатом - данные БД не меняются.
+-- Запуск на базе с применёнными миграциями:
+--     psql "$DATABASE_URL" -v ON_ERROR_STOP=1 -f adapters/database/supabase/tests/income_settlement_test.sql
+
+BEGIN;
+
+CREATE TEMP TABLE users (
+    user_id BIGINT PRIMARY KEY,
+    ryabucks BIGINT NOT NULL DEFAULT 0,
+    quantum_pass_until TIMESTAMPTZ
+) ON COMMIT DROP;
+
+CREATE TEMP TABLE user_specialists (
+    id BIGINT PRIMARY KEY,
+    user_id BIGINT NOT NULL,
+    specialist_type TEXT NOT NULL,
+    efficiency INTEGER,
+    loyalty INTEGER,
+    last_work_at TIMESTAMPTZ
+) ON COMMIT DROP;
+
+CREATE TEMP TABLE specialist_jobs (
+    id BIGINT PRIMARY KEY,
+    user_id BIGINT NOT NULL,
+    specialist_id BIGINT NOT NULL,
+    kind TEXT NOT NULL,
+    due_at TIMESTAMPTZ NOT NULL,
+    created_at TIMESTAMPTZ NOT NULL,
+    finished_at TIMESTAMPTZ,
+    outcome TEXT,
+    income_settled_until TIMESTAMPTZ
+) ON COMMIT DROP;
+
+-- Смена 1: 10ч..2ч назад, завершена, не оплачена (простой расчёта).
+-- Смена 2: началась 2ч назад, идёт ещё 6ч; last_work_at = её начало.
+INSERT INTO users (user_id) VALUES (1);
+INSERT INTO user_specialists VALUES (10, 1, 'laborer', 100, 100, NOW() - INTERVAL '2 hours');
+INSERT INTO specialist_jobs (id, user_id, specialist_id, kind, due_at, created_at, finished_at, outcome) VALUES
+    (100, 1, 10, 'work', NOW() - INTERVAL '2 hours', NOW() - INTERVAL '10 hours', NOW() - INTERVAL '2 hours', 'completed'),
+    (101, 1, 10, 'work', NOW() + INTERVAL '6 hours', NOW() - INTERVAL '2 hours', NULL, NULL);
+
+DO $$
+DECLARE
+    v_page JSONB;
+    v_hours NUMERIC;
+BEGIN
+    v_page := income_settlement_page(NOW(), 0, 100);
+
+    IF jsonb_array_length(v_page->'job_id') <> 2 THEN
+        RAISE EXCEPTION 'ожидались 2 смены, получено %', v_page->'job_id';
+    END IF;
+
+    v_hours := ((v_page->'accrue_to'->>0)::NUMERIC - (v_page->'accrue_from'->>0)::NUMERIC) / 3600;
+    IF round(v_hours, 3) <> 8 THEN
+        RAISE EXCEPTION 'смена 1: окно % ч вместо 8 ч', v_hours;
+    END IF;
+
+    v_hours := ((v_page->'accrue_to'->>1)::NUMERIC - (v_page->'accrue_from'->>1)::NUMERIC) / 3600;
+    IF round(v_hours, 3) <> 2 THEN
+        RAISE EXCEPTION 'смена 2: окно % ч вместо 2 ч', v_hours;
+    END IF;
+
+    RAISE NOTICE 'income_settlement_page: смены подряд оплачиваются за свои окна - OK';
+END;
+$$;
+
+ROLLBACK;
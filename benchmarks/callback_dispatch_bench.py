@@ -0,0 +1,111 @@
+# benchmarks/callback_dispatch_bench.py
+"""
+Бенчмарк маршрутизации callback: линейная цепочка фильтров против индекса
+
+"До": для каждого callback по очереди проверяются фильтры F.data == ... /
+F.data.startswith(...) всех handlers так, как их обходит aiogram: роутеры
+в порядке подключения в setup_handlers, внутри роутера - в порядке
+объявления handlers в модуле.
+"После": один поиск в callback_index.
+
+Запуск (нужны те же переменные окружения, что и для бота):
+    python -m benchmarks.callback_dispatch_bench
+"""
+
+import asyncio
+import inspect
+import random
+import sys
+import time
+from pathlib import Path
+from types import ModuleType
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from aiogram import Dispatcher, F
+from aiogram.types import CallbackQuery, User
+
+from interfaces.telegram_bot import handlers
+from interfaces.telegram_bot.handlers import callback_index, setup_handlers
+
+ROUNDS = 20_000
+
+
+def router_modules():
+    """Модули handlers в порядке обхода роутеров диспетчером"""
+    dp = Dispatcher()
+    asyncio.run(setup_handlers(dp))
+    modules = {
+        id(module.router): module.__name__
+        for module in vars(handlers).values()
+        if isinstance(module, ModuleType) and hasattr(module, "router")
+    }
+    return [modules[id(router)] for router in dp.chain_tail if id(router) in modules]
+
+
+def build_linear_chain():
+    """Цепочка фильтров в порядке реальной цепочки роутеров"""
+    order = {name: position for position, name in enumerate(router_modules())}
+
+    def position(entry):
+        callback = inspect.unwrap(entry[2].callback)
+        return order.get(callback.__module__, len(order)), callback.__code__.co_firstlineno
+
+    chain = []
+    for key, is_prefix, handler in sorted(callback_index.entries(), key=position):
+        magic = F.data.startswith(key) if is_prefix else F.data == key
+        chain.append((magic, handler))
+    return chain
+
+
+def sample_callbacks(count: int):
+    """Callback запросы со случайными callback_data из индекса"""
+    user = User(id=1, is_bot=False, first_name="bench")
+    values = [key + ("1" if is_prefix else "") for key, is_prefix, _ in callback_index.entries()]
+    # Типизированные callback с неподходящими полями индекс отклоняет намеренно
+    values = [value for value in values if callback_index.resolve(value)]
+    rng = random.Random(42)
+    return [
+        CallbackQuery(id=str(i), from_user=user, chat_instance="bench", data=rng.choice(values))
+        for i in range(count)
+    ]
+
+
+def route_linear(chain, callback: CallbackQuery):
+    for magic, handler in chain:
+        if magic.resolve(callback):
+            return handler
+    return None
+
+
+def route_indexed(callback: CallbackQuery):
+    match = callback_index.resolve(callback.data)
+    return match.handler if match else None
+
+
+def measure(route, callbacks) -> float:
+    started = time.perf_counter()
+    for callback in callbacks:
+        route(callback)
+    return (time.perf_counter() - started) / len(callbacks) * 1e6
+
+
+def main():
+    chain = build_linear_chain()
+    callbacks = sample_callbacks(ROUNDS)
+
+    # Оба способа должны находить одни и те же handlers
+    mismatched = sum(1 for c in callbacks[:1000] if route_linear(chain, c) is not route_indexed(c))
+
+    linear_us = measure(lambda c: route_linear(chain, c), callbacks)
+    indexed_us = measure(route_indexed, callbacks)
+
+    print(f"Записей в индексе: {len(callback_index)}")
+    print(f"Расхождений маршрутизации (1000 проб): {mismatched}")
+    print(f"Линейная цепочка: {linear_us:8.2f} мкс/callback")
+    print(f"Индекс:           {indexed_us:8.2f} мкс/callback")
+    print(f"Ускорение:        {linear_us / indexed_us:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
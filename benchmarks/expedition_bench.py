@@ -0,0 +1,72 @@
+# benchmarks/expedition_bench.py
+"""
+Бенчмарк расчёта экспедиций: 10 000 отрядов по 5 бойцов за один вызов
+
+Проверяет бюджет времени и детерминированность по seed.
+
+Запуск (нужны те же переменные окружения, что и для бота):
+    python -m benchmarks.expedition_bench
+"""
+
+import random
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from services.expedition_engine import DIFFICULTIES, MAX_SQUAD_SIZE, SquadBatch, resolve_expeditions
+
+EXPEDITIONS = 10_000
+SEED = 20241019
+BUDGET_SECONDS = 0.25
+
+
+def synthetic_squads(count: int):
+    """Отряды из Q-солдат и лесников с полным или неполным HP"""
+    rng = random.Random(SEED)
+    squads = []
+    next_id = 1
+    for _ in range(count):
+        members = []
+        for _ in range(rng.randint(1, MAX_SQUAD_SIZE)):
+            specialist_type = rng.choice(["q_soldier", "forester"])
+            max_hp = 63 if specialist_type == "q_soldier" else 55
+            members.append({
+                "id": next_id,
+                "specialist_type": specialist_type,
+                "current_hp": rng.randint(max_hp // 2, max_hp),
+                "max_hp": max_hp
+            })
+            next_id += 1
+        squads.append((rng.choice(DIFFICULTIES), members))
+    return squads
+
+
+def main():
+    squads = synthetic_squads(EXPEDITIONS)
+
+    started = time.perf_counter()
+    batch = SquadBatch.from_squads(squads)
+    built = time.perf_counter()
+    outcome = resolve_expeditions(batch, seed=SEED)
+    resolved = time.perf_counter()
+
+    repeat = resolve_expeditions(SquadBatch.from_squads(squads), seed=SEED)
+    assert np.array_equal(outcome.hp_after, repeat.hp_after)
+    assert np.array_equal(outcome.loot_rbtc, repeat.loot_rbtc)
+
+    print(f"Экспедиций: {len(batch):,}, побед: {int(outcome.victory.sum()):,}")
+    print(f"Раненых: {int(outcome.injured.sum()):,}, погибших: {int(outcome.dead.sum()):,}, "
+          f"добыча: {outcome.loot_rbtc.sum() / 1_000_000:,.4f} RBTC, предметов: {int(outcome.loot_items.sum()):,}")
+    print(f"Сборка отрядов: {(built - started) * 1000:6.1f} мс")
+    print(f"Расчёт боёв:    {(resolved - built) * 1000:6.1f} мс (бюджет {BUDGET_SECONDS * 1000:.0f} мс)")
+    print(f"Пример: {outcome.expedition(0, batch)}")
+
+    assert resolved - built <= BUDGET_SECONDS, f"расчёт {resolved - built:.3f} сек превышает бюджет"
+
+
+if __name__ == "__main__":
+    main()
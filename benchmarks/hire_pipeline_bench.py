@@ -0,0 +1,117 @@
+# benchmarks/hire_pipeline_bench.py
+"""
+Бенчмарк найма специалиста против локального фейкового бэкенда
+
+Каждый запрос к фейковому клиенту стоит ROUND_TRIP_MS и, как в
+SupabaseClient, выполняется блокирующим вызовом в пуле потоков
+(asyncio.to_thread) - параллельность чтений та же, что в продакшене. Проверяется бюджет задержки найма в запросах:
+холодный найм (лицензии и счётчики ещё не в памяти) - два последовательных
+запроса (параллельные чтения + RPC), повторный - один RPC.
+
+Запуск (нужны те же переменные окружения, что и для бота):
+    python -m benchmarks.hire_pipeline_bench
+"""
+
+import asyncio
+import logging
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from adapters.database.supabase.repositories.user_repository import SupabaseUserRepository
+from services.ledger_writer import ledger_writer
+from services.license_service import LicenseService, license_cache
+from services.economy_counters import economy_counters
+from services.price_multipliers import price_multipliers
+from services.specialist_service import SpecialistService
+
+ROUND_TRIP_MS = 20
+HIRES = 50
+
+# Бюджет в последовательных запросах + запас на работу процесса
+COLD_BUDGET_ROUND_TRIPS = 2
+WARM_BUDGET_ROUND_TRIPS = 1
+OVERHEAD_MS = 10
+
+
+class FakeBackend:
+    """Supabase-клиент с фиксированной задержкой и минимальными ответами
+    (блокирующий запрос в потоке, как синхронный .execute() SupabaseClient)"""
+
+    def __init__(self):
+        self.queries = 0
+
+    async def _round_trip(self):
+        self.queries += 1
+        await asyncio.to_thread(time.sleep, ROUND_TRIP_MS / 1000)
+
+    async def execute_query(self, table, operation, **kwargs):
+        await self._round_trip()
+        if table == "user_licenses":
+            return [{"license_type": "employer", "level": 10}, {"license_type": "farmer", "level": 10}]
+        return []
+
+    async def execute_rpc(self, function, params=None):
+        await self._round_trip()
+        if function == "economy_counters_snapshot":
+            return {"total_rbtc_burned": "0", "rbtc_in_circulation": "0", "qpass_revenue_rbtc": "0",
+                    "total_bank_ryabucks": 1_050_000_000, "bank_transactions_max_id": 0}
+        if function == "hire_specialist":
+            return {"status": "ok", "specialist_id": self.queries, "energy": 50}
+        raise ValueError(function)
+
+
+async def hire(service: SpecialistService, backend: FakeBackend, user_id: int):
+    queries = backend.queries
+    started = time.perf_counter()
+    success, message = await service.hire_specialist(user_id, "laborer", "ryabucks")
+    elapsed = (time.perf_counter() - started) * 1000
+    assert success, message
+    return elapsed, backend.queries - queries
+
+
+async def run():
+    backend = FakeBackend()
+    ledger_writer.directory = Path(tempfile.mkdtemp())
+    economy_counters.client = backend
+
+    service = SpecialistService(SupabaseUserRepository(backend))
+    service.client = backend
+    service.license_service = LicenseService(service.user_repository)
+    service.license_service.client = backend
+    await service._ensure_dependencies()
+
+    cold, warm = [], []
+    for i in range(HIRES):
+        user_id = 1000 + i
+        license_cache.invalidate()
+        economy_counters.invalidate()
+        price_multipliers.invalidate()
+        cold.append(await hire(service, backend, user_id))
+        warm.append(await hire(service, backend, user_id))
+
+    def report(name, samples, budget_round_trips):
+        times = sorted(t for t, _ in samples)
+        p95 = times[int(len(times) * 0.95) - 1]
+        budget = budget_round_trips * ROUND_TRIP_MS + OVERHEAD_MS
+        queries = statistics.mean(q for _, q in samples)
+        print(f"{name}: медиана {statistics.median(times):6.1f} мс, p95 {p95:6.1f} мс, "
+              f"запросов {queries:.1f} (бюджет {budget} мс)")
+        assert p95 <= budget, f"{name}: p95 {p95:.1f} мс превышает бюджет {budget} мс"
+
+    print(f"Задержка запроса к БД: {ROUND_TRIP_MS} мс, наймов: {HIRES}")
+    report("Холодный найм", cold, COLD_BUDGET_ROUND_TRIPS)
+    report("Повторный найм", warm, WARM_BUDGET_ROUND_TRIPS)
+
+
+def main():
+    logging.disable(logging.INFO)
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+# benchmarks/income_settlement_bench.py
+"""
+Бенчмарк расчёта пассивного дохода на 1 млн смен специалистов
+
+Синтетические колонки в форме ответа income_settlement_page: сборка
+WorkShifts из страниц, векторный расчёт выплат и свёртка по игрокам.
+Бюджет - секунда на расчёт выплат и свёртку (без сети).
+
+Запуск (нужны те же переменные окружения, что и для бота):
+    python -m benchmarks.income_settlement_bench
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from services.income_settlement import (
+    LOAD_PAGE_SIZE, SPECIALIST_TYPES, WorkShifts, aggregate_by_user, compute_payouts
+)
+
+SHIFTS = 1_000_000
+USERS = 100_000
+BUDGET_SECONDS = 1.0
+
+
+def synthetic_pages(rng: np.random.Generator):
+    """Страницы income_settlement_page: колонки по LOAD_PAGE_SIZE смен"""
+    now = time.time()
+    types = np.array(SPECIALIST_TYPES)
+    pages = []
+    for start in range(0, SHIFTS, LOAD_PAGE_SIZE):
+        size = min(LOAD_PAGE_SIZE, SHIFTS - start)
+        accrue_from = now - rng.uniform(0, 8 * 3600, size)
+        pages.append({
+            "job_id": list(range(start + 1, start + size + 1)),
+            "user_id": rng.integers(1, USERS + 1, size).tolist(),
+            "specialist_type": types[rng.integers(0, len(types), size)].tolist(),
+            "efficiency": rng.integers(70, 111, size).tolist(),
+            "loyalty": rng.integers(85, 101, size).tolist(),
+            "accrue_from": accrue_from.tolist(),
+            "accrue_to": [now] * size,
+            "settled_from": [None] * size,
+            "settle_to": ["2026-01-01T00:00:00+00:00"] * size,
+            "quantum_pass": (rng.random(size) < 0.1).tolist()
+        })
+    return pages
+
+
+def main():
+    rng = np.random.default_rng(42)
+    pages = synthetic_pages(rng)
+
+    started = time.perf_counter()
+    shifts = WorkShifts.from_pages(pages)
+    loaded = time.perf_counter()
+    payouts = compute_payouts(shifts, rng)
+    computed = time.perf_counter()
+    users, credits = aggregate_by_user(shifts.user_id, payouts)
+    finished = time.perf_counter()
+
+    print(f"Смен: {len(shifts):,}, игроков: {len(users):,}, начислено: {int(credits.sum()):,} рябаксов")
+    print(f"Сборка колонок:  {(loaded - started) * 1000:7.1f} мс")
+    print(f"Расчёт выплат:   {(computed - loaded) * 1000:7.1f} мс")
+    print(f"Свёртка по игрокам: {(finished - computed) * 1000:4.1f} мс")
+
+    compute_seconds = finished - loaded
+    assert credits.sum() == payouts.sum()
+    assert compute_seconds <= BUDGET_SECONDS, f"расчёт {compute_seconds:.2f} сек превышает бюджет {BUDGET_SECONDS} сек"
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+# benchmarks/lootbox_bench.py
+"""
+Бенчмарк открытия коробок
+
+Проверяется, что открытие 1 и 100 коробок стоит одинаковое число
+запросов к БД (один вызов open_lootboxes) против фейкового бэкенда,
+и замеряется розыгрыш наград по alias-таблицам: миллион коробок
+каждого вида - в пределах бюджета (без сети).
+
+Запуск (нужны те же переменные окружения, что и для бота):
+    python -m benchmarks.lootbox_bench
+"""
+
+import asyncio
+import logging
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from services.lootbox_engine import LOOT_TABLES
+from services.lootbox_service import LootboxService
+
+DRAW_BOXES = 1_000_000
+DRAW_BUDGET_SECONDS = 0.5
+
+
+class FakeBackend:
+    """Supabase-клиент, который только считает запросы"""
+
+    def __init__(self):
+        self.queries = 0
+
+    async def execute_query(self, table, operation, **kwargs):
+        self.queries += 1
+        return []
+
+    async def execute_rpc(self, function, params=None):
+        self.queries += 1
+        if function == "open_lootboxes":
+            return {"status": "ok", "boxes_left": 0, "rbtc": params["p_rbtc"], "rbtc_capped": False}
+        raise ValueError(function)
+
+
+async def count_queries(service: LootboxService, backend: FakeBackend, box_item: str, count: int) -> int:
+    queries = backend.queries
+    result = await service.open_boxes(1, box_item, count, open_id=f"bench-{box_item}-{count}")
+    assert result["status"] == "ok", result
+    return backend.queries - queries
+
+
+async def run():
+    backend = FakeBackend()
+    service = LootboxService(seed=42)
+    service.client = backend
+
+    for box_item in LOOT_TABLES:
+        single = await count_queries(service, backend, box_item, 1)
+        batch = await count_queries(service, backend, box_item, 100)
+        assert single == batch == 1, f"{box_item}: {single} запросов на 1 коробку, {batch} на 100"
+    print(f"Запросов к БД на открытие: 1 коробка - 1, 100 коробок - 1 ({len(LOOT_TABLES)} видов)")
+
+    rng = np.random.default_rng(42)
+    for box_item, table in LOOT_TABLES.items():
+        started = time.perf_counter()
+        rewards = table.draw(DRAW_BOXES, rng)
+        elapsed = time.perf_counter() - started
+        print(f"{box_item:17} {DRAW_BOXES:,} коробок: {elapsed * 1000:6.1f} мс, наград: {len(rewards)}")
+        assert elapsed <= DRAW_BUDGET_SECONDS, f"{box_item}: {elapsed:.2f} сек превышает бюджет {DRAW_BUDGET_SECONDS} сек"
+
+
+def main():
+    logging.disable(logging.INFO)
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+# benchmarks/tournament_bench.py
+"""
+Бенчмарк турнира на 50 тыс. участников
+
+Для каждого формата: посев, все раунды, итоговая таблица, призы и
+сериализация состояния туда и обратно. Бюджет - две секунды на турнир
+(без сети).
+
+Запуск (нужны те же переменные окружения, что и для бота):
+    python -m benchmarks.tournament_bench
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from core.domain.money import Money
+from services.tournament_engine import FORMATS, Tournament
+
+ENTRANTS = 50_000
+PRIZE_FUND = Money.of(10_000)
+BUDGET_SECONDS = 2.0
+
+
+def main():
+    rng = np.random.default_rng(42)
+    ratings = rng.normal(1500, 200, ENTRANTS)
+    entrants = [(user_id, float(rating)) for user_id, rating in enumerate(ratings, start=1)]
+
+    for format in FORMATS:
+        started = time.perf_counter()
+        tournament = Tournament.create("cockfights", format, entrants, seed=7)
+        created = time.perf_counter()
+        tournament.play_all()
+        played = time.perf_counter()
+        places = tournament.standings()
+        user_ids, amounts = tournament.prizes(PRIZE_FUND)
+        ranked = time.perf_counter()
+        data = tournament.to_bytes()
+        restored = Tournament.from_bytes(tournament.kind, tournament.format, data)
+        finished = time.perf_counter()
+
+        print(f"{format}: {len(tournament):,} участников, {tournament.total_rounds} раундов, "
+              f"состояние {len(data) / 1024:.0f} КБ")
+        print(f"  Посев:           {(created - started) * 1000:7.1f} мс")
+        print(f"  Раунды:          {(played - created) * 1000:7.1f} мс")
+        print(f"  Таблица и призы: {(ranked - played) * 1000:7.1f} мс")
+        print(f"  Сериализация:    {(finished - ranked) * 1000:7.1f} мс")
+
+        elapsed = finished - started
+        assert np.array_equal(np.sort(places), np.arange(ENTRANTS))
+        assert int(amounts.sum()) == PRIZE_FUND.micro
+        assert len(np.unique(user_ids)) == len(user_ids)
+        assert np.array_equal(restored.standings(), places)
+        assert elapsed <= BUDGET_SECONDS, f"{format}: {elapsed:.2f} сек превышает бюджет {BUDGET_SECONDS} сек"
+
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,8 @@
 """
 from decimal import Decimal
 
+from core.domain.money import Money, MoneyLike, MICRO
+
 # ═════════════ ЭМИССИЯ ═════════════
 TOTAL_RBTC_EMISSION = Decimal('21000000.0000')
 
@@ -84,8 +86,8 @@ GLOBAL_POOLS = {
 
 # ════════ ПУЛЫ ИГРОВОГО БАНКА ════════
 BANK_POOLS = {
-    'rbtc_pool': Decimal('1050000.0000'),       # 5 % от эмиссии
-    'ryabucks_pool': Decimal('105000000.0000'), # начальный курс 1:100
+    'rbtc_pool': Money.of('1050000'),           # 5 % от эмиссии
+    'ryabucks_pool': Money.of('105000000'),     # начальный курс 1:100
     'total_invested_golden_eggs': 0
 }
 
@@ -95,10 +97,13 @@ STARS_PACKAGE_BASE   = 100                # базовый пакет ⭐
 RBTC_EQUIVALENT      = Decimal('14.3')    # RBTC за 100 ⭐
 
 # ════════ ФУНКЦИИ ДИНАМИКИ КУРСА ════════
-def calculate_current_rate(rbtc_pool: Decimal,
-                           ryabucks_pool: Decimal) -> Decimal:
+# Резервы и объём приводятся к Money (целые микро-единицы), формула x·y=k
+# считается точно в int; результат - целые рябаксы, как и раньше.
+def calculate_current_rate(rbtc_pool: MoneyLike,
+                           ryabucks_pool: MoneyLike) -> Decimal:
     """Текущий курс: ryabucks / rbtc."""
-    return Decimal('0') if rbtc_pool == 0 else ryabucks_pool / rbtc_pool
+    rbtc_pool = Money.of(rbtc_pool)
+    return Decimal('0') if not rbtc_pool else Money.of(ryabucks_pool) / rbtc_pool
 
 
 def calculate_stars_to_ryabucks(stars: int,
@@ -112,31 +117,32 @@ def calculate_stars_to_ryabucks(stars: int,
     return int(ryabucks)  # округляем до целого
 
 
-def _constant_product_k(rbtc_pool: Decimal,
-                        ryabucks_pool: Decimal) -> Decimal:
-    return rbtc_pool * ryabucks_pool
+def _constant_product_k(rbtc_pool: Money,
+                        ryabucks_pool: Money) -> int:
+    """k в микро² - точное целое"""
+    return rbtc_pool.micro * ryabucks_pool.micro
 
 
-def calculate_buy_rbtc_cost(amount: Decimal,
-                             rbtc_pool: Decimal,
-                             ryabucks_pool: Decimal) -> int:
+def calculate_buy_rbtc_cost(amount: MoneyLike,
+                             rbtc_pool: MoneyLike,
+                             ryabucks_pool: MoneyLike) -> int:
     """Стоимость покупки RBTC по формуле x·y=k."""
+    amount, rbtc_pool, ryabucks_pool = Money.of(amount), Money.of(rbtc_pool), Money.of(ryabucks_pool)
     if amount >= rbtc_pool:
         raise ValueError('Недостаточно RBTC в пуле')
-    k                = _constant_product_k(rbtc_pool, ryabucks_pool)
-    new_rbtc_pool    = rbtc_pool - amount
-    new_ryabucks_pool= k / new_rbtc_pool
-    return int(new_ryabucks_pool - ryabucks_pool)
+    k                 = _constant_product_k(rbtc_pool, ryabucks_pool)
+    new_ryabucks_pool = k // (rbtc_pool.micro - amount.micro)
+    return (new_ryabucks_pool - ryabucks_pool.micro) // MICRO
 
 
-def calculate_sell_rbtc_reward(amount: Decimal,
-                               rbtc_pool: Decimal,
-                               ryabucks_pool: Decimal) -> int:
+def calculate_sell_rbtc_reward(amount: MoneyLike,
+                               rbtc_pool: MoneyLike,
+                               ryabucks_pool: MoneyLike) -> int:
     """Награда в рябаксах за продажу RBTC."""
-    k                = _constant_product_k(rbtc_pool, ryabucks_pool)
-    new_rbtc_pool    = rbtc_pool + amount
-    new_ryabucks_pool= k / new_rbtc_pool
-    return int(ryabucks_pool - new_ryabucks_pool)
+    amount, rbtc_pool, ryabucks_pool = Money.of(amount), Money.of(rbtc_pool), Money.of(ryabucks_pool)
+    k                 = _constant_product_k(rbtc_pool, ryabucks_pool)
+    new_ryabucks_pool = -(-k // (rbtc_pool.micro + amount.micro))   # вверх: выплата не больше точной
+    return (ryabucks_pool.micro - new_ryabucks_pool) // MICRO
 
 # ════════ ЛИМИТЫ ОПЕРАЦИЙ ════════
 TRANSACTION_LIMITS = {
@@ -145,7 +151,8 @@ TRANSACTION_LIMITS = {
     'min_ryabucks_trade'   : 10,
     'daily_withdrawal_limit': Decimal('1000'),
     'min_stars_purchase'   : 100,
-    'max_stars_purchase'   : 10000
+    'max_stars_purchase'   : 10000,
+    'max_slippage'         : Decimal('0.01')   # допустимое ухудшение курса после котировки
 }
 
 # ════════ ПАКЕТЫ STARS ════════
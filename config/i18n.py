@@ -0,0 +1,299 @@
+# config/i18n.py
+"""
+Каталог локализованных текстов
+
+Бандлы языков - обычные модули с константами (config.texts для ru,
+config.texts_en для en). Бандл загружается при первом обращении,
+шаблоны заранее разбиваются на литералы и плейсхолдеры, а одинаковые
+рендеры берутся из LRU кэша. Отсутствующие в бандле тексты берутся
+из русского бандла.
+"""
+
+import importlib
+import logging
+from collections import OrderedDict
+from string import Formatter
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LANGUAGE = "ru"
+
+# Язык -> модуль с текстами
+LANGUAGE_BUNDLES = {
+    "ru": "config.texts",
+    "en": "config.texts_en",
+}
+
+RENDER_CACHE_SIZE = 2048
+USER_LANGUAGE_CACHE_SIZE = 50_000
+
+# Типы значений, для которых равенство означает одинаковый текст
+_MEMO_TYPES = (str, int)
+
+_formatter = Formatter()
+
+
+class TemplateError(ValueError):
+    """Ошибка разбора или проверки шаблона"""
+
+
+class CompiledTemplate:
+    """Шаблон, заранее разбитый на сегменты (литерал, поле, формат, конверсия)"""
+
+    __slots__ = ("key", "source", "fields", "is_static", "_parts", "_fallback")
+
+    def __init__(self, key: str, source: str):
+        self.key = key
+        self.source = source
+        self._fallback = False
+
+        try:
+            parsed = list(_formatter.parse(source))
+        except ValueError as e:
+            raise TemplateError(f"{key}: {e}") from e
+
+        parts = []
+        fields = set()
+        for literal, field_name, format_spec, conversion in parsed:
+            if field_name is None:
+                parts.append((literal, None, None, None, True))
+                continue
+            if field_name == "" or field_name.isdigit():
+                raise TemplateError(f"{key}: позиционные плейсхолдеры не поддерживаются")
+            if format_spec and "{" in format_spec:
+                # Вложенные поля в формате - редкий случай, отдаём str.format_map
+                self._fallback = True
+
+            root = _root_field(field_name)
+            fields.add(root)
+            parts.append((literal, field_name, format_spec or "", conversion, root == field_name))
+
+        self.fields: FrozenSet[str] = frozenset(fields)
+        self.is_static = not fields
+        self._parts = tuple(parts)
+
+    @classmethod
+    def literal(cls, key: str, source: str) -> "CompiledTemplate":
+        """Текст без плейсхолдеров (используется, если шаблон не разобрался)"""
+        template = cls.__new__(cls)
+        template.key = key
+        template.source = source
+        template.fields = frozenset()
+        template.is_static = True
+        template._parts = ((source, None, None, None, True),)
+        template._fallback = False
+        return template
+
+    def render(self, values: Dict[str, Any]) -> str:
+        """Подставить значения (KeyError при отсутствии поля, как у str.format)"""
+        if self._fallback:
+            return self.source.format_map(values)
+
+        out = []
+        for literal, field_name, format_spec, conversion, simple in self._parts:
+            if literal:
+                out.append(literal)
+            if field_name is None:
+                continue
+
+            value = values[field_name] if simple else _formatter.get_field(field_name, (), values)[0]
+            if conversion:
+                value = _formatter.convert_field(value, conversion)
+            out.append(format(value, format_spec))
+
+        return "".join(out)
+
+
+def _root_field(field_name: str) -> str:
+    """Имя аргумента без обращения к атрибутам/индексам (user.name -> user)"""
+    for i, char in enumerate(field_name):
+        if char in ".[":
+            return field_name[:i]
+    return field_name
+
+
+class TextBundle:
+    """Скомпилированные тексты одного языка"""
+
+    def __init__(self, lang: str, module_name: str):
+        self.lang = lang
+        self.module_name = module_name
+        self.templates: Dict[str, CompiledTemplate] = {}
+        self.errors: List[str] = []
+
+        module = importlib.import_module(module_name)
+        for key, value in vars(module).items():
+            if not key.isupper() or not isinstance(value, str):
+                continue
+            try:
+                self.templates[key] = CompiledTemplate(key, value)
+            except TemplateError as e:
+                self.errors.append(str(e))
+                self.templates[key] = CompiledTemplate.literal(key, value)
+
+        logger.info(f"🌐 Бандл {lang} загружен: {len(self.templates)} текстов")
+
+
+class TextCatalog:
+    """Каталог текстов с ленивой загрузкой бандлов и кэшем рендеров"""
+
+    def __init__(self, bundles: Dict[str, str] = None, default_language: str = DEFAULT_LANGUAGE,
+                 cache_size: int = RENDER_CACHE_SIZE):
+        self.bundle_modules = dict(bundles or LANGUAGE_BUNDLES)
+        self.default_language = default_language
+        self.cache_size = cache_size
+        self._bundles: Dict[str, TextBundle] = {}
+        self._cache: "OrderedDict[Tuple, str]" = OrderedDict()
+        self._resolved: Dict[Tuple[str, str], CompiledTemplate] = {}
+        self._missing_reported = set()
+        self.stats = {"renders": 0, "cache_hits": 0}
+
+    @property
+    def languages(self) -> Tuple[str, ...]:
+        return tuple(self.bundle_modules)
+
+    def normalize_language(self, lang: Optional[str]) -> str:
+        return lang if lang in self.bundle_modules else self.default_language
+
+    def _bundle(self, lang: str) -> Optional[TextBundle]:
+        bundle = self._bundles.get(lang)
+        if bundle is None:
+            try:
+                bundle = TextBundle(lang, self.bundle_modules[lang])
+            except Exception as e:
+                logger.error(f"Ошибка загрузки бандла {lang}: {e}")
+                return None
+            self._bundles[lang] = bundle
+        return bundle
+
+    def template(self, key: str, lang: str = DEFAULT_LANGUAGE) -> Optional[CompiledTemplate]:
+        """Найти шаблон: сначала в бандле языка, затем в бандле по умолчанию"""
+        resolved = self._resolved.get((key, lang))
+        if resolved is not None:
+            return resolved
+
+        lookup_key = key.upper()
+        lookup_lang = self.normalize_language(lang)
+
+        template = None
+        bundle = self._bundle(lookup_lang)
+        if bundle is not None:
+            template = bundle.templates.get(lookup_key)
+
+        if template is None and lookup_lang != self.default_language:
+            default_bundle = self._bundle(self.default_language)
+            if default_bundle is not None:
+                template = default_bundle.templates.get(lookup_key)
+
+        if template is not None:
+            self._resolved[(key, lang)] = template
+        return template
+
+    def get(self, key: str, lang: str = DEFAULT_LANGUAGE, **values: Any) -> str:
+        """Получить текст по ключу; с values - отрендерить шаблон"""
+        template = self._resolved.get((key, lang)) or self.template(key, lang)
+        if template is None:
+            if key not in self._missing_reported:
+                self._missing_reported.add(key)
+                logger.warning(f"Текст {key} не найден в каталоге")
+            return key
+
+        if not values or template.is_static:
+            # Шаблон без значений отдаём как есть - handler может форматировать сам
+            return template.source
+
+        self.stats["renders"] += 1
+        # Кэшируются только значения str/int: равные значения других типов
+        # (1.0 и True, Decimal("1.5") и Decimal("1.50")) рендерятся по-разному
+        if not all(type(value) in _MEMO_TYPES for value in values.values()):
+            return template.render(values)
+
+        # Порядок kwargs у одного вызова стабилен - сортировка ключа не нужна
+        cache_key = (template.source, tuple(values.items()))
+        cached = self._cache.get(cache_key)
+
+        if cached is not None:
+            self._cache.move_to_end(cache_key)
+            self.stats["cache_hits"] += 1
+            return cached
+
+        text = template.render(values)
+        self._cache[cache_key] = text
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return text
+
+    def validate(self) -> List[str]:
+        """
+        Загрузить все бандлы и проверить шаблоны: ошибки разбора и
+        расхождение плейсхолдеров с бандлом по умолчанию.
+        Переводы с расхождениями отключаются (используется текст по умолчанию).
+        """
+        problems = []
+        default_bundle = self._bundle(self.default_language)
+        if default_bundle is None:
+            return [f"Бандл по умолчанию {self.default_language} не загружен"]
+        problems.extend(default_bundle.errors)
+
+        for lang in self.languages:
+            if lang == self.default_language:
+                continue
+            bundle = self._bundle(lang)
+            if bundle is None:
+                problems.append(f"Бандл {lang} не загружен")
+                continue
+            problems.extend(bundle.errors)
+
+            for key in list(bundle.templates):
+                reference = default_bundle.templates.get(key)
+                if reference is None:
+                    problems.append(f"{lang}.{key}: нет такого текста в бандле {self.default_language}")
+                    continue
+                if bundle.templates[key].fields != reference.fields:
+                    problems.append(
+                        f"{lang}.{key}: плейсхолдеры {sorted(bundle.templates[key].fields)} "
+                        f"не совпадают с {sorted(reference.fields)}"
+                    )
+                    del bundle.templates[key]
+
+        self.clear_cache()
+        for problem in problems:
+            logger.error(f"❌ Каталог текстов: {problem}")
+        logger.info(f"✅ Каталог текстов проверен ({len(problems)} проблем)")
+        return problems
+
+    def clear_cache(self) -> None:
+        self._cache.clear()
+        self._resolved.clear()
+
+
+# === ЯЗЫК ПОЛЬЗОВАТЕЛЯ ===
+# Язык хранится в users.language; handlers, которые и так читают
+# пользователя, запоминают язык здесь, остальные берут его отсюда
+
+_user_languages: "OrderedDict[int, str]" = OrderedDict()
+
+
+def remember_language(user_id: int, lang: Optional[str]) -> str:
+    """Запомнить язык пользователя, вернуть нормализованный код"""
+    lang = catalog.normalize_language(lang)
+    _user_languages[user_id] = lang
+    _user_languages.move_to_end(user_id)
+    if len(_user_languages) > USER_LANGUAGE_CACHE_SIZE:
+        _user_languages.popitem(last=False)
+    return lang
+
+
+def language_of(user_id: int) -> str:
+    """Язык пользователя из кэша (по умолчанию ru)"""
+    return _user_languages.get(user_id, DEFAULT_LANGUAGE)
+
+
+# Глобальный экземпляр
+catalog = TextCatalog()
+
+
+def t(key: str, lang: str = DEFAULT_LANGUAGE, **values: Any) -> str:
+    """Короткий доступ к каталогу: t("WORK_MENU", lang, energy=10)"""
+    return catalog.get(key, lang, **values)
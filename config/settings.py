@@ -83,6 +83,23 @@ class Settings:
     QUANTUM_PASS_ENABLED: bool = os.getenv("QUANTUM_PASS_ENABLED", "true").lower() == "true"
     BLOCKCHAIN_AUDIT_ENABLED: bool = os.getenv("BLOCKCHAIN_AUDIT_ENABLED", "true").lower() == "true"
     CHARACTERS_ENABLED: bool = os.getenv("CHARACTERS_ENABLED", "true").lower() == "true"
+    # Пакетный аукцион сделок банка (сбор заявок в окно и одна запись в пул)
+    BANK_BATCH_AUCTION_ENABLED: bool = os.getenv("BANK_BATCH_AUCTION_ENABLED", "false").lower() == "true"
+    BANK_BATCH_WINDOW_MS: int = int(os.getenv("BANK_BATCH_WINDOW_MS", "100"))
+    # Котировки банка: срок действия и ключ подписи (по умолчанию от BOT_TOKEN)
+    BANK_QUOTE_TTL_SECONDS: int = int(os.getenv("BANK_QUOTE_TTL_SECONDS", "30"))
+    BANK_QUOTE_SECRET: str = os.getenv("BANK_QUOTE_SECRET", "")
+    # Журнал операций банка: локальный fsync-журнал и пакетная отправка в БД
+    LEDGER_JOURNAL_DIR: str = os.getenv("LEDGER_JOURNAL_DIR", "logs/ledger")
+    LEDGER_FLUSH_INTERVAL_SECONDS: float = float(os.getenv("LEDGER_FLUSH_INTERVAL_SECONDS", "5"))
+    LEDGER_BATCH_SIZE: int = int(os.getenv("LEDGER_BATCH_SIZE", "500"))
+    # Таймеры специалистов (обучение, работа, восстановление): тик колеса и размер пачки завершения
+    JOB_TICK_SECONDS: float = float(os.getenv("JOB_TICK_SECONDS", "1"))
+    JOB_BATCH_SIZE: int = int(os.getenv("JOB_BATCH_SIZE", "1000"))
+    # Длительность рабочей смены специалиста
+    WORK_SHIFT_HOURS: float = float(os.getenv("WORK_SHIFT_HOURS", "8"))
+    # Периодичность начисления пассивного дохода специалистов
+    INCOME_SETTLEMENT_INTERVAL_MINUTES: float = float(os.getenv("INCOME_SETTLEMENT_INTERVAL_MINUTES", "60"))
     
     # ========== ИГРОВЫЕ КОНСТАНТЫ ==========
     
@@ -362,6 +362,34 @@ INVENTORY_BOXES = """
 └─🔑 Ключи: {keys}
 """
 
+LOOTBOX_OPENED = """
+🎁 Открыто коробок: {count}
+{rewards}
+"""
+
+LOOTBOX_POOL_CAPPED = "⚠️ Пул лутбоксов почти исчерпан - RBTC выдан в пределах остатка"
+LOOTBOX_NOT_ENOUGH = "📦 Недостаточно коробок (есть: {available})"
+LOOTBOX_EMPTY_REWARD = "└ Пусто"
+
+LOOTBOX_REWARD_NAMES = {
+    "ryabucks": "💵 Рябаксы",
+    "rbtc": "💠 RBTC",
+    "golden_keys": "🔑 Ключи",
+    "golden_shards": "🧩 Золотые осколки",
+    "eggs": "🥚 Яйца",
+    "grain_seeds": "🌾 Семена зерна",
+    "tomato_seeds": "🍅 Семена томатов",
+    "potato_seeds": "🥔 Семена картофеля",
+    "expedition_passes": "🎫 Допуск: Вылазки",
+    "anomaly_passes": "🎫 Допуск: Аномалии",
+    "farm_passes": "🎫 Допуск: Ферма",
+    "city_passes": "🎫 Допуск: Город",
+    "forest_passes": "🎫 Допуск: Лес",
+    "sea_passes": "🎫 Допуск: Море",
+    "fight_passes": "🎫 Допуск: Схватки",
+    "race_passes": "🎫 Допуск: Скачки"
+}
+
 # === МЕНЮ ЛИДЕРОВ ===
 LEADERBOARD_MENU = """
 〰️〰️ 🏆 ЛИДЕРЫ ℹ️ 〰️〰️
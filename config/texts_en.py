@@ -0,0 +1,182 @@
+# config/texts_en.py
+"""
+Английский бандл текстов (config.i18n)
+Содержит только переведённые тексты - остальные берутся из config/texts.py.
+Плейсхолдеры должны совпадать с русскими, иначе перевод отключается при старте.
+Кнопки нижнего меню (BTN_FARM, BTN_TOWN, ...) не переводятся - handlers
+сравнивают с ними текст сообщения.
+"""
+
+# === КНОПКИ РАБОТ ===
+BTN_WORK_BREACH = "⚠️ Breach"
+BTN_WORK_EXPEDITION = "🏕 Expedition"
+BTN_WORK_CITY = "🏢 City"
+BTN_WORK_FARM = "🏡 Farm"
+BTN_WORK_FOREST = "🌲 Forest"
+BTN_WORK_SEA = "🌊 Sea"
+
+# === КНОПКИ ЖИТЕЛЯ ===
+BTN_CITIZEN_PROPERTIES = "🏞 Properties"
+BTN_CITIZEN_WARDROBE = "🥼 Wardrobe"
+BTN_CITIZEN_HISTORY = "📖 History"
+BTN_CITIZEN_TASKS = "📝 Tasks"
+BTN_CITIZEN_ACHIEVEMENTS = "🎯 Achievements"
+BTN_CITIZEN_STATISTICS = "📊 Statistics"
+
+# === КНОПКИ ФЕРМЫ ===
+BTN_FARM_HENHOUSE = "🐔 Henhouse"
+BTN_FARM_COWSHED = "🐄 Cowshed"
+BTN_FARM_SHEEPFOLD = "🐑 Sheepfold"
+BTN_FARM_PIGSTY = "🐖 Pigsty"
+BTN_FARM_APIARY = "🐝 Apiary"
+BTN_FARM_GARDEN = "🪴 Garden"
+BTN_FARM_FORESTRY = "🌳 Forestry"
+BTN_FARM_FISHPOND = "🌊 Fishpond"
+BTN_FARM_MINE = "🪨 Mine"
+BTN_FARM_VILLAGE = "🏘 Village"
+BTN_FARM_QUANTUMLAB = "⚛️ QuantLab"
+BTN_FARM_STABLE = "🐎 Stable"
+
+# === КНОПКИ ГОРОДА ===
+BTN_TOWNHALL = "🏛 Town Hall"
+BTN_MARKET = "🛒 Market"
+BTN_RYABANK = "🏦 Ryabank"
+BTN_SHOP = "🏪 Shop"
+BTN_PAWNSHOP = "💍 Pawnshop"
+BTN_TAVERN = "🍻 Tavern"
+BTN_ACADEMY = "🏫 Academy"
+BTN_FORTUNE = "🎡 Fortune"
+BTN_REALESTATE = "🏞 Real Estate"
+BTN_VETCENTER = "❤️‍🩹 Vet Center"
+BTN_CONSTRUCTION = "🏗 Construction"
+BTN_HOSPITAL = "🏥 Hospital"
+BTN_QUANTUMHUB = "⚛️ Quantum Hub"
+BTN_CEMETERY = "🪦 Cemetery"
+
+# === КНОПКИ ПРОЧЕГО ===
+BTN_OTHER_CHAT = "💬 Chat"
+BTN_OTHER_WIKI = "🔮 Wiki"
+BTN_OTHER_HISTORY = "📖 History"
+BTN_OTHER_DESIGN = "🎨 Design"
+
+# === УНИВЕРСАЛЬНЫЕ ===
+BTN_BACK = "↩️ Back"
+BTN_CONTINUE = "➡️ Continue"
+
+# === ГЛАВНОЕ МЕНЮ ОСТРОВА ===
+ISLAND_MAIN_MENU = """
+🏝 WELCOME TO THE ISLAND ℹ️
+
+💠 TOTAL MINED: {total_rbtc_mined}
+├⚛️ QuantLab: {quantum_labs}
+├👥 Friends: {friends_total}
+├🏕 Expeditions: {expeditions_total}
+├⚠️ Anomalies: {anomalies_total}
+├🥊 Cock-Fight: {fights_total}
+├🏇 Races: {races_total}
+└📦 Boxes: {boxes_total}
+
+🔥[💠] Burned: {total_burned_rbtc:.2f} (~{burn_percentage:.4f}%)
+"""
+
+# === МЕНЮ ГОРОДА ===
+TOWN_MENU = """
+🏢 TOWN ℹ️ [🔋{energy}]
+
+«A buzzing hive of commerce and chaos! The air is filled with the chatter of merchants praising their goods, bankers counting golden eggs and builders hauling fresh timber. Every alley hides an opportunity — if you know where to look».
+"""
+
+# === МЕНЮ РАБОТ ===
+WORK_MENU = """
+〰️〰️ 💼 RYABOT WORK ℹ️ [🔋{energy}] 〰️〰️
+
+📋 TEAM
+├🙍‍♂️ Worker: {workers_total}
+├👷 Builder: {builders_total}
+├👩‍🌾 Farmer: {farmers_total}
+├👨‍🚒 Forester: {foresters_total}
+├🎣 Fisherman: {fishermen_total}
+├🧑‍🍳 Cook: {cooks_total}
+├🧑‍⚕️ Doctor: {doctors_total}
+├🧑‍🔬 Scientist: {scientists_total}
+├🧑‍🏫 Teacher: {teachers_total}
+├💂 Q-Soldier: {q_soldiers_total}
+
+📊 Jobs completed: {works_completed}
+〰️〰️〰️〰️
+💠 Anomaly Pool: {anomaly_pool}
+💠 Expedition Pool: {expedition_pool}
+🌟[💼] Rating: {work_rating}
+"""
+
+# === МЕНЮ ЖИТЕЛЯ ===
+CITIZEN_MENU = """
+〰️ 👤 CITIZEN ID ℹ️ 〰️
+├─ Name: @{username}
+└─ Registered: {registration_date}
+
+🏆 RANKS 🏆
+├🏡 Farmer: [{farmer_rank}]
+├💼 Employer: [{employer_rank}]
+├⚖️ Trader: [{trader_rank}]
+├💠 Burner: [{burner_rank}]
+├🏕 Explorer: [{explorer_rank}]
+├🎲 Gambler: [{gambler_rank}]
+├🏇 Racer: [{racer_rank}]
+├🥊 Fighter: [{fighter_rank}]
+└🤝 Partner: [{partner_rank}]
+
+🧪 Liquid Experience: {liquid_experience}
+🧿 Q-Points: {q_points}
+"""
+
+# === МЕНЮ ФЕРМЫ ===
+FARM_MENU = """
+〰️〰️ 🏡 FARM ℹ 〰️〰️
+
+#️⃣ Farmer ID: #{farmer_id}
+🖼 Area: {total_area} ha
+〰️〰️〰️〰️
+💠 Lab Pool: {lab_pool}
+🌟 Farmer Rating: {farmer_rating}
+"""
+
+# === МЕНЮ ЛИДЕРОВ ===
+LEADERBOARD_MENU = """
+〰️〰️ 🏆 LEADERS ℹ️ 〰️〰️
+
+👑 LEGENDS & CHAMPIONS 👑
+├[🏡] {top_farmer}
+├[💼] {top_employer}
+├[⚖️] {top_trader}
+├[🏕] {top_explorer}
+├[🎲] {top_gambler}
+├[🥊] {top_fighter}
+├[🏇] {top_racer}
+├[💠] {top_rbtc}
+└[🤝] {top_partner}
+"""
+
+# === МЕНЮ ПРОЧЕГО ===
+OTHER_MENU = """
+〰️〰️ 🗄 OTHER ℹ️ 〰️〰️
+
+₽YABOT is an engaging farming simulator with social features. Build your farm, look after your animals, grow crops and trade resources. Hire workers and share the duties between them!
+
+🤖 Set off on an adventure and become a seasoned farmer!
+"""
+
+WELCOME_TO_ISLAND = """
+🏝️ Welcome to Ryabot island!
+
+🤖 Uptime: {uptime}
+🏝 Islanders: {total_users}
+🟢 Playing now: {online_users}
+1️⃣ New/day: {new_today}
+📅 New/month: {new_month}
+🪪 Q-Pass holders: {qpass_holders}
+"""
+
+# === ОШИБКИ ===
+ERROR_GENERAL = "❌ Something went wrong. Please try again."
+SECTION_UNDER_DEVELOPMENT = "🚧 This section is under development.\nNew features are coming soon!"
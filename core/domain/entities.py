@@ -9,6 +9,8 @@ from typing import Optional, Dict, Any, List, Union
 from dataclasses import dataclass, field
 from enum import Enum
 
+from core.domain.money import Money, ZERO
+
 class TutorialStep(Enum):
     """Шаги туториала и системы заданий"""
     # Выбор языка и персонажа
@@ -68,17 +70,20 @@ class QuestStatus(Enum):
 @dataclass
 class RBTC:
     """RBTC криптовалюта"""
-    amount: Decimal = field(default_factory=lambda: Decimal('0.0000'))
-    
+    amount: Money = field(default_factory=Money)
+
+    def __post_init__(self):
+        self.amount = Money.of(self.amount)
+
     def __add__(self, other):
         if isinstance(other, RBTC):
             return RBTC(self.amount + other.amount)
-        return RBTC(self.amount + Decimal(str(other)))
-    
+        return RBTC(self.amount + other)
+
     def __sub__(self, other):
         if isinstance(other, RBTC):
-            return RBTC(max(Decimal('0'), self.amount - other.amount))
-        return RBTC(max(Decimal('0'), self.amount - Decimal(str(other))))
+            return RBTC(max(ZERO, self.amount - other.amount))
+        return RBTC(max(ZERO, self.amount - other))
 
 @dataclass
 class Energy:
@@ -309,9 +314,9 @@ class UserStats:
     enemies_defeated: int = 0
     
     # Экономика
-    rbtc_found: Decimal = field(default_factory=lambda: Decimal('0'))
-    rbtc_earned: Decimal = field(default_factory=lambda: Decimal('0'))
-    rbtc_spent: Decimal = field(default_factory=lambda: Decimal('0'))
+    rbtc_found: Money = field(default_factory=Money)
+    rbtc_earned: Money = field(default_factory=Money)
+    rbtc_spent: Money = field(default_factory=Money)
     ryabucks_earned: int = 0
     ryabucks_spent: int = 0
     items_bought: int = 0
@@ -0,0 +1,183 @@
+# core/domain/money.py
+"""
+Денежный тип с фиксированной точкой
+
+Сумма хранится целым числом микро-единиц (1 RBTC = 1 000 000 микро),
+поэтому сложение, вычитание и сравнение - операции над int без
+Decimal и без дрейфа float. Значения из БД (str, int, float, Decimal)
+приводятся один раз через Money.of, в БД уходит точная строка str(money).
+"""
+
+from decimal import Decimal, ROUND_HALF_EVEN
+from typing import Union
+
+MICRO_DIGITS = 6
+MICRO = 10 ** MICRO_DIGITS
+
+MoneyLike = Union["Money", int, str, float, Decimal]
+
+
+def _parse_str(value: str) -> int:
+    """Разбор десятичной строки в микро-единицы без Decimal"""
+    text = value.strip()
+    negative = text.startswith("-")
+    if negative or text.startswith("+"):
+        text = text[1:]
+
+    whole, dot, frac = text.partition(".")
+    if not (whole or frac) or not (whole or "0").isdigit() or (frac and not frac.isdigit()):
+        # Экспонента и прочие редкие формы - через Decimal
+        return _from_decimal(Decimal(value))
+
+    micro = int(whole or "0") * MICRO
+    if frac:
+        if len(frac) > MICRO_DIGITS:
+            return _from_decimal(Decimal(value))
+        micro += int(frac.ljust(MICRO_DIGITS, "0"))
+    return -micro if negative else micro
+
+
+def _from_decimal(value: Decimal) -> int:
+    return int(value.scaleb(MICRO_DIGITS).to_integral_value(rounding=ROUND_HALF_EVEN))
+
+
+class Money:
+    """Сумма в микро-единицах"""
+
+    __slots__ = ("micro",)
+
+    def __init__(self, micro: int = 0):
+        self.micro = micro
+
+    @classmethod
+    def of(cls, value: MoneyLike) -> "Money":
+        """Привести значение к Money (целые числа - это целые единицы)"""
+        if isinstance(value, Money):
+            return value
+        if isinstance(value, int):
+            return cls(value * MICRO)
+        if isinstance(value, str):
+            return cls(_parse_str(value))
+        if isinstance(value, float):
+            # repr - кратчайшее точное представление float
+            return cls(_parse_str(repr(value)))
+        if isinstance(value, Decimal):
+            return cls(_from_decimal(value))
+        if value is None:
+            return cls(0)
+        raise TypeError(f"Нельзя привести к Money: {type(value).__name__}")
+
+    def to_decimal(self) -> Decimal:
+        return Decimal(self.micro).scaleb(-MICRO_DIGITS)
+
+    # ─── Арифметика ───
+
+    def __add__(self, other: MoneyLike) -> "Money":
+        if isinstance(other, Money):
+            return Money(self.micro + other.micro)
+        if isinstance(other, int):
+            return Money(self.micro + other * MICRO)
+        return Money(self.micro + Money.of(other).micro)
+
+    __radd__ = __add__
+
+    def __sub__(self, other: MoneyLike) -> "Money":
+        if isinstance(other, Money):
+            return Money(self.micro - other.micro)
+        if isinstance(other, int):
+            return Money(self.micro - other * MICRO)
+        return Money(self.micro - Money.of(other).micro)
+
+    def __rsub__(self, other: MoneyLike) -> "Money":
+        return Money.of(other) - self
+
+    def __neg__(self) -> "Money":
+        return Money(-self.micro)
+
+    def __abs__(self) -> "Money":
+        return Money(abs(self.micro))
+
+    def __mul__(self, factor: Union[int, Decimal, float]) -> "Money":
+        """Умножение на коэффициент (результат округляется до микро-единицы)"""
+        if isinstance(factor, int):
+            return Money(self.micro * factor)
+        if isinstance(factor, float):
+            factor = Decimal(repr(factor))
+        if isinstance(factor, Decimal):
+            return Money(int((self.micro * factor).to_integral_value(rounding=ROUND_HALF_EVEN)))
+        return NotImplemented
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, other: Union["Money", int, Decimal]):
+        """Money / Money - отношение (Decimal), Money / число - Money"""
+        if isinstance(other, Money):
+            return Decimal(self.micro) / Decimal(other.micro)
+        if isinstance(other, (int, Decimal)):
+            return Money(int((Decimal(self.micro) / other).to_integral_value(rounding=ROUND_HALF_EVEN)))
+        return NotImplemented
+
+    def __rtruediv__(self, other: Union[int, Decimal]) -> Decimal:
+        if isinstance(other, (int, Decimal)):
+            return Money.of(other) / self
+        return NotImplemented
+
+    # ─── Сравнение ───
+
+    def _other_micro(self, other) -> int:
+        if isinstance(other, Money):
+            return other.micro
+        if isinstance(other, int):
+            return other * MICRO
+        if other is None:
+            raise TypeError("Сравнение Money с None")
+        return Money.of(other).micro
+
+    def __eq__(self, other) -> bool:
+        try:
+            return self.micro == self._other_micro(other)
+        except (TypeError, ArithmeticError):
+            return NotImplemented
+
+    def __lt__(self, other) -> bool:
+        return self.micro < self._other_micro(other)
+
+    def __le__(self, other) -> bool:
+        return self.micro <= self._other_micro(other)
+
+    def __gt__(self, other) -> bool:
+        return self.micro > self._other_micro(other)
+
+    def __ge__(self, other) -> bool:
+        return self.micro >= self._other_micro(other)
+
+    def __hash__(self) -> int:
+        # Совместим с hash(int) / hash(Decimal) равных значений
+        return hash(self.to_decimal())
+
+    def __bool__(self) -> bool:
+        return self.micro != 0
+
+    # ─── Представление ───
+
+    def __int__(self) -> int:
+        # Отсечение дробной части, как int(Decimal)
+        return self.micro // MICRO if self.micro >= 0 else -(-self.micro // MICRO)
+
+    def __float__(self) -> float:
+        return self.micro / MICRO
+
+    def __str__(self) -> str:
+        """Точная строка для БД и RPC: '12.500000'"""
+        sign = "-" if self.micro < 0 else ""
+        whole, frac = divmod(abs(self.micro), MICRO)
+        return f"{sign}{whole}.{frac:0{MICRO_DIGITS}d}"
+
+    def __repr__(self) -> str:
+        return f"Money('{self}')"
+
+    def __format__(self, spec: str) -> str:
+        return format(self.to_decimal(), spec) if spec else str(self)
+
+
+ZERO = Money(0)
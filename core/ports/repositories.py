@@ -56,6 +56,10 @@ class UserRepository(ABC):
         """Проверить существование игрового имени"""
         pass
 
+    def invalidate_cached(self, user_id: int) -> None:
+        """Сбросить закэшированного пользователя (после записи в обход репозитория)"""
+        pass
+
 
 class SpecialistRepository(ABC):
     """Репозиторий специалистов"""
@@ -6,7 +6,6 @@ Use case для создания нового пользователя
 
 import logging
 from datetime import datetime
-from decimal import Decimal
 
 from core.domain.entities import User, Resources, RBTC, Energy
 from core.ports.repositories import UserRepository
@@ -46,7 +45,7 @@ class CreateUserUseCase:
                 username=username,
                 resources=Resources(
                     ryabucks=settings.INITIAL_RYABUCKS,  # 100 рябаксов
-                    rbtc=RBTC(Decimal('0')),            # 0 RBTC
+                    rbtc=RBTC(),                        # 0 RBTC
                     energy=Energy(
                         current=settings.INITIAL_ENERGY,     # 30 энергии
                         maximum=settings.INITIAL_ENERGY_MAX, # максимум 30
@@ -0,0 +1,170 @@
+# interfaces/telegram_bot/callback_protocol.py
+"""
+Протокол callback_data и индекс диспетчеризации
+
+CallbackSpec описывает типизированный callback: префикс и поля,
+упакованные через разделитель ("work_breach", "char_3", "hire_spec:farmer").
+CallbackIndex находит handler по callback_data за O(1) от числа
+зарегистрированных handlers: точное совпадение - словарь, префиксы -
+проверка позиций разделителей в самой строке (их единицы).
+"""
+
+from typing import Any, Callable, Dict, Generic, Iterable, List, NamedTuple, Optional, Tuple, TypeVar, Union
+
+# Ограничение Telegram на callback_data
+MAX_CALLBACK_DATA_BYTES = 64
+
+SEPARATORS = ("_", ":")
+
+H = TypeVar("H")
+
+FieldSpec = Union[str, Tuple[str, Callable[[str], Any]]]
+
+
+class CallbackProtocolError(ValueError):
+    """Ошибка упаковки или разбора callback_data"""
+
+
+class CallbackSpec:
+    """
+    Типизированный callback: CallbackSpec("char", ("index", int))
+    pack(index=3) -> "char_3", unpack("char_3") -> {"index": 3}
+    Последнее поле забирает остаток строки (значения с разделителем внутри).
+    """
+
+    __slots__ = ("prefix", "sep", "fields", "_converters", "_head")
+
+    def __init__(self, prefix: str, *fields: FieldSpec, sep: str = "_"):
+        if sep not in SEPARATORS:
+            raise CallbackProtocolError(f"Неподдерживаемый разделитель: {sep!r}")
+        self.prefix = prefix
+        self.sep = sep
+        self.fields: Tuple[str, ...] = tuple(f if isinstance(f, str) else f[0] for f in fields)
+        self._converters: Tuple[Callable[[str], Any], ...] = tuple(str if isinstance(f, str) else f[1] for f in fields)
+        self._head = prefix + sep
+
+    @property
+    def index_key(self) -> str:
+        """Ключ в индексе: префикс с разделителем, для спеки без полей - точное значение"""
+        return self._head if self.fields else self.prefix
+
+    def pack(self, **values: Any) -> str:
+        if not self.fields:
+            return self.prefix
+
+        missing = [name for name in self.fields if name not in values]
+        if missing:
+            raise CallbackProtocolError(f"{self.prefix}: не заданы поля {', '.join(missing)}")
+
+        parts = []
+        for i, name in enumerate(self.fields):
+            part = str(values[name])
+            if i < len(self.fields) - 1 and self.sep in part:
+                raise CallbackProtocolError(f"{self.prefix}.{name}: значение содержит разделитель {self.sep!r}")
+            parts.append(part)
+
+        data = self._head + self.sep.join(parts)
+        if len(data.encode("utf-8")) > MAX_CALLBACK_DATA_BYTES:
+            raise CallbackProtocolError(f"{self.prefix}: callback_data длиннее {MAX_CALLBACK_DATA_BYTES} байт")
+        return data
+
+    def unpack(self, data: str) -> Optional[Dict[str, Any]]:
+        """Разобрать callback_data; None, если строка не подходит под спеку"""
+        if not self.fields:
+            return {} if data == self.prefix else None
+        if not data.startswith(self._head):
+            return None
+
+        parts = data[len(self._head):].split(self.sep, len(self.fields) - 1)
+        if len(parts) != len(self.fields):
+            return None
+
+        try:
+            return {name: convert(part) for name, convert, part in zip(self.fields, self._converters, parts)}
+        except (TypeError, ValueError):
+            return None
+
+
+class CallbackMatch(NamedTuple, Generic[H]):
+    handler: H
+    args: Dict[str, Any]
+
+
+class CallbackIndex(Generic[H]):
+    """Индекс callback_data -> handler"""
+
+    def __init__(self):
+        self._exact: Dict[str, H] = {}
+        self._prefixes: Dict[str, Tuple[H, Optional[CallbackSpec]]] = {}
+        self.stats = {"lookups": 0, "hits": 0}
+
+    def register_exact(self, data: Union[str, Iterable[str]], handler: H) -> None:
+        for value in ([data] if isinstance(data, str) else data):
+            if value in self._exact:
+                raise CallbackProtocolError(f"callback_data {value!r} уже зарегистрирован")
+            self._exact[value] = handler
+
+    def register_prefix(self, prefix: str, handler: H, spec: Optional[CallbackSpec] = None) -> None:
+        """prefix должен заканчиваться разделителем ("work_", "hire_spec:")"""
+        if not prefix or prefix[-1] not in SEPARATORS:
+            raise CallbackProtocolError(f"Префикс {prefix!r} должен заканчиваться на {' или '.join(SEPARATORS)}")
+        if prefix in self._prefixes:
+            raise CallbackProtocolError(f"Префикс {prefix!r} уже зарегистрирован")
+        self._prefixes[prefix] = (handler, spec)
+
+    def register(self, spec: CallbackSpec, handler: H) -> None:
+        if spec.fields:
+            self.register_prefix(spec.index_key, handler, spec)
+        else:
+            self.register_exact(spec.prefix, handler)
+
+    def resolve(self, data: Optional[str]) -> Optional[CallbackMatch]:
+        """
+        Найти handler: точное совпадение, затем самый длинный
+        зарегистрированный префикс, оканчивающийся на разделитель
+        """
+        self.stats["lookups"] += 1
+        if not data:
+            return None
+
+        handler = self._exact.get(data)
+        if handler is not None:
+            self.stats["hits"] += 1
+            return CallbackMatch(handler, {})
+
+        prefixes = self._prefixes
+        if not prefixes:
+            return None
+
+        end = len(data)
+        while end > 0:
+            # Ближайший разделитель слева - срез до него включительно
+            cut = max(data.rfind("_", 0, end), data.rfind(":", 0, end))
+            if cut < 0:
+                break
+            entry = prefixes.get(data[:cut + 1])
+            if entry is not None:
+                handler, spec = entry
+                if spec is None:
+                    self.stats["hits"] += 1
+                    return CallbackMatch(handler, {})
+                args = spec.unpack(data)
+                if args is not None:
+                    self.stats["hits"] += 1
+                    return CallbackMatch(handler, args)
+            end = cut
+
+        return None
+
+    def __len__(self) -> int:
+        return len(self._exact) + len(self._prefixes)
+
+    def keys(self) -> List[str]:
+        return sorted([*self._exact, *self._prefixes])
+
+    def entries(self) -> List[Tuple[str, bool, H]]:
+        """Все записи: (callback_data или префикс, это префикс, handler)"""
+        return [
+            *((data, False, handler) for data, handler in self._exact.items()),
+            *((prefix, True, handler) for prefix, (handler, _) in self._prefixes.items())
+        ]
@@ -28,11 +28,18 @@ from .quantum_hub import router as quantum_hub_router
 from .bank import router as bank_router
 from .specialists import router as specialists_router
 
+# Индекс callback handlers (заполняется при импорте модулей выше)
+from .dispatch import router as dispatch_router, callback_index
+
 logger = logging.getLogger(__name__)
 
 async def setup_handlers(dp):
     """Регистрация всех handlers в правильном порядке"""
     try:
+        # Индексная диспетчеризация callback - до любых фильтров
+        dp.include_router(dispatch_router)
+        logger.info(f"🗂 Индекс callback: {len(callback_index)} записей")
+
         # Admin роутер первым (для доступа к админ командам)
         dp.include_router(admin_router)
 
@@ -4,15 +4,17 @@ Handler для Академии - адаптированный под ваш п
 """
 
 import logging
-from aiogram import Router, F
+from aiogram import Router
 from aiogram.types import Message, CallbackQuery, InlineKeyboardMarkup, InlineKeyboardButton
 
 from config.texts import *
+from interfaces.telegram_bot.keyboards.registry import keyboard_registry, KeyboardTemplate
 from services.quest_service import quest_service
 from services.blockchain_service import blockchain_service
 from adapters.database.supabase.client import get_supabase_client
 from adapters.database.supabase.repositories.user_repository import SupabaseUserRepository
 from core.use_cases.user.create_user import GetUserProfileUseCase, UpdateUserResourcesUseCase
+from interfaces.telegram_bot.handlers.dispatch import indexed_callback
 
 router = Router()
 logger = logging.getLogger(__name__)
@@ -28,7 +30,8 @@ async def get_use_cases():
     }
 
 
-def get_academy_keyboard():
+@keyboard_registry.static("academy")
+def get_academy_keyboard(lang: str = "ru") -> InlineKeyboardMarkup:
     """Главное меню академии"""
     keyboard = [
         [InlineKeyboardButton(text=BTN_LABOR_EXCHANGE, callback_data="academy_hire")],
@@ -39,27 +42,28 @@ def get_academy_keyboard():
     return InlineKeyboardMarkup(inline_keyboard=keyboard)
 
 
+HIRE_KEYBOARD_TEMPLATE = KeyboardTemplate([
+    "hire",
+    [InlineKeyboardButton(text=BTN_BACK, callback_data="back_to_academy")]
+])
+
+
 def get_hire_keyboard(can_hire=True, worker_count=0):
-    """Клавиатура найма рабочих"""
+    """Клавиатура найма рабочих - пересобирается только кнопка найма"""
     if can_hire:
         cost = 30 + (worker_count * 10)  # Цена растет с количеством
-        keyboard = [
-            [InlineKeyboardButton(
-                text=f"👷 Нанять рабочего ({cost} 💵)",
-                callback_data=f"hire_worker_{cost}"
-            )],
-            [InlineKeyboardButton(text=BTN_BACK, callback_data="back_to_academy")]
-        ]
+        hire_button = InlineKeyboardButton(
+            text=f"👷 Нанять рабочего ({cost} 💵)",
+            callback_data=f"hire_worker_{cost}"
+        )
     else:
-        keyboard = [
-            [InlineKeyboardButton(text="⏳ Недостаточно средств", callback_data="hire_unavailable")],
-            [InlineKeyboardButton(text=BTN_BACK, callback_data="back_to_academy")]
-        ]
+        hire_button = InlineKeyboardButton(text="⏳ Недостаточно средств", callback_data="hire_unavailable")
 
-    return InlineKeyboardMarkup(inline_keyboard=keyboard)
+    return HIRE_KEYBOARD_TEMPLATE.render(hire=[[hire_button]])
 
 
-def get_training_keyboard():
+@keyboard_registry.static("academy_training")
+def get_training_keyboard(lang: str = "ru") -> InlineKeyboardMarkup:
     """Клавиатура обучения специалистов"""
     keyboard = [
         [InlineKeyboardButton(text="👨‍🌾 Обучить фермера (25🧪 + 50💵)", callback_data="train_farmer")],
@@ -110,7 +114,7 @@ async def show_academy_menu(callback: CallbackQuery):
 
 # === ОБРАБОТЧИКИ АКАДЕМИИ ===
 
-@router.callback_query(F.data == "academy_hire")
+@indexed_callback("academy_hire")
 async def academy_hire(callback: CallbackQuery):
     """Биржа труда - найм рабочих"""
     try:
@@ -155,7 +159,7 @@ async def academy_hire(callback: CallbackQuery):
         await callback.answer("Ошибка загрузки биржи труда", show_alert=True)
 
 
-@router.callback_query(F.data.startswith("hire_worker_"))
+@indexed_callback(prefix="hire_worker_")
 async def hire_worker(callback: CallbackQuery):
     """Нанять рабочего"""
     try:
@@ -235,7 +239,7 @@ async def hire_worker(callback: CallbackQuery):
 
 
 
-@router.callback_query(F.data == "academy_train")
+@indexed_callback("academy_train")
 async def academy_train(callback: CallbackQuery):
     """Курсы экспертов - обучение специалистов"""
     try:
@@ -261,9 +265,7 @@ async def academy_train(callback: CallbackQuery):
 ❌ У вас нет рабочих для обучения!
 
 Сначала наймите рабочего в 💼 Бирже труда.""",
-                reply_markup=InlineKeyboardMarkup(inline_keyboard=[
-                    [InlineKeyboardButton(text=BTN_BACK, callback_data="back_to_academy")]
-                ]),
+                reply_markup=keyboard_registry.back("back_to_academy"),
                 parse_mode="Markdown"
             )
             await callback.answer()
@@ -293,7 +295,7 @@ async def academy_train(callback: CallbackQuery):
         await callback.answer("Ошибка загрузки курсов", show_alert=True)
 
 
-@router.callback_query(F.data.startswith("train_"))
+@indexed_callback(prefix="train_")
 async def train_specialist(callback: CallbackQuery):
     """Обучить специалиста"""
     try:
@@ -386,26 +388,24 @@ async def train_specialist(callback: CallbackQuery):
         await callback.answer("Ошибка обучения специалиста", show_alert=True)
 
 
-@router.callback_query(F.data == "academy_class")
+@indexed_callback("academy_class")
 async def academy_class(callback: CallbackQuery):
     """Класс обучения (заглушка)"""
     await callback.message.edit_text(
         f"📚 *КЛАСС ОБУЧЕНИЯ*\n\n{SECTION_UNDER_DEVELOPMENT}",
-        reply_markup=InlineKeyboardMarkup(inline_keyboard=[
-            [InlineKeyboardButton(text=BTN_BACK, callback_data="back_to_academy")]
-        ]),
+        reply_markup=keyboard_registry.back("back_to_academy"),
         parse_mode="Markdown"
     )
     await callback.answer()
 
 
-@router.callback_query(F.data == "hire_unavailable")
+@indexed_callback("hire_unavailable")
 async def hire_unavailable(callback: CallbackQuery):
     """Найм недоступен"""
     await callback.answer("Недостаточно средств для найма рабочего", show_alert=True)
 
 
-@router.callback_query(F.data == "back_to_academy")
+@indexed_callback("back_to_academy")
 async def back_to_academy(callback: CallbackQuery):
     """Возврат в академию"""
     await show_academy_menu(callback)
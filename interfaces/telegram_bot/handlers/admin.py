@@ -74,11 +74,25 @@ async def admin_stats(message: Message):
             filters={"tutorial_completed": True}
         )
 
-        # Статистика специалистов
-        specialists = await client.execute_query(
-            table="specialists",
-            operation="count"
-        )
+        # Статистика специалистов (сводки команд)
+        from services.roster_summary import roster_summaries
+        roster_totals = await roster_summaries.totals()
+
+        # Статистика рендера сообщений
+        from interfaces.telegram_bot.render import message_renderer
+        render_stats = message_renderer.get_stats()
+        from interfaces.telegram_bot.middlewares.callback_debounce_middleware import callback_debouncer
+        debounce_stats = callback_debouncer.get_stats()
+        from services.user_lanes import user_lanes
+        lane_stats = user_lanes.get_stats()
+        from services.bank_pool_cache import bank_pool_cache
+        pool_cache_stats = bank_pool_cache.get_stats()
+        from services.ledger_writer import ledger_writer
+        ledger_stats = ledger_writer.get_stats()
+        from services.job_scheduler import job_scheduler
+        job_stats = job_scheduler.get_stats()
+        from services.income_settlement import income_settlement
+        income_stats = income_settlement.get_stats()
 
         stats_text = f"""
 📊 *СТАТИСТИКА RYABOT ISLAND*
@@ -90,7 +104,43 @@ async def admin_stats(message: Message):
 • Завершили туториал: {completed_tutorial or 0}
 
 🎮 *Игровая активность:*
-• Всего специалистов: {specialists or 0}
+• Всего специалистов: {roster_totals.active} (погибло: {roster_totals.count(status='dead')})
+• Игроков с командой: {roster_totals.users}
+
+✏️ *Редактирования сообщений:*
+• Отправлено: {render_stats['edits_sent']}
+• Пропущено без изменений: {render_stats['edits_suppressed']}
+• Схлопнуто: {render_stats['edits_collapsed']}
+
+👆 *Повторные нажатия:*
+• Защищённых нажатий: {debounce_stats['guarded']}
+• Повторов во время обработки: {debounce_stats['duplicates_inflight']}
+• Повторов после обработки: {debounce_stats['duplicates_recent']}
+
+🔒 *Очереди операций игроков:*
+• Операций: {lane_stats['acquired']}
+• Ждали очереди: {lane_stats['contended']} (макс. {lane_stats['wait_time_max']:.2f} сек)
+• Активных очередей: {lane_stats['active_lanes']}
+
+🏦 *Кэш пулов банка:*
+• Попаданий: {pool_cache_stats['hits']} ({pool_cache_stats['hit_ratio']:.0%})
+• Чтений из БД: {pool_cache_stats['refreshes']}
+• Сделок других воркеров: {pool_cache_stats['external_changes']}
+
+📒 *Журнал операций:*
+• Записей: {ledger_stats['appended']} (fsync: {ledger_stats['fsyncs']})
+• Отправлено в БД: {ledger_stats['applied']} за {ledger_stats['batches']} пачек
+• Ожидают отправки сегментов: {ledger_stats['pending_segments']}
+
+⏱ *Таймеры специалистов:*
+• Ожидают: {job_stats['pending']} (загружено при старте: {job_stats['loaded']})
+• Завершено: {job_stats['completed']} за {job_stats['batches']} пачек (пропущено: {job_stats['skipped']})
+• Отменено: {job_stats['cancelled']}
+
+💼 *Доход специалистов:*
+• Расчётов: {income_stats['runs']} (последний: {income_stats['last_run_seconds']:.2f} сек)
+• Смен: {income_stats['shifts']}, начислено: {income_stats['credited_total']:,} рябаксов
+• Устаревших пачек: {income_stats['stale_chunks']}, ошибок: {income_stats['failed_chunks']}
 
 🕒 *Время:* {datetime.now().strftime("%H:%M:%S")}
         """.strip()
@@ -129,19 +179,10 @@ async def admin_user(message: Message):
             await message.answer(f"❌ Пользователь {target_user_id} не найден")
             return
 
-        # Получаем специалистов
-        specialists = await client.execute_query(
-            table="specialists",
-            operation="select",
-            columns=["specialist_type"],
-            filters={"user_id": target_user_id}
-        )
-
-        specialist_types = {}
-        if specialists:
-            for s in specialists:
-                spec_type = s['specialist_type']
-                specialist_types[spec_type] = specialist_types.get(spec_type, 0) + 1
+        # Сводка команды
+        from services.roster_summary import roster_summaries
+        roster = await roster_summaries.get(target_user_id)
+        specialist_types = {spec_type: count for spec_type, count in roster.active_by_type().items() if count}
 
         user_info = f"""
 👤 *ИНФОРМАЦИЯ О ПОЛЬЗОВАТЕЛЕ*
@@ -162,7 +203,7 @@ async def admin_user(message: Message):
 🎯 Туториал: {user.get('tutorial_step', 'not_started')}
 ✅ Завершен: {'Да' if user.get('tutorial_completed', False) else 'Нет'}
 
-👥 *Специалисты:* {len(specialists) if specialists else 0}
+👥 *Специалисты:* {roster.active} (ранены: {roster.count(status='injured')}, погибли: {roster.count(status='dead')})
 {chr(10).join([f"• {spec_type}: {count}" for spec_type, count in specialist_types.items()]) if specialist_types else "• Нет специалистов"}
 
 📅 *Регистрация:* {user.get('created_at', 'Неизвестно')[:10]}
@@ -264,6 +305,44 @@ async def admin_give(message: Message):
         await message.answer(f"❌ Ошибка: {str(e)}")
 
 
+@router.message(Command("admin_boxes"))
+async def admin_boxes(message: Message):
+    """Выдать коробки: /admin_boxes 123456789 free_boxes 5"""
+    if not is_admin(message.from_user.id):
+        return
+
+    try:
+        from services.lootbox_engine import LOOT_TABLES
+        from services.lootbox_service import lootbox_service
+
+        args = message.text.split()
+        if len(args) not in (3, 4):
+            await message.answer(
+                "Использование: /admin_boxes <user_id> <box> [count]\n"
+                f"Коробки: {', '.join(LOOT_TABLES)}"
+            )
+            return
+
+        target_user_id = int(args[1])
+        box_item = args[2]
+        count = int(args[3]) if len(args) == 4 else 1
+
+        if box_item not in LOOT_TABLES or count <= 0:
+            await message.answer(f"❌ Неизвестная коробка. Доступны: {', '.join(LOOT_TABLES)}")
+            return
+
+        if await lootbox_service.grant_boxes(target_user_id, box_item, count):
+            await message.answer(f"✅ Пользователю {target_user_id} выдано: 📦 {count} x {box_item}")
+        else:
+            await message.answer("❌ Не удалось выдать коробки")
+
+    except ValueError:
+        await message.answer("❌ Неверный формат числа")
+    except Exception as e:
+        logger.error(f"Ошибка выдачи коробок: {e}")
+        await message.answer(f"❌ Ошибка: {str(e)}")
+
+
 @router.message(Command("admin_reset"))
 async def admin_reset(message: Message):
     """Сбросить туториал: /admin_reset 123456789"""
@@ -417,6 +496,108 @@ async def admin_broadcast(message: Message):
 
 # === ИНФОРМАЦИОННЫЕ КОМАНДЫ ===
 
+@router.message(Command("admin_candles"))
+async def admin_candles(message: Message):
+    """Свечи курса RBTC: /admin_candles [1m|1h|1d] [N]"""
+    if not is_admin(message.from_user.id):
+        return
+
+    try:
+        from datetime import datetime
+        from services.price_history import price_history
+
+        args = message.text.split()
+        interval = args[1] if len(args) > 1 else "1h"
+        limit = min(int(args[2]), 48) if len(args) > 2 else 12
+
+        candles = await price_history.get_candles(interval, limit)
+        if not candles:
+            await message.answer(f"📈 Свечей {interval} пока нет")
+            return
+
+        lines = [f"📈 *Курс RBTC, {interval}* (O / H / L / C, объём)"]
+        for candle in candles:
+            time_label = datetime.fromtimestamp(candle['time']).strftime("%d.%m %H:%M")
+            lines.append(
+                f"`{time_label}` {candle['open']:.2f} / {candle['high']:.2f} / "
+                f"{candle['low']:.2f} / {candle['close']:.2f} • {candle['volume_rbtc']:.4f} 💠"
+            )
+
+        await message.answer("\n".join(lines), parse_mode="Markdown")
+
+    except ValueError:
+        await message.answer("Использование: /admin_candles [1m|1h|1d] [N]")
+    except Exception as e:
+        logger.error(f"Ошибка получения свечей: {e}")
+        await message.answer(f"❌ Ошибка: {str(e)}")
+
+
+@router.message(Command("admin_candles_backfill"))
+async def admin_candles_backfill(message: Message):
+    """Пересобрать свечи курса из журнала pool_transactions"""
+    if not is_admin(message.from_user.id):
+        return
+
+    try:
+        from services.price_history import price_history
+
+        await message.answer("⏳ Пересборка свечей из журнала сделок...")
+        processed = await price_history.backfill()
+        await message.answer(f"✅ Свечи пересобраны: {processed} сделок")
+
+    except Exception as e:
+        logger.error(f"Ошибка пересборки свечей: {e}")
+        await message.answer(f"❌ Ошибка: {str(e)}")
+
+
+@router.message(Command("admin_economy"))
+async def admin_economy(message: Message):
+    """Счётчики экономики"""
+    if not is_admin(message.from_user.id):
+        return
+
+    try:
+        from services.economy_counters import economy_counters
+        from services.price_multipliers import price_multipliers
+
+        counters = await economy_counters.get()
+        multipliers = await price_multipliers.current()
+        await message.answer(
+            "💰 *Экономика острова*\n\n"
+            f"🔥 Сожжено RBTC: {counters['total_rbtc_burned']:.4f}\n"
+            f"💠 RBTC у игроков: {counters['rbtc_in_circulation']:.4f}\n"
+            f"⚛️ Выручка Quantum Pass: {counters['qpass_revenue_rbtc']:.4f} RBTC\n"
+            f"🏦 Общий банк: {counters['total_bank_ryabucks']:,} рябаксов\n"
+            f"📐 Мультипликаторы: x{multipliers.ryabucks} 💵 / x{multipliers.rbtc} 💠 (версия {multipliers.version})",
+            parse_mode="Markdown"
+        )
+
+    except Exception as e:
+        logger.error(f"Ошибка получения счётчиков экономики: {e}")
+        await message.answer(f"❌ Ошибка: {str(e)}")
+
+
+@router.message(Command("admin_economy_reconcile"))
+async def admin_economy_reconcile(message: Message):
+    """Пересчитать счётчики экономики из журналов"""
+    if not is_admin(message.from_user.id):
+        return
+
+    try:
+        from services.economy_counters import economy_counters
+
+        await message.answer("⏳ Сверка счётчиков с журналами...")
+        result = await economy_counters.reconcile()
+        lines = ["✅ Сверка завершена"]
+        for name, delta in result["deltas"].items():
+            lines.append(f"• {name}: {result['recomputed'][name]:.4f} (поправка {delta:+.4f})")
+        await message.answer("\n".join(lines))
+
+    except Exception as e:
+        logger.error(f"Ошибка сверки счётчиков экономики: {e}")
+        await message.answer(f"❌ Ошибка: {str(e)}")
+
+
 @router.message(Command("admin"))
 async def admin_help(message: Message):
     """Список админских команд"""
@@ -429,10 +610,15 @@ async def admin_help(message: Message):
 
 📊 *Статистика:*
 • `/admin_stats` - общая статистика бота
+• `/admin_candles [1m|1h|1d] [N]` - свечи курса RBTC
+• `/admin_candles_backfill` - пересобрать свечи из журнала
+• `/admin_economy` - счётчики экономики
+• `/admin_economy_reconcile` - сверить счётчики с журналами
 
 👤 *Управление пользователями:*
 • `/admin_user <id>` - информация о пользователе
 • `/admin_give <id> <resource> <amount>` - выдать ресурсы
+• `/admin_boxes <id> <box> [count]` - выдать коробки
 • `/admin_reset <id>` - сбросить туториал
 • `/admin_energy <id> [amount]` - восстановить энергию
 
@@ -9,17 +9,23 @@ from aiogram.types import Message, CallbackQuery, InlineKeyboardMarkup, InlineKe
 from aiogram.fsm.context import FSMContext
 
 from config.texts import *
+from interfaces.telegram_bot.keyboards.registry import keyboard_registry
 from services.bank_service import bank_service
+from services.bank_quotes import bank_quotes, BankQuote, QuoteError
+from core.domain.money import Money
+from services.swap_engine import SIDE_BUY, SIDE_SELL
 from interfaces.telegram_bot.states import BankState
 from adapters.database.supabase.client import get_supabase_client
 from aiogram.types import LabeledPrice
+from interfaces.telegram_bot.handlers.dispatch import indexed_callback
 
 
 router = Router()
 logger = logging.getLogger(__name__)
 
 
-def get_bank_keyboard() -> InlineKeyboardMarkup:
+@keyboard_registry.static("bank")
+def get_bank_keyboard(lang: str = "ru") -> InlineKeyboardMarkup:
     """Клавиатура главного меню банка"""
     keyboard = [
         [
@@ -41,7 +47,7 @@ def get_bank_keyboard() -> InlineKeyboardMarkup:
     return InlineKeyboardMarkup(inline_keyboard=keyboard)
 
 
-@router.callback_query(F.data == "town_ryabank")
+@indexed_callback("town_ryabank")
 async def show_bank_menu(callback: CallbackQuery):
     """Показать меню рябанка с экономической информацией"""
     try:
@@ -100,11 +106,32 @@ async def show_bank_menu(callback: CallbackQuery):
         await callback.answer("Техническая ошибка", show_alert=True)
 
 
+def _format_quote_terms(quote: BankQuote) -> str:
+    """Условия котировки для экрана подтверждения"""
+    bound = "Не дороже" if quote.side == SIDE_BUY else "Не меньше"
+    return (
+        f"Средний курс: 1 💠 = {quote.price:.2f} 💵\n"
+        f"Влияние на курс: {quote.price_impact * 100:.2f}%\n"
+        f"{bound}: {quote.ryabucks_limit:,} 💵 (проскальзывание)\n\n"
+        f"⏳ Котировка действует {bank_quotes.ttl_seconds} сек."
+    )
+
+
+async def _execute_state_quote(callback: CallbackQuery, state: FSMContext):
+    """Исполнить котировку, сохранённую в FSM на шаге ввода суммы"""
+    data = await state.get_data()
+    try:
+        quote = BankQuote.from_state(data.get('quote') or {})
+    except QuoteError as e:
+        return False, str(e)
+    return await bank_service.execute_quote(callback.from_user.id, quote)
+
+
 # ═══════════════════════════════════════════════════════════════════════
 # ПОКУПКА RBTC ЗА РЯБАКСЫ
 # ═══════════════════════════════════════════════════════════════════════
 
-@router.callback_query(F.data == "bank_buy_rbtc")
+@indexed_callback("bank_buy_rbtc")
 async def buy_rbtc_start(callback: CallbackQuery, state: FSMContext):
     """Начать покупку RBTC"""
     try:
@@ -125,7 +152,7 @@ async def buy_rbtc_start(callback: CallbackQuery, state: FSMContext):
             return
 
         user_ryabucks = user.get('ryabucks', 0)
-        user_rbtc = user.get('rbtc', 0)
+        user_rbtc = Money.of(user.get('rbtc'))
 
         # Получить текущий курс
         pools = await bank_service.get_bank_pools()
@@ -193,30 +220,22 @@ async def process_buy_rbtc_amount(message: Message, state: FSMContext):
             await message.answer("❌ Введите корректную сумму (например: 10.5)")
             return
 
-        # Рассчитать реальную стоимость по AMM
-        pools = await bank_service.get_bank_pools()
-        from config.global_pools import calculate_buy_rbtc_cost
-
+        # Котировка по кэшу пулов (AMM), исполняется при подтверждении
         try:
-            cost = calculate_buy_rbtc_cost(
-                amount,
-                pools['rbtc_pool'],
-                pools['ryabucks_pool']
-            )
+            quote = await bank_service.quote_trade(message.from_user.id, SIDE_BUY, amount)
+        except QuoteError as e:
+            await message.answer(f"❌ {e}")
+            return
         except Exception as e:
             logger.error(f"Ошибка расчёта стоимости: {e}")
             await message.answer("❌ Ошибка расчёта стоимости")
             return
 
-        avg_rate = cost / float(amount)
-
         confirm_text = f"""💰 Подтверждение покупки
 
 Покупаете: {amount:.4f} 💠 RBTC
-Стоимость: {cost:,} 💵 рябаксов
-Средний курс: 1 💠 = {avg_rate:.2f} 💵
-
-⚠️ Курс меняется при покупке (DEX механика)
+Стоимость: {quote.ryabucks_amount:,} 💵 рябаксов
+{_format_quote_terms(quote)}
 
 Подтвердить покупку?"""
 
@@ -232,7 +251,7 @@ async def process_buy_rbtc_amount(message: Message, state: FSMContext):
             reply_markup=InlineKeyboardMarkup(inline_keyboard=keyboard)
         )
 
-        await state.update_data(amount=float(amount), cost=cost)
+        await state.update_data(quote=quote.to_state())
         await state.set_state(BankState.BUY_RBTC_CONFIRM)
 
     except Exception as e:
@@ -240,15 +259,11 @@ async def process_buy_rbtc_amount(message: Message, state: FSMContext):
         await message.answer("❌ Произошла ошибка")
 
 
-@router.callback_query(F.data == "confirm_buy_rbtc")
+@indexed_callback("confirm_buy_rbtc")
 async def confirm_buy_rbtc(callback: CallbackQuery, state: FSMContext):
     """Подтвердить покупку RBTC"""
     try:
-        data = await state.get_data()
-        amount = Decimal(str(data.get('amount', 0)))
-        user_id = callback.from_user.id
-
-        success, message_text = await bank_service.buy_rbtc(user_id, amount)
+        success, message_text = await _execute_state_quote(callback, state)
 
         # Кнопка возврата в банк
         keyboard = InlineKeyboardMarkup(inline_keyboard=[
@@ -273,7 +288,7 @@ async def confirm_buy_rbtc(callback: CallbackQuery, state: FSMContext):
 # ПРОДАЖА RBTC ЗА РЯБАКСЫ
 # ═══════════════════════════════════════════════════════════════════════
 
-@router.callback_query(F.data == "bank_sell_rbtc")
+@indexed_callback("bank_sell_rbtc")
 async def sell_rbtc_start(callback: CallbackQuery, state: FSMContext):
     """Начать продажу RBTC"""
     try:
@@ -293,7 +308,7 @@ async def sell_rbtc_start(callback: CallbackQuery, state: FSMContext):
             await callback.answer("Пользователь не найден", show_alert=True)
             return
 
-        user_rbtc = Decimal(str(user.get('rbtc', 0)))
+        user_rbtc = Money.of(user.get('rbtc'))
         user_ryabucks = user.get('ryabucks', 0)
 
         pools = await bank_service.get_bank_pools()
@@ -318,7 +333,7 @@ async def sell_rbtc_start(callback: CallbackQuery, state: FSMContext):
         )
 
         await state.set_state(BankState.SELL_RBTC_AMOUNT)
-        await state.update_data(user_rbtc=float(user_rbtc))
+        await state.update_data(user_rbtc=str(user_rbtc))
         await callback.answer()
 
     except Exception as e:
@@ -331,7 +346,7 @@ async def process_sell_rbtc_amount(message: Message, state: FSMContext):
     """Обработать ввод суммы RBTC для продажи"""
     try:
         data = await state.get_data()
-        user_rbtc = data.get('user_rbtc', 0)
+        user_rbtc = Money.of(data.get('user_rbtc'))
 
         # Очистка и валидация ввода
         try:
@@ -355,25 +370,22 @@ async def process_sell_rbtc_amount(message: Message, state: FSMContext):
             await message.answer("❌ Введите корректную сумму (например: 10.5)")
             return
 
-        # Рассчитать награду по AMM
-        pools = await bank_service.get_bank_pools()
-        from config.global_pools import calculate_sell_rbtc_reward
-
-        reward = calculate_sell_rbtc_reward(
-            amount,
-            pools['rbtc_pool'],
-            pools['ryabucks_pool']
-        )
-
-        avg_rate = reward / float(amount)
+        # Котировка по кэшу пулов (AMM), исполняется при подтверждении
+        try:
+            quote = await bank_service.quote_trade(message.from_user.id, SIDE_SELL, amount)
+        except QuoteError as e:
+            await message.answer(f"❌ {e}")
+            return
+        except Exception as e:
+            logger.error(f"Ошибка расчёта выручки: {e}")
+            await message.answer("❌ Ошибка расчёта выручки")
+            return
 
         confirm_text = f"""💰 Подтверждение продажи
 
 Продаете: {amount:.4f} 💠 RBTC
-Получите: {reward:,} 💵 рябаксов
-Средний курс: 1 💠 = {avg_rate:.2f} 💵
-
-⚠️ Курс меняется при продаже (DEX механика)
+Получите: {quote.ryabucks_amount:,} 💵 рябаксов
+{_format_quote_terms(quote)}
 
 Подтвердить продажу?"""
 
@@ -389,7 +401,7 @@ async def process_sell_rbtc_amount(message: Message, state: FSMContext):
             reply_markup=InlineKeyboardMarkup(inline_keyboard=keyboard)
         )
 
-        await state.update_data(amount=float(amount), reward=reward)
+        await state.update_data(quote=quote.to_state())
         await state.set_state(BankState.SELL_RBTC_CONFIRM)
 
     except Exception as e:
@@ -397,15 +409,11 @@ async def process_sell_rbtc_amount(message: Message, state: FSMContext):
         await message.answer("❌ Произошла ошибка")
 
 
-@router.callback_query(F.data == "confirm_sell_rbtc")
+@indexed_callback("confirm_sell_rbtc")
 async def confirm_sell_rbtc(callback: CallbackQuery, state: FSMContext):
     """Подтвердить продажу RBTC"""
     try:
-        data = await state.get_data()
-        amount = Decimal(str(data.get('amount', 0)))
-        user_id = callback.from_user.id
-
-        success, message_text = await bank_service.sell_rbtc(user_id, amount)
+        success, message_text = await _execute_state_quote(callback, state)
 
         # Кнопка возврата в банк
         keyboard = InlineKeyboardMarkup(inline_keyboard=[
@@ -430,7 +438,7 @@ async def confirm_sell_rbtc(callback: CallbackQuery, state: FSMContext):
 # ПОКУПКА РЯБАКСОВ ЗА TELEGRAM STARS
 # ═══════════════════════════════════════════════════════════════════════
 
-@router.callback_query(F.data == "bank_buy_ryabucks")
+@indexed_callback("bank_buy_ryabucks")
 async def buy_ryabucks_stars(callback: CallbackQuery):
     """Покупка рябаксов за Telegram Stars - МЕНЮ ВЫБОРА"""
     try:
@@ -479,7 +487,7 @@ async def buy_ryabucks_stars(callback: CallbackQuery):
         await callback.answer("Произошла ошибка", show_alert=True)
 
 
-@router.callback_query(F.data.startswith("buy_stars_"))
+@indexed_callback(prefix="buy_stars_")
 async def process_buy_stars(callback: CallbackQuery):
     """Обработка покупки рябаксов за Stars - СОЗДАНИЕ ИНВОЙСА"""
     try:
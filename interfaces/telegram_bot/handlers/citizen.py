@@ -5,26 +5,31 @@ Handler меню жителя
 
 import logging
 from datetime import datetime
-from aiogram import Router, F
+from aiogram import Router
 from aiogram.types import Message, CallbackQuery, InlineKeyboardMarkup, InlineKeyboardButton
 from core.domain.entities import TutorialStep
 from config.texts import *
+from config.i18n import t, language_of, remember_language
+from interfaces.telegram_bot.keyboards.registry import keyboard_registry
+from interfaces.telegram_bot.render import message_renderer
 from services.quest_service import quest_service
 from adapters.database.supabase.client import get_supabase_client
+from interfaces.telegram_bot.handlers.dispatch import indexed_callback
 
 router = Router()
 logger = logging.getLogger(__name__)
 
 
-def get_citizen_keyboard():
+@keyboard_registry.static("citizen")
+def get_citizen_keyboard(lang: str = "ru") -> InlineKeyboardMarkup:
     """Клавиатура жителя - ТОЧНЫЕ НАЗВАНИЯ"""
     keyboard = [
-        [InlineKeyboardButton(text=BTN_CITIZEN_PROPERTIES, callback_data="citizen_properties"),
-         InlineKeyboardButton(text=BTN_CITIZEN_WARDROBE, callback_data="citizen_wardrobe")],
-        [InlineKeyboardButton(text=BTN_CITIZEN_HISTORY, callback_data="citizen_history"),
-         InlineKeyboardButton(text=BTN_CITIZEN_TASKS, callback_data="citizen_tasks")],
-        [InlineKeyboardButton(text=BTN_CITIZEN_ACHIEVEMENTS, callback_data="citizen_achievements"),
-         InlineKeyboardButton(text=BTN_CITIZEN_STATISTICS, callback_data="citizen_statistics")]
+        [InlineKeyboardButton(text=t("BTN_CITIZEN_PROPERTIES", lang), callback_data="citizen_properties"),
+         InlineKeyboardButton(text=t("BTN_CITIZEN_WARDROBE", lang), callback_data="citizen_wardrobe")],
+        [InlineKeyboardButton(text=t("BTN_CITIZEN_HISTORY", lang), callback_data="citizen_history"),
+         InlineKeyboardButton(text=t("BTN_CITIZEN_TASKS", lang), callback_data="citizen_tasks")],
+        [InlineKeyboardButton(text=t("BTN_CITIZEN_ACHIEVEMENTS", lang), callback_data="citizen_achievements"),
+         InlineKeyboardButton(text=t("BTN_CITIZEN_STATISTICS", lang), callback_data="citizen_statistics")]
     ]
 
     return InlineKeyboardMarkup(inline_keyboard=keyboard)
@@ -38,7 +43,7 @@ async def get_citizen_data(user_id: int) -> dict:
         user_data = await client.execute_query(
             table="users",
             operation="select",
-            columns=["username", "created_at", "has_employer_license", "liquid_experience", "level"],
+            columns=["username", "created_at", "has_employer_license", "liquid_experience", "level", "language"],
             filters={"user_id": user_id},
             single=True
         )
@@ -46,6 +51,8 @@ async def get_citizen_data(user_id: int) -> dict:
         if not user_data:
             return {}
 
+        remember_language(user_id, user_data.get('language'))
+
         # Форматируем дату регистрации
         created_at = user_data.get('created_at', '2024-01-01')
         if isinstance(created_at, str):
@@ -87,11 +94,12 @@ async def show_citizen_menu(message: Message):
             return
 
         # Формируем текст меню
-        citizen_text = CITIZEN_MENU.format(**citizen_data)
+        lang = language_of(user_id)
+        citizen_text = t("CITIZEN_MENU", lang, **citizen_data)
 
         await message.answer(
             citizen_text,
-            reply_markup=get_citizen_keyboard()
+            reply_markup=get_citizen_keyboard(lang)
         )
 
     except Exception as e:
@@ -101,7 +109,7 @@ async def show_citizen_menu(message: Message):
 
 # === ОБРАБОТЧИКИ РАЗДЕЛОВ ЖИТЕЛЯ ===
 
-@router.callback_query(F.data == "citizen_tasks")
+@indexed_callback("citizen_tasks")
 async def citizen_tasks(callback: CallbackQuery):
     try:
         user_id = callback.from_user.id
@@ -167,7 +175,11 @@ async def citizen_tasks(callback: CallbackQuery):
             ])
 
             logger.info("Sending quest text to user")
-            await callback.message.edit_text(quest_text, reply_markup=keyboard)
+            await message_renderer.edit_text(
+                callback.message,
+                quest_text,
+                reply_markup=keyboard
+            )
             await callback.answer()
             return
 
@@ -183,7 +195,11 @@ async def citizen_tasks(callback: CallbackQuery):
         ])
 
         logger.info("Sending completed quest message")
-        await callback.message.edit_text(quest_text, reply_markup=keyboard)
+        await message_renderer.edit_text(
+            callback.message,
+            quest_text,
+            reply_markup=keyboard
+        )
         await callback.answer()
 
     except Exception as e:
@@ -191,7 +207,7 @@ async def citizen_tasks(callback: CallbackQuery):
         await callback.answer("❌ Произошла ошибка. Проверьте логи.", show_alert=True)
 
 
-@router.callback_query(F.data.startswith("citizen_"))
+@indexed_callback(prefix="citizen_")
 async def handle_citizen_section(callback: CallbackQuery):
     """Обработка остальных разделов жителя"""
     try:
@@ -210,12 +226,12 @@ async def handle_citizen_section(callback: CallbackQuery):
         }
 
         section_name = section_names.get(section, "НЕИЗВЕСТНЫЙ РАЗДЕЛ")
+        lang = language_of(callback.from_user.id)
 
-        await callback.message.edit_text(
-            f"{section_name}\n\n{SECTION_UNDER_DEVELOPMENT}",
-            reply_markup=InlineKeyboardMarkup(inline_keyboard=[
-                [InlineKeyboardButton(text=BTN_BACK, callback_data="back_to_citizen")]
-            ])
+        await message_renderer.edit_text(
+            callback.message,
+            f"{section_name}\n\n{t('SECTION_UNDER_DEVELOPMENT', lang)}",
+            reply_markup=keyboard_registry.back("back_to_citizen", lang)
         )
 
         await callback.answer()
@@ -225,7 +241,7 @@ async def handle_citizen_section(callback: CallbackQuery):
         await callback.answer("Ошибка", show_alert=True)
 
 
-@router.callback_query(F.data == "back_to_citizen")
+@indexed_callback("back_to_citizen")
 async def back_to_citizen(callback: CallbackQuery):
     """Возврат в меню жителя"""
     try:
@@ -237,11 +253,13 @@ async def back_to_citizen(callback: CallbackQuery):
             await callback.answer("Ошибка", show_alert=True)
             return
 
-        citizen_text = CITIZEN_MENU.format(**citizen_data)
+        lang = language_of(user_id)
+        citizen_text = t("CITIZEN_MENU", lang, **citizen_data)
 
-        await callback.message.edit_text(
+        await message_renderer.edit_text(
+            callback.message,
             citizen_text,
-            reply_markup=get_citizen_keyboard()
+            reply_markup=get_citizen_keyboard(lang)
         )
 
         await callback.answer()
@@ -0,0 +1,71 @@
+# interfaces/telegram_bot/handlers/dispatch.py
+"""
+Индексная диспетчеризация callback запросов
+
+Вместо цепочки роутеров с фильтрами F.data == ... / F.data.startswith(...)
+callback handlers регистрируются в одном индексе, и роутер dispatch
+(подключается первым) находит handler одним поиском по словарю.
+Callback, которых нет в индексе, идут дальше по обычной цепочке роутеров.
+"""
+
+import logging
+from typing import Any, Callable, Dict, Iterable, Optional, Union
+
+from aiogram import Router
+from aiogram.dispatcher.event.handler import CallableObject
+from aiogram.filters import Filter
+from aiogram.types import CallbackQuery
+
+from interfaces.telegram_bot.callback_protocol import CallbackIndex, CallbackProtocolError, CallbackSpec
+
+logger = logging.getLogger(__name__)
+router = Router(name="callback_dispatch")
+
+# Глобальный экземпляр
+callback_index: CallbackIndex[CallableObject] = CallbackIndex()
+
+
+def indexed_callback(data: Union[str, Iterable[str], CallbackSpec, None] = None, *,
+                     prefix: Optional[str] = None) -> Callable:
+    """
+    Декоратор callback handler:
+      @indexed_callback("back_to_work")             - точное совпадение
+      @indexed_callback(["town_shop", "town_tavern"]) - набор значений
+      @indexed_callback(prefix="work_")              - префикс
+      @indexed_callback(CHARACTER_CALLBACK)          - типизированный callback,
+        разобранные поля приходят в handler аргументом callback_args
+
+    Повторная регистрация того же callback_data игнорируется - как и в
+    цепочке роутеров, срабатывает handler, объявленный первым.
+    """
+    def decorator(handler: Callable) -> Callable:
+        target = CallableObject(handler)
+        try:
+            if isinstance(data, CallbackSpec):
+                callback_index.register(data, target)
+            elif prefix is not None:
+                callback_index.register_prefix(prefix, target)
+            elif data is not None:
+                callback_index.register_exact(data, target)
+            else:
+                raise CallbackProtocolError(f"{handler.__name__}: не задан callback_data")
+        except CallbackProtocolError as e:
+            logger.warning(f"⚠️ {handler.__module__}.{handler.__name__} не зарегистрирован: {e}")
+        return handler
+    return decorator
+
+
+class IndexedCallbackFilter(Filter):
+    """Находит handler в индексе и передаёт его в dispatch_indexed"""
+
+    async def __call__(self, callback: CallbackQuery) -> Union[bool, Dict[str, Any]]:
+        match = callback_index.resolve(callback.data)
+        if match is None:
+            return False
+        return {"indexed_handler": match.handler, "callback_args": match.args}
+
+
+@router.callback_query(IndexedCallbackFilter())
+async def dispatch_indexed(callback: CallbackQuery, indexed_handler: CallableObject, **kwargs: Any) -> Any:
+    """Вызов найденного handler с теми же зависимостями (state, bot, ...)"""
+    return await indexed_handler.call(callback, **kwargs)
@@ -4,31 +4,36 @@ Handler меню фермы
 """
 
 import logging
-from aiogram import Router, F
+from aiogram import Router
 from aiogram.types import Message, CallbackQuery, InlineKeyboardMarkup, InlineKeyboardButton
 
 from config.texts import *
+from config.i18n import t, language_of
+from interfaces.telegram_bot.keyboards.registry import keyboard_registry
+from interfaces.telegram_bot.render import message_renderer
 from adapters.database.supabase.client import get_supabase_client
+from interfaces.telegram_bot.handlers.dispatch import indexed_callback
 
 router = Router()
 logger = logging.getLogger(__name__)
 
 
-def get_farm_keyboard():
+@keyboard_registry.static("farm")
+def get_farm_keyboard(lang: str = "ru") -> InlineKeyboardMarkup:
     """Клавиатура фермы - ТОЧНЫЕ НАЗВАНИЯ"""
     keyboard = [
-        [InlineKeyboardButton(text=BTN_FARM_HENHOUSE, callback_data="farm_henhouse"),
-         InlineKeyboardButton(text=BTN_FARM_COWSHED, callback_data="farm_cowshed")],
-        [InlineKeyboardButton(text=BTN_FARM_SHEEPFOLD, callback_data="farm_sheepfold"),
-         InlineKeyboardButton(text=BTN_FARM_PIGSTY, callback_data="farm_pigsty")],
-        [InlineKeyboardButton(text=BTN_FARM_APIARY, callback_data="farm_apiary"),
-         InlineKeyboardButton(text=BTN_FARM_GARDEN, callback_data="farm_garden")],
-        [InlineKeyboardButton(text=BTN_FARM_FORESTRY, callback_data="farm_forestry"),
-         InlineKeyboardButton(text=BTN_FARM_FISHPOND, callback_data="farm_fishpond")],
-        [InlineKeyboardButton(text=BTN_FARM_MINE, callback_data="farm_mine"),
-         InlineKeyboardButton(text=BTN_FARM_VILLAGE, callback_data="farm_village")],
-        [InlineKeyboardButton(text=BTN_FARM_QUANTUMLAB, callback_data="farm_quantumlab"),
-         InlineKeyboardButton(text=BTN_FARM_STABLE, callback_data="farm_stable")]
+        [InlineKeyboardButton(text=t("BTN_FARM_HENHOUSE", lang), callback_data="farm_henhouse"),
+         InlineKeyboardButton(text=t("BTN_FARM_COWSHED", lang), callback_data="farm_cowshed")],
+        [InlineKeyboardButton(text=t("BTN_FARM_SHEEPFOLD", lang), callback_data="farm_sheepfold"),
+         InlineKeyboardButton(text=t("BTN_FARM_PIGSTY", lang), callback_data="farm_pigsty")],
+        [InlineKeyboardButton(text=t("BTN_FARM_APIARY", lang), callback_data="farm_apiary"),
+         InlineKeyboardButton(text=t("BTN_FARM_GARDEN", lang), callback_data="farm_garden")],
+        [InlineKeyboardButton(text=t("BTN_FARM_FORESTRY", lang), callback_data="farm_forestry"),
+         InlineKeyboardButton(text=t("BTN_FARM_FISHPOND", lang), callback_data="farm_fishpond")],
+        [InlineKeyboardButton(text=t("BTN_FARM_MINE", lang), callback_data="farm_mine"),
+         InlineKeyboardButton(text=t("BTN_FARM_VILLAGE", lang), callback_data="farm_village")],
+        [InlineKeyboardButton(text=t("BTN_FARM_QUANTUMLAB", lang), callback_data="farm_quantumlab"),
+         InlineKeyboardButton(text=t("BTN_FARM_STABLE", lang), callback_data="farm_stable")]
     ]
 
     return InlineKeyboardMarkup(inline_keyboard=keyboard)
@@ -59,12 +64,13 @@ async def show_farm_menu(message: Message):
     try:
         user_id = message.from_user.id
 
+        lang = language_of(user_id)
         farm_data = await get_farm_data(user_id)
-        farm_text = FARM_MENU.format(**farm_data)
+        farm_text = t("FARM_MENU", lang, **farm_data)
 
         await message.answer(
             farm_text,
-            reply_markup=get_farm_keyboard()
+            reply_markup=get_farm_keyboard(lang)
         )
 
     except Exception as e:
@@ -74,11 +80,12 @@ async def show_farm_menu(message: Message):
 
 # === ОБРАБОТЧИКИ ПОСТРОЕК ФЕРМЫ ===
 
-@router.callback_query(F.data.startswith("farm_"))
+@indexed_callback(prefix="farm_")
 async def handle_farm_building(callback: CallbackQuery):
     """Обработка построек фермы"""
     try:
         building = callback.data.split("_")[1]
+        lang = language_of(callback.from_user.id)
 
         building_names = {
             "henhouse": "🐔 КУРЯТНИК",
@@ -97,11 +104,10 @@ async def handle_farm_building(callback: CallbackQuery):
 
         building_name = building_names.get(building, "НЕИЗВЕСТНАЯ ПОСТРОЙКА")
 
-        await callback.message.edit_text(
-            f"{building_name}\n\n{SECTION_UNDER_DEVELOPMENT}",
-            reply_markup=InlineKeyboardMarkup(inline_keyboard=[
-                [InlineKeyboardButton(text=BTN_BACK, callback_data="back_to_farm")]
-            ])
+        await message_renderer.edit_text(
+            callback.message,
+            f"{building_name}\n\n{t('SECTION_UNDER_DEVELOPMENT', lang)}",
+            reply_markup=keyboard_registry.back("back_to_farm", lang)
         )
 
         await callback.answer()
@@ -111,18 +117,20 @@ async def handle_farm_building(callback: CallbackQuery):
         await callback.answer("Ошибка", show_alert=True)
 
 
-@router.callback_query(F.data == "back_to_farm")
+@indexed_callback("back_to_farm")
 async def back_to_farm(callback: CallbackQuery):
     """Возврат в меню фермы"""
     try:
         user_id = callback.from_user.id
 
+        lang = language_of(user_id)
         farm_data = await get_farm_data(user_id)
-        farm_text = FARM_MENU.format(**farm_data)
+        farm_text = t("FARM_MENU", lang, **farm_data)
 
-        await callback.message.edit_text(
+        await message_renderer.edit_text(
+            callback.message,
             farm_text,
-            reply_markup=get_farm_keyboard()
+            reply_markup=get_farm_keyboard(lang)
         )
 
         await callback.answer()
@@ -4,18 +4,21 @@ Handler меню друзей
 """
 
 import logging
-from aiogram import Router, F
+from aiogram import Router
 from aiogram.types import Message, CallbackQuery, InlineKeyboardMarkup, InlineKeyboardButton
 from aiogram.types import LinkPreviewOptions
 from config.texts import *
+from interfaces.telegram_bot.keyboards.registry import keyboard_registry
 from config.settings import settings
+from interfaces.telegram_bot.handlers.dispatch import indexed_callback
 
 
 router = Router()
 logger = logging.getLogger(__name__)
 
 
-def get_friends_keyboard():
+@keyboard_registry.static("friends")
+def get_friends_keyboard(lang: str = "ru") -> InlineKeyboardMarkup:
     """Клавиатура друзей - ТОЧНЫЕ НАЗВАНИЯ"""
     keyboard = [
         [InlineKeyboardButton(text=BTN_FRIENDS_MY, callback_data="friends_my")],
@@ -135,7 +138,7 @@ async def show_friends_menu(message: Message):
 
 # === ОБРАБОТЧИКИ РАЗДЕЛОВ ДРУЗЕЙ ===
 
-@router.callback_query(F.data.startswith("friends_"))
+@indexed_callback(prefix="friends_")
 async def handle_friends_section(callback: CallbackQuery):
     """Обработка разделов друзей"""
     try:
@@ -151,9 +154,7 @@ async def handle_friends_section(callback: CallbackQuery):
 
         await callback.message.edit_text(
             f"{section_name}\n\n{SECTION_UNDER_DEVELOPMENT}",
-            reply_markup=InlineKeyboardMarkup(inline_keyboard=[
-                [InlineKeyboardButton(text=BTN_BACK, callback_data="back_to_friends")]
-            ])
+            reply_markup=keyboard_registry.back("back_to_friends")
         )
 
         await callback.answer()
@@ -163,7 +164,7 @@ async def handle_friends_section(callback: CallbackQuery):
         await callback.answer("Ошибка", show_alert=True)
 
 
-@router.callback_query(F.data == "back_to_friends")
+@indexed_callback("back_to_friends")
 async def back_to_friends(callback: CallbackQuery):
     """Возврат в меню друзей"""
     try:
@@ -1,37 +1,60 @@
 # interfaces/telegram_bot/handlers/inventory.py
 
+import asyncio
 import logging
 from aiogram import Router, F
 from aiogram.types import Message, CallbackQuery, InlineKeyboardMarkup, InlineKeyboardButton
 
 from config.texts import *
+from interfaces.telegram_bot.keyboards.registry import keyboard_registry
 from adapters.database.supabase.client import get_supabase_client
+from interfaces.telegram_bot.handlers.dispatch import indexed_callback
+from services.lootbox_engine import LOOT_TABLES
+from services.lootbox_service import lootbox_service
 
 router = Router()
 logger = logging.getLogger(__name__)
 
 
-def get_inventory_keyboard(selected_section="wallet"):
+INVENTORY_SECTIONS = [
+    ("wallet", "💰 Кошелек"),
+    ("passes", "🎫 Допуски"),
+    ("products", "🥚 Продукты"),
+    ("harvest", "🥕 Урожай"),
+    ("animals", "🐮 Животные"),
+    ("seeds", "🍃 Семена"),
+    ("resources", "🪵 Ресурсы"),
+    ("boxes", "📦 Коробки")
+]
+
+# Кнопки открытия коробок в разделе «Коробки»
+LOOTBOX_BUTTONS = {
+    "free_boxes": "🆓",
+    "farm_boxes": "🏡",
+    "work_boxes": "💼",
+    "rbtc_boxes": "💠",
+    "expedition_boxes": "🏕",
+    "fight_boxes": "🥊",
+    "race_boxes": "🏇",
+    "pass_boxes": "🎫"
+}
+LOOTBOX_OPEN_COUNTS = (1, 10)
+
+# Предметы user_items, поле рюкзака которых называется иначе
+ITEM_FIELDS = {"golden_keys": "keys"}
+
+
+@keyboard_registry.variants("inventory", [key for key, _ in INVENTORY_SECTIONS])
+def get_inventory_keyboard(selected_section="wallet", lang: str = "ru") -> InlineKeyboardMarkup:
     """
     Клавиатура рюкзака с динамическим индикатором в два столбца
     selected_section - текущий выбранный раздел
     """
-    sections = [
-        ("wallet", "💰 Кошелек"),
-        ("passes", "🎫 Допуски"),
-        ("products", "🥚 Продукты"),
-        ("harvest", "🥕 Урожай"),
-        ("animals", "🐮 Животные"),
-        ("seeds", "🍃 Семена"),
-        ("resources", "🪵 Ресурсы"),
-        ("boxes", "📦 Коробки")
-    ]
-
     keyboard = []
     row = []
 
     # Создаем кнопки по две в ряд
-    for section_key, section_name in sections:
+    for section_key, section_name in INVENTORY_SECTIONS:
         if section_key == selected_section:
             button_text = f"👉{section_name}"
         else:
@@ -53,6 +76,16 @@ def get_inventory_keyboard(selected_section="wallet"):
     if row:
         keyboard.append(row)
 
+    if selected_section == "boxes":
+        for box_item, icon in LOOTBOX_BUTTONS.items():
+            keyboard.append([
+                InlineKeyboardButton(
+                    text=f"📦[{icon}] Открыть ×{count}",
+                    callback_data=f"lootbox_open_{box_item}_{count}"
+                )
+                for count in LOOTBOX_OPEN_COUNTS
+            ])
+
     return InlineKeyboardMarkup(inline_keyboard=keyboard)
 
 
@@ -60,11 +93,19 @@ async def get_inventory_data(user_id: int) -> dict:
     """Получить данные инвентаря пользователя"""
     try:
         client = await get_supabase_client()
-        user_data = await client.execute_query(
-            table="users",
-            operation="select",
-            filters={"user_id": user_id},
-            single=True
+        user_data, items = await asyncio.gather(
+            client.execute_query(
+                table="users",
+                operation="select",
+                filters={"user_id": user_id},
+                single=True
+            ),
+            client.execute_query(
+                table="user_items",
+                operation="select",
+                columns=["item", "quantity"],
+                filters={"user_id": user_id, "quantity": {"gt": 0}}
+            )
         )
 
         if not user_data:
@@ -73,7 +114,7 @@ async def get_inventory_data(user_id: int) -> dict:
         # Здесь добавьте получение данных из других таблиц
         # (animals, resources, items и т.д.)
 
-        return {
+        data = {
             "ryabucks": user_data.get('ryabucks', 0),
             "rbtc": user_data.get('rbtc', 0),
             "storage_used": 0,  # TODO: рассчитать реально
@@ -162,6 +203,14 @@ async def get_inventory_data(user_id: int) -> dict:
             "keys": user_data.get('golden_keys', 0)
         }
 
+        # Коробки, допуски, семена и ресурсы из user_items
+        for row in items or []:
+            field = ITEM_FIELDS.get(row["item"], row["item"])
+            if field in data:
+                data[field] = (data[field] or 0) + row["quantity"]
+
+        return data
+
     except Exception as e:
         logger.error(f"Ошибка получения инвентаря: {e}")
         return {}
@@ -208,7 +257,7 @@ async def inventory_handler(message: Message):
     await show_inventory_menu(message, section="wallet")
 
 
-@router.callback_query(F.data.startswith("inventory_"))
+@indexed_callback(prefix="inventory_")
 async def inventory_section_handler(callback: CallbackQuery):
     """Переключение между разделами рюкзака"""
     try:
@@ -228,3 +277,50 @@ async def inventory_section_handler(callback: CallbackQuery):
     except Exception as e:
         logger.error(f"Ошибка переключения раздела: {e}")
         await callback.answer("Ошибка", show_alert=True)
+
+
+def format_lootbox_rewards(rewards: dict) -> str:
+    """Список наград открытия в стиле рюкзака"""
+    if not rewards:
+        return LOOTBOX_EMPTY_REWARD
+    lines = [f"├{LOOTBOX_REWARD_NAMES.get(reward, reward)}: {amount}" for reward, amount in rewards.items()]
+    lines[-1] = "└" + lines[-1][1:]
+    return "\n".join(lines)
+
+
+@indexed_callback(prefix="lootbox_open_")
+async def lootbox_open_handler(callback: CallbackQuery):
+    """Открыть коробки одного вида (×1 или ×10) - один запрос к БД"""
+    try:
+        box_item, count = callback.data.replace("lootbox_open_", "").rsplit("_", 1)
+        user_id = callback.from_user.id
+
+        if box_item not in LOOT_TABLES:
+            await callback.answer("Ошибка", show_alert=True)
+            return
+
+        # id нажатия - ключ идемпотентности: повтор апдейта не откроет коробки дважды
+        result = await lootbox_service.open_boxes(user_id, box_item, int(count), open_id=callback.id)
+        if result["status"] == "not_enough_boxes":
+            await callback.answer(LOOTBOX_NOT_ENOUGH.format(available=result["available"]), show_alert=True)
+            return
+        if result["status"] != "ok":
+            await callback.answer(ERROR_GENERAL, show_alert=True)
+            return
+
+        text = LOOTBOX_OPENED.format(count=count, rewards=format_lootbox_rewards(result["rewards"]))
+        if result["rbtc_capped"]:
+            text += f"\n{LOOTBOX_POOL_CAPPED}\n"
+
+        data = await get_inventory_data(user_id)
+        text += await get_inventory_text("boxes", data)
+
+        await callback.message.edit_text(
+            text,
+            reply_markup=get_inventory_keyboard("boxes")
+        )
+        await callback.answer()
+
+    except Exception as e:
+        logger.error(f"Ошибка открытия коробок: {e}")
+        await callback.answer("Ошибка", show_alert=True)
@@ -4,16 +4,21 @@ Handler меню лидерборда
 """
 
 import logging
-from aiogram import Router, F
+from aiogram import Router
 from aiogram.types import Message, CallbackQuery, InlineKeyboardMarkup, InlineKeyboardButton
 
 from config.texts import *
+from config.i18n import t, language_of
+from interfaces.telegram_bot.keyboards.registry import keyboard_registry
+from interfaces.telegram_bot.render import message_renderer
+from interfaces.telegram_bot.handlers.dispatch import indexed_callback
 
 router = Router()
 logger = logging.getLogger(__name__)
 
 
-def get_leaderboard_keyboard():
+@keyboard_registry.static("leaderboard")
+def get_leaderboard_keyboard(lang: str = "ru") -> InlineKeyboardMarkup:
     """Клавиатура лидерборда - ТОЧНЫЕ НАЗВАНИЯ"""
     keyboard = [
         [InlineKeyboardButton(text=BTN_LEADERS_FARM, callback_data="leaders_farm"),
@@ -49,12 +54,13 @@ async def get_leaderboard_data() -> dict:
 async def show_leaderboard_menu(message: Message):
     """Показать меню лидерборда"""
     try:
+        lang = language_of(message.from_user.id)
         leaders_data = await get_leaderboard_data()
-        leaders_text = LEADERBOARD_MENU.format(**leaders_data)
+        leaders_text = t("LEADERBOARD_MENU", lang, **leaders_data)
 
         await message.answer(
             leaders_text,
-            reply_markup=get_leaderboard_keyboard()
+            reply_markup=get_leaderboard_keyboard(lang)
         )
 
     except Exception as e:
@@ -64,11 +70,12 @@ async def show_leaderboard_menu(message: Message):
 
 # === ОБРАБОТЧИКИ РЕЙТИНГОВ ===
 
-@router.callback_query(F.data.startswith("leaders_"))
+@indexed_callback(prefix="leaders_")
 async def handle_leaderboard(callback: CallbackQuery):
     """Обработка рейтингов"""
     try:
         category = callback.data.split("_")[1]
+        lang = language_of(callback.from_user.id)
 
         category_names = {
             "farm": "🏡 ТОП 50 ФЕРМЕРОВ",
@@ -84,11 +91,10 @@ async def handle_leaderboard(callback: CallbackQuery):
 
         category_name = category_names.get(category, "ТОП 50")
 
-        await callback.message.edit_text(
-            f"{category_name}\n\n{SECTION_UNDER_DEVELOPMENT}",
-            reply_markup=InlineKeyboardMarkup(inline_keyboard=[
-                [InlineKeyboardButton(text=BTN_BACK, callback_data="back_to_leaderboard")]
-            ])
+        await message_renderer.edit_text(
+            callback.message,
+            f"{category_name}\n\n{t('SECTION_UNDER_DEVELOPMENT', lang)}",
+            reply_markup=keyboard_registry.back("back_to_leaderboard", lang)
         )
 
         await callback.answer()
@@ -98,16 +104,18 @@ async def handle_leaderboard(callback: CallbackQuery):
         await callback.answer("Ошибка", show_alert=True)
 
 
-@router.callback_query(F.data == "back_to_leaderboard")
+@indexed_callback("back_to_leaderboard")
 async def back_to_leaderboard(callback: CallbackQuery):
     """Возврат в меню лидерборда"""
     try:
+        lang = language_of(callback.from_user.id)
         leaders_data = await get_leaderboard_data()
-        leaders_text = LEADERBOARD_MENU.format(**leaders_data)
+        leaders_text = t("LEADERBOARD_MENU", lang, **leaders_data)
 
-        await callback.message.edit_text(
+        await message_renderer.edit_text(
+            callback.message,
             leaders_text,
-            reply_markup=get_leaderboard_keyboard()
+            reply_markup=get_leaderboard_keyboard(lang)
         )
 
         await callback.answer()
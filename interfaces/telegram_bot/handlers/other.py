@@ -4,22 +4,27 @@ Handler меню прочего
 """
 
 import logging
-from aiogram import Router, F
+from aiogram import Router
 from aiogram.types import Message, CallbackQuery, InlineKeyboardMarkup, InlineKeyboardButton
 
 from config.texts import *
+from config.i18n import t, language_of
+from interfaces.telegram_bot.keyboards.registry import keyboard_registry
+from interfaces.telegram_bot.render import message_renderer
+from interfaces.telegram_bot.handlers.dispatch import indexed_callback
 
 router = Router()
 logger = logging.getLogger(__name__)
 
 
-def get_other_keyboard():
+@keyboard_registry.static("other")
+def get_other_keyboard(lang: str = "ru") -> InlineKeyboardMarkup:
     """Клавиатура прочего - ТОЧНЫЕ НАЗВАНИЯ"""
     keyboard = [
-        [InlineKeyboardButton(text=BTN_OTHER_CHAT, url="https://t.me/ryabot_island"),
-         InlineKeyboardButton(text=BTN_OTHER_WIKI, url="https://telegra.ph/Ostrov-YABOT-Wiki-10-05")],
-        [InlineKeyboardButton(text=BTN_OTHER_HISTORY, url="https://t.me/ryabot_history"),
-         InlineKeyboardButton(text=BTN_OTHER_DESIGN, callback_data="other_design")]
+        [InlineKeyboardButton(text=t("BTN_OTHER_CHAT", lang), url="https://t.me/ryabot_island"),
+         InlineKeyboardButton(text=t("BTN_OTHER_WIKI", lang), url="https://telegra.ph/Ostrov-YABOT-Wiki-10-05")],
+        [InlineKeyboardButton(text=t("BTN_OTHER_HISTORY", lang), url="https://t.me/ryabot_history"),
+         InlineKeyboardButton(text=t("BTN_OTHER_DESIGN", lang), callback_data="other_design")]
     ]
 
     return InlineKeyboardMarkup(inline_keyboard=keyboard)
@@ -28,9 +33,10 @@ def get_other_keyboard():
 async def show_other_menu(message: Message):
     """Показать меню прочего"""
     try:
+        lang = language_of(message.from_user.id)
         await message.answer(
-            OTHER_MENU,
-            reply_markup=get_other_keyboard()
+            t("OTHER_MENU", lang),
+            reply_markup=get_other_keyboard(lang)
         )
 
     except Exception as e:
@@ -40,15 +46,15 @@ async def show_other_menu(message: Message):
 
 # === ОБРАБОТЧИК ДИЗАЙНА ===
 
-@router.callback_query(F.data == "other_design")
+@indexed_callback("other_design")
 async def other_design(callback: CallbackQuery):
     """Дизайн игры"""
     try:
-        await callback.message.edit_text(
-            f"🎨 *ДИЗАЙН ИГРЫ*\n\n{SECTION_UNDER_DEVELOPMENT}",
-            reply_markup=InlineKeyboardMarkup(inline_keyboard=[
-                [InlineKeyboardButton(text=BTN_BACK, callback_data="back_to_other")]
-            ])
+        lang = language_of(callback.from_user.id)
+        await message_renderer.edit_text(
+            callback.message,
+            f"🎨 *ДИЗАЙН ИГРЫ*\n\n{t('SECTION_UNDER_DEVELOPMENT', lang)}",
+            reply_markup=keyboard_registry.back("back_to_other", lang)
         )
 
         await callback.answer()
@@ -58,13 +64,15 @@ async def other_design(callback: CallbackQuery):
         await callback.answer("Ошибка", show_alert=True)
 
 
-@router.callback_query(F.data == "back_to_other")
+@indexed_callback("back_to_other")
 async def back_to_other(callback: CallbackQuery):
     """Возврат в меню прочего"""
     try:
-        await callback.message.edit_text(
-            OTHER_MENU,
-            reply_markup=get_other_keyboard()
+        lang = language_of(callback.from_user.id)
+        await message_renderer.edit_text(
+            callback.message,
+            t("OTHER_MENU", lang),
+            reply_markup=get_other_keyboard(lang)
         )
 
         await callback.answer()
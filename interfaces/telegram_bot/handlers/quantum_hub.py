@@ -4,16 +4,19 @@ Quantum Hub Handler - Квантхаб
 """
 
 import logging
-from aiogram import Router, F
+from aiogram import Router
 from aiogram.types import CallbackQuery, InlineKeyboardMarkup, InlineKeyboardButton
 from adapters.database.supabase.client import get_supabase_client
 from config.texts import *
+from interfaces.telegram_bot.keyboards.registry import keyboard_registry
+from interfaces.telegram_bot.handlers.dispatch import indexed_callback
 
 router = Router()
 logger = logging.getLogger(__name__)
 
 
-def get_quantum_hub_keyboard():
+@keyboard_registry.static("quantum_hub")
+def get_quantum_hub_keyboard(lang: str = "ru") -> InlineKeyboardMarkup:
     """Клавиатура меню Квантхаба"""
     keyboard = [
         [
@@ -29,7 +32,7 @@ def get_quantum_hub_keyboard():
     return InlineKeyboardMarkup(inline_keyboard=keyboard)
 
 
-@router.callback_query(F.data == "town_quantumhub")
+@indexed_callback("town_quantumhub")
 async def show_quantum_hub_menu(callback: CallbackQuery):
     """Показать меню Квантхаба"""
     try:
@@ -62,7 +65,7 @@ async def show_quantum_hub_menu(callback: CallbackQuery):
         await callback.answer("Произошла ошибка", show_alert=True)
 
 
-@router.callback_query(F.data == "qhub_lab_equipment")
+@indexed_callback("qhub_lab_equipment")
 async def show_lab_equipment(callback: CallbackQuery):
     """Показать Лабораторное оборудование"""
     try:
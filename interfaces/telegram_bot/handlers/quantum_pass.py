@@ -1,17 +1,20 @@
 # interfaces/telegram_bot/handlers/quantum_pass.py
 import logging
-from aiogram import Router, F
+from aiogram import Router
 from aiogram.types import CallbackQuery, InlineKeyboardMarkup, InlineKeyboardButton
 from aiogram.fsm.context import FSMContext
 
 from services.quantum_pass_service import quantum_pass_service
 from interfaces.telegram_bot.states import QuantumPassState
+from interfaces.telegram_bot.keyboards.registry import keyboard_registry
+from interfaces.telegram_bot.handlers.dispatch import indexed_callback
 
 router = Router()
 logger = logging.getLogger(__name__)
 
 
-def get_quantum_pass_keyboard():
+@keyboard_registry.static("quantum_pass")
+def get_quantum_pass_keyboard(lang: str = "ru") -> InlineKeyboardMarkup:
     """Клавиатура меню Quantum Pass"""
     keyboard = [
         [
@@ -36,7 +39,7 @@ def get_quantum_pass_keyboard():
     return InlineKeyboardMarkup(inline_keyboard=keyboard)
 
 
-@router.callback_query(F.data == "quantum_pass")
+@indexed_callback("quantum_pass")
 async def show_quantum_pass_menu(callback: CallbackQuery):
     """Показать меню Quantum Pass"""
     try:
@@ -70,7 +73,7 @@ async def show_quantum_pass_menu(callback: CallbackQuery):
         await callback.answer("Произошла ошибка", show_alert=True)
 
 
-@router.callback_query(F.data.startswith("qpass_buy_"))
+@indexed_callback(prefix="qpass_buy_")
 async def buy_quantum_pass_confirm(callback: CallbackQuery, state: FSMContext):
     """Подтверждение покупки Quantum Pass"""
     try:
@@ -134,7 +137,7 @@ async def buy_quantum_pass_confirm(callback: CallbackQuery, state: FSMContext):
         await callback.answer("Произошла ошибка", show_alert=True)
 
 
-@router.callback_query(F.data.startswith("qpass_confirm_"))
+@indexed_callback(prefix="qpass_confirm_")
 async def confirm_quantum_pass_purchase(callback: CallbackQuery, state: FSMContext):
     """Выполнить покупку Quantum Pass"""
     try:
@@ -4,7 +4,7 @@ Specialist Handler - обработчики для найма и управле
 """
 
 import logging
-from aiogram import Router, F
+from aiogram import Router
 from aiogram.types import CallbackQuery, InlineKeyboardMarkup, InlineKeyboardButton
 from aiogram.utils.keyboard import InlineKeyboardBuilder
 
@@ -12,6 +12,7 @@ from services.specialist_service import SpecialistService, SPECIALIST_CONFIG
 from services.energy_service import EnergyService
 from adapters.database.supabase.repositories.user_repository import SupabaseUserRepository
 from adapters.database.supabase.client import get_supabase_client
+from interfaces.telegram_bot.handlers.dispatch import indexed_callback
 
 logger = logging.getLogger(__name__)
 router = Router(name="specialists")
@@ -38,7 +39,7 @@ async def get_energy_service() -> EnergyService:
         _energy_service = EnergyService(user_repo)
     return _energy_service
 
-@router.callback_query(F.data == "hire_specialists")
+@indexed_callback("hire_specialists")
 async def show_specialists_menu(query: CallbackQuery):
     """Показать меню найма специалистов"""
     try:
@@ -53,9 +54,9 @@ async def show_specialists_menu(query: CallbackQuery):
         # Получаем доступных специалистов
         available_specialists = await specialist_service.get_available_specialists(user_id)
 
-        # Получаем текущих специалистов
-        current_specialists = await specialist_service.get_user_specialists(user_id)
-        current_count = len([s for s in current_specialists if s["status"] != "dead"])
+        # Сводка команды (одна строка вместо списка специалистов)
+        roster = await specialist_service.get_roster_summary(user_id)
+        current_count = roster.active
 
         # Определяем максимум
         max_specialists = await specialist_service._get_max_specialists(user_id)
@@ -72,8 +73,8 @@ async def show_specialists_menu(query: CallbackQuery):
 • Рябаксы/RBTC и жидкий опыт  
 • Достаточно энергии
 
-🏥 **Раненых:** {len([s for s in current_specialists if s['status'] == 'injured'])}
-💀 **Погибших:** {len([s for s in current_specialists if s['status'] == 'dead'])}"""
+🏥 **Раненых:** {roster.count(status='injured')}
+💀 **Погибших:** {roster.count(status='dead')}"""
 
         keyboard = InlineKeyboardBuilder()
 
@@ -119,7 +120,7 @@ async def show_specialists_menu(query: CallbackQuery):
         logger.error(f"Ошибка показа меню специалистов для {query.from_user.id}: {e}")
         await query.answer("Техническая ошибка", show_alert=True)
 
-@router.callback_query(F.data.startswith("hire_spec:"))
+@indexed_callback(prefix="hire_spec:")
 async def show_specialist_details(query: CallbackQuery):
     """Показать детали специалиста перед наймом"""
     try:
@@ -178,16 +179,17 @@ async def show_specialist_details(query: CallbackQuery):
 
         keyboard = InlineKeyboardBuilder()
 
-        # Кнопки найма
+        # Кнопки найма (с версией мультипликаторов - найм по показанной цене)
+        version = specialist["multipliers_version"]
         keyboard.add(InlineKeyboardButton(
             text=f"✅ Нанять за {specialist['price_ryabucks']:,} 💵",
-            callback_data=f"confirm_hire:{specialist_type}:ryabucks"
+            callback_data=f"confirm_hire:{specialist_type}:ryabucks:{version}"
         ))
 
         if specialist.get('price_rbtc'):
             keyboard.row(InlineKeyboardButton(
                 text=f"✅ Нанять за {specialist['price_rbtc']:.2f} 💠",
-                callback_data=f"confirm_hire:{specialist_type}:rbtc"
+                callback_data=f"confirm_hire:{specialist_type}:rbtc:{version}"
             ))
 
         # Кнопка назад
@@ -200,19 +202,22 @@ async def show_specialist_details(query: CallbackQuery):
         logger.error(f"Ошибка показа деталей специалиста для {query.from_user.id}: {e}")
         await query.answer("Техническая ошибка", show_alert=True)
 
-@router.callback_query(F.data.startswith("confirm_hire:"))
+@indexed_callback(prefix="confirm_hire:")
 async def hire_specialist(query: CallbackQuery):
     """Подтвердить найм специалиста"""
     try:
         parts = query.data.split(":")
         specialist_type = parts[1]
         currency = parts[2] if len(parts) > 2 else "ryabucks"
+        version = int(parts[3]) if len(parts) > 3 and parts[3].isdigit() else None
         user_id = query.from_user.id
 
         specialist_service = await get_specialist_service()
 
         # Нанимаем специалиста
-        success, message = await specialist_service.hire_specialist(user_id, specialist_type, currency)
+        success, message = await specialist_service.hire_specialist(
+            user_id, specialist_type, currency, multipliers_version=version
+        )
 
         if success:
             # Успешный найм
@@ -228,7 +233,7 @@ async def hire_specialist(query: CallbackQuery):
         logger.error(f"Ошибка найма специалиста для {query.from_user.id}: {e}")
         await query.answer("Техническая ошибка при найме", show_alert=True)
 
-@router.callback_query(F.data == "my_specialists")
+@indexed_callback("my_specialists")
 async def show_my_specialists(query: CallbackQuery):
     """Показать список нанятых специалистов"""
     try:
@@ -315,7 +320,7 @@ async def show_my_specialists(query: CallbackQuery):
         logger.error(f"Ошибка показа специалистов для {query.from_user.id}: {e}")
         await query.answer("Техническая ошибка", show_alert=True)
 
-@router.callback_query(F.data == "hospital")
+@indexed_callback("hospital")
 async def show_hospital(query: CallbackQuery):
     """Показать госпиталь с ранеными специалистами"""
     try:
@@ -379,7 +384,7 @@ async def show_hospital(query: CallbackQuery):
         logger.error(f"Ошибка показа госпиталя для {query.from_user.id}: {e}")
         await query.answer("Техническая ошибка", show_alert=True)
 
-@router.callback_query(F.data.startswith("heal_spec:"))
+@indexed_callback(prefix="heal_spec:")
 async def heal_individual_specialist(query: CallbackQuery):
     """Вылечить конкретного специалиста"""
     try:
@@ -402,36 +407,64 @@ async def heal_individual_specialist(query: CallbackQuery):
         logger.error(f"Ошибка лечения специалиста для {query.from_user.id}: {e}")
         await query.answer("Техническая ошибка при лечении", show_alert=True)
 
+@indexed_callback("heal_all")
+async def heal_all_from_roster(query: CallbackQuery):
+    """Лечить всех из списка специалистов - через госпиталь с итоговой ценой"""
+    await show_hospital(query)
+
+@indexed_callback("heal_all_confirm")
+async def heal_all_specialists(query: CallbackQuery):
+    """Вылечить всех раненых специалистов"""
+    try:
+        user_id = query.from_user.id
+        specialist_service = await get_specialist_service()
+
+        success, message, healed = await specialist_service.heal_all(user_id)
+
+        if not success:
+            await query.answer(message, show_alert=True)
+            return
+
+        text = f"""〰️ 🏥 ГОСПИТАЛЬ 〰️
+
+{message}
+
+🩹 **Вылечены:**"""
+        for spec in healed:
+            text += f"\n• {spec['icon']} {spec['name']} {spec['hp_before']}→{spec['hp_after']}❤️ - {spec['healing_cost']}💵"
+
+        keyboard = InlineKeyboardBuilder()
+        keyboard.add(InlineKeyboardButton(text="↪️ Назад", callback_data="hire_specialists"))
+
+        await query.message.edit_text(text, reply_markup=keyboard.as_markup())
+        await query.answer()
+
+    except Exception as e:
+        logger.error(f"Ошибка массового лечения для {query.from_user.id}: {e}")
+        await query.answer("Техническая ошибка при лечении", show_alert=True)
+
 # Заглушки для функций в разработке
-@router.callback_query(F.data == "no_specialists")
+@indexed_callback("no_specialists")
 async def no_specialists_available(query: CallbackQuery):
     await query.answer("🔒 Улучшите лицензии для доступа к специалистам", show_alert=True)
 
-@router.callback_query(F.data == "academy")
+@indexed_callback("academy")
 async def academy_placeholder(query: CallbackQuery):
     await query.answer("🚧 Академия в разработке", show_alert=True)
 
-@router.callback_query(F.data == "heal_all")
-async def heal_all_placeholder(query: CallbackQuery):
-    await query.answer("🚧 Массовое лечение в разработке", show_alert=True)
-
-@router.callback_query(F.data == "heal_all_confirm")
-async def heal_all_confirm_placeholder(query: CallbackQuery):
-    await query.answer("🚧 Массовое лечение в разработке", show_alert=True)
-
-@router.callback_query(F.data == "specialist_details")
+@indexed_callback("specialist_details")
 async def specialist_details_placeholder(query: CallbackQuery):
     await query.answer("🚧 Детальная информация в разработке", show_alert=True)
 
-@router.callback_query(F.data == "assign_work")
+@indexed_callback("assign_work")
 async def assign_work_placeholder(query: CallbackQuery):
     await query.answer("🚧 Система работ в разработке", show_alert=True)
 
-@router.callback_query(F.data == "train_specialist")
+@indexed_callback("train_specialist")
 async def train_specialist_placeholder(query: CallbackQuery):
     await query.answer("🚧 Обучение в академии в разработке", show_alert=True)
 
-@router.callback_query(F.data == "form_squad")
+@indexed_callback("form_squad")
 async def form_squad_placeholder(query: CallbackQuery):
     await query.answer("🚧 Система экспедиций в разработке", show_alert=True)
 
@@ -6,7 +6,7 @@
 import logging
 from datetime import datetime
 from aiogram import Router, F
-from aiogram.types import Message, CallbackQuery, InlineKeyboardMarkup, InlineKeyboardButton, ReplyKeyboardMarkup, KeyboardButton
+from aiogram.types import Message, CallbackQuery, InlineKeyboardMarkup, InlineKeyboardButton
 from aiogram.filters import Command
 from aiogram.fsm.context import FSMContext
 from config.texts import (
@@ -27,67 +27,27 @@ from config.texts import (
     BTN_OTHER,
     BTN_SUPPORT,
     BTN_WORK,
-    BTN_LANGUAGE_RU,
-    BTN_LANGUAGE_EN,
-    ISLAND_MAIN_MENU,
-    WELCOME_TO_ISLAND,
     SECTION_UNDER_DEVELOPMENT,
 )
 from config.settings import settings
+from config.i18n import t, language_of, remember_language
 from config.game_stats import game_stats
 from core.domain.entities import TutorialStep
 from adapters.database.supabase.client import get_supabase_client
-from interfaces.telegram_bot.keyboards.main_menu import get_start_menu, get_island_menu
-from interfaces.telegram_bot.keyboards.inline_menus import get_language_keyboard, get_settings_keyboard
+from interfaces.telegram_bot.keyboards.main_menu import get_start_menu, get_island_menu, get_language_keyboard, LANGUAGE_CALLBACK
+from interfaces.telegram_bot.keyboards.inline_menus import get_settings_keyboard, get_stats_keyboard
+from interfaces.telegram_bot.render import message_renderer
 from interfaces.telegram_bot.states import TutorialState
 from services.tutorial_service import tutorial_service
+from services.economy_counters import economy_counters
 from utils.base62_helper import decode_player_id
+from interfaces.telegram_bot.handlers.dispatch import indexed_callback
 
 
 router = Router()
 logger = logging.getLogger(__name__)
 
 
-def get_language_keyboard() -> InlineKeyboardMarkup:
-    """Клавиатура выбора языка"""
-    return InlineKeyboardMarkup(inline_keyboard=[
-        [InlineKeyboardButton(text=BTN_LANGUAGE_RU, callback_data="lang_ru")],
-        [InlineKeyboardButton(text=BTN_LANGUAGE_EN, callback_data="lang_en")]
-    ])
-
-
-def get_start_menu() -> ReplyKeyboardMarkup:
-    """Стартовое меню (вне острова)"""
-    keyboard = [
-        [KeyboardButton(text=BTN_ENTER_ISLAND)],
-        [KeyboardButton(text=BTN_SETTINGS), KeyboardButton(text=BTN_SUPPORT)]
-    ]
-
-    return ReplyKeyboardMarkup(
-        keyboard=keyboard,
-        resize_keyboard=True,
-        one_time_keyboard=False,
-        input_field_placeholder="Выберите действие"
-    )
-
-
-def get_island_menu() -> ReplyKeyboardMarkup:
-    """Главное меню острова - ФИНАЛЬНЫЕ НАЗВАНИЯ (БЕЗ кнопки выхода)"""
-    keyboard = [
-        [KeyboardButton(text=BTN_FARM), KeyboardButton(text=BTN_TOWN)],
-        [KeyboardButton(text=BTN_CITIZEN), KeyboardButton(text=BTN_WORK)],
-        [KeyboardButton(text=BTN_INVENTORY), KeyboardButton(text=BTN_FRIENDS)],
-        [KeyboardButton(text=BTN_LEADERBOARD), KeyboardButton(text=BTN_OTHER)]
-    ]
-
-    return ReplyKeyboardMarkup(
-        keyboard=keyboard,
-        resize_keyboard=True,
-        is_persistent=True,
-        input_field_placeholder="Выберите раздел острова"
-    )
-
-
 # ОБРАБОТЧИК: кнопка "Настройки"
 @router.message(F.text == BTN_SETTINGS)
 async def settings_menu_message(message: Message):
@@ -128,7 +88,7 @@ async def settings_menu_message(message: Message):
 
 
 # ОБРАБОТЧИК: начало смены имени из настроек
-@router.callback_query(F.data == "settings_change_name")
+@indexed_callback("settings_change_name")
 async def change_name_start(callback: CallbackQuery, state: FSMContext):
     """Начало процесса смены имени"""
     try:
@@ -207,7 +167,7 @@ async def change_name_process(message: Message, state: FSMContext):
 
 
 # ОБРАБОТЧИК: возврат в настройки
-@router.callback_query(F.data == "back_to_settings")
+@indexed_callback("back_to_settings")
 async def back_to_settings(callback: CallbackQuery):
     """Возврат в меню настроек"""
     try:
@@ -243,72 +203,24 @@ async def back_to_settings(callback: CallbackQuery):
 
 
 # ОБРАБОТЧИК: отмена
-@router.callback_query(F.data == "settings_cancel")
+@indexed_callback("settings_cancel")
 async def settings_cancel(callback: CallbackQuery, state: FSMContext):
     """Отмена текущего действия в настройках"""
     await state.clear()
     await back_to_settings(callback)
 
 
-@router.callback_query(F.data == "settings_back")
+@indexed_callback("settings_back")
 async def settings_back_to_menu(callback: CallbackQuery):
     """Закрытие настроек"""
     await callback.message.delete()
     await callback.answer("Настройки закрыты")
 
-def get_stats_keyboard(selected: str = "rbtc") -> InlineKeyboardMarkup:
-    """Инлайн кнопки статистики - переключение эмодзи пальца"""
-    keyboard_data = {
-        "rbtc": ["👉📊💠", "📊🏡", "📊🏢", "📊💼"],
-        "farm": ["📊💠", "👉📊🏡", "📊🏢", "📊💼"],
-        "city": ["📊💠", "📊🏡", "👉📊🏢", "📊💼"],
-        "work": ["📊💠", "📊🏡", "📊🏢", "👉📊💼"]
-    }
-
-    buttons = keyboard_data.get(selected, keyboard_data["rbtc"])
-
-    keyboard = [
-        [
-            InlineKeyboardButton(text=buttons[0], callback_data="stats_rbtc"),
-            InlineKeyboardButton(text=buttons[1], callback_data="stats_farm"),
-            InlineKeyboardButton(text=buttons[2], callback_data="stats_city"),
-            InlineKeyboardButton(text=buttons[3], callback_data="stats_work")
-        ]
-    ]
-
-    return InlineKeyboardMarkup(inline_keyboard=keyboard)
-
-
-async def get_total_burned_rbtc(client) -> float:
-    """Получить общее количество сожженных RBTC"""
-    try:
-        # ✅ ИСПРАВЛЕНО: используем pool_transactions вместо bank_transactions
-        burned_transactions = await client.execute_query(
-            table="bank_transactions",
-            operation="select",
-            columns=["amount_from"],
-            filters={"currency_to": "burned"}
-        )
-
-        if not burned_transactions:
-            return 0.0
-
-        # Суммировать все сожженные RBTC
-        total_burned = sum(float(tx.get('amount_from', 0)) for tx in burned_transactions)
-        return total_burned
-
-    except Exception as e:
-        logger.error(f"Ошибка получения сожженных RBTC: {e}")
-        return 0.0
-
-
 async def get_island_stats() -> dict:
     """Получить статистику острова"""
     try:
-        client = await get_supabase_client()
-
-        # Вызвать функцию для получения сожженных RBTC
-        total_burned_rbtc = await get_total_burned_rbtc(client)
+        # Сожжённые RBTC - готовый счётчик экономики (без обхода bank_transactions)
+        total_burned_rbtc = float(await economy_counters.burned_rbtc())
 
         # Рассчитать процент
         burn_percentage = (total_burned_rbtc / 17_850_000) * 100 if total_burned_rbtc > 0 else 0.0
@@ -341,7 +253,7 @@ async def get_island_stats() -> dict:
         }
 
 
-async def format_welcome_message(stats: dict) -> str:
+async def format_welcome_message(stats: dict, lang: str = "ru") -> str:
     """Форматирование стартового сообщения"""
     uptime = stats['uptime']
 
@@ -350,7 +262,8 @@ async def format_welcome_message(stats: dict) -> str:
     else:
         uptime_text = f"{uptime['hours']}ч {uptime['minutes']}м"
 
-    return WELCOME_TO_ISLAND.format(
+    return t(
+        "WELCOME_TO_ISLAND", lang,
         uptime=uptime_text,
         total_users=stats['total_users'],
         online_users=stats['online_users'],
@@ -378,7 +291,7 @@ async def cmd_start(message: Message, state: FSMContext):
         user_data_raw = await client.execute_query(
             table="users",
             operation="select",
-            columns=["user_id", "tutorial_step", "has_island_access", "has_employer_license", "referred_by"],
+            columns=["user_id", "tutorial_step", "has_island_access", "has_employer_license", "referred_by", "language"],
             filters={"user_id": user_id},
             single=True
         )
@@ -471,7 +384,8 @@ async def cmd_start(message: Message, state: FSMContext):
 
         # Показываем стартовое меню
         stats = await game_stats.get_all_stats()
-        welcome_text = await format_welcome_message(stats)
+        lang = remember_language(user_id, user_data.get("language") if user_data else None)
+        welcome_text = await format_welcome_message(stats, lang)
 
         await message.answer(
             welcome_text,
@@ -486,12 +400,13 @@ async def cmd_start(message: Message, state: FSMContext):
 
 # === ВЫБОР ЯЗЫКА ===
 
-@router.callback_query(F.data.startswith("lang_"))
-async def select_language(callback: CallbackQuery):
+@indexed_callback(LANGUAGE_CALLBACK)
+async def select_language(callback: CallbackQuery, callback_args: dict):
     """Выбор языка"""
     try:
         user_id = callback.from_user.id
-        lang_code = callback.data.split("_")[1]
+        lang_code = callback_args["code"]
+        remember_language(user_id, lang_code)
 
         client = await get_supabase_client()
         await client.execute_query(
@@ -538,7 +453,7 @@ async def enter_island(message: Message, state: FSMContext):
         user_data = await client.execute_query(
             table="users",
             operation="select",
-            columns=["tutorial_step", "has_island_access", "has_employer_license"],
+            columns=["tutorial_step", "has_island_access", "has_employer_license", "language"],
             filters={"user_id": user_id},
             single=True
         )
@@ -563,15 +478,14 @@ async def enter_island(message: Message, state: FSMContext):
             reply_markup=get_island_menu()
         )
 
+        lang = remember_language(user_id, user_data.get("language"))
         stats = await get_island_stats()
-        menu_text = ISLAND_MAIN_MENU.format(**stats)
-
-
+        menu_text = t("ISLAND_MAIN_MENU", lang, **stats)
 
         # Отправляем инлайн меню со статистикой
         await message.answer(
             menu_text,
-            reply_markup=get_stats_keyboard("rbtc")
+            reply_markup=get_stats_keyboard("rbtc", lang)
         )
 
 
@@ -584,20 +498,22 @@ async def enter_island(message: Message, state: FSMContext):
 
 # === ОБРАБОТЧИКИ СТАТИСТИКИ ===
 
-@router.callback_query(F.data.startswith("stats_"))
+@indexed_callback(prefix="stats_")
 async def handle_stats(callback: CallbackQuery):
     """Обработка переключения статистики"""
     try:
         stats_type = callback.data.split("_")[1]
 
         # Получаем статистику
+        lang = language_of(callback.from_user.id)
         stats = await get_island_stats()
-        menu_text = ISLAND_MAIN_MENU.format(**stats)
+        menu_text = t("ISLAND_MAIN_MENU", lang, **stats)
 
         # Обновляем с новыми кнопками (палец переместился)
-        await callback.message.edit_text(
+        await message_renderer.edit_text(
+            callback.message,
             menu_text,
-            reply_markup=get_stats_keyboard(stats_type)
+            reply_markup=get_stats_keyboard(stats_type, lang)
         )
 
         await callback.answer()
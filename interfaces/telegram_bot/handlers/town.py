@@ -4,33 +4,38 @@ Handler меню города
 """
 
 import logging
-from aiogram import Router, F
+from aiogram import Router
 from aiogram.types import Message, CallbackQuery, InlineKeyboardMarkup, InlineKeyboardButton
 
 from config.texts import *
+from config.i18n import t, language_of, remember_language
+from interfaces.telegram_bot.keyboards.registry import keyboard_registry
+from interfaces.telegram_bot.render import message_renderer
 from adapters.database.supabase.client import get_supabase_client
+from interfaces.telegram_bot.handlers.dispatch import indexed_callback
 
 router = Router()
 logger = logging.getLogger(__name__)
 
 
-def get_town_keyboard():
+@keyboard_registry.static("town")
+def get_town_keyboard(lang: str = "ru") -> InlineKeyboardMarkup:
     """Клавиатура города - ТОЧНЫЕ НАЗВАНИЯ"""
     keyboard = [
-        [InlineKeyboardButton(text=BTN_TOWNHALL, callback_data="town_hall"),
-         InlineKeyboardButton(text=BTN_MARKET, callback_data="town_market")],
-        [InlineKeyboardButton(text=BTN_RYABANK, callback_data="town_ryabank"),
-         InlineKeyboardButton(text=BTN_SHOP, callback_data="town_shop")],
-        [InlineKeyboardButton(text=BTN_PAWNSHOP, callback_data="town_pawnshop"),
-         InlineKeyboardButton(text=BTN_TAVERN, callback_data="town_tavern")],
-        [InlineKeyboardButton(text=BTN_ACADEMY, callback_data="town_academy"),
-         InlineKeyboardButton(text=BTN_FORTUNE, callback_data="town_fortune")],
-        [InlineKeyboardButton(text=BTN_REALESTATE, callback_data="town_realestate"),
-         InlineKeyboardButton(text=BTN_VETCENTER, callback_data="town_vetcenter")],
-        [InlineKeyboardButton(text=BTN_CONSTRUCTION, callback_data="town_construction"),
-         InlineKeyboardButton(text=BTN_HOSPITAL, callback_data="town_hospital")],
-        [InlineKeyboardButton(text=BTN_QUANTUMHUB, callback_data="town_quantumhub"),
-         InlineKeyboardButton(text=BTN_CEMETERY, callback_data="town_cemetery")]
+        [InlineKeyboardButton(text=t("BTN_TOWNHALL", lang), callback_data="town_hall"),
+         InlineKeyboardButton(text=t("BTN_MARKET", lang), callback_data="town_market")],
+        [InlineKeyboardButton(text=t("BTN_RYABANK", lang), callback_data="town_ryabank"),
+         InlineKeyboardButton(text=t("BTN_SHOP", lang), callback_data="town_shop")],
+        [InlineKeyboardButton(text=t("BTN_PAWNSHOP", lang), callback_data="town_pawnshop"),
+         InlineKeyboardButton(text=t("BTN_TAVERN", lang), callback_data="town_tavern")],
+        [InlineKeyboardButton(text=t("BTN_ACADEMY", lang), callback_data="town_academy"),
+         InlineKeyboardButton(text=t("BTN_FORTUNE", lang), callback_data="town_fortune")],
+        [InlineKeyboardButton(text=t("BTN_REALESTATE", lang), callback_data="town_realestate"),
+         InlineKeyboardButton(text=t("BTN_VETCENTER", lang), callback_data="town_vetcenter")],
+        [InlineKeyboardButton(text=t("BTN_CONSTRUCTION", lang), callback_data="town_construction"),
+         InlineKeyboardButton(text=t("BTN_HOSPITAL", lang), callback_data="town_hospital")],
+        [InlineKeyboardButton(text=t("BTN_QUANTUMHUB", lang), callback_data="town_quantumhub"),
+         InlineKeyboardButton(text=t("BTN_CEMETERY", lang), callback_data="town_cemetery")]
     ]
 
     return InlineKeyboardMarkup(inline_keyboard=keyboard)
@@ -46,19 +51,20 @@ async def show_town_menu(message: Message):
         user_data = await client.execute_query(
             table="users",
             operation="select",
-            columns=["energy"],
+            columns=["energy", "language"],
             filters={"user_id": user_id},
             single=True
         )
 
         energy = user_data.get('energy', 0) if user_data else 0
+        lang = remember_language(user_id, user_data.get('language') if user_data else None)
 
         # Формируем текст меню
-        town_text = TOWN_MENU.format(energy=energy)
+        town_text = t("TOWN_MENU", lang, energy=energy)
 
         await message.answer(
             town_text,
-            reply_markup=get_town_keyboard()
+            reply_markup=get_town_keyboard(lang)
         )
 
     except Exception as e:
@@ -68,7 +74,7 @@ async def show_town_menu(message: Message):
 
 # === СПЕЦИАЛЬНЫЕ ОБРАБОТЧИКИ (ДО ОБЩЕГО) ===
 
-@router.callback_query(F.data == "town_academy")
+@indexed_callback("town_academy")
 async def town_academy(callback: CallbackQuery):
     """Переход в академию"""
     try:
@@ -79,28 +85,19 @@ async def town_academy(callback: CallbackQuery):
         await callback.answer("Ошибка", show_alert=True)
 
 
-@router.callback_query(F.data == "town_ryabank")
-async def town_ryabank(callback: CallbackQuery):
-    """Переход в Рябанк - обрабатывается в bank.py"""
-    # Этот хендлер НЕ нужен, т.к. bank.py уже обрабатывает "town_ryabank"
-    # Но если bank.py не перехватывает, оставляем заглушку
-    logger.info(f"town_ryabank вызван из town.py (должен обрабатываться bank.py)")
-    await callback.answer("Загрузка банка...", show_alert=False)
-
-
 # === ОБЩИЙ ОБРАБОТЧИК ЗДАНИЙ ГОРОДА ===
 
-# ДОЛЖНО БЫТЬ:
-@router.callback_query(F.data.in_([
+@indexed_callback([
     "town_market", "town_shop", "town_pawnshop",
     "town_tavern", "town_fortune", "town_realestate",
     "town_vetcenter", "town_construction", "town_hospital",
     "town_cemetery"
-]))
+])
 async def handle_town_building(callback: CallbackQuery):
     """Обработка остальных зданий города"""
     try:
         building = callback.data.split("_")[1]
+        lang = language_of(callback.from_user.id)
 
         building_names = {
             "hall": "🏛 РАТУША",
@@ -118,11 +115,10 @@ async def handle_town_building(callback: CallbackQuery):
 
         building_name = building_names.get(building, "НЕИЗВЕСТНОЕ ЗДАНИЕ")
 
-        await callback.message.edit_text(
-            f"{building_name}\n\n{SECTION_UNDER_DEVELOPMENT}",
-            reply_markup=InlineKeyboardMarkup(inline_keyboard=[
-                [InlineKeyboardButton(text=BTN_BACK, callback_data="back_to_town")]
-            ])
+        await message_renderer.edit_text(
+            callback.message,
+            f"{building_name}\n\n{t('SECTION_UNDER_DEVELOPMENT', lang)}",
+            reply_markup=keyboard_registry.back("back_to_town", lang)
         )
 
         await callback.answer()
@@ -132,7 +128,7 @@ async def handle_town_building(callback: CallbackQuery):
         await callback.answer("Ошибка", show_alert=True)
 
 
-@router.callback_query(F.data == "back_to_town")
+@indexed_callback("back_to_town")
 async def back_to_town(callback: CallbackQuery):
     """Возврат в меню города"""
     try:
@@ -143,17 +139,19 @@ async def back_to_town(callback: CallbackQuery):
         user_data = await client.execute_query(
             table="users",
             operation="select",
-            columns=["energy"],
+            columns=["energy", "language"],
             filters={"user_id": user_id},
             single=True
         )
 
         energy = user_data.get('energy', 0) if user_data else 0
-        town_text = TOWN_MENU.format(energy=energy)
+        lang = remember_language(user_id, user_data.get('language') if user_data else None)
+        town_text = t("TOWN_MENU", lang, energy=energy)
 
-        await callback.message.edit_text(
+        await message_renderer.edit_text(
+            callback.message,
             town_text,
-            reply_markup=get_town_keyboard()
+            reply_markup=get_town_keyboard(lang)
         )
 
         await callback.answer()
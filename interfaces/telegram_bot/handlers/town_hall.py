@@ -4,7 +4,7 @@ Town Hall Handler - обработчики для ратуши и лицензи
 """
 
 import logging
-from aiogram import Router, F
+from aiogram import Router
 from aiogram.types import CallbackQuery, InlineKeyboardMarkup, InlineKeyboardButton
 from aiogram.utils.keyboard import InlineKeyboardBuilder
 
@@ -13,10 +13,15 @@ from services.energy_service import EnergyService
 from adapters.database.supabase.repositories.user_repository import SupabaseUserRepository
 from adapters.database.supabase.client import get_supabase_client
 from config.texts import TOWN_HALL_TEXTS
+from interfaces.telegram_bot.callback_protocol import CallbackSpec
+from interfaces.telegram_bot.handlers.dispatch import indexed_callback
 
 logger = logging.getLogger(__name__)
 router = Router(name="town_hall")
 
+# buy_license:<тип лицензии>:<валюта>:<версия мультипликаторов>
+LICENSE_PURCHASE_CALLBACK = CallbackSpec("buy_license", "license_type", "currency", ("version", int), sep=":")
+
 # Инициализируем сервисы
 _license_service = None
 _energy_service = None
@@ -39,7 +44,7 @@ async def get_energy_service() -> EnergyService:
         _energy_service = EnergyService(user_repo)
     return _energy_service
 
-@router.callback_query(F.data == "town_hall")
+@indexed_callback("town_hall")
 async def show_town_hall(query: CallbackQuery):
     """Показать главное меню ратуши"""
     try:
@@ -91,18 +96,19 @@ async def show_town_hall(query: CallbackQuery):
 
 # ИСПРАВЛЕННАЯ версия метода show_licenses в town_hall.py
 
-@router.callback_query(F.data == "licenses")
+@indexed_callback("licenses")
 async def show_licenses(query: CallbackQuery):
     """Показать меню лицензий"""
     try:
         user_id = query.from_user.id
         license_service = await get_license_service()
 
-        # Получаем лицензии для отображения
-        licenses_data = await license_service.get_licenses_for_display(user_id)
-
-        # Получаем мультипликаторы для информации
+        # Один снимок мультипликаторов на экран; версия уходит в кнопки покупки
         multipliers = await license_service.calculate_price_multipliers()
+        version = multipliers["version"]
+
+        # Получаем лицензии для отображения
+        licenses_data = await license_service.get_licenses_for_display(user_id, multipliers)
 
         # Формируем текст
         text = f"""〰️ 📜 БЮРО ЛИЦЕНЗИЙ ℹ️ 〰️
@@ -138,7 +144,7 @@ async def show_licenses(query: CallbackQuery):
                         price = price.replace(',', '')  # ← Убираем запятые!
                         price = int(float(price))
                     ryabucks_text = f"💵 {price:,}"
-                    ryabucks_callback = f"buy_license:{license_data['type']}:ryabucks"
+                    ryabucks_callback = LICENSE_PURCHASE_CALLBACK.pack(license_type=license_data['type'], currency="ryabucks", version=version)
 
                 keyboard.add(InlineKeyboardButton(
                     text=ryabucks_text,
@@ -155,7 +161,7 @@ async def show_licenses(query: CallbackQuery):
                         rbtc_price = rbtc_price.replace(',', '')  # ← Убираем запятые!
                         rbtc_price = float(rbtc_price)
                     rbtc_text = f"💠 {rbtc_price:.2f}"
-                    rbtc_callback = f"buy_license:{license_data['type']}:rbtc"
+                    rbtc_callback = LICENSE_PURCHASE_CALLBACK.pack(license_type=license_data['type'], currency="rbtc", version=version)
                 else:
                     rbtc_text = "—"
                     rbtc_callback = "no_rbtc_price"
@@ -178,18 +184,20 @@ async def show_licenses(query: CallbackQuery):
         logger.error(f"Ошибка показа лицензий для {query.from_user.id}: {e}", exc_info=True)
         await query.answer("Техническая ошибка", show_alert=True)
 
-@router.callback_query(F.data.startswith("buy_license:"))
-async def buy_license(query: CallbackQuery):
+@indexed_callback(LICENSE_PURCHASE_CALLBACK)
+async def buy_license(query: CallbackQuery, callback_args: dict):
     """Покупка лицензии"""
     try:
-        # Парсим callback_data
-        _, license_type, currency = query.data.split(":")
+        license_type = callback_args["license_type"]
+        currency = callback_args["currency"]
         user_id = query.from_user.id
 
         license_service = await get_license_service()
 
         # Пытаемся купить лицензию
-        success, message = await license_service.upgrade_license(user_id, license_type, currency)
+        success, message = await license_service.upgrade_license(
+            user_id, license_type, currency, multipliers_version=callback_args["version"]
+        )
 
         if success:
             # Успешная покупка
@@ -205,37 +213,37 @@ async def buy_license(query: CallbackQuery):
         logger.error(f"Ошибка покупки лицензии для {query.from_user.id}: {e}")
         await query.answer("Техническая ошибка при покупке лицензии", show_alert=True)
 
-@router.callback_query(F.data == "license_maxed")
+@indexed_callback("license_maxed")
 async def license_maxed_notification(query: CallbackQuery):
     """Уведомление о максимальной лицензии"""
     await query.answer("Лицензия уже максимального уровня! 🎉", show_alert=True)
 
-@router.callback_query(F.data == "my_office")
+@indexed_callback("my_office")
 async def show_my_office(query: CallbackQuery):
     """Заглушка для личного кабинета"""
     await query.answer("🚧 Личный кабинет в разработке", show_alert=True)
 
-@router.callback_query(F.data == "tasks")
+@indexed_callback("tasks")
 async def show_tasks(query: CallbackQuery):
     """Заглушка для поручений"""
     await query.answer("🚧 Система поручений в разработке", show_alert=True)
 
-@router.callback_query(F.data == "rewards")
+@indexed_callback("rewards")
 async def show_rewards(query: CallbackQuery):
     """Заглушка для наград"""
     await query.answer("🚧 Система наград в разработке", show_alert=True)
 
-@router.callback_query(F.data == "guilds")
+@indexed_callback("guilds")
 async def show_guilds(query: CallbackQuery):
     """Заглушка для гильдий"""
     await query.answer("🚧 Система гильдий в разработке", show_alert=True)
 
-@router.callback_query(F.data == "daily_bonuses")
+@indexed_callback("daily_bonuses")
 async def show_daily_bonuses(query: CallbackQuery):
     """Заглушка для ежедневных бонусов"""
     await query.answer("🚧 Ежедневные бонусы в разработке", show_alert=True)
 
-@router.callback_query(F.data == "main_menu")
+@indexed_callback("main_menu")
 async def back_to_main_menu(query: CallbackQuery):
     """Вернуться в главное меню"""
     try:
@@ -248,12 +256,12 @@ async def back_to_main_menu(query: CallbackQuery):
         logger.error(f"Ошибка возврата в главное меню: {e}")
         await query.answer("Ошибка возврата в меню", show_alert=True)
 
-@router.callback_query(F.data == "no_rbtc_price")
+@indexed_callback("no_rbtc_price")
 async def no_rbtc_price_handler(query: CallbackQuery):
     """Обработчик для лицензий без RBTC цены"""
     await query.answer("Эту лицензию можно купить только за рябаксы", show_alert=True)
 
-@router.callback_query(F.data == "license_maxed")
+@indexed_callback("license_maxed")
 async def license_maxed_notification(query: CallbackQuery):
     """Уведомление о максимальной лицензии"""
     await query.answer("Лицензия уже максимального уровня! 🎉", show_alert=True)
@@ -6,7 +6,7 @@
 import logging
 import asyncio
 from datetime import datetime
-from aiogram import Router, F
+from aiogram import Router
 from aiogram.types import Message, CallbackQuery, InlineKeyboardMarkup, InlineKeyboardButton
 from aiogram.fsm.context import FSMContext
 
@@ -19,11 +19,14 @@ from interfaces.telegram_bot.states import TutorialState
 
 # Config
 from config.texts import *
+from interfaces.telegram_bot.keyboards.registry import keyboard_registry
 from config.game_stats import game_stats
 
 # Services
 from services.blockchain_service import blockchain_service
 from services.tutorial_service import tutorial_service
+from interfaces.telegram_bot.callback_protocol import CallbackSpec
+from interfaces.telegram_bot.handlers.dispatch import indexed_callback
 
 router = Router()
 logger = logging.getLogger(__name__)
@@ -39,21 +42,26 @@ async def get_user_use_cases():
         'update_resources': UpdateUserResourcesUseCase(user_repo)
     }
 
-def get_character_keyboard():
+# char_<номер персонажа>
+CHARACTER_CALLBACK = CallbackSpec("char", ("index", int))
+
+
+@keyboard_registry.static("characters")
+def get_character_keyboard(lang: str = "ru") -> InlineKeyboardMarkup:
     """Клавиатура выбора персонажа"""
     keyboard = []
     for i in range(1, 11, 2):  # 5 строк по 2 персонажа
         row = [
             InlineKeyboardButton(
                 text=f"{i}. {CHARACTER_NAMES[i][:15]}...",
-                callback_data=f"char_{i}"
+                callback_data=CHARACTER_CALLBACK.pack(index=i)
             )
         ]
         if i + 1 <= 10:
             row.append(
                 InlineKeyboardButton(
                     text=f"{i+1}. {CHARACTER_NAMES[i+1][:15]}...",
-                    callback_data=f"char_{i+1}"
+                    callback_data=CHARACTER_CALLBACK.pack(index=i + 1)
                 )
             )
         keyboard.append(row)
@@ -134,7 +142,7 @@ def get_tutorial_keyboard(step: str):
 
 # === СОЗДАНИЕ ПЕРСОНАЖА ===
 
-@router.callback_query(F.data == "start_character_creation")
+@indexed_callback("start_character_creation")
 async def start_character_creation(callback: CallbackQuery, state: FSMContext):
     """Начало создания персонажа"""
     try:
@@ -149,11 +157,11 @@ async def start_character_creation(callback: CallbackQuery, state: FSMContext):
         await callback.answer("Ошибка создания персонажа", show_alert=True)
 
 
-@router.callback_query(F.data.startswith("char_"))
-async def select_character(callback: CallbackQuery, state: FSMContext):
+@indexed_callback(CHARACTER_CALLBACK)
+async def select_character(callback: CallbackQuery, state: FSMContext, callback_args: dict):
     """Выбор персонажа"""
     try:
-        char_id = int(callback.data.split("_")[1])
+        char_id = callback_args["index"]
         user_id = callback.from_user.id
 
         # Обновляем персонажа в БД
@@ -254,7 +262,7 @@ async def process_display_name_in_tutorial(message: Message, state: FSMContext):
         await state.clear()
 
 
-@router.callback_query(F.data == "retry_display_name")
+@indexed_callback("retry_display_name")
 async def retry_display_name(callback: CallbackQuery, state: FSMContext):
     """Повтор ввода имени"""
     text = (
@@ -276,7 +284,7 @@ async def retry_display_name(callback: CallbackQuery, state: FSMContext):
     await callback.answer()
 
 
-@router.callback_query(F.data == "skip_display_name")
+@indexed_callback("skip_display_name")
 async def skip_display_name(callback: CallbackQuery, state: FSMContext):
     """Пропуск ввода имени"""
     try:
@@ -384,7 +392,7 @@ async def process_display_name_in_tutorial(message: Message, state: FSMContext):
 
 
 # НОВОЕ: Повтор ввода имени
-@router.callback_query(F.data == "retry_display_name")
+@indexed_callback("retry_display_name")
 async def retry_display_name(callback: CallbackQuery, state: FSMContext):
     """Повтор ввода имени"""
     text = (
@@ -407,7 +415,7 @@ async def retry_display_name(callback: CallbackQuery, state: FSMContext):
 
 
 # НОВОЕ: Пропуск ввода имени
-@router.callback_query(F.data == "skip_display_name")
+@indexed_callback("skip_display_name")
 async def skip_display_name(callback: CallbackQuery, state: FSMContext):
     """Пропуск ввода имени"""
     await state.clear()
@@ -428,7 +436,7 @@ async def skip_display_name(callback: CallbackQuery, state: FSMContext):
 
 # === ТУТОРИАЛ ===
 
-@router.callback_query(F.data == "tutorial_shipwreck")
+@indexed_callback("tutorial_shipwreck")
 async def tutorial_shipwreck(callback: CallbackQuery):
     """Кораблекрушение"""
     try:
@@ -442,7 +450,7 @@ async def tutorial_shipwreck(callback: CallbackQuery):
         logger.error(f"Ошибка туториала кораблекрушения: {e}")
         await callback.answer("Ошибка", show_alert=True)
 
-@router.callback_query(F.data == "tutorial_tavern")
+@indexed_callback("tutorial_tavern")
 async def tutorial_tavern(callback: CallbackQuery):
     """Посещение таверны"""
     try:
@@ -461,7 +469,7 @@ async def tutorial_tavern(callback: CallbackQuery):
         logger.error(f"Ошибка туториала таверны: {e}")
         await callback.answer("Ошибка", show_alert=True)
 
-@router.callback_query(F.data == "tutorial_pawnshop")
+@indexed_callback("tutorial_pawnshop")
 async def tutorial_pawnshop(callback: CallbackQuery):
     """Посещение ломбарда"""
     try:
@@ -480,7 +488,7 @@ async def tutorial_pawnshop(callback: CallbackQuery):
         await callback.answer("Ошибка", show_alert=True)
 
 
-@router.callback_query(F.data == "tutorial_sell_shard")
+@indexed_callback("tutorial_sell_shard")
 async def tutorial_sell_shard(callback: CallbackQuery):
     """Продать осколок в ломбарде"""
     try:
@@ -574,7 +582,7 @@ async def tutorial_sell_shard(callback: CallbackQuery):
 
 # Добавьте этот handler после функции tutorial_sell_shard:
 
-@router.callback_query(F.data == "tutorial_townhall")
+@indexed_callback("tutorial_townhall")
 async def tutorial_townhall(callback: CallbackQuery):
     """Переход в ратушу"""
     try:
@@ -596,7 +604,7 @@ async def tutorial_townhall(callback: CallbackQuery):
         await callback.answer("Ошибка", show_alert=True)
 
 
-@router.callback_query(F.data == "tutorial_register")
+@indexed_callback("tutorial_register")
 async def tutorial_register(callback: CallbackQuery):
     """Регистрация в ратуше - УПРОЩЕННАЯ ВЕРСИЯ"""
     try:
@@ -680,7 +688,7 @@ async def tutorial_register(callback: CallbackQuery):
         await callback.answer(f"Ошибка: {type(e).__name__}", show_alert=True)
 
 
-@router.callback_query(F.data == "tutorial_employer_license")
+@indexed_callback("tutorial_employer_license")
 async def tutorial_employer_license(callback: CallbackQuery):
     """Показать информацию о лицензии работодателя"""
     try:
@@ -695,7 +703,7 @@ async def tutorial_employer_license(callback: CallbackQuery):
         await callback.answer("Ошибка", show_alert=True)
 
 
-@router.callback_query(F.data == "tutorial_buy_employer_license")
+@indexed_callback("tutorial_buy_employer_license")
 async def tutorial_buy_employer_license(callback: CallbackQuery):
     """Купить лицензию работодателя"""
     try:
@@ -765,7 +773,7 @@ async def tutorial_buy_employer_license(callback: CallbackQuery):
 
 
 
-@router.callback_query(F.data == "tutorial_employer_license")
+@indexed_callback("tutorial_employer_license")
 async def tutorial_employer_license(callback: CallbackQuery):
     """Покупка лицензии работодателя"""
     try:
@@ -779,7 +787,7 @@ async def tutorial_employer_license(callback: CallbackQuery):
         logger.error(f"Ошибка лицензии: {e}")
         await callback.answer("Ошибка", show_alert=True)
 
-@router.callback_query(F.data == "tutorial_buy_employer_license")
+@indexed_callback("tutorial_buy_employer_license")
 async def tutorial_buy_employer_license(callback: CallbackQuery):
     """Покупка лицензии работодателя"""
     try:
@@ -829,7 +837,7 @@ async def tutorial_buy_employer_license(callback: CallbackQuery):
         logger.error(f"Ошибка покупки лицензии: {e}")
         await callback.answer("Ошибка покупки", show_alert=True)
 
-@router.callback_query(F.data == "tutorial_academy")
+@indexed_callback("tutorial_academy")
 async def tutorial_academy(callback: CallbackQuery):
     """Академия - найм рабочего"""
     try:
@@ -851,7 +859,7 @@ async def tutorial_academy(callback: CallbackQuery):
         logger.error(f"Ошибка академии: {e}")
         await callback.answer("Ошибка", show_alert=True)
 
-@router.callback_query(F.data == "tutorial_hire_worker")
+@indexed_callback("tutorial_hire_worker")
 async def tutorial_hire_worker(callback: CallbackQuery):
     """Найм первого рабочего"""
     try:
@@ -903,7 +911,7 @@ async def tutorial_hire_worker(callback: CallbackQuery):
         logger.error(f"Ошибка найма рабочего: {e}")
         await callback.answer("Ошибка найма", show_alert=True)
 
-@router.callback_query(F.data == "tutorial_first_work")
+@indexed_callback("tutorial_first_work")
 async def tutorial_first_work(callback: CallbackQuery):
     """Первая работа"""
     try:
@@ -917,7 +925,7 @@ async def tutorial_first_work(callback: CallbackQuery):
         logger.error(f"Ошибка первой работы: {e}")
         await callback.answer("Ошибка", show_alert=True)
 
-@router.callback_query(F.data == "tutorial_do_work")
+@indexed_callback("tutorial_do_work")
 async def tutorial_do_work(callback: CallbackQuery):
     """Выполнение первой работы"""
     try:
@@ -958,7 +966,7 @@ async def tutorial_do_work(callback: CallbackQuery):
         logger.error(f"Ошибка выполнения работы: {e}")
         await callback.answer("Ошибка работы", show_alert=True)
 
-@router.callback_query(F.data == "tutorial_citizen")
+@indexed_callback("tutorial_citizen")
 async def tutorial_citizen(callback: CallbackQuery):
     """Задание жителя"""
     try:
@@ -987,7 +995,7 @@ async def tutorial_citizen(callback: CallbackQuery):
         await callback.answer("Ошибка", show_alert=True)
 
 
-@router.callback_query(F.data == "tutorial_train")
+@indexed_callback("tutorial_train")
 async def tutorial_train_menu(callback: CallbackQuery):
     """Меню выбора специалиста для обучения"""
     try:
@@ -1006,7 +1014,7 @@ async def tutorial_train_menu(callback: CallbackQuery):
         await callback.answer("Ошибка", show_alert=True)
 
 
-@router.callback_query(F.data == "tutorial_train_farmer")
+@indexed_callback("tutorial_train_farmer")
 async def tutorial_train_farmer(callback: CallbackQuery):
     """Обучение фермера"""
     try:
@@ -1061,7 +1069,7 @@ async def tutorial_train_farmer(callback: CallbackQuery):
         await callback.answer("Ошибка обучения", show_alert=True)
 
 
-@router.callback_query(F.data == "tutorial_train_builder")
+@indexed_callback("tutorial_train_builder")
 async def tutorial_train_builder(callback: CallbackQuery):
     """Обучение строителя"""
     try:
@@ -1120,7 +1128,7 @@ async def tutorial_train_builder(callback: CallbackQuery):
 # Можно добавить остальные шаги туториала аналогично...
 # Это базовая структура, которую можно расширить
 
-@router.callback_query(F.data == "tutorial_continue")
+@indexed_callback("tutorial_continue")
 async def tutorial_continue(callback: CallbackQuery):
     """Продолжение туториала (заглушка)"""
     try:
@@ -4,49 +4,65 @@ Handler меню работ
 """
 
 import logging
-from aiogram import Router, F
+from aiogram import Router
 from aiogram.types import Message, CallbackQuery, InlineKeyboardMarkup, InlineKeyboardButton
 
 from config.texts import *
+from config.i18n import t, language_of, remember_language
+from interfaces.telegram_bot.keyboards.registry import keyboard_registry
+from interfaces.telegram_bot.render import message_renderer
 from adapters.database.supabase.client import get_supabase_client
+from services.roster_summary import roster_summaries
+from interfaces.telegram_bot.handlers.dispatch import indexed_callback
 
 router = Router()
 logger = logging.getLogger(__name__)
 
 
-def get_work_keyboard():
+@keyboard_registry.static("work")
+def get_work_keyboard(lang: str = "ru") -> InlineKeyboardMarkup:
     """Клавиатура работ - ТОЧНЫЕ НАЗВАНИЯ"""
     keyboard = [
-        [InlineKeyboardButton(text=BTN_WORK_BREACH, callback_data="work_breach"),
-         InlineKeyboardButton(text=BTN_WORK_EXPEDITION, callback_data="work_expedition")],
-        [InlineKeyboardButton(text=BTN_WORK_CITY, callback_data="work_city"),
-         InlineKeyboardButton(text=BTN_WORK_FARM, callback_data="work_farm")],
-        [InlineKeyboardButton(text=BTN_WORK_FOREST, callback_data="work_forest"),
-         InlineKeyboardButton(text=BTN_WORK_SEA, callback_data="work_sea")]
+        [InlineKeyboardButton(text=t("BTN_WORK_BREACH", lang), callback_data="work_breach"),
+         InlineKeyboardButton(text=t("BTN_WORK_EXPEDITION", lang), callback_data="work_expedition")],
+        [InlineKeyboardButton(text=t("BTN_WORK_CITY", lang), callback_data="work_city"),
+         InlineKeyboardButton(text=t("BTN_WORK_FARM", lang), callback_data="work_farm")],
+        [InlineKeyboardButton(text=t("BTN_WORK_FOREST", lang), callback_data="work_forest"),
+         InlineKeyboardButton(text=t("BTN_WORK_SEA", lang), callback_data="work_sea")]
     ]
 
     return InlineKeyboardMarkup(inline_keyboard=keyboard)
 
 
+# Тип специалиста -> поле WORK_MENU
+WORK_MENU_TOTALS = {
+    "laborer": "workers_total",
+    "builder": "builders_total",
+    "farmer": "farmers_total",
+    "forester": "foresters_total",
+    "fisherman": "fishermen_total",
+    "cook": "cooks_total",
+    "doctor": "doctors_total",
+    "scientist": "scientists_total",
+    "teacher": "teachers_total",
+    "q_soldier": "q_soldiers_total"
+}
+
+
 async def get_work_stats(user_id: int) -> dict:
     """Получить статистику работников"""
-    # TODO: Получать реальные данные из БД
-    return {
-        "workers_total": 0,
-        "builders_total": 0,
-        "farmers_total": 0,
-        "foresters_total": 0,
-        "fishermen_total": 0,
-        "cooks_total": 0,
-        "doctors_total": 0,
-        "scientists_total": 0,
-        "teachers_total": 0,
-        "q_soldiers_total": 0,
+    roster = await roster_summaries.get(user_id)
+    active_by_type = roster.active_by_type()
+
+    stats = {field: active_by_type.get(specialist_type, 0) for specialist_type, field in WORK_MENU_TOTALS.items()}
+    # TODO: Получать выполненные работы, пулы и рейтинг из БД
+    stats.update({
         "works_completed": 0,
         "anomaly_pool": 840000,
         "expedition_pool": 2730000,
         "work_rating": 0
-    }
+    })
+    return stats
 
 
 async def show_work_menu(message: Message):
@@ -59,22 +75,23 @@ async def show_work_menu(message: Message):
         user_data = await client.execute_query(
             table="users",
             operation="select",
-            columns=["energy"],
+            columns=["energy", "language"],
             filters={"user_id": user_id},
             single=True
         )
 
         energy = user_data.get('energy', 0) if user_data else 0
+        lang = remember_language(user_id, user_data.get('language') if user_data else None)
 
         work_stats = await get_work_stats(user_id)
         work_stats['energy'] = energy
 
         # Формируем текст меню
-        work_text = WORK_MENU.format(**work_stats)
+        work_text = t("WORK_MENU", lang, **work_stats)
 
         await message.answer(
             work_text,
-            reply_markup=get_work_keyboard()
+            reply_markup=get_work_keyboard(lang)
         )
 
     except Exception as e:
@@ -84,11 +101,12 @@ async def show_work_menu(message: Message):
 
 # === ОБРАБОТЧИКИ ЛОКАЦИЙ РАБОТ ===
 
-@router.callback_query(F.data.startswith("work_"))
+@indexed_callback(prefix="work_")
 async def handle_work_location(callback: CallbackQuery):
     """Обработка локаций работ"""
     try:
         location = callback.data.split("_")[1]
+        lang = language_of(callback.from_user.id)
 
         location_names = {
             "breach": "⚠️ БРЕШЬ",
@@ -101,11 +119,10 @@ async def handle_work_location(callback: CallbackQuery):
 
         location_name = location_names.get(location, "НЕИЗВЕСТНАЯ ЛОКАЦИЯ")
 
-        await callback.message.edit_text(
-            f"{location_name}\n\n{SECTION_UNDER_DEVELOPMENT}",
-            reply_markup=InlineKeyboardMarkup(inline_keyboard=[
-                [InlineKeyboardButton(text=BTN_BACK, callback_data="back_to_work")]
-            ])
+        await message_renderer.edit_text(
+            callback.message,
+            f"{location_name}\n\n{t('SECTION_UNDER_DEVELOPMENT', lang)}",
+            reply_markup=keyboard_registry.back("back_to_work", lang)
         )
 
         await callback.answer()
@@ -115,7 +132,7 @@ async def handle_work_location(callback: CallbackQuery):
         await callback.answer("Ошибка", show_alert=True)
 
 
-@router.callback_query(F.data == "back_to_work")
+@indexed_callback("back_to_work")
 async def back_to_work(callback: CallbackQuery):
     """Возврат в меню работ"""
     try:
@@ -126,21 +143,23 @@ async def back_to_work(callback: CallbackQuery):
         user_data = await client.execute_query(
             table="users",
             operation="select",
-            columns=["energy"],
+            columns=["energy", "language"],
             filters={"user_id": user_id},
             single=True
         )
 
         energy = user_data.get('energy', 0) if user_data else 0
+        lang = remember_language(user_id, user_data.get('language') if user_data else None)
 
         work_stats = await get_work_stats(user_id)
         work_stats['energy'] = energy
 
-        work_text = WORK_MENU.format(**work_stats)
+        work_text = t("WORK_MENU", lang, **work_stats)
 
-        await callback.message.edit_text(
+        await message_renderer.edit_text(
+            callback.message,
             work_text,
-            reply_markup=get_work_keyboard()
+            reply_markup=get_work_keyboard(lang)
         )
 
         await callback.answer()
@@ -3,12 +3,17 @@
 Клавиатуры для Telegram бота
 """
 
-from .main_menu import get_start_menu, get_island_menu
-from .inline_menus import get_settings_keyboard, get_language_keyboard
+from .registry import keyboard_registry, KeyboardRegistry, KeyboardTemplate
+from .main_menu import get_start_menu, get_island_menu, get_language_keyboard
+from .inline_menus import get_settings_keyboard, get_stats_keyboard
 
 __all__ = [
+    'keyboard_registry',
+    'KeyboardRegistry',
+    'KeyboardTemplate',
     'get_start_menu',
     'get_island_menu',
     'get_settings_keyboard',
-    'get_language_keyboard'
+    'get_language_keyboard',
+    'get_stats_keyboard'
 ]
@@ -9,10 +9,11 @@ from config.texts import (
     BTN_NOTIFICATIONS,
     BTN_CHANGE_CHARACTER,
 )
+from .registry import keyboard_registry
 
 
-
-def get_settings_keyboard() -> InlineKeyboardMarkup:
+@keyboard_registry.static("settings")
+def get_settings_keyboard(lang: str = "ru") -> InlineKeyboardMarkup:
     """Клавиатура настроек"""
     keyboard = [
         [InlineKeyboardButton(text="🌐 Изменить язык", callback_data="change_language")],
@@ -22,39 +23,27 @@ def get_settings_keyboard() -> InlineKeyboardMarkup:
     ]
     return InlineKeyboardMarkup(inline_keyboard=keyboard)
 
-def get_language_keyboard() -> InlineKeyboardMarkup:
-    """Клавиатура выбора языка"""
-    keyboard = [
-        [InlineKeyboardButton(text="🇷🇺 Русский", callback_data="lang_ru")],
-        [InlineKeyboardButton(text="🇬🇧 English", callback_data="lang_en")],
-        [InlineKeyboardButton(text="🔙 Назад", callback_data="settings")]
-    ]
-    return InlineKeyboardMarkup(inline_keyboard=keyboard)
 
+STATS_SECTIONS = ("rbtc", "farm", "city", "work")
+STATS_BUTTONS = {
+    "rbtc": "📊💠",
+    "farm": "📊🏡",
+    "city": "📊🏢",
+    "work": "📊💼"
+}
 
 
-def get_language_keyboard(lang: str = 'ru') -> InlineKeyboardMarkup:
-    """Выбор языка"""
-    keyboard = InlineKeyboardMarkup(inline_keyboard=[
-        [
-            InlineKeyboardButton(
-                text="🇷🇺 Русский",
-                callback_data="lang_ru"
-            ),
-            InlineKeyboardButton(
-                text="🇬🇧 English",
-                callback_data="lang_en"
-            )
-        ],
-        [
-            InlineKeyboardButton(
-                text=t('btn_back', lang),
-                callback_data="settings"
-            )
-        ]
-    ])
-
-    return keyboard
+@keyboard_registry.variants("stats", STATS_SECTIONS)
+def get_stats_keyboard(selected: str = "rbtc", lang: str = "ru") -> InlineKeyboardMarkup:
+    """Инлайн кнопки статистики - палец указывает на выбранный раздел"""
+    keyboard = [[
+        InlineKeyboardButton(
+            text=f"👉{STATS_BUTTONS[section]}" if section == selected else STATS_BUTTONS[section],
+            callback_data=f"stats_{section}"
+        )
+        for section in STATS_SECTIONS
+    ]]
+    return InlineKeyboardMarkup(inline_keyboard=keyboard)
 
 
 def get_profile_keyboard(lang: str = 'ru') -> InlineKeyboardMarkup:
@@ -5,6 +5,7 @@
 
 import logging
 from aiogram.types import ReplyKeyboardMarkup, KeyboardButton, InlineKeyboardMarkup, InlineKeyboardButton
+from interfaces.telegram_bot.callback_protocol import CallbackSpec
 from config.texts import (
     BTN_FARM,
     BTN_TOWN,
@@ -16,12 +17,16 @@ from config.texts import (
     BTN_OTHER,
     BTN_SETTINGS,
     BTN_SUPPORT,
-    BTN_ENTER_ISLAND
+    BTN_ENTER_ISLAND,
+    BTN_LANGUAGE_RU,
+    BTN_LANGUAGE_EN
 )
+from .registry import keyboard_registry
 
 logger = logging.getLogger(__name__)
 
-def get_start_menu() -> ReplyKeyboardMarkup:
+@keyboard_registry.static("start_menu")
+def get_start_menu(lang: str = "ru") -> ReplyKeyboardMarkup:
     """Стартовое меню до входа на остров"""
     keyboard = [
         [KeyboardButton(text=BTN_ENTER_ISLAND)],
@@ -30,10 +35,13 @@ def get_start_menu() -> ReplyKeyboardMarkup:
     return ReplyKeyboardMarkup(
         keyboard=keyboard,
         resize_keyboard=True,
-        one_time_keyboard=False
+        one_time_keyboard=False,
+        input_field_placeholder="Выберите действие"
     )
 
-def get_island_menu() -> ReplyKeyboardMarkup:
+
+@keyboard_registry.static("island_menu")
+def get_island_menu(lang: str = "ru") -> ReplyKeyboardMarkup:
     """Основное меню острова"""
     keyboard = [
         [KeyboardButton(text=BTN_FARM), KeyboardButton(text=BTN_TOWN)],
@@ -44,30 +52,25 @@ def get_island_menu() -> ReplyKeyboardMarkup:
     return ReplyKeyboardMarkup(
         keyboard=keyboard,
         resize_keyboard=True,
-        is_persistent=True
+        is_persistent=True,
+        input_field_placeholder="Выберите раздел острова"
     )
 
 
-def get_language_keyboard() -> InlineKeyboardMarkup:
+# lang_<код языка>
+LANGUAGE_CALLBACK = CallbackSpec("lang", "code")
+
+
+@keyboard_registry.static("language")
+def get_language_keyboard(lang: str = "ru") -> InlineKeyboardMarkup:
     """
     Inline клавиатура выбора языка (только для первого запуска)
     """
-    try:
-        keyboard = [
-            [InlineKeyboardButton(text="🇷🇺 Русский", callback_data="lang_ru")],
-            [InlineKeyboardButton(text="🇬🇧 English", callback_data="lang_en")]
-        ]
-
-        return InlineKeyboardMarkup(inline_keyboard=keyboard)
-    except Exception as e:
-        logger.error(f"Error creating language keyboard: {e}")
-        # Fallback клавиатура
-        return InlineKeyboardMarkup(
-            inline_keyboard=[
-                [InlineKeyboardButton(text="🇷🇺 Русский", callback_data="lang_ru")],
-                [InlineKeyboardButton(text="🇬🇧 English", callback_data="lang_en")]
-            ]
-        )
+    keyboard = [
+        [InlineKeyboardButton(text=BTN_LANGUAGE_RU, callback_data=LANGUAGE_CALLBACK.pack(code="ru"))],
+        [InlineKeyboardButton(text=BTN_LANGUAGE_EN, callback_data=LANGUAGE_CALLBACK.pack(code="en"))]
+    ]
+    return InlineKeyboardMarkup(inline_keyboard=keyboard)
 
 
 def get_tutorial_keyboard(step: int, lang: str = "ru") -> InlineKeyboardMarkup:
@@ -197,18 +200,6 @@ def get_expert_courses_menu(lang: str = "ru") -> InlineKeyboardMarkup:
 
 def get_back_keyboard(callback_data: str, lang: str = "ru") -> InlineKeyboardMarkup:
     """
-    Простая клавиатура с кнопкой "Назад"
+    Простая клавиатура с кнопкой "Назад" (общий экземпляр на callback_data)
     """
-    try:
-        return InlineKeyboardMarkup(
-            inline_keyboard=[
-                [InlineKeyboardButton(text=t("btn_back", lang), callback_data=callback_data)]
-            ]
-        )
-    except Exception as e:
-        logger.error(f"Error creating back keyboard: {e}")
-        return InlineKeyboardMarkup(
-            inline_keyboard=[
-                [InlineKeyboardButton(text="🔙 Назад", callback_data=callback_data)]
-            ]
-        )
\ No newline at end of file
+    return keyboard_registry.back(callback_data, lang)
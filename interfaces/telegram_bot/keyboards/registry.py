@@ -0,0 +1,226 @@
+# interfaces/telegram_bot/keyboards/registry.py
+"""
+Реестр клавиатур: статические клавиатуры строятся один раз на язык
+и раздаются общими неизменяемыми экземплярами
+"""
+
+import logging
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup, KeyboardButton, ReplyKeyboardMarkup
+from pydantic import ConfigDict
+
+from config.i18n import t, LANGUAGE_BUNDLES, DEFAULT_LANGUAGE
+
+logger = logging.getLogger(__name__)
+
+SUPPORTED_LANGUAGES = tuple(LANGUAGE_BUNDLES)
+
+Markup = Union[InlineKeyboardMarkup, ReplyKeyboardMarkup]
+
+
+# === НЕИЗМЕНЯЕМЫЕ МОДЕЛИ ===
+# aiogram объявляет кнопки и разметку изменяемыми, общие экземпляры
+# замораживаем, чтобы случайная правка в одном handler не "протекла" в другие
+
+class FrozenInlineKeyboardButton(InlineKeyboardButton):
+    model_config = ConfigDict(frozen=True)
+
+
+class FrozenInlineKeyboardMarkup(InlineKeyboardMarkup):
+    model_config = ConfigDict(frozen=True)
+
+
+class FrozenKeyboardButton(KeyboardButton):
+    model_config = ConfigDict(frozen=True)
+
+
+class FrozenReplyKeyboardMarkup(ReplyKeyboardMarkup):
+    model_config = ConfigDict(frozen=True)
+
+
+def _freeze_inline_button(button: InlineKeyboardButton) -> FrozenInlineKeyboardButton:
+    if isinstance(button, FrozenInlineKeyboardButton):
+        return button
+    return FrozenInlineKeyboardButton(**button.model_dump(exclude_none=True))
+
+
+def freeze_markup(markup: Markup) -> Markup:
+    """Превратить собранную клавиатуру в неизменяемую копию"""
+    if isinstance(markup, (FrozenInlineKeyboardMarkup, FrozenReplyKeyboardMarkup)):
+        return markup
+
+    if isinstance(markup, InlineKeyboardMarkup):
+        return FrozenInlineKeyboardMarkup(inline_keyboard=[
+            [_freeze_inline_button(button) for button in row]
+            for row in markup.inline_keyboard
+        ])
+
+    if isinstance(markup, ReplyKeyboardMarkup):
+        data = markup.model_dump(exclude_none=True, exclude={"keyboard"})
+        return FrozenReplyKeyboardMarkup(
+            keyboard=[
+                [FrozenKeyboardButton(**button.model_dump(exclude_none=True)) for button in row]
+                for row in markup.keyboard
+            ],
+            **data
+        )
+
+    raise TypeError(f"Неподдерживаемый тип клавиатуры: {type(markup).__name__}")
+
+
+def inline_row(*buttons: Tuple[str, str]) -> List[FrozenInlineKeyboardButton]:
+    """Ряд inline кнопок из пар (текст, callback_data)"""
+    return [FrozenInlineKeyboardButton(text=text, callback_data=data) for text, data in buttons]
+
+
+# === ШАБЛОНЫ ДИНАМИЧЕСКИХ КЛАВИАТУР ===
+
+class KeyboardTemplate:
+    """
+    Шаблон inline клавиатуры: статичные ряды собраны заранее,
+    при рендере пересобираются только именованные слоты
+    """
+
+    def __init__(self, rows: Sequence[Union[str, Sequence[InlineKeyboardButton]]]):
+        self._rows: List[Union[str, List[FrozenInlineKeyboardButton]]] = [
+            row if isinstance(row, str) else [_freeze_inline_button(button) for button in row]
+            for row in rows
+        ]
+        self.slots = tuple(row for row in self._rows if isinstance(row, str))
+
+    def render(self, **slots: Iterable[Sequence[InlineKeyboardButton]]) -> InlineKeyboardMarkup:
+        """Собрать клавиатуру, подставив ряды в слоты (пустой слот пропускается)"""
+        unknown = set(slots) - set(self.slots)
+        if unknown:
+            raise KeyError(f"Неизвестные слоты шаблона: {', '.join(sorted(unknown))}")
+
+        keyboard = []
+        for row in self._rows:
+            if isinstance(row, str):
+                keyboard.extend(list(slot_row) for slot_row in slots.get(row, ()))
+            else:
+                keyboard.append(row)
+
+        # Статичные ряды уже провалидированы - пропускаем повторную валидацию разметки
+        return InlineKeyboardMarkup.model_construct(inline_keyboard=keyboard)
+
+
+# === РЕЕСТР ===
+
+class KeyboardRegistry:
+    """Реестр статических клавиатур с кэшем по (имя, вариант, язык)"""
+
+    def __init__(self, languages: Sequence[str] = SUPPORTED_LANGUAGES):
+        self.languages = tuple(languages)
+        self._builders: Dict[str, Callable[..., Markup]] = {}
+        self._variants: Dict[str, Tuple[Tuple[Optional[str], ...], Optional[str]]] = {}
+        self._cache: Dict[Tuple[str, Optional[str], str], Markup] = {}
+        self._back_cache: Dict[Tuple[str, str], FrozenInlineKeyboardMarkup] = {}
+        self.stats = {"hits": 0, "builds": 0}
+
+    def register(self, name: str, builder: Callable[[str], Markup]) -> None:
+        """Зарегистрировать статическую клавиатуру: builder(lang) -> markup"""
+        self._register(name, builder, (None,), None)
+
+    def register_variants(self, name: str, variants: Sequence[str],
+                          builder: Callable[[str, str], Markup], default: Optional[str] = None) -> None:
+        """Зарегистрировать клавиатуру с конечным набором вариантов: builder(variant, lang) -> markup"""
+        if not variants:
+            raise ValueError(f"Клавиатура {name}: пустой список вариантов")
+        self._register(name, builder, tuple(variants), default or variants[0])
+
+    def _register(self, name: str, builder: Callable[..., Markup],
+                  variants: Tuple[Optional[str], ...], default: Optional[str]) -> None:
+        if name in self._builders:
+            raise ValueError(f"Клавиатура {name} уже зарегистрирована")
+        self._builders[name] = builder
+        self._variants[name] = (variants, default)
+
+    def static(self, name: str) -> Callable[[Callable[[str], Markup]], Callable[..., Markup]]:
+        """Декоратор: регистрирует builder и подменяет его чтением из кэша"""
+        def decorator(builder: Callable[[str], Markup]) -> Callable[..., Markup]:
+            self.register(name, builder)
+
+            def getter(lang: str = DEFAULT_LANGUAGE) -> Markup:
+                return self.get(name, lang=lang)
+
+            getter.__name__ = builder.__name__
+            getter.__doc__ = builder.__doc__
+            return getter
+        return decorator
+
+    def variants(self, name: str, variants: Sequence[str],
+                 default: Optional[str] = None) -> Callable[[Callable[[str, str], Markup]], Callable[..., Markup]]:
+        """Декоратор для клавиатур с вариантами: getter(variant, lang)"""
+        def decorator(builder: Callable[[str, str], Markup]) -> Callable[..., Markup]:
+            self.register_variants(name, variants, builder, default)
+
+            def getter(variant: Optional[str] = None, lang: str = DEFAULT_LANGUAGE) -> Markup:
+                return self.get(name, variant=variant, lang=lang)
+
+            getter.__name__ = builder.__name__
+            getter.__doc__ = builder.__doc__
+            return getter
+        return decorator
+
+    def get(self, name: str, variant: Optional[str] = None, lang: str = DEFAULT_LANGUAGE) -> Markup:
+        """Получить общий экземпляр клавиатуры (строится при первом обращении)"""
+        variants, default = self._variants[name]
+        if variant not in variants:
+            variant = default
+        if lang not in self.languages:
+            lang = DEFAULT_LANGUAGE
+
+        key = (name, variant, lang)
+        markup = self._cache.get(key)
+        if markup is not None:
+            self.stats["hits"] += 1
+            return markup
+
+        return self._build(key)
+
+    def _build(self, key: Tuple[str, Optional[str], str]) -> Markup:
+        name, variant, lang = key
+        builder = self._builders[name]
+        markup = builder(lang) if variant is None else builder(variant, lang)
+        markup = freeze_markup(markup)
+        self._cache[key] = markup
+        self.stats["builds"] += 1
+        return markup
+
+    def back(self, callback_data: str, lang: str = DEFAULT_LANGUAGE) -> FrozenInlineKeyboardMarkup:
+        """Клавиатура из одной кнопки "Назад" - кэшируется по callback_data"""
+        key = (callback_data, lang)
+        markup = self._back_cache.get(key)
+        if markup is None:
+            markup = FrozenInlineKeyboardMarkup(inline_keyboard=[inline_row((t("BTN_BACK", lang), callback_data))])
+            self._back_cache[key] = markup
+        return markup
+
+    def build_all(self) -> int:
+        """Построить все зарегистрированные клавиатуры для всех языков (при старте)"""
+        built = 0
+        for name, (variants, _) in self._variants.items():
+            for lang in self.languages:
+                for variant in variants:
+                    key = (name, variant, lang)
+                    if key in self._cache:
+                        continue
+                    try:
+                        self._build(key)
+                        built += 1
+                    except Exception as e:
+                        logger.error(f"Ошибка построения клавиатуры {name}/{variant}/{lang}: {e}")
+
+        logger.info(f"⌨️ Клавиатуры построены: {built} (всего в кэше {len(self._cache)})")
+        return built
+
+    def clear(self) -> None:
+        """Сбросить кэш (например, после перезагрузки текстов)"""
+        self._cache.clear()
+        self._back_cache.clear()
+
+
+# Глобальный экземпляр
+keyboard_registry = KeyboardRegistry()
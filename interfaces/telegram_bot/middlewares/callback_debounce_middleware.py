@@ -0,0 +1,189 @@
+# interfaces/telegram_bot/middlewares/callback_debounce_middleware.py
+"""
+Защита от двойного нажатия кнопок подтверждения
+
+Callback ключуется по (user_id, callback_data, message_id). Пока первое
+нажатие обрабатывается, повторные не запускают handler повторно, а
+получают тот же ответ (текст callback.answer первого нажатия). После
+завершения ключ живёт ещё короткое скользящее окно - каждое повторное
+нажатие в окне продлевает его. Число ключей ограничено.
+"""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Tuple
+
+from aiogram import BaseMiddleware
+from aiogram.client.session.middlewares.base import BaseRequestMiddleware, NextRequestMiddlewareType
+from aiogram.methods import AnswerCallbackQuery, TelegramMethod
+from aiogram.types import CallbackQuery, TelegramObject
+
+logger = logging.getLogger(__name__)
+
+# Callback, которые списывают средства или меняют состояние игрока
+DEBOUNCED_CALLBACKS = frozenset({
+    "confirm_buy_rbtc",
+    "confirm_sell_rbtc",
+    "tutorial_sell_shard",
+    "tutorial_buy_employer_license",
+    "tutorial_hire_worker",
+})
+DEBOUNCED_PREFIXES = ("confirm_hire:", "qpass_confirm_", "buy_license:", "hire_worker_")
+
+DebounceKey = Tuple[int, str, Any]
+Answer = Tuple[Optional[str], bool]
+
+
+class _InFlight:
+    """Маркер обработки нажатия и его результат"""
+
+    __slots__ = ("future", "expires_at", "answer")
+
+    def __init__(self, future: asyncio.Future):
+        self.future = future
+        # Пока handler работает, окно не истекает
+        self.expires_at = float("inf")
+        self.answer: Optional[Answer] = None
+
+
+class _AnswerRecorder(BaseRequestMiddleware):
+    """Запоминает, что handler ответил на callback (для повторных нажатий)"""
+
+    def __init__(self, debouncer: "CallbackDebounceMiddleware"):
+        self.debouncer = debouncer
+
+    async def __call__(self, make_request: NextRequestMiddlewareType, bot: Any, method: TelegramMethod) -> Any:
+        if isinstance(method, AnswerCallbackQuery):
+            entry = self.debouncer._by_callback_id.get(method.callback_query_id)
+            if entry is not None and entry.answer is None:
+                entry.answer = (method.text, bool(method.show_alert))
+        return await make_request(bot, method)
+
+
+class CallbackDebounceMiddleware(BaseMiddleware):
+    """Outer middleware для callback_query: подавление повторных нажатий"""
+
+    def __init__(
+            self,
+            window_seconds: float = 2.0,
+            wait_seconds: float = 5.0,
+            max_entries: int = 10_000,
+            callbacks: Iterable[str] = DEBOUNCED_CALLBACKS,
+            prefixes: Iterable[str] = DEBOUNCED_PREFIXES
+    ):
+        """
+        Args:
+            window_seconds: Сколько помнить завершённое нажатие (продлевается повторами)
+            wait_seconds: Сколько повторное нажатие ждёт ответа первого
+            max_entries: Максимум отслеживаемых ключей
+        """
+        super().__init__()
+        self.window_seconds = window_seconds
+        self.wait_seconds = wait_seconds
+        self.max_entries = max_entries
+        self.callbacks = frozenset(callbacks)
+        self.prefixes = tuple(prefixes)
+
+        self._entries: "OrderedDict[DebounceKey, _InFlight]" = OrderedDict()
+        self._by_callback_id: Dict[str, _InFlight] = {}
+        # Регистрируется на bot.session в main.py
+        self.answer_recorder = _AnswerRecorder(self)
+
+        self.stats = {
+            'guarded': 0,
+            'duplicates_inflight': 0,
+            'duplicates_recent': 0,
+            'evicted': 0
+        }
+
+    def _is_guarded(self, data: Optional[str]) -> bool:
+        return bool(data) and (data in self.callbacks or data.startswith(self.prefixes))
+
+    def _prune(self, now: float) -> None:
+        """Убрать истёкшие ключи и лишние сверх лимита (самые старые)"""
+        entries = self._entries
+        while entries:
+            key, entry = next(iter(entries.items()))
+            if entry.expires_at > now and len(entries) <= self.max_entries:
+                break
+            entries.popitem(last=False)
+            if entry.expires_at > now:
+                self.stats['evicted'] += 1
+
+    async def __call__(
+            self,
+            handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+            event: TelegramObject,
+            data: Dict[str, Any]
+    ) -> Any:
+        if not isinstance(event, CallbackQuery) or not self._is_guarded(event.data):
+            return await handler(event, data)
+
+        message_id = event.message.message_id if event.message else event.inline_message_id
+        key = (event.from_user.id, event.data, message_id)
+        now = time.monotonic()
+        self._prune(now)
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            return await self._answer_duplicate(event, key, entry)
+
+        self.stats['guarded'] += 1
+        entry = _InFlight(asyncio.get_running_loop().create_future())
+        self._entries[key] = entry
+        self._by_callback_id[event.id] = entry
+
+        try:
+            result = await handler(event, data)
+        except Exception:
+            # Ошибка - повтор должен выполниться заново
+            if self._entries.get(key) is entry:
+                del self._entries[key]
+            if entry.answer is None:
+                entry.answer = ("❌ Не удалось выполнить, попробуйте ещё раз", True)
+            raise
+        else:
+            entry.expires_at = time.monotonic() + self.window_seconds
+            if key in self._entries:
+                self._entries.move_to_end(key)
+            return result
+        finally:
+            self._by_callback_id.pop(event.id, None)
+            if not entry.future.done():
+                entry.future.set_result(entry.answer)
+
+    async def _answer_duplicate(self, event: CallbackQuery, key: DebounceKey, entry: _InFlight) -> None:
+        if entry.future.done():
+            self.stats['duplicates_recent'] += 1
+            # Скользящее окно: повторы продлевают его
+            entry.expires_at = time.monotonic() + self.window_seconds
+            self._entries.move_to_end(key)
+            answer = entry.answer
+        else:
+            self.stats['duplicates_inflight'] += 1
+            try:
+                answer = await asyncio.wait_for(asyncio.shield(entry.future), timeout=self.wait_seconds)
+            except asyncio.TimeoutError:
+                answer = ("⏳ Запрос уже обрабатывается...", False)
+
+        logger.debug(f"Повторное нажатие {event.data} от {event.from_user.id} подавлено")
+
+        text, show_alert = answer or ("✅ Уже выполнено", False)
+        try:
+            await event.answer(text, show_alert=show_alert)
+        except Exception as e:
+            logger.error(f"Ошибка ответа на повторное нажатие: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Получить статистику подавления повторов"""
+        return {
+            **self.stats,
+            'tracked_keys': len(self._entries),
+            'in_flight': len(self._by_callback_id)
+        }
+
+
+# Глобальный экземпляр
+callback_debouncer = CallbackDebounceMiddleware()
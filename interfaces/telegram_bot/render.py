@@ -0,0 +1,189 @@
+# interfaces/telegram_bot/render.py
+"""
+Слой рендера сообщений: пропускает редактирования, которые не меняют сообщение
+
+Для каждого (chat_id, message_id) запоминается отпечаток последнего
+отправленного контента и то, как сообщение выглядело после правки.
+Если новое содержимое совпадает, а сообщение с тех пор не меняли
+в обход рендера, запрос к Bot API не отправляется. Быстрые повторные
+правки одного сообщения схлопываются: пока одна правка в полёте,
+сохраняется только последняя, и она отправляется следующей.
+"""
+
+import logging
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from aiogram.exceptions import TelegramBadRequest
+from aiogram.types import InlineKeyboardMarkup, Message
+
+from interfaces.telegram_bot.keyboards.registry import FrozenInlineKeyboardMarkup
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_MESSAGES = 20_000
+
+MessageKey = Tuple[int, int]
+
+
+def markup_signature(markup: Optional[InlineKeyboardMarkup]) -> tuple:
+    """Компактная подпись inline клавиатуры (текст и действие каждой кнопки)"""
+    if markup is None:
+        return ()
+    return tuple(
+        tuple((button.text, button.callback_data, button.url) for button in row)
+        for row in markup.inline_keyboard
+    )
+
+
+def is_not_modified_error(error: Exception) -> bool:
+    return isinstance(error, TelegramBadRequest) and "message is not modified" in str(error).lower()
+
+
+class _RenderedState:
+    """Что было отправлено в сообщение и как оно выглядит после правки"""
+
+    __slots__ = ("fingerprint", "text", "markup")
+
+    def __init__(self, fingerprint: int, text: Optional[str], markup: tuple):
+        self.fingerprint = fingerprint
+        self.text = text
+        self.markup = markup
+
+
+class MessageRenderer:
+    """Редактирование сообщений с подавлением пустых правок"""
+
+    def __init__(self, max_messages: int = DEFAULT_MAX_MESSAGES):
+        self.max_messages = max_messages
+        self._states: "OrderedDict[MessageKey, _RenderedState]" = OrderedDict()
+        # key -> последняя отложенная правка (None - правка в полёте, очереди нет)
+        self._inflight: Dict[MessageKey, Optional[tuple]] = {}
+        # Подписи общих клавиатур из реестра - они живут всё время работы бота
+        self._frozen_signatures: Dict[int, tuple] = {}
+
+        self.stats = {
+            'edits_requested': 0,
+            'edits_sent': 0,
+            'edits_suppressed': 0,
+            'edits_collapsed': 0,
+            'not_modified_errors': 0
+        }
+
+    def _signature(self, markup: Optional[InlineKeyboardMarkup]) -> tuple:
+        if isinstance(markup, FrozenInlineKeyboardMarkup):
+            signature = self._frozen_signatures.get(id(markup))
+            if signature is None:
+                signature = markup_signature(markup)
+                self._frozen_signatures[id(markup)] = signature
+            return signature
+        return markup_signature(markup)
+
+    def _is_current(self, key: MessageKey, fingerprint: int, message: Message) -> bool:
+        """Совпадает ли запрошенный контент с тем, что сейчас в сообщении"""
+        state = self._states.get(key)
+        if state is None or state.fingerprint != fingerprint:
+            return False
+
+        # Сообщение могли изменить в обход рендера - сверяем с его текущим видом
+        if state.text is not None and message.text is not None and message.text != state.text:
+            return False
+        if self._signature(message.reply_markup) != state.markup:
+            return False
+
+        self._states.move_to_end(key)
+        return True
+
+    def _remember(self, key: MessageKey, fingerprint: int, signature: tuple, result: Any) -> None:
+        text = result.text if isinstance(result, Message) else None
+        self._states[key] = _RenderedState(fingerprint, text, signature)
+        self._states.move_to_end(key)
+        if len(self._states) > self.max_messages:
+            self._states.popitem(last=False)
+
+    async def edit_text(self, message: Message, text: str,
+                        reply_markup: Optional[InlineKeyboardMarkup] = None, **kwargs: Any) -> bool:
+        """
+        Отредактировать текст сообщения.
+        Возвращает False, если правка была подавлена как пустая.
+        """
+        self.stats['edits_requested'] += 1
+
+        key = (message.chat.id, message.message_id)
+        signature = self._signature(reply_markup)
+        try:
+            fingerprint = hash((text, signature, tuple(sorted(kwargs.items()))))
+        except TypeError:
+            # Нехэшируемые параметры (entities и т.п.) - отправляем без учёта
+            self.stats['edits_sent'] += 1
+            self._states.pop(key, None)
+            await message.edit_text(text, reply_markup=reply_markup, **kwargs)
+            return True
+
+        if self._is_current(key, fingerprint, message):
+            self.stats['edits_suppressed'] += 1
+            return False
+
+        if key in self._inflight:
+            # Правка этого сообщения уже отправляется - оставляем только последнюю
+            if self._inflight[key] is not None:
+                self.stats['edits_collapsed'] += 1
+            self._inflight[key] = (text, reply_markup, kwargs, signature, fingerprint)
+            return True
+
+        self._inflight[key] = None
+        pending = (text, reply_markup, kwargs, signature, fingerprint)
+        sent = False
+        first = True
+        try:
+            while pending is not None:
+                sent = await self._send(message, key, *pending, skip_duplicate=not first) or sent
+                first = False
+                pending = self._inflight.get(key)
+                self._inflight[key] = None
+        finally:
+            self._inflight.pop(key, None)
+
+        return sent
+
+    async def _send(self, message: Message, key: MessageKey, text: str,
+                    reply_markup: Optional[InlineKeyboardMarkup], kwargs: Dict[str, Any],
+                    signature: tuple, fingerprint: int, skip_duplicate: bool = False) -> bool:
+        state = self._states.get(key)
+        if skip_duplicate and state is not None and state.fingerprint == fingerprint:
+            # Отложенная правка совпала с только что отправленной
+            self.stats['edits_suppressed'] += 1
+            return False
+
+        try:
+            result = await message.edit_text(text, reply_markup=reply_markup, **kwargs)
+        except TelegramBadRequest as e:
+            if not is_not_modified_error(e):
+                self._states.pop(key, None)
+                raise
+            self.stats['not_modified_errors'] += 1
+            self.stats['edits_suppressed'] += 1
+            # Сообщение уже в нужном виде - запоминаем его текущий текст
+            self._remember(key, fingerprint, signature, message)
+            return False
+
+        self.stats['edits_sent'] += 1
+        self._remember(key, fingerprint, signature, result)
+        return True
+
+    def forget(self, chat_id: int, message_id: int) -> None:
+        """Забыть сообщение (например, после удаления)"""
+        self._states.pop((chat_id, message_id), None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Получить статистику рендера"""
+        requested = self.stats['edits_requested']
+        return {
+            **self.stats,
+            'tracked_messages': len(self._states),
+            'suppressed_ratio': round(self.stats['edits_suppressed'] / requested, 4) if requested else 0.0
+        }
+
+
+# Глобальный экземпляр
+message_renderer = MessageRenderer()
@@ -29,6 +29,7 @@ from interfaces.telegram_bot.handlers import setup_handlers
 from interfaces.telegram_bot.middlewares import setup_middlewares
 from interfaces.telegram_bot.middlewares.energy_middleware import EnergyMiddleware
 from interfaces.telegram_bot.middlewares.user_activity_middleware import UserActivityMiddleware
+from interfaces.telegram_bot.middlewares.callback_debounce_middleware import callback_debouncer
 from adapters.database.supabase.client import get_supabase_client, close_supabase_client
 
 
@@ -77,9 +78,22 @@ async def initialize_app():
         await setup_handlers(dp)
         logger.info("✅ Handlers зарегистрированы")
 
+        # Проверка каталога текстов (плейсхолдеры переводов должны совпадать)
+        from config.i18n import catalog
+        catalog.validate()
+
+        # Статические клавиатуры строим один раз (handlers уже зарегистрировали builders)
+        from interfaces.telegram_bot.keyboards.registry import keyboard_registry
+        keyboard_registry.build_all()
+
         # ✅ РЕГИСТРАЦИЯ MIDDLEWARE ДЛЯ АКТИВНОСТИ
         logger.info("🔧 Регистрация middleware...")
 
+        # Повторные нажатия кнопок подтверждения отсекаются до любых запросов к БД
+        dp.callback_query.outer_middleware(callback_debouncer)
+        bot.session.middleware(callback_debouncer.answer_recorder)
+        logger.info("✅ CallbackDebounceMiddleware зарегистрирован")
+
         # Middleware для отслеживания активности (ПЕРВЫМ!)
         dp.message.middleware(UserActivityMiddleware(throttle_seconds=600))
         dp.callback_query.middleware(UserActivityMiddleware(throttle_seconds=600))
@@ -102,6 +116,26 @@ async def initialize_app():
         from services.bank_service import bank_service
         logger.info("✅ Bank service инициализирован")
 
+        # Свечи курса: последние из БД и периодическое сохранение
+        from services.price_history import price_history
+        await price_history.start()
+        logger.info("✅ История курса загружена")
+
+        # Журнал операций: досылка оставшегося с прошлого запуска и фоновая отправка
+        from services.ledger_writer import ledger_writer
+        await ledger_writer.start()
+        logger.info("✅ Журнал операций запущен")
+
+        # Таймеры специалистов: загрузка незавершённых задач и тики колеса
+        from services.job_scheduler import job_scheduler
+        await job_scheduler.start()
+        logger.info("✅ Таймеры специалистов запущены")
+
+        # Пассивный доход специалистов на работе
+        from services.income_settlement import income_settlement
+        await income_settlement.start()
+        logger.info("✅ Начисление дохода специалистов запущено")
+
 
         logger.info("🎉 Инициализация завершена успешно!")
 
@@ -117,6 +151,20 @@ async def shutdown_app():
     logger.info("🛑 Остановка Ryabot Island Bot...")
 
     try:
+        # Останавливаем тики таймеров (задачи остаются в specialist_jobs)
+        from services.job_scheduler import job_scheduler
+        await job_scheduler.stop()
+        from services.income_settlement import income_settlement
+        await income_settlement.stop()
+
+        # Сохраняем несохранённые свечи курса до закрытия БД
+        from services.price_history import price_history
+        await price_history.stop()
+
+        # Досылаем журнал операций до закрытия БД
+        from services.ledger_writer import ledger_writer
+        await ledger_writer.stop()
+
         # Закрываем соединение с БД
         await close_supabase_client()
         logger.info("✅ Соединение с Supabase закрыто")
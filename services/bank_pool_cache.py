@@ -0,0 +1,116 @@
+# services/bank_pool_cache.py
+"""
+Кэш состояния пулов игрового банка
+
+Резервы, курс и общий банк рябаксов держатся в памяти процесса.
+Сделки этого процесса обновляют их локально по ответу bank_swap
+(новые резервы и версия пула). Если в ответе версия перескочила -
+между сделками торговал другой воркер, это и есть сигнал инвалидации:
+состояние берётся из ответа. В остальных случаях кэш перечитывается
+одним запросом по истечении короткого TTL или после invalidate().
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from config.global_pools import calculate_current_rate
+from core.domain.money import Money
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL_SECONDS = 3.0
+
+PoolLoader = Callable[[], Awaitable[Dict[str, Any]]]
+
+
+class BankPoolCache:
+    """Состояние пулов банка с TTL и локальным применением сделок"""
+
+    def __init__(self, ttl_seconds: float = DEFAULT_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self._state: Optional[Dict[str, Any]] = None
+        self._version: Optional[int] = None
+        self._expires_at = 0.0
+        self._refresh: Optional[asyncio.Future] = None
+
+        self.stats = {
+            'hits': 0,
+            'refreshes': 0,
+            'local_applies': 0,
+            'external_changes': 0,
+            'invalidations': 0
+        }
+
+    async def get(self, loader: PoolLoader) -> Dict[str, Any]:
+        """Текущее состояние пулов (копия); при устаревании - перечитать через loader"""
+        if self._state is not None and time.monotonic() < self._expires_at:
+            self.stats['hits'] += 1
+            return dict(self._state)
+
+        # Одна перезагрузка на всех ожидающих
+        if self._refresh is None:
+            self._refresh = asyncio.ensure_future(self._load(loader))
+        refresh = self._refresh
+        try:
+            return dict(await asyncio.shield(refresh))
+        finally:
+            if self._refresh is refresh and refresh.done():
+                self._refresh = None
+
+    async def _load(self, loader: PoolLoader) -> Dict[str, Any]:
+        state = await loader()
+        self.stats['refreshes'] += 1
+        self._set_state(state, state.get("version"))
+        return state
+
+    def _set_state(self, state: Dict[str, Any], version: Optional[int]) -> None:
+        self._state = state
+        self._version = version
+        self._expires_at = time.monotonic() + self.ttl_seconds
+
+    def apply_reserves(self, rbtc_pool: Money, ryabucks_pool: Money, version: Optional[int]) -> None:
+        """Применить резервы из ответа bank_swap (новее кэша - только по версии)"""
+        if self._state is None:
+            return
+        if version is not None and self._version is not None:
+            if version <= self._version:
+                return
+            if version > self._version + 1:
+                # Между нашими сделками торговал другой воркер
+                self.stats['external_changes'] += 1
+
+        state = dict(self._state)
+        state["rbtc_pool"] = rbtc_pool
+        state["ryabucks_pool"] = ryabucks_pool
+        state["current_rate"] = calculate_current_rate(rbtc_pool, ryabucks_pool)
+        state["version"] = version
+        self.stats['local_applies'] += 1
+        self._set_state(state, version)
+
+    def adjust_total_bank(self, delta_ryabucks: int) -> None:
+        """Учесть изменение общего банка рябаксов (покупка за Stars)"""
+        if self._state is None:
+            return
+        state = dict(self._state)
+        state["total_bank_ryabucks"] = Money.of(state.get("total_bank_ryabucks", 0)) + delta_ryabucks
+        self._state = state
+        self.stats['local_applies'] += 1
+
+    def invalidate(self) -> None:
+        """Сбросить кэш - следующее чтение пойдёт в БД"""
+        self._expires_at = 0.0
+        self.stats['invalidations'] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        reads = self.stats['hits'] + self.stats['refreshes']
+        return {
+            **self.stats,
+            'version': self._version,
+            'hit_ratio': round(self.stats['hits'] / reads, 4) if reads else 0.0
+        }
+
+
+# Глобальный экземпляр
+bank_pool_cache = BankPoolCache()
@@ -0,0 +1,202 @@
+# services/bank_quotes.py
+"""
+Котировки обмена в банке
+
+Котировка считается по состоянию пулов из bank_pool_cache (без запросов
+к БД): сколько отдаёт и получает игрок, цена исполнения, влияние сделки
+на курс и граница проскальзывания. Котировка подписана HMAC и имеет срок
+действия - её можно хранить в FSM и исполнять при подтверждении без
+пересчёта, подделка или просрочка обнаруживаются при проверке.
+Подписанный quote_id уходит в bank_swap: повторное исполнение той же
+котировки отклоняется уникальным индексом (015_bank_quote_once.sql).
+"""
+
+import hashlib
+import hmac
+import logging
+import time
+import uuid
+from dataclasses import dataclass, asdict, replace
+from decimal import Decimal, ROUND_CEILING, ROUND_FLOOR
+from typing import Any, Dict, Optional
+
+from config.global_pools import (
+    calculate_buy_rbtc_cost, calculate_sell_rbtc_reward, TRANSACTION_LIMITS
+)
+from config.settings import settings
+from core.domain.money import Money
+from services.swap_engine import SIDE_BUY, SIDE_SELL
+
+logger = logging.getLogger(__name__)
+
+
+class QuoteError(ValueError):
+    """Котировка недействительна (status - причина)"""
+
+    def __init__(self, status: str, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+@dataclass(frozen=True)
+class BankQuote:
+    """Подписанная котировка обмена RBTC <-> рябаксы"""
+    user_id: int
+    side: str
+    rbtc_amount: Money
+    ryabucks_amount: int          # стоимость покупки / выручка продажи
+    ryabucks_limit: int           # граница проскальзывания для исполнения
+    price: Decimal                # средняя цена исполнения
+    spot_rate: Decimal            # курс пула до сделки
+    price_impact: Decimal         # отклонение цены исполнения от курса пула
+    pool_version: Optional[int]
+    expires_at: int
+    quote_id: str
+    signature: str = ""
+
+    def payload(self) -> str:
+        """Каноническая строка для подписи"""
+        return "|".join((
+            str(self.user_id), self.side, str(self.rbtc_amount),
+            str(self.ryabucks_amount), str(self.ryabucks_limit),
+            str(self.price), str(self.pool_version), str(self.expires_at),
+            self.quote_id
+        ))
+
+    @property
+    def expired(self) -> bool:
+        return time.time() >= self.expires_at
+
+    def to_state(self) -> Dict[str, Any]:
+        """Сериализация для FSM (только str/int)"""
+        data = asdict(self)
+        for key in ("rbtc_amount", "price", "spot_rate", "price_impact"):
+            data[key] = str(data[key])
+        return data
+
+    @classmethod
+    def from_state(cls, data: Dict[str, Any]) -> "BankQuote":
+        try:
+            return cls(
+                user_id=int(data["user_id"]),
+                side=data["side"],
+                rbtc_amount=Money.of(data["rbtc_amount"]),
+                ryabucks_amount=int(data["ryabucks_amount"]),
+                ryabucks_limit=int(data["ryabucks_limit"]),
+                price=Decimal(data["price"]),
+                spot_rate=Decimal(data["spot_rate"]),
+                price_impact=Decimal(data["price_impact"]),
+                pool_version=data.get("pool_version"),
+                expires_at=int(data["expires_at"]),
+                quote_id=str(data["quote_id"]),
+                signature=data.get("signature", "")
+            )
+        except (KeyError, TypeError, ValueError, ArithmeticError) as e:
+            raise QuoteError("invalid", f"Повреждённая котировка: {e}")
+
+
+class QuoteSigner:
+    """HMAC-SHA256 подпись котировок"""
+
+    def __init__(self, secret: str):
+        self._key = hashlib.sha256(secret.encode()).digest()
+
+    def sign(self, quote: BankQuote) -> str:
+        return hmac.new(self._key, quote.payload().encode(), hashlib.sha256).hexdigest()
+
+    def verify(self, quote: BankQuote) -> bool:
+        return hmac.compare_digest(self.sign(quote), quote.signature)
+
+
+class BankQuoteService:
+    """Расчёт и проверка котировок по кэшированному состоянию пулов"""
+
+    def __init__(self, signer: QuoteSigner, ttl_seconds: int):
+        self.signer = signer
+        self.ttl_seconds = ttl_seconds
+        self.stats = {
+            'issued': 0,
+            'rejected_expired': 0,
+            'rejected_signature': 0,
+            'rejected_moved': 0
+        }
+
+    @staticmethod
+    def price(side: str, rbtc_amount: Money, pools: Dict[str, Any]) -> int:
+        """Рябаксы за rbtc_amount по текущим резервам"""
+        if side == SIDE_BUY:
+            return calculate_buy_rbtc_cost(rbtc_amount, pools["rbtc_pool"], pools["ryabucks_pool"])
+        if side == SIDE_SELL:
+            return calculate_sell_rbtc_reward(rbtc_amount, pools["rbtc_pool"], pools["ryabucks_pool"])
+        raise ValueError(f"Неизвестная сторона сделки: {side}")
+
+    def quote(self, user_id: int, side: str, rbtc_amount, pools: Dict[str, Any],
+              max_slippage: Decimal = TRANSACTION_LIMITS["max_slippage"]) -> BankQuote:
+        """Котировка по состоянию пулов (ValueError при нехватке ликвидности)"""
+        rbtc_amount = Money.of(rbtc_amount)
+        ryabucks = self.price(side, rbtc_amount, pools)
+
+        amount = rbtc_amount.to_decimal()
+        price = Decimal(ryabucks) / amount
+        spot = pools["current_rate"]
+        impact = abs(price - spot) / spot if spot else Decimal("0")
+
+        if side == SIDE_BUY:
+            limit = int((ryabucks * (1 + max_slippage)).to_integral_value(rounding=ROUND_FLOOR))
+        else:
+            limit = int((ryabucks * (1 - max_slippage)).to_integral_value(rounding=ROUND_CEILING))
+
+        quote = BankQuote(
+            user_id=user_id,
+            side=side,
+            rbtc_amount=rbtc_amount,
+            ryabucks_amount=ryabucks,
+            ryabucks_limit=limit,
+            price=price.quantize(Decimal("0.0001")),
+            spot_rate=spot.quantize(Decimal("0.0001")),
+            price_impact=impact.quantize(Decimal("0.000001")),
+            pool_version=pools.get("version"),
+            expires_at=int(time.time()) + self.ttl_seconds,
+            quote_id=uuid.uuid4().hex
+        )
+        self.stats['issued'] += 1
+        return replace(quote, signature=self.signer.sign(quote))
+
+    def validate(self, quote: BankQuote, user_id: int, pools: Dict[str, Any]) -> int:
+        """
+        Проверить котировку перед исполнением и вернуть текущую цену.
+        Без обращения к БД: подпись, владелец, срок и сдвиг резервов в кэше
+        сверх допустимого проскальзывания - сразу QuoteError.
+        """
+        if quote.user_id != user_id or not self.signer.verify(quote):
+            self.stats['rejected_signature'] += 1
+            raise QuoteError("invalid", "Котировка недействительна. Запросите новую.")
+
+        if quote.expired:
+            self.stats['rejected_expired'] += 1
+            raise QuoteError("expired", "Котировка устарела. Запросите новую.")
+
+        try:
+            current = self.price(quote.side, quote.rbtc_amount, pools)
+        except (ValueError, ZeroDivisionError):
+            self.stats['rejected_moved'] += 1
+            raise QuoteError("insufficient_liquidity", "В пуле недостаточно RBTC")
+
+        moved = current > quote.ryabucks_limit if quote.side == SIDE_BUY else current < quote.ryabucks_limit
+        if moved:
+            self.stats['rejected_moved'] += 1
+            raise QuoteError(
+                "slippage",
+                f"Курс изменился: сейчас {current:,} рябаксов. Повторите сделку по новому курсу."
+            )
+        return current
+
+    def get_stats(self) -> Dict[str, Any]:
+        return dict(self.stats)
+
+
+# Глобальный экземпляр
+bank_quotes = BankQuoteService(
+    QuoteSigner(settings.BANK_QUOTE_SECRET or settings.BOT_TOKEN),
+    ttl_seconds=settings.BANK_QUOTE_TTL_SECONDS
+)
@@ -6,12 +6,20 @@ Bank Service с правильной структурой пулов
 import logging
 from decimal import Decimal
 from typing import Tuple, Optional, Dict
-from datetime import datetime, timezone
 
 from adapters.database.supabase.client import get_supabase_client
+from core.domain.money import Money
+from services.user_lanes import user_lanes
+from services.bank_pool_cache import bank_pool_cache
+from services.swap_engine import swap_engine, SwapResult, SIDE_BUY, SIDE_SELL
+from services.batch_auction import BatchAuction
+from services.bank_quotes import bank_quotes, BankQuote, QuoteError
+from services.price_history import price_history
+from services.ledger_writer import ledger_writer
+from config.settings import settings
 from config.global_pools import (
     BANK_POOLS, calculate_current_rate, calculate_stars_to_ryabucks,
-    calculate_buy_rbtc_cost, calculate_sell_rbtc_reward,
+    calculate_buy_rbtc_cost,
     TRANSACTION_LIMITS, RBTC_EQUIVALENT, STARS_PACKAGES
 )
 
@@ -20,6 +28,7 @@ logger = logging.getLogger(__name__)
 class BankService:
     def __init__(self):
         self.client = None
+        self.batch_auction = BatchAuction(self._load_bank_pools, window_ms=settings.BANK_BATCH_WINDOW_MS)
 
     async def _ensure_client(self):
         """Supabase клиент"""
@@ -28,93 +37,11 @@ class BankService:
 
     async def get_bank_pools(self) -> Dict:
         """
-        ИСПРАВЛЕНО: Работа с раздельными пулами game_bank_rbtc и game_bank_ryabucks
+        Состояние пулов банка: game_bank_rbtc, game_bank_ryabucks и общий банк.
+        Берётся из bank_pool_cache - БД читается не чаще TTL кэша.
         """
         try:
-            await self._ensure_client()
-
-            # Получаем RBTC пул
-            rbtc_pool_data = await self.client.execute_query(
-                table="global_pools",
-                operation="select",
-                columns=["rbtc_amount"],
-                filters={"pool_name": "game_bank_rbtc"},
-                single=True
-            )
-
-            if rbtc_pool_data and rbtc_pool_data.get("rbtc_amount"):
-                rbtc_pool = Decimal(str(rbtc_pool_data["rbtc_amount"]))
-            else:
-                rbtc_pool = BANK_POOLS["rbtc_pool"]
-                logger.warning(f"RBTC пул не найден, используем дефолт: {rbtc_pool}")
-
-            # Получаем рябаксов пул для обмена
-            ryabucks_pool_data = await self.client.execute_query(
-                table="global_pools",
-                operation="select",
-                columns=["ryabucks_amount"],
-                filters={"pool_name": "game_bank_ryabucks"},
-                single=True
-            )
-
-            if ryabucks_pool_data and ryabucks_pool_data.get("ryabucks_amount"):
-                ryabucks_pool = Decimal(str(ryabucks_pool_data["ryabucks_amount"]))
-            else:
-                ryabucks_pool = BANK_POOLS["ryabucks_pool"]
-                logger.warning(f"Рябаксов пул не найден, используем дефолт: {ryabucks_pool}")
-
-            # Получаем ОБЩИЙ банк рябаксов (вся экономика)
-            total_bank_data = await self.client.execute_query(
-                table="global_pools",
-                operation="select",
-                columns=["ryabucks_amount"],
-                filters={"pool_name": "total_bank_ryabucks"},
-                single=True
-            )
-
-            if total_bank_data and total_bank_data.get("ryabucks_amount"):
-                total_bank_ryabucks = Decimal(str(total_bank_data["ryabucks_amount"]))
-            else:
-                # Если нет записи - считаем сумму всех пулов КРОМЕ game_bank_ryabucks
-                all_pools = await self.client.execute_query(
-                    table="global_pools",
-                    operation="select",
-                    columns=["pool_name", "ryabucks_amount"]
-                )
-
-                total_bank_ryabucks = Decimal("0")
-                if all_pools:
-                    for pool in all_pools:
-                        pool_name = pool.get("pool_name", "")
-                        # Считаем все пулы КРОМЕ пула обмена
-                        if pool_name != "game_bank_ryabucks":
-                            amount = pool.get("ryabucks_amount", 0)
-                            if amount:
-                                total_bank_ryabucks += Decimal(str(amount))
-
-                logger.info(f"total_bank_ryabucks рассчитан как сумма: {total_bank_ryabucks}")
-
-            # Проверяем что пулы не нулевые
-            if rbtc_pool <= 0:
-                rbtc_pool = Decimal("1050000")
-                logger.error("RBTC пул = 0! Используем дефолт")
-
-            if ryabucks_pool <= 0:
-                ryabucks_pool = Decimal("105000000")
-                logger.error("Рябаксов пул = 0! Используем дефолт")
-
-            # Рассчитываем курс по формуле x*y=k
-            current_rate = calculate_current_rate(rbtc_pool, ryabucks_pool)
-
-            logger.info(f"✅ Пулы: RBTC={rbtc_pool}, Обмен_рябаксы={ryabucks_pool}, Общий_банк={total_bank_ryabucks}, Курс={current_rate:.2f}")
-
-            return {
-                "rbtc_pool": rbtc_pool,
-                "ryabucks_pool": ryabucks_pool,
-                "current_rate": current_rate,
-                "total_invested_golden_eggs": 0,
-                "total_bank_ryabucks": total_bank_ryabucks
-            }
+            return await bank_pool_cache.get(self._load_bank_pools)
 
         except Exception as e:
             logger.error(f"Ошибка получения пулов банка: {e}", exc_info=True)
@@ -123,9 +50,72 @@ class BankService:
                 "ryabucks_pool": BANK_POOLS["ryabucks_pool"],
                 "current_rate": Decimal("100"),
                 "total_invested_golden_eggs": 0,
-                "total_bank_ryabucks": BANK_POOLS["ryabucks_pool"]
+                "total_bank_ryabucks": BANK_POOLS["ryabucks_pool"],
+                "version": None
             }
 
+    async def _load_bank_pools(self) -> Dict:
+        """Прочитать все пулы одним запросом"""
+        await self._ensure_client()
+
+        pools = await self.client.execute_query(
+            table="global_pools",
+            operation="select",
+            columns=["pool_name", "rbtc_amount", "ryabucks_amount", "version"]
+        )
+        by_name = {pool.get("pool_name"): pool for pool in pools or []}
+
+        rbtc_pool_data = by_name.get("game_bank_rbtc")
+        if rbtc_pool_data and rbtc_pool_data.get("rbtc_amount"):
+            rbtc_pool = Money.of(rbtc_pool_data["rbtc_amount"])
+        else:
+            rbtc_pool = BANK_POOLS["rbtc_pool"]
+            logger.warning(f"RBTC пул не найден, используем дефолт: {rbtc_pool}")
+
+        ryabucks_pool_data = by_name.get("game_bank_ryabucks")
+        if ryabucks_pool_data and ryabucks_pool_data.get("ryabucks_amount"):
+            ryabucks_pool = Money.of(ryabucks_pool_data["ryabucks_amount"])
+        else:
+            ryabucks_pool = BANK_POOLS["ryabucks_pool"]
+            logger.warning(f"Рябаксов пул не найден, используем дефолт: {ryabucks_pool}")
+
+        # ОБЩИЙ банк рябаксов (вся экономика)
+        total_bank_data = by_name.get("total_bank_ryabucks")
+        if total_bank_data and total_bank_data.get("ryabucks_amount"):
+            total_bank_ryabucks = Money.of(total_bank_data["ryabucks_amount"])
+        else:
+            # Если нет записи - считаем сумму всех пулов КРОМЕ game_bank_ryabucks
+            total_bank_ryabucks = sum(
+                (Money.of(pool["ryabucks_amount"])
+                 for name, pool in by_name.items()
+                 if name != "game_bank_ryabucks" and pool.get("ryabucks_amount")),
+                Money()
+            )
+            logger.info(f"total_bank_ryabucks рассчитан как сумма: {total_bank_ryabucks}")
+
+        # Проверяем что пулы не нулевые
+        if rbtc_pool <= 0:
+            rbtc_pool = BANK_POOLS["rbtc_pool"]
+            logger.error("RBTC пул = 0! Используем дефолт")
+
+        if ryabucks_pool <= 0:
+            ryabucks_pool = BANK_POOLS["ryabucks_pool"]
+            logger.error("Рябаксов пул = 0! Используем дефолт")
+
+        # Рассчитываем курс по формуле x*y=k
+        current_rate = calculate_current_rate(rbtc_pool, ryabucks_pool)
+
+        logger.info(f"✅ Пулы: RBTC={rbtc_pool}, Обмен_рябаксы={ryabucks_pool}, Общий_банк={total_bank_ryabucks}, Курс={current_rate:.2f}")
+
+        return {
+            "rbtc_pool": rbtc_pool,
+            "ryabucks_pool": ryabucks_pool,
+            "current_rate": current_rate,
+            "total_invested_golden_eggs": 0,
+            "total_bank_ryabucks": total_bank_ryabucks,
+            "version": (rbtc_pool_data or {}).get("version")
+        }
+
     async def calculate_max_buyable_rbtc(self, user_ryabucks: int) -> Tuple[Decimal, int]:
         """Рассчитать максимум RBTC который можно купить"""
         pools = await self.get_bank_pools()
@@ -137,7 +127,7 @@ class BankService:
             current_rate = Decimal("100")
 
         max_by_money = Decimal(user_ryabucks) / current_rate
-        max_by_pool = rbtc_pool * Decimal("0.99")
+        max_by_pool = (rbtc_pool * Decimal("0.99")).to_decimal()
         max_buyable = min(max_by_money, max_by_pool)
 
         try:
@@ -148,204 +138,138 @@ class BankService:
 
         return max_buyable, min(cost, user_ryabucks)
 
-    async def buy_rbtc(self, user_id: int, amount: Decimal) -> Tuple[bool, str]:
-        """Покупка RBTC за рябаксы"""
+    @user_lanes.serialized
+    async def buy_rbtc(self, user_id: int, amount: Decimal, quoted_cost: Optional[int] = None) -> Tuple[bool, str]:
+        """
+        Покупка RBTC за рябаксы - одна атомарная сделка (bank_swap)
+        quoted_cost - стоимость, которую видел игрок; сделка не пройдёт,
+        если курс ушёл хуже допустимого проскальзывания
+        """
         try:
-            await self._ensure_client()
-
             if amount <= TRANSACTION_LIMITS["min_rbtc_trade"]:
                 return False, f"Минимум {TRANSACTION_LIMITS['min_rbtc_trade']} RBTC"
 
-            user = await self.client.execute_query(
-                table="users",
-                operation="select",
-                columns=["ryabucks", "rbtc"],
-                filters={"user_id": user_id},
-                single=True
-            )
-
-            if not user:
-                return False, "Пользователь не найден"
-
-            user_ryabucks = user.get("ryabucks", 0)
-
-            pools = await self.get_bank_pools()
-            rbtc_pool = pools["rbtc_pool"]
-            ryabucks_pool = pools["ryabucks_pool"]
-
-            if rbtc_pool <= 0 or ryabucks_pool <= 0:
-                return False, "Ошибка пулов банка. Обратитесь к администратору."
-
-            if amount >= rbtc_pool:
-                return False, f"В пуле недостаточно RBTC. Максимум: {float(rbtc_pool * Decimal('0.99')):.4f}"
-
-            try:
-                cost = calculate_buy_rbtc_cost(amount, rbtc_pool, ryabucks_pool)
-            except (ValueError, ZeroDivisionError) as e:
-                logger.error(f"Ошибка расчета стоимости покупки RBTC: {e}")
-                return False, "Ошибка расчета стоимости."
-
-            if user_ryabucks < cost:
-                return False, f"Недостаточно рябаксов. Нужно: {cost:,}, есть: {user_ryabucks:,}"
-
-            # Обновляем баланс пользователя
-            new_user_ryabucks = user_ryabucks - cost
-            new_user_rbtc = float(user.get("rbtc", 0)) + float(amount)
-
-            await self.client.execute_query(
-                table="users",
-                operation="update",
-                data={
-                    "ryabucks": new_user_ryabucks,
-                    "rbtc": new_user_rbtc
-                },
-                filters={"user_id": user_id}
-            )
-
-            # Обновляем RBTC пул
-            new_rbtc_pool = rbtc_pool - amount
-            await self.client.execute_query(
-                table="global_pools",
-                operation="update",
-                data={
-                    "rbtc_amount": float(new_rbtc_pool),
-                    "updated_at": datetime.now(timezone.utc).isoformat()
-                },
-                filters={"pool_name": "game_bank_rbtc"}
-            )
-
-            # Обновляем рябаксов пул
-            new_ryabucks_pool = ryabucks_pool + cost
-            await self.client.execute_query(
-                table="global_pools",
-                operation="update",
-                data={
-                    "ryabucks_amount": int(new_ryabucks_pool),
-                    "updated_at": datetime.now(timezone.utc).isoformat()
-                },
-                filters={"pool_name": "game_bank_ryabucks"}
-            )
-
-            # Логируем транзакцию
-            new_rate = calculate_current_rate(new_rbtc_pool, new_ryabucks_pool)
+            limit = None
+            if quoted_cost:
+                limit = int(quoted_cost * (1 + TRANSACTION_LIMITS["max_slippage"]))
 
-            await self.client.execute_query(
-                table="pool_transactions",
-                operation="insert",
-                data={
-                    "pool_name": "game_bank_rbtc",
-                    "transaction_type": "buy_rbtc",
-                    "rbtc_amount": float(amount),
-                    "ryabucks_amount": cost,
-                    "user_id": user_id,
-                    "description": f"Куплено {float(amount):.4f} RBTC по курсу {float(new_rate):.2f}"
-                }
-            )
+            result = await self._swap(user_id, SIDE_BUY, amount, limit)
+            if not result.success:
+                return False, self._swap_error_message(result)
 
-            return True, f"✅ Куплено {float(amount):.4f} RBTC за {cost:,} рябаксов\n💱 Новый курс: 1 RBTC = {float(new_rate):.2f} рябаксов"
+            return True, self._swap_success_message(result)
 
         except Exception as e:
             logger.error(f"Ошибка покупки RBTC для user {user_id}: {e}", exc_info=True)
             return False, f"Ошибка: {str(e)}"
 
-    async def sell_rbtc(self, user_id: int, amount: Decimal) -> Tuple[bool, str]:
-        """Продажа RBTC за рябаксы"""
+    @user_lanes.serialized
+    async def sell_rbtc(self, user_id: int, amount: Decimal, quoted_reward: Optional[int] = None) -> Tuple[bool, str]:
+        """
+        Продажа RBTC за рябаксы - одна атомарная сделка (bank_swap)
+        quoted_reward - выручка, которую видел игрок (защита от проскальзывания)
+        """
         try:
-            await self._ensure_client()
-
             if amount <= TRANSACTION_LIMITS["min_rbtc_trade"]:
                 return False, f"Минимум {TRANSACTION_LIMITS['min_rbtc_trade']} RBTC"
 
-            user = await self.client.execute_query(
-                table="users",
-                operation="select",
-                columns=["ryabucks", "rbtc"],
-                filters={"user_id": user_id},
-                single=True
-            )
+            limit = None
+            if quoted_reward:
+                limit = int(quoted_reward * (1 - TRANSACTION_LIMITS["max_slippage"]))
 
-            if not user:
-                return False, "Пользователь не найден"
-
-            user_rbtc = Decimal(str(user.get("rbtc", 0)))
-
-            if user_rbtc < amount:
-                return False, f"Недостаточно RBTC. Нужно: {float(amount):.4f}, есть: {float(user_rbtc):.4f}"
-
-            pools = await self.get_bank_pools()
-            rbtc_pool = pools["rbtc_pool"]
-            ryabucks_pool = pools["ryabucks_pool"]
-
-            if rbtc_pool <= 0 or ryabucks_pool <= 0:
-                return False, "Ошибка пулов банка"
-
-            try:
-                reward = calculate_sell_rbtc_reward(amount, rbtc_pool, ryabucks_pool)
-            except (ValueError, ZeroDivisionError) as e:
-                logger.error(f"Ошибка расчета продажи RBTC: {e}")
-                return False, "Ошибка расчета"
-
-            if reward > ryabucks_pool:
-                return False, "В пуле недостаточно рябаксов"
-
-            new_user_ryabucks = user.get("ryabucks", 0) + reward
-            new_user_rbtc = float(user_rbtc - amount)
-
-            await self.client.execute_query(
-                table="users",
-                operation="update",
-                data={
-                    "ryabucks": new_user_ryabucks,
-                    "rbtc": new_user_rbtc
-                },
-                filters={"user_id": user_id}
-            )
+            result = await self._swap(user_id, SIDE_SELL, amount, limit)
+            if not result.success:
+                return False, self._swap_error_message(result)
 
-            # Обновляем RBTC пул
-            new_rbtc_pool = rbtc_pool + amount
-            await self.client.execute_query(
-                table="global_pools",
-                operation="update",
-                data={
-                    "rbtc_amount": float(new_rbtc_pool),
-                    "updated_at": datetime.now(timezone.utc).isoformat()
-                },
-                filters={"pool_name": "game_bank_rbtc"}
-            )
+            return True, self._swap_success_message(result)
 
-            # Обновляем рябаксов пул
-            new_ryabucks_pool = ryabucks_pool - reward
-            await self.client.execute_query(
-                table="global_pools",
-                operation="update",
-                data={
-                    "ryabucks_amount": int(new_ryabucks_pool),
-                    "updated_at": datetime.now(timezone.utc).isoformat()
-                },
-                filters={"pool_name": "game_bank_ryabucks"}
-            )
+        except Exception as e:
+            logger.error(f"Ошибка продажи RBTC для user {user_id}: {e}", exc_info=True)
+            return False, f"Ошибка: {str(e)}"
 
-            new_rate = calculate_current_rate(new_rbtc_pool, new_ryabucks_pool)
+    async def quote_trade(self, user_id: int, side: str, amount: Decimal) -> BankQuote:
+        """
+        Подписанная котировка по кэшу пулов - без запросов к БД
+        QuoteError при слишком малой сумме, ValueError при нехватке ликвидности
+        """
+        if amount <= TRANSACTION_LIMITS["min_rbtc_trade"]:
+            raise QuoteError("invalid_amount", f"Минимум {TRANSACTION_LIMITS['min_rbtc_trade']} RBTC")
+        pools = await self.get_bank_pools()
+        return bank_quotes.quote(user_id, side, amount, pools)
 
-            await self.client.execute_query(
-                table="pool_transactions",
-                operation="insert",
-                data={
-                    "pool_name": "game_bank_rbtc",
-                    "transaction_type": "sell_rbtc",
-                    "rbtc_amount": float(amount),
-                    "ryabucks_amount": reward,
-                    "user_id": user_id,
-                    "description": f"Продано {float(amount):.4f} RBTC по курсу {float(new_rate):.2f}"
-                }
-            )
+    @user_lanes.serialized
+    async def execute_quote(self, user_id: int, quote: BankQuote) -> Tuple[bool, str]:
+        """
+        Исполнить котировку: проверка подписи, срока и сдвига резервов по кэшу
+        (отказ без запроса к БД), затем сделка с лимитом из котировки
+        """
+        try:
+            bank_quotes.validate(quote, user_id, await self.get_bank_pools())
+        except QuoteError as e:
+            return False, str(e)
 
-            return True, f"✅ Продано {float(amount):.4f} RBTC за {reward:,} рябаксов\n💱 Новый курс: 1 RBTC = {float(new_rate):.2f} рябаксов"
+        try:
+            result = await self._swap(user_id, quote.side, quote.rbtc_amount.to_decimal(), quote.ryabucks_limit,
+                                      quote.quote_id)
+            if not result.success:
+                return False, self._swap_error_message(result)
+            return True, self._swap_success_message(result)
 
         except Exception as e:
-            logger.error(f"Ошибка продажи RBTC для user {user_id}: {e}", exc_info=True)
+            logger.error(f"Ошибка исполнения котировки для user {user_id}: {e}", exc_info=True)
             return False, f"Ошибка: {str(e)}"
 
+    async def _swap(self, user_id: int, side: str, amount: Decimal, limit: Optional[int],
+                    quote_id: Optional[str] = None) -> SwapResult:
+        """Сделка с пулом: отдельным bank_swap или в пакете аукциона"""
+        if settings.BANK_BATCH_AUCTION_ENABLED:
+            result = await self.batch_auction.submit(user_id, side, amount, ryabucks_limit=limit, quote_id=quote_id)
+        else:
+            result = await swap_engine.swap(user_id, side, amount, ryabucks_limit=limit, quote_id=quote_id)
+
+        if result.success:
+            # RBTC у игроков учтён в той же транзакции сделки (bank_swap / bank_batch_swap)
+            price_history.record_trade(result.price, result.rbtc_amount, result.ryabucks_amount)
+        return result
+
+    @staticmethod
+    def _swap_success_message(result: SwapResult) -> str:
+        action = "Куплено" if result.side == SIDE_BUY else "Продано"
+        return (
+            f"✅ {action} {float(result.rbtc_amount):.4f} RBTC за {result.ryabucks_amount:,} рябаксов\n"
+            f"💵 Цена исполнения: 1 RBTC = {float(result.price):.2f} рябаксов\n"
+            f"💱 Новый курс: 1 RBTC = {float(result.rate_after):.2f} рябаксов"
+        )
+
+    @staticmethod
+    def _swap_error_message(result: SwapResult) -> str:
+        """Текст отказа по статусу bank_swap"""
+        if result.status == "user_not_found":
+            return "Пользователь не найден"
+        if result.status == "insufficient_funds":
+            if result.user_ryabucks is None and result.user_rbtc is None:
+                # Отказ из пакета аукциона - баланс не возвращается
+                if result.side == SIDE_BUY:
+                    return f"Недостаточно рябаксов. Нужно: {result.ryabucks_amount:,}"
+                return f"Недостаточно RBTC. Нужно: {float(result.rbtc_amount):.4f}"
+            if result.side == SIDE_BUY:
+                return f"Недостаточно рябаксов. Нужно: {result.ryabucks_amount:,}, есть: {result.user_ryabucks or 0:,}"
+            return f"Недостаточно RBTC. Нужно: {float(result.rbtc_amount):.4f}, есть: {float(result.user_rbtc or 0):.4f}"
+        if result.status == "insufficient_liquidity":
+            if result.side == SIDE_BUY and result.rbtc_pool:
+                return f"В пуле недостаточно RBTC. Максимум: {float(result.rbtc_pool * Decimal('0.99')):.4f}"
+            return "В пуле недостаточно рябаксов"
+        if result.status == "slippage":
+            return f"Курс изменился: сейчас {result.ryabucks_amount:,} рябаксов. Повторите сделку по новому курсу."
+        if result.status == "conflict":
+            return "Банк сейчас перегружен сделками. Попробуйте ещё раз."
+        if result.status == "duplicate":
+            return "Эта котировка уже исполнена. Запросите новую."
+        if result.status == "pool_unavailable":
+            return "Ошибка пулов банка. Обратитесь к администратору."
+        return "Ошибка обмена. Попробуйте позже."
+
+    @user_lanes.serialized
     async def buy_ryabucks_with_stars(self, user_id: int, stars: int) -> Tuple[bool, str, int]:
         """Покупка рябаксов за Telegram Stars"""
         try:
@@ -388,41 +312,21 @@ class BankService:
                 filters={"user_id": user_id}
             )
 
-            # Обновляем total_bank_ryabucks (добавляем новые рябаксы в экономику)
-            total_bank_data = await self.client.execute_query(
-                table="global_pools",
-                operation="select",
-                columns=["ryabucks_amount"],
-                filters={"pool_name": "total_bank_ryabucks"},
-                single=True
-            )
-
-            if total_bank_data:
-                current_total = Decimal(str(total_bank_data.get("ryabucks_amount", 0)))
-                new_total = current_total + total_ryabucks
-
-                await self.client.execute_query(
-                    table="global_pools",
-                    operation="update",
-                    data={
-                        "ryabucks_amount": int(new_total),
-                        "updated_at": datetime.now(timezone.utc).isoformat()
-                    },
-                    filters={"pool_name": "total_bank_ryabucks"}
-                )
-
-            await self.client.execute_query(
-                table="pool_transactions",
-                operation="insert",
-                data={
+            # Рябаксы добавлены в экономику: строка журнала и рост total_bank_ryabucks
+            # пишутся пакетом в фоне (ledger_writer), здесь только fsync журнала
+            await ledger_writer.append(
+                "pool_transactions",
+                {
                     "pool_name": "stars_purchase",
                     "transaction_type": "buy_ryabucks",
                     "rbtc_amount": 0,
                     "ryabucks_amount": total_ryabucks,
                     "user_id": user_id,
                     "description": f"Куплено {total_ryabucks:,} рябаксов за {stars} Stars"
-                }
+                },
+                counters={"total_bank_ryabucks": total_ryabucks}
             )
+            bank_pool_cache.adjust_total_bank(total_ryabucks)
 
             return True, f"Получено {total_ryabucks:,} рябаксов!", total_ryabucks
 
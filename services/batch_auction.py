@@ -0,0 +1,300 @@
+# services/batch_auction.py
+"""
+Пакетный аукцион сделок банка
+
+В режиме BANK_BATCH_AUCTION_ENABLED заявки на покупку/продажу RBTC
+собираются в окно (BANK_BATCH_WINDOW_MS) и исполняются по единой цене.
+Встречные заявки взаимозачитываются, с пулом торгуется только нетто-объём
+по кривой x*y=k (calculate_buy_rbtc_cost / calculate_sell_rbtc_reward),
+цена клиринга = стоимость нетто-объёма / нетто-объём. Все балансы и одна
+запись в каждый пул применяются функцией bank_batch_swap одной транзакцией.
+"""
+
+import asyncio
+import json
+import logging
+from dataclasses import dataclass, field
+from decimal import Decimal, ROUND_CEILING, ROUND_FLOOR
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+
+from adapters.database.supabase.client import get_supabase_client
+from core.domain.money import Money
+from config.global_pools import calculate_buy_rbtc_cost, calculate_sell_rbtc_reward
+from services.bank_pool_cache import bank_pool_cache
+from services.swap_engine import SwapResult, SIDE_BUY, SIDE_SELL
+
+logger = logging.getLogger(__name__)
+
+BATCH_FUNCTION = "bank_batch_swap"
+MAX_BATCH_SIZE = 200
+MAX_CLEARING_ATTEMPTS = 5
+
+PoolLoader = Callable[[], Awaitable[Dict[str, Any]]]
+
+
+@dataclass
+class BatchOrder:
+    """Заявка в пакете"""
+    user_id: int
+    side: str
+    rbtc_amount: Decimal
+    ryabucks_limit: Optional[int] = None
+    quote_id: Optional[str] = None
+    future: Optional[asyncio.Future] = field(default=None, repr=False)
+
+
+@dataclass
+class BatchFill:
+    order: BatchOrder
+    ryabucks_amount: int
+
+
+@dataclass
+class BatchClearing:
+    """Результат клиринга пакета"""
+    price: Decimal
+    fills: List[BatchFill]
+    rejected: Dict[int, str]          # id(order) -> статус отказа
+    rbtc_pool_delta: Decimal
+    ryabucks_pool_delta: int
+
+
+def clear_batch(orders: List[BatchOrder], rbtc_pool: Money, ryabucks_pool: Money) -> BatchClearing:
+    """
+    Единая цена для пакета заявок.
+    Покупатели платят вверх, продавцы получают вниз до целых рябаксов -
+    остаток округлений остаётся в пуле, пул получает не меньше, чем при
+    одной сделке на нетто-объём.
+    Заявки, для которых цена хуже их лимита, исключаются, цена пересчитывается.
+    """
+    active = list(orders)
+    rejected: Dict[int, str] = {}
+
+    while True:
+        bought = sum((o.rbtc_amount for o in active if o.side == SIDE_BUY), Decimal("0"))
+        sold = sum((o.rbtc_amount for o in active if o.side == SIDE_SELL), Decimal("0"))
+        net = bought - sold
+
+        if net > 0 and net >= rbtc_pool:
+            # Пул не покрывает нетто-покупку - убираем самую крупную заявку
+            largest = max((o for o in active if o.side == SIDE_BUY), key=lambda o: o.rbtc_amount)
+            rejected[id(largest)] = "insufficient_liquidity"
+            active.remove(largest)
+            continue
+
+        if net > 0:
+            price = Decimal(calculate_buy_rbtc_cost(net, rbtc_pool, ryabucks_pool)) / net
+        elif net < 0:
+            price = Decimal(calculate_sell_rbtc_reward(-net, rbtc_pool, ryabucks_pool)) / -net
+        else:
+            price = ryabucks_pool / rbtc_pool
+
+        fills = []
+        violators = []
+        for order in active:
+            if order.side == SIDE_BUY:
+                amount = int((price * order.rbtc_amount).to_integral_value(rounding=ROUND_CEILING))
+                if order.ryabucks_limit is not None and amount > order.ryabucks_limit:
+                    violators.append(order)
+            else:
+                amount = int((price * order.rbtc_amount).to_integral_value(rounding=ROUND_FLOOR))
+                if order.ryabucks_limit is not None and amount < order.ryabucks_limit:
+                    violators.append(order)
+            fills.append(BatchFill(order, amount))
+
+        if not violators:
+            break
+        for order in violators:
+            rejected[id(order)] = "slippage"
+            active.remove(order)
+
+    paid = sum(f.ryabucks_amount for f in fills if f.order.side == SIDE_BUY)
+    received = sum(f.ryabucks_amount for f in fills if f.order.side == SIDE_SELL)
+
+    return BatchClearing(
+        price=price,
+        fills=fills,
+        rejected=rejected,
+        rbtc_pool_delta=-net,
+        ryabucks_pool_delta=paid - received
+    )
+
+
+class BatchAuction:
+    """Сбор заявок в окно и исполнение пакета одной транзакцией"""
+
+    def __init__(self, pool_loader: PoolLoader, window_ms: int = 100, max_batch: int = MAX_BATCH_SIZE):
+        self.pool_loader = pool_loader
+        self.window = window_ms / 1000
+        self.max_batch = max_batch
+        self.client = None
+
+        self._pending: List[BatchOrder] = []
+        self._timer: Optional[asyncio.Task] = None
+        self._running: Set[asyncio.Task] = set()
+
+        self.stats = {
+            'batches': 0,
+            'orders': 0,
+            'filled': 0,
+            'netted_rbtc': Decimal("0"),
+            'conflicts': 0
+        }
+
+    async def _ensure_client(self):
+        if not self.client:
+            self.client = await get_supabase_client()
+
+    async def submit(self, user_id: int, side: str, rbtc_amount: Decimal,
+                     ryabucks_limit: Optional[int] = None, quote_id: Optional[str] = None) -> SwapResult:
+        """Поставить заявку в текущее окно и дождаться исполнения пакета"""
+        order = BatchOrder(user_id, side, rbtc_amount, ryabucks_limit, quote_id,
+                           asyncio.get_running_loop().create_future())
+        self._pending.append(order)
+        self.stats['orders'] += 1
+
+        if len(self._pending) >= self.max_batch:
+            self._flush_now()
+        elif self._timer is None:
+            self._timer = self._spawn(self._close_window())
+
+        return await order.future
+
+    async def _close_window(self):
+        await asyncio.sleep(self.window)
+        self._timer = None
+        await self._run(self._take_pending())
+
+    def _flush_now(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        self._spawn(self._run(self._take_pending()))
+
+    def _spawn(self, coro) -> asyncio.Task:
+        """Задача окна или пакета; ссылка держится до завершения - иначе её может собрать GC"""
+        task = asyncio.ensure_future(coro)
+        self._running.add(task)
+        task.add_done_callback(self._running.discard)
+        return task
+
+    def _take_pending(self) -> List[BatchOrder]:
+        orders, self._pending = self._pending, []
+        return orders
+
+    async def _run(self, orders: List[BatchOrder]):
+        if not orders:
+            return
+        try:
+            await self._execute(orders)
+        except Exception as e:
+            logger.error(f"Ошибка исполнения пакета из {len(orders)} заявок: {e}", exc_info=True)
+            for order in orders:
+                if not order.future.done():
+                    order.future.set_exception(e)
+
+    async def _execute(self, orders: List[BatchOrder]):
+        await self._ensure_client()
+        pools = await bank_pool_cache.get(self.pool_loader)
+        rbtc_pool, ryabucks_pool, version = pools["rbtc_pool"], pools["ryabucks_pool"], pools.get("version")
+
+        active = list(orders)
+        for _ in range(MAX_CLEARING_ATTEMPTS):
+            clearing = clear_batch(active, rbtc_pool, ryabucks_pool)
+            for order in [o for o in active if id(o) in clearing.rejected]:
+                self._resolve(order, clearing.rejected[id(order)])
+                active.remove(order)
+            if not clearing.fills:
+                return
+
+            data = await self.client.execute_rpc(BATCH_FUNCTION, {
+                "p_fills": [
+                    {
+                        "user_id": fill.order.user_id,
+                        "side": fill.order.side,
+                        "rbtc_amount": str(fill.order.rbtc_amount),
+                        "ryabucks_amount": fill.ryabucks_amount,
+                        "quote_id": fill.order.quote_id
+                    }
+                    for fill in clearing.fills
+                ],
+                "p_expected_version": version,
+                "p_rbtc_pool_delta": str(clearing.rbtc_pool_delta),
+                "p_ryabucks_pool_delta": clearing.ryabucks_pool_delta,
+                "p_price": str(clearing.price)
+            })
+            if isinstance(data, str):
+                data = json.loads(data)
+            if isinstance(data, list):
+                data = data[0] if data else {}
+            if not isinstance(data, dict):
+                data = {}
+            status = data.get("status")
+
+            if status == "ok":
+                new_rbtc = Money.of(data["rbtc_pool"])
+                new_ryabucks = Money.of(data["ryabucks_pool"])
+                bank_pool_cache.apply_reserves(new_rbtc, new_ryabucks, data.get("version"))
+                rate_after = new_ryabucks / new_rbtc
+                for fill in clearing.fills:
+                    self._resolve(fill.order, "ok", fill.ryabucks_amount, clearing.price, rate_after,
+                                  new_rbtc, new_ryabucks, data.get("version"))
+
+                gross = sum((f.order.rbtc_amount for f in clearing.fills), Decimal("0"))
+                self.stats['batches'] += 1
+                self.stats['filled'] += len(clearing.fills)
+                self.stats['netted_rbtc'] += gross - abs(clearing.rbtc_pool_delta)
+                return
+
+            if status == "conflict":
+                # Другой воркер изменил пул - пересчитываем по свежим резервам из ответа
+                self.stats['conflicts'] += 1
+                rbtc_pool = Money.of(data["rbtc_pool"])
+                ryabucks_pool = Money.of(data["ryabucks_pool"])
+                version = data.get("version")
+                bank_pool_cache.apply_reserves(rbtc_pool, ryabucks_pool, version)
+                continue
+
+            if status == "rejected":
+                # Не хватило баланса или котировка уже исполнена - исключаем
+                # заявки и пересчитываем цену
+                rejected_users = set(data.get("user_ids") or [])
+                duplicate_users = set(data.get("duplicates") or [])
+                for fill in clearing.fills:
+                    if fill.order.user_id in rejected_users:
+                        self._resolve(fill.order, "insufficient_funds", fill.ryabucks_amount, clearing.price)
+                        active.remove(fill.order)
+                    elif fill.order.quote_id is not None and fill.order.user_id in duplicate_users:
+                        self._resolve(fill.order, "duplicate")
+                        active.remove(fill.order)
+                if not active:
+                    return
+                continue
+
+            for order in active:
+                self._resolve(order, status or "error")
+            return
+
+        for order in active:
+            self._resolve(order, "conflict")
+
+    @staticmethod
+    def _resolve(order: BatchOrder, status: str, ryabucks_amount: int = 0, price: Decimal = Decimal("0"),
+                 rate_after: Decimal = Decimal("0"), rbtc_pool: Optional[Money] = None,
+                 ryabucks_pool: Optional[Money] = None, version: Optional[int] = None):
+        if order.future.done():
+            return
+        order.future.set_result(SwapResult(
+            status=status,
+            side=order.side,
+            rbtc_amount=order.rbtc_amount,
+            ryabucks_amount=ryabucks_amount,
+            price=price,
+            rate_after=rate_after,
+            rbtc_pool=rbtc_pool,
+            ryabucks_pool=ryabucks_pool,
+            version=version
+        ))
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self.stats, 'pending': len(self._pending)}
@@ -0,0 +1,226 @@
+# services/economy_counters.py
+"""
+Счётчики экономики острова
+
+Сожжённые RBTC, общий банк рябаксов, RBTC у игроков и выручка Quantum
+Pass хранятся готовыми значениями: строка pool_statistics увеличивается
+атомарно в ledger_apply_batch вместе с записями журнала (005_economy_counters.sql).
+Сделки банка, призы турниров и награды коробок меняют RBTC у игроков
+в той же транзакции, что и балансы (015, 011, 012).
+Чтение - снимок из БД раз в TTL плюс дельты, ещё не отправленные
+ledger_writer, без пересчёта журналов на каждый запрос.
+Сверка (reconcile) заново суммирует журналы потоковым обходом и
+поправляет счётчики на найденное расхождение; RBTC у игроков сверяются
+одним запросом - сумма users.rbtc и счётчик из одного снимка.
+"""
+
+import asyncio
+import logging
+import time
+from decimal import Decimal
+from typing import Any, Dict, Optional, Tuple
+
+from adapters.database.supabase.client import get_supabase_client
+from core.domain.money import Money
+from services.ledger_writer import ledger_writer
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_FUNCTION = "economy_counters_snapshot"
+ADJUST_FUNCTION = "economy_counters_adjust"
+CIRCULATION_FUNCTION = "economy_circulation_snapshot"
+
+DEFAULT_TTL_SECONDS = 30.0
+RECONCILE_PAGE_SIZE = 1000
+
+RBTC_COUNTERS = ("total_rbtc_burned", "rbtc_in_circulation", "qpass_revenue_rbtc")
+
+
+class EconomyCounters:
+    """Счётчики экономики: снимок из БД + неотправленные дельты журнала"""
+
+    def __init__(self, ttl_seconds: float = DEFAULT_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self.client = None
+        self._snapshot: Optional[Dict[str, Any]] = None
+        self._expires_at = 0.0
+        self._refresh: Optional[asyncio.Future] = None
+
+        self.stats = {
+            'hits': 0,
+            'refreshes': 0,
+            'reconciliations': 0,
+            'circulation_skipped': 0
+        }
+
+    async def _ensure_client(self):
+        if not self.client:
+            self.client = await get_supabase_client()
+
+    async def _load_snapshot(self) -> Dict[str, Any]:
+        await self._ensure_client()
+        data = await self.client.execute_rpc(SNAPSHOT_FUNCTION)
+        if isinstance(data, list):
+            data = data[0] if data else {}
+        data = data or {}
+
+        snapshot = {name: Money.of(data.get(name)) for name in RBTC_COUNTERS}
+        snapshot["total_bank_ryabucks"] = int(Money.of(data.get("total_bank_ryabucks")))
+        snapshot["bank_transactions_max_id"] = int(data.get("bank_transactions_max_id") or 0)
+        return snapshot
+
+    async def _refresh_snapshot(self) -> Dict[str, Any]:
+        snapshot = await self._load_snapshot()
+        self.stats['refreshes'] += 1
+        self._snapshot = snapshot
+        self._expires_at = time.monotonic() + self.ttl_seconds
+        return snapshot
+
+    async def get(self) -> Dict[str, Any]:
+        """Текущие значения счётчиков"""
+        if self._snapshot is not None and time.monotonic() < self._expires_at:
+            self.stats['hits'] += 1
+            snapshot = self._snapshot
+        else:
+            # Одна перезагрузка на всех ожидающих
+            if self._refresh is None:
+                self._refresh = asyncio.ensure_future(self._refresh_snapshot())
+            refresh = self._refresh
+            try:
+                snapshot = await asyncio.shield(refresh)
+            finally:
+                if self._refresh is refresh and refresh.done():
+                    self._refresh = None
+
+        values = {name: snapshot[name] for name in RBTC_COUNTERS}
+        values["total_bank_ryabucks"] = snapshot["total_bank_ryabucks"]
+        for name, delta in ledger_writer.pending_counters().items():
+            if name == "total_bank_ryabucks":
+                values[name] += int(delta)
+            else:
+                values[name] += delta
+        return values
+
+    async def burned_rbtc(self) -> Money:
+        return (await self.get())["total_rbtc_burned"]
+
+    def invalidate(self) -> None:
+        self._expires_at = 0.0
+
+    # ---------- изменения ----------
+
+    async def record_burn(self, user_id: int, amount, transaction_type: str, qpass: bool = False) -> None:
+        """Сжигание RBTC игрока: строка bank_transactions и счётчики одной записью журнала"""
+        amount = Money.of(amount)
+        counters = {"total_rbtc_burned": amount, "rbtc_in_circulation": -amount}
+        if qpass:
+            counters["qpass_revenue_rbtc"] = amount
+
+        await ledger_writer.append(
+            "bank_transactions",
+            {
+                "user_id": user_id,
+                "transaction_type": transaction_type,
+                "amount_from": str(amount),
+                "amount_to": 0,
+                "currency_from": "rbtc",
+                "currency_to": "burned",
+                "exchange_rate": 1
+            },
+            counters=counters
+        )
+
+    # ---------- сверка ----------
+
+    async def reconcile(self, page_size: int = RECONCILE_PAGE_SIZE) -> Dict[str, Any]:
+        """
+        Пересчитать счётчики из журналов и поправить расхождение.
+        Сожжения и выручка Q-Pass суммируются по bank_transactions до границы
+        снимка (пакеты журнала во время обхода не учитываются дважды),
+        обход страницами по ключу, без загрузки таблицы целиком.
+        RBTC у игроков: сумма users.rbtc и счётчик читаются одним запросом
+        (economy_circulation_snapshot). Если за это время в журнал процесса
+        попали изменения RBTC у игроков, их ещё нет в счётчике - поправка
+        RBTC у игроков пропускается до следующей сверки.
+        """
+        await ledger_writer.flush()
+        await self._ensure_client()
+        snapshot = await self._load_snapshot()
+        max_id = snapshot["bank_transactions_max_id"]
+
+        burned = Money()
+        qpass = Money()
+        last_id = 0
+        while last_id < max_id:
+            page = await self.client.execute_query(
+                table="bank_transactions",
+                operation="select",
+                columns=["id", "transaction_type", "amount_from"],
+                filters={"currency_to": "burned", "id": {"gt": last_id, "lte": max_id}},
+                order="id",
+                limit=page_size
+            )
+            if not page:
+                break
+            for row in page:
+                last_id = row["id"]
+                amount = Money.of(row.get("amount_from"))
+                burned += amount
+                if row.get("transaction_type") == "quantum_pass_purchase":
+                    qpass += amount
+            if len(page) < page_size:
+                break
+
+        circulation, circulation_counter = await self._circulation_snapshot()
+
+        recomputed = {
+            "total_rbtc_burned": burned,
+            "rbtc_in_circulation": circulation,
+            "qpass_revenue_rbtc": qpass
+        }
+        deltas = {name: recomputed[name] - snapshot[name] for name in RBTC_COUNTERS}
+        if circulation_counter is None:
+            deltas["rbtc_in_circulation"] = Money()
+        else:
+            deltas["rbtc_in_circulation"] = circulation - circulation_counter
+
+        if any(deltas.values()):
+            await self.client.execute_rpc(ADJUST_FUNCTION, {
+                "p_deltas": {name: str(delta) for name, delta in deltas.items()}
+            })
+            logger.warning(f"📊 Сверка счётчиков экономики: поправки {deltas}")
+
+        self.stats['reconciliations'] += 1
+        self.invalidate()
+        return {"recomputed": recomputed, "deltas": deltas}
+
+    async def _circulation_snapshot(self) -> Tuple[Money, Optional[Money]]:
+        """
+        (сумма users.rbtc, счётчик) из одного снимка БД; счётчик None,
+        если в журнале процесса есть неотправленные изменения RBTC у игроков
+        """
+        await ledger_writer.flush()
+        appended = ledger_writer.stats['appended']
+        in_flight = ledger_writer.pending_counters().get("rbtc_in_circulation")
+
+        data = await self.client.execute_rpc(CIRCULATION_FUNCTION)
+        if isinstance(data, list):
+            data = data[0] if data else {}
+        data = data or {}
+        circulation = Money.of(data.get("users_rbtc") or 0)
+        counter = Money.of(data.get("rbtc_in_circulation") or 0)
+
+        # Сделка между записью users и журналом - счётчик отстаёт не по ошибке
+        if in_flight or ledger_writer.pending_counters().get("rbtc_in_circulation") \
+                or ledger_writer.stats['appended'] != appended:
+            logger.info("📊 Сверка RBTC у игроков отложена: журнал изменился во время сверки")
+            self.stats['circulation_skipped'] += 1
+            return circulation, None
+        return circulation, counter
+
+    def get_stats(self) -> Dict[str, Any]:
+        return dict(self.stats)
+
+
+# Глобальный экземпляр
+economy_counters = EconomyCounters()
@@ -0,0 +1,205 @@
+# services/expedition_engine.py
+"""
+Расчёт экспедиций: отряд специалистов против встречи
+
+Пачка экспедиций считается одновременно: отряды - массивы NumPy формы
+(экспедиции, MAX_SQUAD_SIZE) с маской занятых мест, встречи - массивы
+по экспедициям. Каждый раунд - несколько векторных операций над всей
+пачкой и пакетные розыгрыши одного генератора: отряд бьёт встречу,
+встреча бьёт случайного живого бойца. По итогам - потеря HP, раненые,
+погибшие и добыча победивших отрядов (RBTC из пула экспедиций и
+предметы).
+
+Результат детерминирован: та же пачка и тот же seed дают те же исходы,
+поэтому для аудита достаточно сохранить seed и состав пачки.
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from core.domain.money import MICRO, Money
+from services.specialist_service import SPECIALIST_CONFIG, SpecialistType
+
+logger = logging.getLogger(__name__)
+
+MAX_SQUAD_SIZE = 5
+MAX_ROUNDS = 12
+
+DAMAGE_SPREAD = 0.2               # урон: ±20% от атаки
+ARMOR_CONSTANT = 100.0            # снижение урона: 100 / (100 + защита)
+INJURY_THRESHOLD = 0.5            # ранен, если осталось меньше половины HP
+DEATH_SAVE_CHANCE = 0.6           # шанс выжить с 1 HP при смертельном ударе
+
+# Встречи по сложности: характеристики и добыча за победу
+EXPEDITION_DIFFICULTIES = {
+    "easy": {
+        "attack": 25, "defense": 20, "hp": 120,
+        "loot_rbtc": (Money.of("0.01"), Money.of("0.05")), "items": 0.5
+    },
+    "normal": {
+        "attack": 45, "defense": 40, "hp": 260,
+        "loot_rbtc": (Money.of("0.05"), Money.of("0.2")), "items": 1.0
+    },
+    "hard": {
+        "attack": 70, "defense": 60, "hp": 480,
+        "loot_rbtc": (Money.of("0.2"), Money.of("1")), "items": 2.0
+    }
+}
+
+DIFFICULTIES: Tuple[str, ...] = tuple(EXPEDITION_DIFFICULTIES)
+_ENCOUNTER_ATTACK = np.array([d["attack"] for d in EXPEDITION_DIFFICULTIES.values()], dtype=np.float64)
+_ENCOUNTER_DEFENSE = np.array([d["defense"] for d in EXPEDITION_DIFFICULTIES.values()], dtype=np.float64)
+_ENCOUNTER_HP = np.array([d["hp"] for d in EXPEDITION_DIFFICULTIES.values()], dtype=np.float64)
+_LOOT_MIN = np.array([d["loot_rbtc"][0].micro for d in EXPEDITION_DIFFICULTIES.values()], dtype=np.int64)
+_LOOT_MAX = np.array([d["loot_rbtc"][1].micro for d in EXPEDITION_DIFFICULTIES.values()], dtype=np.int64)
+_ITEMS_MEAN = np.array([d["items"] for d in EXPEDITION_DIFFICULTIES.values()], dtype=np.float64)
+
+
+@dataclass
+class SquadBatch:
+    """Отряды пачки экспедиций: (экспедиции, MAX_SQUAD_SIZE)"""
+    difficulty: np.ndarray      # int8, индекс в DIFFICULTIES
+    specialist_id: np.ndarray   # int64, 0 - пустое место
+    attack: np.ndarray          # float64
+    defense: np.ndarray         # float64
+    hp: np.ndarray              # float64, текущее HP на выходе
+    max_hp: np.ndarray          # float64
+    occupied: np.ndarray        # bool
+
+    def __len__(self) -> int:
+        return len(self.difficulty)
+
+    @classmethod
+    def from_squads(cls, squads: Sequence[Tuple[str, Sequence[Dict[str, Any]]]]) -> "SquadBatch":
+        """
+        squads: (сложность, специалисты) - строки user_specialists; боевые
+        характеристики из combat_stats, иначе из базовых характеристик типа
+        """
+        size = (len(squads), MAX_SQUAD_SIZE)
+        batch = cls(
+            difficulty=np.empty(len(squads), dtype=np.int8),
+            specialist_id=np.zeros(size, dtype=np.int64),
+            attack=np.zeros(size),
+            defense=np.zeros(size),
+            hp=np.zeros(size),
+            max_hp=np.ones(size),
+            occupied=np.zeros(size, dtype=bool)
+        )
+        for i, (difficulty, members) in enumerate(squads):
+            batch.difficulty[i] = DIFFICULTIES.index(difficulty)
+            for j, member in enumerate(members[:MAX_SQUAD_SIZE]):
+                stats = member.get("combat_stats") or {}
+                base = SPECIALIST_CONFIG[SpecialistType(member["specialist_type"])]["base_stats"]
+                batch.specialist_id[i, j] = member["id"]
+                batch.attack[i, j] = stats.get("attack", base.get("attack", 10))
+                batch.defense[i, j] = stats.get("defense", base.get("defense", 10))
+                batch.max_hp[i, j] = member.get("max_hp") or stats.get("max_health", base.get("hp", 10))
+                batch.hp[i, j] = member.get("current_hp", batch.max_hp[i, j])
+                batch.occupied[i, j] = True
+        return batch
+
+
+@dataclass
+class ExpeditionOutcome:
+    """Исходы пачки: по экспедициям и по местам отряда"""
+    seed: int
+    victory: np.ndarray         # bool (экспедиции)
+    rounds: np.ndarray          # int16 (экспедиции)
+    hp_before: np.ndarray       # int32 (экспедиции, места)
+    hp_after: np.ndarray        # int32
+    injured: np.ndarray         # bool
+    dead: np.ndarray            # bool
+    loot_rbtc: np.ndarray       # int64, микро-RBTC (экспедиции)
+    loot_items: np.ndarray      # int16 (экспедиции)
+
+    def expedition(self, index: int, batch: SquadBatch) -> Dict[str, Any]:
+        """Итог одной экспедиции (для записи и события EXPEDITION_COMPLETED)"""
+        members = []
+        for j in np.flatnonzero(batch.occupied[index]):
+            members.append({
+                "specialist_id": int(batch.specialist_id[index, j]),
+                "hp_before": int(self.hp_before[index, j]),
+                "hp_after": int(self.hp_after[index, j]),
+                "hp_lost": int(self.hp_before[index, j] - self.hp_after[index, j]),
+                "injured": bool(self.injured[index, j]),
+                "dead": bool(self.dead[index, j])
+            })
+        return {
+            "difficulty": DIFFICULTIES[batch.difficulty[index]],
+            "victory": bool(self.victory[index]),
+            "rounds": int(self.rounds[index]),
+            "rbtc_found": Money(int(self.loot_rbtc[index])),
+            "items_found": int(self.loot_items[index]),
+            "members": members
+        }
+
+
+def resolve_expeditions(batch: SquadBatch, seed: Optional[int] = None) -> ExpeditionOutcome:
+    """Рассчитать все экспедиции пачки; seed=None - случайный (сохраняется в исходе)"""
+    if seed is None:
+        seed = int(np.random.SeedSequence().generate_state(1)[0])
+    rng = np.random.default_rng(seed)
+
+    n = len(batch)
+    rows = np.arange(n)
+    difficulty = batch.difficulty.astype(np.intp)
+
+    hp = np.where(batch.occupied, batch.hp, 0.0)
+    hp_before = hp.copy()
+    encounter_hp = _ENCOUNTER_HP[difficulty].copy()
+    encounter_attack = _ENCOUNTER_ATTACK[difficulty]
+    squad_mitigation = ARMOR_CONSTANT / (ARMOR_CONSTANT + _ENCOUNTER_DEFENSE[difficulty])
+    member_mitigation = ARMOR_CONSTANT / (ARMOR_CONSTANT + batch.defense)
+
+    active = (hp > 0).any(axis=1)
+    rounds = np.zeros(n, dtype=np.int16)
+
+    for _ in range(MAX_ROUNDS):
+        if not active.any():
+            break
+        alive = hp > 0
+        rounds += active
+
+        # Отряд бьёт встречу: сумма атак живых с разбросом
+        spread = rng.uniform(1 - DAMAGE_SPREAD, 1 + DAMAGE_SPREAD, size=hp.shape)
+        squad_damage = (batch.attack * spread * alive).sum(axis=1) * squad_mitigation
+        encounter_hp -= np.where(active, squad_damage, 0.0)
+        active &= encounter_hp > 0
+
+        # Встреча бьёт случайного живого бойца
+        target = np.argmax(rng.random(hp.shape) * alive, axis=1)
+        hit = rng.uniform(1 - DAMAGE_SPREAD, 1 + DAMAGE_SPREAD, size=n) * encounter_attack
+        hit *= member_mitigation[rows, target]
+        hp[rows, target] -= np.where(active, hit, 0.0)
+        active &= (hp > 0).any(axis=1)
+
+    victory = encounter_hp <= 0
+
+    # Смертельный удар: часть бойцов выживает с 1 HP
+    fallen = batch.occupied & (hp <= 0) & (hp_before > 0)
+    saved = fallen & (rng.random(hp.shape) < DEATH_SAVE_CHANCE)
+    hp = np.where(saved, 1.0, np.maximum(hp, 0.0))
+    hp_after = np.ceil(hp).astype(np.int32)
+    dead = fallen & ~saved
+    injured = batch.occupied & ~dead & (hp_after < batch.max_hp * INJURY_THRESHOLD)
+
+    # Добыча победивших отрядов
+    loot_span = _LOOT_MAX[difficulty] - _LOOT_MIN[difficulty]
+    loot_rbtc = _LOOT_MIN[difficulty] + (rng.random(n) * (loot_span + 1)).astype(np.int64)
+    loot_rbtc = np.where(victory, loot_rbtc // (MICRO // 10_000) * (MICRO // 10_000), 0)  # до 4 знаков
+    loot_items = np.where(victory, rng.poisson(_ITEMS_MEAN[difficulty]), 0).astype(np.int16)
+
+    return ExpeditionOutcome(
+        seed=seed,
+        victory=victory,
+        rounds=rounds,
+        hp_before=np.ceil(hp_before).astype(np.int32),
+        hp_after=hp_after,
+        injured=injured,
+        dead=dead,
+        loot_rbtc=loot_rbtc,
+        loot_items=loot_items
+    )
@@ -0,0 +1,225 @@
+# services/income_settlement.py
+"""
+Пассивный доход специалистов на работе
+
+Смены, по которым ещё не начислен доход, загружаются колонками
+(income_settlement_page, 010_income_settlement.sql) в массивы NumPy:
+тип, эффективность, лояльность, начало и конец неоплаченного интервала,
+Quantum Pass владельца. Выплаты считаются одним векторным проходом:
+ставка за час - один пакетный розыгрыш в пределах base_income типа,
+умноженная на часы, эффективность, лояльность и множитель Q-Pass.
+Суммы сворачиваются по игрокам, и каждая пачка смен начисляется одним
+вызовом settle_specialist_income (курсоры смен + один UPDATE users).
+"""
+
+import asyncio
+import logging
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from adapters.database.supabase.client import get_supabase_client
+from config.settings import settings
+from services.specialist_service import SPECIALIST_CONFIG
+
+logger = logging.getLogger(__name__)
+
+PAGE_FUNCTION = "income_settlement_page"
+SETTLE_FUNCTION = "settle_specialist_income"
+
+LOAD_PAGE_SIZE = 20000
+SETTLE_CHUNK_SIZE = 20000
+
+# Индекс типа в массивах = порядок SPECIALIST_CONFIG
+SPECIALIST_TYPES: Tuple[str, ...] = tuple(spec_type.value for spec_type in SPECIALIST_CONFIG)
+TYPE_CODES = {spec_type: code for code, spec_type in enumerate(SPECIALIST_TYPES)}
+INCOME_MIN = np.array([config["base_income"]["min"] for config in SPECIALIST_CONFIG.values()], dtype=np.float64)
+INCOME_MAX = np.array([config["base_income"]["max"] for config in SPECIALIST_CONFIG.values()], dtype=np.float64)
+
+
+@dataclass
+class WorkShifts:
+    """Неоплаченные смены колонками (одна позиция = одна смена)"""
+    job_id: np.ndarray          # int64
+    user_id: np.ndarray         # int64
+    type_code: np.ndarray       # int16, индекс в SPECIALIST_TYPES
+    efficiency: np.ndarray      # float32, %
+    loyalty: np.ndarray         # float32, %
+    accrue_from: np.ndarray     # float64, unix-время
+    accrue_to: np.ndarray       # float64, unix-время
+    quantum_pass: np.ndarray    # bool
+    settled_from: List[Optional[str]]   # курсор смены как есть из БД (для проверки)
+    settle_to: List[str]
+
+    def __len__(self) -> int:
+        return len(self.job_id)
+
+    @classmethod
+    def from_pages(cls, pages: List[Dict[str, List[Any]]]) -> "WorkShifts":
+        def column(name: str, dtype) -> np.ndarray:
+            parts = [np.asarray(page[name], dtype=dtype) for page in pages]
+            return np.concatenate(parts) if parts else np.empty(0, dtype=dtype)
+
+        type_codes = [
+            np.fromiter((TYPE_CODES.get(t, -1) for t in page["specialist_type"]), dtype=np.int16,
+                        count=len(page["specialist_type"]))
+            for page in pages
+        ]
+        return cls(
+            job_id=column("job_id", np.int64),
+            user_id=column("user_id", np.int64),
+            type_code=np.concatenate(type_codes) if type_codes else np.empty(0, dtype=np.int16),
+            efficiency=column("efficiency", np.float32),
+            loyalty=column("loyalty", np.float32),
+            accrue_from=column("accrue_from", np.float64),
+            accrue_to=column("accrue_to", np.float64),
+            quantum_pass=column("quantum_pass", np.bool_),
+            settled_from=[value for page in pages for value in page["settled_from"]],
+            settle_to=[value for page in pages for value in page["settle_to"]]
+        )
+
+
+def compute_payouts(shifts: WorkShifts, rng: np.random.Generator,
+                    qpass_multiplier: float = settings.QUANTUM_PASS_MULTIPLIERS["income"]) -> np.ndarray:
+    """Выплата по каждой смене (целые рябаксы, int64) одним векторным проходом"""
+    known = shifts.type_code >= 0
+    codes = np.where(known, shifts.type_code, 0)
+
+    hours = np.maximum(shifts.accrue_to - shifts.accrue_from, 0.0) / 3600.0
+    hourly = rng.uniform(INCOME_MIN[codes], INCOME_MAX[codes])
+    payout = hourly * hours
+    payout *= shifts.efficiency / 100.0
+    payout *= shifts.loyalty / 100.0
+    payout *= np.where(shifts.quantum_pass, qpass_multiplier, 1.0)
+    payout[~known] = 0.0
+    return np.floor(payout).astype(np.int64)
+
+
+def aggregate_by_user(user_ids: np.ndarray, payouts: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """(игроки, суммы) - выплаты, свёрнутые по владельцу"""
+    users, inverse = np.unique(user_ids, return_inverse=True)
+    credits = np.bincount(inverse, weights=payouts, minlength=len(users))
+    return users, np.rint(credits).astype(np.int64)
+
+
+class IncomeSettlementEngine:
+    """Периодический расчёт пассивного дохода"""
+
+    def __init__(self, interval_seconds: float, seed: Optional[int] = None):
+        self.interval_seconds = interval_seconds
+        self.rng = np.random.default_rng(seed)
+        self.client = None
+        self._task: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+
+        self.stats = {
+            'runs': 0,
+            'shifts': 0,
+            'credited_users': 0,
+            'credited_total': 0,
+            'stale_chunks': 0,
+            'failed_chunks': 0,
+            'last_run_seconds': 0.0
+        }
+
+    async def _ensure_client(self):
+        if not self.client:
+            self.client = await get_supabase_client()
+
+    async def load(self, cutoff: float) -> WorkShifts:
+        """Все неоплаченные смены на момент cutoff (keyset-страницы колонками)"""
+        await self._ensure_client()
+        cutoff_iso = time.strftime("%Y-%m-%dT%H:%M:%S+00:00", time.gmtime(cutoff))
+        pages = []
+        after_id = 0
+        while True:
+            page = await self.client.execute_rpc(PAGE_FUNCTION, {
+                "p_cutoff": cutoff_iso,
+                "p_after_id": after_id,
+                "p_limit": LOAD_PAGE_SIZE
+            })
+            if isinstance(page, list):
+                page = page[0] if page else {}
+            if not page or not page.get("job_id"):
+                break
+            pages.append(page)
+            if len(page["job_id"]) < LOAD_PAGE_SIZE:
+                break
+            after_id = page["job_id"][-1]
+        return WorkShifts.from_pages(pages)
+
+    async def settle(self, now: Optional[float] = None) -> Dict[str, Any]:
+        """Начислить доход по всем сменам до now"""
+        async with self._lock:
+            started = time.perf_counter()
+            shifts = await self.load(now if now is not None else time.time())
+            result = {'shifts': len(shifts), 'users': 0, 'total': 0}
+            if not len(shifts):
+                return result
+
+            payouts = compute_payouts(shifts, self.rng)
+
+            for start in range(0, len(shifts), SETTLE_CHUNK_SIZE):
+                chunk = slice(start, start + SETTLE_CHUNK_SIZE)
+                users, credits = aggregate_by_user(shifts.user_id[chunk], payouts[chunk])
+                try:
+                    response = await self.client.execute_rpc(SETTLE_FUNCTION, {
+                        "p_run_id": str(uuid.uuid4()),
+                        "p_job_ids": shifts.job_id[chunk].tolist(),
+                        "p_settled_from": shifts.settled_from[chunk],
+                        "p_settle_to": shifts.settle_to[chunk],
+                        "p_user_ids": users.tolist(),
+                        "p_credits": credits.tolist()
+                    })
+                    if isinstance(response, list):
+                        response = response[0] if response else {}
+                    response = response or {}
+                    if response.get("status") == "ok":
+                        result['users'] += len(users)
+                        result['total'] += int(credits.sum())
+                except Exception as e:
+                    # Пачка откатилась целиком - смены будут пересчитаны в следующий раз
+                    if "income_settlement_stale" in str(e):
+                        self.stats['stale_chunks'] += 1
+                        logger.warning(f"Доход специалистов: пачка из {len(users)} игроков устарела, пересчёт позже")
+                    else:
+                        self.stats['failed_chunks'] += 1
+                        logger.error(f"Ошибка начисления дохода специалистов: {e}")
+
+            self.stats['runs'] += 1
+            self.stats['shifts'] += len(shifts)
+            self.stats['credited_users'] += result['users']
+            self.stats['credited_total'] += result['total']
+            self.stats['last_run_seconds'] = time.perf_counter() - started
+            logger.info(f"💼 Доход специалистов: {len(shifts)} смен, {result['users']} игроков, {result['total']:,} рябаксов")
+            return result
+
+    async def _run_loop(self):
+        while True:
+            try:
+                await asyncio.sleep(self.interval_seconds)
+                await self.settle()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Ошибка расчёта дохода специалистов: {e}")
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run_loop())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        return dict(self.stats)
+
+
+# Глобальный экземпляр
+income_settlement = IncomeSettlementEngine(settings.INCOME_SETTLEMENT_INTERVAL_MINUTES * 60)
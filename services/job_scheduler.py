@@ -0,0 +1,331 @@
+# services/job_scheduler.py
+"""
+Таймеры специалистов: обучение и работа
+
+Таймеры живут в памяти процесса в иерархическом колесе таймеров
+(TimingWheel): вставка и отмена - O(1), на каждом тике извлекается только
+текущий слот. Долговременная копия - таблица specialist_jobs
+(009_specialist_jobs.sql): запуск задачи меняет статус специалиста и
+пишет строку одной транзакцией, созревшие за тик задачи завершаются
+одним RPC на пачку, при старте незавершённые задачи загружаются обратно
+в колесо. Таблица не опрашивается.
+"""
+
+import asyncio
+import logging
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+from adapters.database.supabase.client import get_supabase_client
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+START_FUNCTION = "start_specialist_job"
+COMPLETE_FUNCTION = "complete_specialist_jobs"
+CANCEL_FUNCTION = "cancel_specialist_jobs"
+
+JOBS_TABLE = "specialist_jobs"
+LOAD_PAGE_SIZE = 1000
+
+WHEEL_SLOT_BITS = 6               # 64 слота на уровень
+WHEEL_LEVELS = 4                  # 64^4 тиков: ~194 дня при тике в 1 сек
+RETRY_DELAY_TICKS = 5
+
+
+class Job:
+    """Задача специалиста в колесе таймеров"""
+
+    __slots__ = ("id", "user_id", "specialist_id", "kind", "due_tick", "_slot")
+
+    def __init__(self, job_id: int, user_id: int, specialist_id: int, kind: str, due_tick: int):
+        self.id = job_id
+        self.user_id = user_id
+        self.specialist_id = specialist_id
+        self.kind = kind
+        self.due_tick = due_tick
+        self._slot: Optional[Dict[int, "Job"]] = None
+
+
+class TimingWheel:
+    """
+    Иерархическое колесо таймеров
+
+    Уровень L хранит задачи, до которых от 64^L до 64^(L+1) тиков; слот -
+    соответствующие биты номера тика срабатывания. Когда младшие биты
+    текущего тика обнуляются, слот старшего уровня перекладывается
+    вниз (каскад). Задачи дальше последнего уровня ждут в overflow.
+    """
+
+    def __init__(self, current_tick: int, slot_bits: int = WHEEL_SLOT_BITS, levels: int = WHEEL_LEVELS):
+        self.slot_bits = slot_bits
+        self.levels = levels
+        self.mask = (1 << slot_bits) - 1
+        self.current_tick = current_tick
+        self._wheels: List[List[Dict[int, Job]]] = [
+            [{} for _ in range(1 << slot_bits)] for _ in range(levels)
+        ]
+        self._overflow: Dict[int, Job] = {}
+        self._ready: Dict[int, Job] = {}
+        self._jobs: Dict[int, Job] = {}
+
+    def __len__(self) -> int:
+        return len(self._jobs)
+
+    def __contains__(self, job_id: int) -> bool:
+        return job_id in self._jobs
+
+    def add(self, job: Job) -> None:
+        """Вставка O(1); повторная вставка того же id заменяет задачу"""
+        self.cancel(job.id)
+        self._jobs[job.id] = job
+        self._place(job)
+
+    def _place(self, job: Job) -> None:
+        delta = job.due_tick - self.current_tick
+        if delta <= 0:
+            slot = self._ready
+        else:
+            for level in range(self.levels):
+                if delta < 1 << (self.slot_bits * (level + 1)):
+                    slot = self._wheels[level][(job.due_tick >> (self.slot_bits * level)) & self.mask]
+                    break
+            else:
+                slot = self._overflow
+        slot[job.id] = job
+        job._slot = slot
+
+    def get(self, job_id: int) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    def cancel(self, job_id: int) -> Optional[Job]:
+        """Отмена O(1); None если задачи нет"""
+        job = self._jobs.pop(job_id, None)
+        if job is not None:
+            job._slot.pop(job_id, None)
+            job._slot = None
+        return job
+
+    def advance(self, tick: int) -> List[Job]:
+        """Продвинуть колесо до тика tick включительно, вернуть созревшие задачи"""
+        expired = list(self._ready.values())
+        self._ready.clear()
+
+        while self.current_tick < tick:
+            if not self._jobs:
+                self.current_tick = tick
+                break
+            self.current_tick += 1
+            self._cascade()
+            # Каскад кладёт задачи, созревшие ровно на этом тике, в _ready
+            for slot in (self._wheels[0][self.current_tick & self.mask], self._ready):
+                if slot:
+                    expired.extend(slot.values())
+                    slot.clear()
+
+        for job in expired:
+            del self._jobs[job.id]
+            job._slot = None
+        return expired
+
+    def _cascade(self) -> None:
+        tick = self.current_tick
+        for level in range(1, self.levels):
+            if tick & ((1 << (self.slot_bits * level)) - 1):
+                return
+            slot = self._wheels[level][(tick >> (self.slot_bits * level)) & self.mask]
+            if slot:
+                jobs = list(slot.values())
+                slot.clear()
+                for job in jobs:
+                    self._place(job)
+        if self._overflow and not tick & ((1 << (self.slot_bits * self.levels)) - 1):
+            jobs = list(self._overflow.values())
+            self._overflow.clear()
+            for job in jobs:
+                self._place(job)
+
+
+class JobScheduler:
+    """Колесо таймеров + specialist_jobs + пакетное завершение"""
+
+    def __init__(self, tick_seconds: float, batch_size: int):
+        self.tick_seconds = tick_seconds
+        self.batch_size = batch_size
+        self.client = None
+        self.wheel = TimingWheel(self._tick_of(time.time()))
+        self._by_specialist: Dict[int, int] = {}
+        self._task: Optional[asyncio.Task] = None
+
+        self.stats = {
+            'scheduled': 0,
+            'loaded': 0,
+            'cancelled': 0,
+            'fired': 0,
+            'completed': 0,
+            'skipped': 0,
+            'batches': 0,
+            'failed_batches': 0
+        }
+
+    async def _ensure_client(self):
+        if not self.client:
+            self.client = await get_supabase_client()
+
+    def _tick_of(self, timestamp: float) -> int:
+        return int(timestamp // self.tick_seconds)
+
+    def _track(self, job_id: int, user_id: int, specialist_id: int, kind: str, due_at: Any) -> Job:
+        if isinstance(due_at, str):
+            due_at = datetime.fromisoformat(due_at)
+        # Округление вверх: задача не срабатывает раньше due_at
+        due_tick = -int(-due_at.timestamp() // self.tick_seconds)
+        job = Job(job_id, user_id, specialist_id, kind, due_tick)
+        # Прежняя задача специалиста уже закрыта в БД (start_specialist_job)
+        previous = self._by_specialist.get(specialist_id)
+        if previous is not None and previous != job_id:
+            self.wheel.cancel(previous)
+        self.wheel.add(job)
+        self._by_specialist[specialist_id] = job_id
+        return job
+
+    # ---------- запуск и отмена ----------
+
+    async def schedule(self, user_id: int, specialist_id: int, kind: str, from_status: str, to_status: str,
+                       durations: Dict[str, float], payload: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Запустить задачу: смена статуса и строка specialist_jobs одной транзакцией
+        durations: {тип специалиста: секунд}; тип без длительности не допускается
+        Возвращает ответ start_specialist_job ('status': ok | not_found | wrong_status | not_allowed | busy)
+        """
+        await self._ensure_client()
+        result = await self.client.execute_rpc(START_FUNCTION, {
+            "p_user_id": user_id,
+            "p_specialist_id": specialist_id,
+            "p_kind": kind,
+            "p_from_status": from_status,
+            "p_to_status": to_status,
+            "p_durations": {spec_type: int(seconds) for spec_type, seconds in durations.items()},
+            "p_payload": payload or {}
+        })
+        if isinstance(result, list):
+            result = result[0] if result else {}
+        result = result or {}
+
+        if result.get("status") == "ok":
+            self._track(result["job_id"], user_id, specialist_id, kind, result["due_at"])
+            self.stats['scheduled'] += 1
+        return result
+
+    async def cancel_specialists(self, specialist_ids: Iterable[int], kind: Optional[str] = None) -> int:
+        """Отменить активные задачи специалистов (в памяти и в БД)"""
+        specialist_ids = list(specialist_ids)
+        if not specialist_ids:
+            return 0
+
+        for specialist_id in specialist_ids:
+            job = self.wheel.get(self._by_specialist.get(specialist_id))
+            if job is None or (kind is not None and job.kind != kind):
+                continue
+            self.wheel.cancel(job.id)
+            del self._by_specialist[specialist_id]
+            self.stats['cancelled'] += 1
+
+        await self._ensure_client()
+        return await self.client.execute_rpc(CANCEL_FUNCTION, {
+            "p_specialist_ids": specialist_ids,
+            "p_kind": kind
+        }) or 0
+
+    # ---------- завершение ----------
+
+    async def run_due(self, now: Optional[float] = None) -> int:
+        """Завершить созревшие к now задачи пачками; возвращает число задач"""
+        due = self.wheel.advance(self._tick_of(now if now is not None else time.time()))
+        if not due:
+            return 0
+        self.stats['fired'] += len(due)
+
+        await self._ensure_client()
+        for start in range(0, len(due), self.batch_size):
+            batch = due[start:start + self.batch_size]
+            try:
+                result = await self.client.execute_rpc(COMPLETE_FUNCTION, {"p_job_ids": [job.id for job in batch]})
+                if isinstance(result, list):
+                    result = result[0] if result else {}
+                result = result or {}
+                completed = int(result.get("completed", 0))
+                self.stats['completed'] += completed
+                self.stats['skipped'] += int(result.get("finished", 0)) - completed
+                self.stats['batches'] += 1
+                for job in batch:
+                    if self._by_specialist.get(job.specialist_id) == job.id:
+                        del self._by_specialist[job.specialist_id]
+            except Exception as e:
+                # Задачи остаются в БД незавершёнными - повтор через несколько тиков
+                logger.error(f"Ошибка завершения {len(batch)} задач специалистов: {e}")
+                self.stats['failed_batches'] += 1
+                for job in batch:
+                    job.due_tick = self.wheel.current_tick + RETRY_DELAY_TICKS
+                    self.wheel.add(job)
+        return len(due)
+
+    async def _run_loop(self):
+        while True:
+            try:
+                await asyncio.sleep(self.tick_seconds)
+                await self.run_due()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Ошибка тика таймеров специалистов: {e}")
+
+    # ---------- запуск процесса ----------
+
+    async def load_pending(self) -> int:
+        """Загрузить незавершённые задачи из specialist_jobs (keyset по id)"""
+        await self._ensure_client()
+        loaded = 0
+        last_id = 0
+        while True:
+            page = await self.client.execute_query(
+                table=JOBS_TABLE,
+                operation="select",
+                columns=["id", "user_id", "specialist_id", "kind", "due_at"],
+                filters={"finished_at": {"is": "null"}, "id": {"gt": last_id}},
+                order="id",
+                limit=LOAD_PAGE_SIZE
+            ) or []
+            for row in page:
+                self._track(row["id"], row["user_id"], row["specialist_id"], row["kind"], row["due_at"])
+            loaded += len(page)
+            if len(page) < LOAD_PAGE_SIZE:
+                break
+            last_id = page[-1]["id"]
+        self.stats['loaded'] += loaded
+        return loaded
+
+    async def start(self) -> None:
+        """Загрузить незавершённые задачи и запустить тики"""
+        loaded = await self.load_pending()
+        if loaded:
+            logger.info(f"⏱ Таймеры специалистов: загружено {loaded} задач")
+        if self._task is None:
+            self._task = asyncio.create_task(self._run_loop())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self.stats, 'pending': len(self.wheel)}
+
+
+# Глобальный экземпляр
+job_scheduler = JobScheduler(
+    tick_seconds=settings.JOB_TICK_SECONDS,
+    batch_size=settings.JOB_BATCH_SIZE
+)
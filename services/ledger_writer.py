@@ -0,0 +1,259 @@
+# services/ledger_writer.py
+"""
+Журнал операций банка - запись вне пути запроса
+
+Записи pool_transactions / bank_transactions и дельты счётчиков
+экономики (services/economy_counters.py) дописываются в локальный журнал
+процесса с fsync (групповой коммит: одновременные записи делят один
+fsync) - после await append() запись не потеряется при падении.
+Фоновая задача периодически закрывает текущий сегмент журнала и
+отправляет его пачками в ledger_apply_batch (004_ledger.sql): строки
+вставляются одним запросом, строка счётчиков pool_statistics обновляется
+один раз на пачку. Сегмент удаляется после подтверждения БД; при старте
+оставшиеся сегменты отправляются повторно (функция идемпотентна по id).
+"""
+
+import asyncio
+import json
+import logging
+import os
+import uuid
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from adapters.database.supabase.client import get_supabase_client
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+APPLY_FUNCTION = "ledger_apply_batch"
+LEDGER_TABLES = {"pool_transactions", "bank_transactions"}
+LEDGER_COUNTERS = {"total_rbtc_burned", "total_bank_ryabucks", "rbtc_in_circulation", "qpass_revenue_rbtc"}
+
+ACTIVE_NAME = "ledger.journal"
+SEALED_SUFFIX = ".sealed"
+
+
+class LedgerWriter:
+    """Локальный журнал с fsync и пакетная отправка в БД"""
+
+    def __init__(self, directory: str, flush_interval: float, batch_size: int):
+        self.directory = Path(directory)
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.client = None
+
+        self._file = None
+        self._pending: List[Tuple[bytes, asyncio.Future]] = []
+        self._sync_task: Optional[asyncio.Task] = None
+        self._flush_task: Optional[asyncio.Task] = None
+        self._journal_lock = asyncio.Lock()
+        self._flush_lock = asyncio.Lock()
+        self._seq = 0
+        # Дельты счётчиков, записанные в журнал, но ещё не применённые в БД
+        self._unapplied: Dict[str, Dict[str, Decimal]] = {}
+        self._pending_counters: Dict[str, Decimal] = {}
+
+        self.stats = {
+            'appended': 0,
+            'fsyncs': 0,
+            'batches': 0,
+            'applied': 0,
+            'duplicates': 0,
+            'failed_flushes': 0,
+            'corrupt_lines': 0
+        }
+
+    async def _ensure_client(self):
+        if not self.client:
+            self.client = await get_supabase_client()
+
+    # ---------- запись в журнал ----------
+
+    async def append(self, table: Optional[str], row: Optional[Dict[str, Any]] = None,
+                     counters: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Записать операцию в журнал. Возвращается после fsync.
+        table=None - только дельты счётчиков (без строки журнала).
+        """
+        if table is not None and table not in LEDGER_TABLES:
+            raise ValueError(f"Таблица {table} не поддерживается журналом")
+        if counters and not set(counters) <= LEDGER_COUNTERS:
+            raise ValueError(f"Неизвестные счётчики: {set(counters) - LEDGER_COUNTERS}")
+
+        entry = {"id": str(uuid.uuid4()), "table": table, "row": row or {}, "counters": counters or {}}
+        line = (json.dumps(entry, ensure_ascii=False, default=str) + "\n").encode()
+
+        # Дельты учитываются до записи: запись может уйти в БД раньше, чем вернётся await
+        if counters:
+            deltas = {name: Decimal(str(value)) for name, value in counters.items()}
+            self._unapplied[entry["id"]] = deltas
+            for name, delta in deltas.items():
+                self._pending_counters[name] = self._pending_counters.get(name, Decimal(0)) + delta
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((line, future))
+        if self._sync_task is None or self._sync_task.done():
+            self._sync_task = asyncio.create_task(self._sync_pending())
+        try:
+            await future
+        except Exception:
+            self._settle([entry])
+            raise
+
+    def pending_counters(self) -> Dict[str, Decimal]:
+        """Дельты счётчиков, ещё не дошедшие до БД (для текущих значений в памяти)"""
+        return dict(self._pending_counters)
+
+    def _settle(self, entries: List[Dict[str, Any]]) -> None:
+        """Убрать из ожидающих дельты записей, подтверждённых БД"""
+        for entry in entries:
+            deltas = self._unapplied.pop(entry.get("id"), None)
+            for name, delta in (deltas or {}).items():
+                self._pending_counters[name] -= delta
+
+    async def _sync_pending(self) -> None:
+        """Групповой коммит: все накопленные строки - одна запись и один fsync"""
+        async with self._journal_lock:
+            while self._pending:
+                batch, self._pending = self._pending, []
+                try:
+                    await asyncio.to_thread(self._write_sync, b"".join(line for line, _ in batch))
+                    self.stats['appended'] += len(batch)
+                    self.stats['fsyncs'] += 1
+                    for _, future in batch:
+                        if not future.done():
+                            future.set_result(None)
+                except Exception as e:
+                    logger.error(f"Ошибка записи журнала операций: {e}")
+                    for _, future in batch:
+                        if not future.done():
+                            future.set_exception(e)
+
+    def _open_active(self):
+        if self._file is None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.directory / ACTIVE_NAME, "ab")
+        return self._file
+
+    def _write_sync(self, data: bytes) -> None:
+        file = self._open_active()
+        file.write(data)
+        file.flush()
+        os.fsync(file.fileno())
+
+    def _seal_sync(self) -> Optional[Path]:
+        """Закрыть активный сегмент и переименовать его для отправки"""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+        active = self.directory / ACTIVE_NAME
+        if not active.exists() or active.stat().st_size == 0:
+            return None
+
+        self._seq += 1
+        sealed = self.directory / f"ledger.{self._seq:012d}.journal{SEALED_SUFFIX}"
+        os.replace(active, sealed)
+        self._fsync_directory()
+        return sealed
+
+    def _fsync_directory(self) -> None:
+        """fsync каталога: переименование сегмента переживает падение"""
+        fd = os.open(self.directory, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    def _sealed_segments(self) -> List[Path]:
+        if not self.directory.exists():
+            return []
+        return sorted(self.directory.glob(f"ledger.*{SEALED_SUFFIX}"))
+
+    def _read_segment(self, path: Path) -> List[Dict[str, Any]]:
+        entries = []
+        with open(path, "rb") as file:
+            for raw in file:
+                try:
+                    entries.append(json.loads(raw))
+                except ValueError:
+                    # Оборванная последняя строка после падения - записи не было
+                    self.stats['corrupt_lines'] += 1
+                    logger.warning(f"Пропущена повреждённая строка журнала в {path.name}")
+        return entries
+
+    # ---------- отправка в БД ----------
+
+    async def flush(self) -> int:
+        """Отправить журнал в БД, вернуть число применённых записей"""
+        async with self._flush_lock:
+            async with self._journal_lock:
+                await asyncio.to_thread(self._seal_sync)
+
+            applied = 0
+            for segment in self._sealed_segments():
+                try:
+                    entries = await asyncio.to_thread(self._read_segment, segment)
+                    for i in range(0, len(entries), self.batch_size):
+                        applied += await self._apply_batch(entries[i:i + self.batch_size])
+                    await asyncio.to_thread(segment.unlink)
+                except Exception as e:
+                    self.stats['failed_flushes'] += 1
+                    logger.error(f"Ошибка отправки журнала {segment.name}: {e}")
+                    break   # порядок сегментов сохраняется, повтор на следующем цикле
+            return applied
+
+    async def _apply_batch(self, entries: List[Dict[str, Any]]) -> int:
+        await self._ensure_client()
+        result = await self.client.execute_rpc(APPLY_FUNCTION, {"p_entries": entries})
+        if isinstance(result, list):
+            result = result[0] if result else {}
+        if not result or result.get("status") != "ok":
+            raise RuntimeError(f"{APPLY_FUNCTION} вернула {result}")
+
+        applied = int(result.get("applied", 0))
+        self._settle(entries)
+        self.stats['batches'] += 1
+        self.stats['applied'] += applied
+        self.stats['duplicates'] += int(result.get("skipped", 0))
+        return applied
+
+    async def _flush_loop(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    async def start(self) -> None:
+        """Отправить оставшееся с прошлого запуска и запустить фоновую отправку"""
+        segments = self._sealed_segments()
+        if segments:
+            self._seq = max(self._seq, *(int(p.name.split(".")[1]) for p in segments))
+        recovered = await self.flush()
+        if recovered:
+            logger.info(f"📒 Журнал операций: восстановлено {recovered} записей")
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_loop())
+
+    async def stop(self) -> None:
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+        if self._sync_task is not None:
+            await asyncio.gather(self._sync_task, return_exceptions=True)
+        await self.flush()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            'pending_segments': len(self._sealed_segments())
+        }
+
+
+# Глобальный экземпляр
+ledger_writer = LedgerWriter(
+    settings.LEDGER_JOURNAL_DIR,
+    flush_interval=settings.LEDGER_FLUSH_INTERVAL_SECONDS,
+    batch_size=settings.LEDGER_BATCH_SIZE
+)
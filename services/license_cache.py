@@ -0,0 +1,113 @@
+# services/license_cache.py
+"""
+Кэш уровней лицензий игроков
+
+Уровни лицензий игрока - массив байт фиксированной длины, индекс -
+порядковый номер типа лицензии (порядок LICENSE_CONFIG). Массив
+загружается из user_licenses один раз за сессию игрока, дальше любая
+проверка лицензии - чтение элемента массива. upgrade_license обновляет
+кэш сразу после записи в БД (write-through). Кэш общий для всех
+экземпляров LicenseService (экран ратуши, найм специалистов).
+"""
+
+import logging
+import time
+from array import array
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL_SECONDS = 1800        # сессия: повторная загрузка после простоя
+DEFAULT_MAX_USERS = 20000
+
+RowsLoader = Callable[[int], Awaitable[List[Dict[str, Any]]]]
+
+
+class LicenseLevels:
+    """Уровни всех лицензий одного игрока"""
+
+    __slots__ = ("_levels", "_index")
+
+    def __init__(self, index: Dict[str, int], levels: Optional[Iterable[int]] = None):
+        self._index = index
+        self._levels = array("B", levels if levels is not None else bytes(len(index)))
+
+    def level(self, license_type: str) -> int:
+        position = self._index.get(license_type)
+        return self._levels[position] if position is not None else 0
+
+    def set(self, license_type: str, level: int) -> None:
+        self._levels[self._index[license_type]] = level
+
+    def as_dict(self) -> Dict[str, int]:
+        """{тип: уровень} для лицензий с уровнем > 0"""
+        return {license_type: self._levels[i] for license_type, i in self._index.items() if self._levels[i]}
+
+    def copy(self) -> "LicenseLevels":
+        return LicenseLevels(self._index, self._levels)
+
+
+class LicenseCache:
+    """LRU-кэш LicenseLevels по user_id"""
+
+    def __init__(self, license_types: Sequence[str], ttl_seconds: float = DEFAULT_TTL_SECONDS,
+                 max_users: int = DEFAULT_MAX_USERS):
+        self.index = {license_type: i for i, license_type in enumerate(license_types)}
+        self.ttl_seconds = ttl_seconds
+        self.max_users = max_users
+        self._entries: "OrderedDict[int, Tuple[LicenseLevels, float]]" = OrderedDict()
+
+        self.stats = {
+            'hits': 0,
+            'loads': 0,
+            'write_through': 0,
+            'evictions': 0
+        }
+
+    def _from_rows(self, rows: List[Dict[str, Any]]) -> LicenseLevels:
+        levels = LicenseLevels(self.index)
+        for row in rows or []:
+            license_type = row.get("license_type")
+            if license_type in self.index:
+                levels.set(license_type, int(row.get("level") or 0))
+        return levels
+
+    async def get(self, user_id: int, loader: RowsLoader) -> LicenseLevels:
+        """Уровни игрока; при отсутствии в кэше - одна загрузка через loader"""
+        entry = self._entries.get(user_id)
+        if entry is not None and time.monotonic() < entry[1]:
+            self._entries.move_to_end(user_id)
+            self.stats['hits'] += 1
+            return entry[0]
+
+        levels = self._from_rows(await loader(user_id))
+        self.stats['loads'] += 1
+        self._store(user_id, levels)
+        return levels
+
+    def _store(self, user_id: int, levels: LicenseLevels) -> None:
+        self._entries[user_id] = (levels, time.monotonic() + self.ttl_seconds)
+        self._entries.move_to_end(user_id)
+        while len(self._entries) > self.max_users:
+            self._entries.popitem(last=False)
+            self.stats['evictions'] += 1
+
+    def set_level(self, user_id: int, license_type: str, level: int) -> None:
+        """Write-through после записи в user_licenses"""
+        entry = self._entries.get(user_id)
+        if entry is None:
+            return
+        updated = entry[0].copy()
+        updated.set(license_type, level)
+        self._entries[user_id] = (updated, entry[1])
+        self.stats['write_through'] += 1
+
+    def invalidate(self, user_id: Optional[int] = None) -> None:
+        if user_id is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(user_id, None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self.stats, 'users': len(self._entries)}
@@ -11,6 +11,11 @@ from decimal import Decimal
 from core.domain.entities import User
 from core.ports.repositories import UserRepository
 from services.event_tracker import get_event_tracker, EventType, EventSignificance
+from services.economy_counters import economy_counters
+from services.price_multipliers import price_multipliers
+from services.license_cache import LicenseCache, LicenseLevels
+from services.price_tables import LicensePriceTable, PriceTableCache, license_price
+from services.user_lanes import user_lanes
 from adapters.database.supabase.client import get_supabase_client
 
 logger = logging.getLogger(__name__)
@@ -121,6 +126,10 @@ LICENSE_CONFIG = {
     }
 }
 
+# Глобальные экземпляры (общие для всех LicenseService)
+license_cache = LicenseCache(tuple(LICENSE_CONFIG))
+license_price_tables = PriceTableCache(lambda multipliers: LicensePriceTable(LICENSE_CONFIG, multipliers))
+
 class LicenseService:
     """Система лицензий - правильная версия"""
 
@@ -128,9 +137,6 @@ class LicenseService:
         self.user_repository = user_repository
         self.event_tracker = None
         self.client = None
-        self.INITIAL_BANK_RYABUCKS = Decimal("1050000000")
-        self.TOTAL_RBTC_POOL = Decimal("18480000")
-        self.SMOOTHING_COEFFICIENT = 0.7
 
     async def _ensure_dependencies(self):
         """Подключаем зависимости"""
@@ -139,106 +145,48 @@ class LicenseService:
         if not self.client:
             self.client = await get_supabase_client()
 
-    async def calculate_price_multipliers(self) -> Dict[str, float]:
-        """Рассчитать мультипликаторы цен"""
-        try:
-            await self._ensure_dependencies()
-
-            pools = await self.client.execute_query(
-                table="global_pools",
-                operation="select"
-            )
-
-            total_bank_ryabucks = None
-
-            for pool in pools:
-                pool_name = pool.get("pool_name", "")
-                if pool_name == "total_bank_ryabucks":
-                    total_bank_ryabucks = Decimal(str(pool.get("ryabucks_amount", self.INITIAL_BANK_RYABUCKS)))
-
-            if total_bank_ryabucks is None:
-                total_bank_ryabucks = self.INITIAL_BANK_RYABUCKS
-
-            ryabucks_multiplier = max(0.2, min(5.0, float(total_bank_ryabucks / self.INITIAL_BANK_RYABUCKS)))
-            burned_rbtc = await self._get_total_burned_rbtc()
-            burn_ratio = min(1.0, float(burned_rbtc / self.TOTAL_RBTC_POOL))
-            rbtc_multiplier = max(0.1, 1.0 - (burn_ratio ** self.SMOOTHING_COEFFICIENT))
-
-            return {
-                "ryabucks": round(ryabucks_multiplier, 2),
-                "rbtc": round(rbtc_multiplier, 2),
-                "bank_ryabucks": float(total_bank_ryabucks),
-                "burned_rbtc": float(burned_rbtc)
-            }
-
-        except Exception as e:
-            logger.error(f"Ошибка расчёта мультипликаторов: {e}", exc_info=True)
-            return {
-                "ryabucks": 1.0,
-                "rbtc": 1.0,
-                "bank_ryabucks": float(self.INITIAL_BANK_RYABUCKS),
-                "burned_rbtc": 0.0
-            }
-
-    async def _get_total_burned_rbtc(self) -> Decimal:
-        """Получить сожженные RBTC"""
-        try:
-            stats = await self.client.execute_query(
-                table="pool_statistics",
-                operation="select",
-                single=True
-            )
-
-            if stats and "total_rbtc_burned" in stats:
-                return Decimal(str(stats.get("total_rbtc_burned", 0)))
-
-            return Decimal("0")
-        except:
-            return Decimal("0")
+    async def calculate_price_multipliers(self, version: Optional[int] = None) -> Dict[str, float]:
+        """Мультипликаторы цен (снимок из памяти; version - показанный игроку снимок)"""
+        snapshot = await price_multipliers.snapshot(version)
+        return snapshot.as_dict()
 
     def calculate_license_price(self, license_type: str, level: int, multipliers: Dict[str, float]) -> Tuple[int, Decimal]:
-        """Рассчитать стоимость лицензии"""
+        """Рассчитать стоимость лицензии (из таблицы цен версии мультипликаторов)"""
         if license_type not in LICENSE_CONFIG:
             return 0, Decimal("0")
-
-        config = LICENSE_CONFIG[license_type]
-        base_ryabucks = config["base_price_ryabucks"] * (2 ** (level - 1))
-        base_rbtc = config["base_price_rbtc"] * (2 ** (level - 1))
-
-        final_ryabucks = int(base_ryabucks * multipliers["ryabucks"])
-        final_rbtc = base_rbtc * Decimal(str(multipliers["rbtc"]))
-
-        return final_ryabucks, final_rbtc
-
-    async def get_user_licenses(self, user_id: int) -> Dict[str, int]:
-        """Получить лицензии пользователя"""
+        if multipliers.get("version") is None:
+            return license_price(LICENSE_CONFIG[license_type], level, multipliers)
+        return license_price_tables.get(multipliers).price(license_type, level)
+
+    async def _load_license_rows(self, user_id: int) -> List[Dict]:
+        await self._ensure_dependencies()
+        return await self.client.execute_query(
+            table="user_licenses",
+            operation="select",
+            columns=["license_type", "level"],
+            filters={"user_id": user_id}
+        )
+
+    async def get_license_levels(self, user_id: int) -> LicenseLevels:
+        """Уровни всех лицензий пользователя (из кэша, БД - раз за сессию)"""
         try:
-            await self._ensure_dependencies()
-
-            licenses_data = await self.client.execute_query(
-                table="user_licenses",
-                operation="select",
-                filters={"user_id": user_id}
-            )
-
-            licenses = {}
-            if licenses_data:
-                for license_data in licenses_data:
-                    licenses[license_data["license_type"]] = license_data["level"]
-
-            return licenses
-
+            return await license_cache.get(user_id, self._load_license_rows)
         except Exception as e:
             logger.error(f"Ошибка получения лицензий для {user_id}: {e}", exc_info=True)
-            return {}
+            return LicenseLevels(license_cache.index)
+
+    async def get_user_licenses(self, user_id: int) -> Dict[str, int]:
+        """Получить лицензии пользователя"""
+        return (await self.get_license_levels(user_id)).as_dict()
 
     async def get_license_level(self, user_id: int, license_type: str) -> int:
         """Получить уровень лицензии"""
-        licenses = await self.get_user_licenses(user_id)
-        return licenses.get(license_type, 0)
+        return (await self.get_license_levels(user_id)).level(license_type)
 
-    async def upgrade_license(self, user_id: int, license_type: str, currency: str) -> Tuple[bool, str]:
-        """Улучшить лицензию пользователя"""
+    @user_lanes.serialized
+    async def upgrade_license(self, user_id: int, license_type: str, currency: str,
+                              multipliers_version: Optional[int] = None) -> Tuple[bool, str]:
+        """Улучшить лицензию пользователя (по ценам снимка multipliers_version)"""
         try:
             await self._ensure_dependencies()
 
@@ -246,14 +194,20 @@ class LicenseService:
                 return False, "Неизвестный тип лицензии"
 
             config = LICENSE_CONFIG[license_type]
-            current_level = await self.get_license_level(user_id, license_type)
+            # Без подстановки пустых уровней: иначе купленная лицензия сочтётся нулевой
+            try:
+                levels = await license_cache.get(user_id, self._load_license_rows)
+            except Exception as e:
+                logger.error(f"Не удалось загрузить лицензии {user_id} для улучшения: {e}")
+                return False, "Не удалось загрузить лицензии, попробуйте позже"
+            current_level = levels.level(license_type)
             next_level = current_level + 1
 
             if next_level > config["max_level"]:
                 return False, f"Максимальный уровень достигнут ({config['max_level']})"
 
-            # Рассчитываем цены
-            multipliers = await self.calculate_price_multipliers()
+            # Рассчитываем цены по тому же снимку, что видел игрок
+            multipliers = await self.calculate_price_multipliers(multipliers_version)
             ryabucks_price, rbtc_price = self.calculate_license_price(license_type, next_level, multipliers)
 
             # Проверяем баланс пользователя
@@ -284,39 +238,24 @@ class LicenseService:
                 new_rbtc = user.resources.rbtc.amount - rbtc_price
                 await self.user_repository.update_resources(
                     user_id=user_id,
-                    updates={"rbtc": float(new_rbtc)}
+                    updates={"rbtc": new_rbtc}
                 )
 
                 # Записываем сжигание RBTC
                 await self._record_rbtc_burn(user_id, rbtc_price, f"license_{license_type}")
 
-            # Проверяем существует ли лицензия
-            existing_license = await self.client.execute_query(
+            # Одна строка на (user_id, license_type) независимо от кэша
+            await self.client.execute_query(
                 table="user_licenses",
-                operation="select",
-                filters={"user_id": user_id, "license_type": license_type},
-                single=True
+                operation="upsert",
+                data={
+                    "user_id": user_id,
+                    "license_type": license_type,
+                    "level": next_level
+                },
+                on_conflict="user_id,license_type"
             )
-
-            if existing_license:
-                # Обновляем существующую лицензию
-                await self.client.execute_query(
-                    table="user_licenses",
-                    operation="update",
-                    data={"level": next_level},
-                    filters={"user_id": user_id, "license_type": license_type}
-                )
-            else:
-                # Создаём новую лицензию
-                await self.client.execute_query(
-                    table="user_licenses",
-                    operation="insert",
-                    data={
-                        "user_id": user_id,
-                        "license_type": license_type,
-                        "level": next_level
-                    }
-                )
+            license_cache.set_level(user_id, license_type, next_level)
 
             # Трекаем событие
             if self.event_tracker:
@@ -336,78 +275,23 @@ class LicenseService:
             return False, f"Техническая ошибка: {str(e)}"
 
     async def _record_rbtc_burn(self, user_id: int, amount: Decimal, reason: str):
-        """Записать сжигание RBTC"""
+        """Записать сжигание RBTC (журнал и счётчики - пакетом в фоне)"""
         try:
-            stats = await self.client.execute_query(
-                table="pool_statistics",
-                operation="select",
-                single=True
-            )
-
-            if stats:
-                current_burned = Decimal(str(stats.get("total_rbtc_burned", 0)))
-                new_burned = current_burned + amount
-
-                await self.client.execute_query(
-                    table="pool_statistics",
-                    operation="update",
-                    data={"total_rbtc_burned": float(new_burned)},
-                    filters={"id": stats["id"]}
-                )
-            else:
-                await self.client.execute_query(
-                    table="pool_statistics",
-                    operation="insert",
-                    data={"total_rbtc_burned": float(amount)}
-                )
-
+            await economy_counters.record_burn(user_id, amount, reason)
             logger.info(f"🔥 Сожжено {amount} RBTC ({reason})")
 
         except Exception as e:
             logger.warning(f"Не удалось записать сжигание RBTC: {e}")
 
-    async def get_licenses_for_display(self, user_id: int) -> List[Dict]:
-        """Получить лицензии для отображения"""
+    async def get_licenses_for_display(self, user_id: int, multipliers: Optional[Dict[str, float]] = None) -> List[Dict]:
+        """Получить лицензии для отображения (готовые строки таблицы цен)"""
         try:
-            multipliers = await self.calculate_price_multipliers()
-            current_licenses = await self.get_user_licenses(user_id)
-
-            result = []
-
-            for license_type, config in LICENSE_CONFIG.items():
-                current_level = current_licenses.get(license_type, 0)
-
-                if current_level >= config["max_level"]:
-                    result.append({
-                        "type": license_type,
-                        "icon": config["icon"],
-                        "name": config["name"],
-                        "current_level": current_level,
-                        "max_level": config["max_level"],
-                        "ryabucks_price": "MAX",
-                        "rbtc_price": "MAX",
-                        "telegra_link": config["telegra_link"],
-                        "is_max": True
-                    })
-                else:
-                    next_level = current_level + 1
-                    ryabucks_price, rbtc_price = self.calculate_license_price(license_type, next_level, multipliers)
-
-                    result.append({
-                        "type": license_type,
-                        "icon": config["icon"],
-                        "name": config["name"],
-                        "current_level": current_level,
-                        "max_level": config["max_level"],
-                        "ryabucks_price": f"{ryabucks_price:,}",
-                        "rbtc_price": f"{float(rbtc_price):.2f}",
-                        "ryabucks_price_raw": ryabucks_price,
-                        "rbtc_price_raw": float(rbtc_price),
-                        "telegra_link": config["telegra_link"],
-                        "is_max": False
-                    })
-
-            return result
+            if multipliers is None:
+                multipliers = await self.calculate_price_multipliers()
+            table = license_price_tables.get(multipliers)
+            levels = await self.get_license_levels(user_id)
+
+            return [table.display_row(license_type, levels.level(license_type)) for license_type in table.types]
 
         except Exception as e:
             logger.error(f"Ошибка получения лицензий: {e}", exc_info=True)
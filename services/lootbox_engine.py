@@ -0,0 +1,177 @@
+# services/lootbox_engine.py
+"""
+Таблицы выпадения коробок и розыгрыш открытия
+
+Таблица каждой коробки при импорте компилируется в alias-таблицу Воуза:
+вероятность и альтернатива на каждый слот. Розыгрыш одной коробки -
+случайный слот и одно сравнение, O(1) независимо от размера таблицы.
+Открытие N коробок - один пакетный розыгрыш на N позиций: слоты,
+количества в пределах [min, max] записи (RBTC - целым числом шагов
+RBTC_STEP) и сумма по наградам. Итог
+открытия - словарь «награда -> количество» (RBTC - в микро-единицах),
+который записывается одним вызовом open_lootboxes (012_lootboxes.sql).
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Dict, Sequence, Tuple
+
+import numpy as np
+
+from core.domain.money import MICRO, Money
+
+logger = logging.getLogger(__name__)
+
+RBTC = "rbtc"
+RYABUCKS = "ryabucks"
+
+# Награды, которые пишутся в колонки users; остальные - в user_items
+USER_COLUMNS = (RYABUCKS, RBTC)
+
+RBTC_STEP = MICRO // 10_000       # RBTC из коробок - до 4 знаков
+
+# Таблицы выпадения: (награда, минимум, максимум, вес). Ключ - предмет
+# коробки в user_items, он же поле раздела «Коробки» рюкзака
+LOOTBOX_TABLES = {
+    "free_boxes": [
+        (RYABUCKS, 50, 200, 60),
+        ("grain_seeds", 1, 5, 20),
+        ("eggs", 1, 3, 12),
+        ("golden_shards", 1, 1, 6),
+        (RBTC, Money.of("0.0001"), Money.of("0.001"), 2)
+    ],
+    "farm_boxes": [
+        (RYABUCKS, 100, 400, 35),
+        ("grain_seeds", 3, 10, 20),
+        ("tomato_seeds", 2, 6, 15),
+        ("potato_seeds", 2, 6, 15),
+        ("farm_passes", 1, 1, 10),
+        (RBTC, Money.of("0.0005"), Money.of("0.002"), 5)
+    ],
+    "work_boxes": [
+        (RYABUCKS, 200, 800, 55),
+        ("golden_shards", 1, 2, 25),
+        ("expedition_passes", 1, 1, 15),
+        (RBTC, Money.of("0.001"), Money.of("0.005"), 5)
+    ],
+    "rbtc_boxes": [
+        (RBTC, Money.of("0.01"), Money.of("0.05"), 60),
+        (RBTC, Money.of("0.05"), Money.of("0.2"), 30),
+        (RBTC, Money.of("0.2"), Money.of("1"), 9),
+        ("golden_keys", 1, 1, 1)
+    ],
+    "expedition_boxes": [
+        (RYABUCKS, 300, 1000, 40),
+        ("expedition_passes", 1, 2, 25),
+        ("golden_shards", 1, 3, 20),
+        (RBTC, Money.of("0.005"), Money.of("0.02"), 15)
+    ],
+    "fight_boxes": [
+        (RYABUCKS, 300, 1000, 45),
+        ("fight_passes", 1, 2, 30),
+        ("golden_shards", 1, 3, 15),
+        (RBTC, Money.of("0.01"), Money.of("0.05"), 10)
+    ],
+    "race_boxes": [
+        (RYABUCKS, 300, 1000, 45),
+        ("race_passes", 1, 2, 30),
+        ("golden_shards", 1, 3, 15),
+        (RBTC, Money.of("0.01"), Money.of("0.05"), 10)
+    ],
+    "pass_boxes": [
+        ("expedition_passes", 1, 1, 25),
+        ("farm_passes", 1, 1, 20),
+        ("anomaly_passes", 1, 1, 15),
+        ("city_passes", 1, 1, 15),
+        ("forest_passes", 1, 1, 10),
+        ("sea_passes", 1, 1, 5),
+        ("fight_passes", 1, 1, 5),
+        ("race_passes", 1, 1, 5)
+    ]
+}
+
+
+@dataclass(frozen=True)
+class AliasTable:
+    """Alias-таблица Воуза: слот i выпадает с prob[i], иначе alias[i]"""
+    prob: np.ndarray        # float64
+    alias: np.ndarray       # int32
+
+    @classmethod
+    def build(cls, weights: Sequence[float]) -> "AliasTable":
+        weights = np.asarray(weights, dtype=np.float64)
+        if len(weights) == 0 or (weights < 0).any() or weights.sum() <= 0:
+            raise ValueError("Веса таблицы выпадения должны быть неотрицательны и не все нулевые")
+
+        k = len(weights)
+        scaled = weights * k / weights.sum()
+        prob = np.ones(k)
+        alias = np.arange(k, dtype=np.int32)
+
+        small = [i for i in range(k) if scaled[i] < 1.0]
+        large = [i for i in range(k) if scaled[i] >= 1.0]
+        while small and large:
+            less, more = small.pop(), large.pop()
+            prob[less] = scaled[less]
+            alias[less] = more
+            scaled[more] -= 1.0 - scaled[less]
+            (small if scaled[more] < 1.0 else large).append(more)
+        # Остатки - погрешность округления, их слоты выпадают всегда
+        return cls(prob=prob, alias=alias)
+
+    def sample(self, rng: np.random.Generator, size: int) -> np.ndarray:
+        slots = rng.integers(0, len(self.prob), size=size)
+        keep = rng.random(size) < self.prob[slots]
+        return np.where(keep, slots, self.alias[slots])
+
+
+@dataclass(frozen=True)
+class LootTable:
+    """Скомпилированная таблица выпадения одной коробки"""
+    box: str
+    rewards: Tuple[str, ...]        # награды таблицы без повторов
+    reward_code: np.ndarray         # int16, индекс в rewards по записи
+    low: np.ndarray                 # int64, минимум записи в шагах
+    span: np.ndarray                # int64, число значений max - min + 1 в шагах
+    step: np.ndarray                # int64, шаг количества (RBTC - RBTC_STEP микро)
+    alias: AliasTable
+
+    @classmethod
+    def compile(cls, box: str, entries: Sequence[Tuple[str, object, object, float]]) -> "LootTable":
+        def units(value) -> int:
+            return value.micro if isinstance(value, Money) else int(value)
+
+        rewards = tuple(dict.fromkeys(reward for reward, _, _, _ in entries))
+        step = np.array([RBTC_STEP if reward == RBTC else 1 for reward, _, _, _ in entries], dtype=np.int64)
+        # Границы в целых шагах: минимум вверх, максимум вниз
+        low = -(-np.array([units(low) for _, low, _, _ in entries], dtype=np.int64) // step)
+        high = np.array([units(high) for _, _, high, _ in entries], dtype=np.int64) // step
+        if (high < low).any():
+            raise ValueError(f"{box}: максимум награды меньше минимума")
+        return cls(
+            box=box,
+            rewards=rewards,
+            reward_code=np.array([rewards.index(reward) for reward, _, _, _ in entries], dtype=np.int16),
+            low=low,
+            span=high - low + 1,
+            step=step,
+            alias=AliasTable.build([weight for _, _, _, weight in entries])
+        )
+
+    def draw(self, count: int, rng: np.random.Generator) -> Dict[str, int]:
+        """Открыть count коробок: награда -> сумма (RBTC - микро-единицы)"""
+        if count <= 0:
+            return {}
+        slots = self.alias.sample(rng, count)
+        # Целое число шагов в [min, max] - все значения RBTC равновероятны
+        amounts = (self.low[slots] + rng.integers(0, self.span[slots])) * self.step[slots]
+
+        totals = np.zeros(len(self.rewards), dtype=np.int64)
+        np.add.at(totals, self.reward_code[slots], amounts)
+        return {reward: int(total) for reward, total in zip(self.rewards, totals) if total > 0}
+
+
+# Таблицы компилируются один раз при импорте
+LOOT_TABLES: Dict[str, LootTable] = {
+    box: LootTable.compile(box, entries) for box, entries in LOOTBOX_TABLES.items()
+}
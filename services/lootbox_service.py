@@ -0,0 +1,129 @@
+# services/lootbox_service.py
+"""
+Открытие коробок игрока
+
+Награды всех открываемых коробок разыгрываются одним пакетным
+розыгрышем (services/lootbox_engine.py) и записываются одним вызовом
+open_lootboxes (012_lootboxes.sql): открыть 100 коробок стоит столько же
+запросов к БД, сколько открыть одну. RBTC ограничен остатком пула
+лутбоксов - при исчерпании пула игрок получает остаток, а остальные
+награды начисляются полностью.
+"""
+
+import logging
+import uuid
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from adapters.database.supabase.client import get_supabase_client
+from core.domain.money import Money
+from services.lootbox_engine import LOOT_TABLES, RBTC, RYABUCKS, USER_COLUMNS
+
+logger = logging.getLogger(__name__)
+
+OPEN_FUNCTION = "open_lootboxes"
+GRANT_FUNCTION = "grant_lootboxes"
+
+MAX_BOXES_PER_OPEN = 1000
+
+# open_id вызывающего (id нажатия кнопки) -> UUID ключа lootbox_openings
+OPEN_ID_NAMESPACE = uuid.UUID("5b0f3c1e-7a52-4d8e-9c61-2f4a8e0d93b7")
+
+
+class LootboxService:
+    """Коробки: выдача и открытие"""
+
+    def __init__(self, seed: Optional[int] = None):
+        self.client = None
+        self.rng = np.random.default_rng(seed)
+
+    async def _ensure_client(self):
+        if not self.client:
+            self.client = await get_supabase_client()
+
+    async def grant_boxes(self, user_id: int, box_item: str, count: int = 1) -> bool:
+        """Выдать игроку коробки"""
+        if box_item not in LOOT_TABLES or count <= 0:
+            return False
+        try:
+            await self._ensure_client()
+            response = await self.client.execute_rpc(GRANT_FUNCTION, {
+                "p_user_id": user_id,
+                "p_box_item": box_item,
+                "p_count": count
+            })
+            if isinstance(response, list):
+                response = response[0] if response else {}
+            return (response or {}).get("status") == "ok"
+
+        except Exception as e:
+            logger.error(f"Ошибка выдачи коробок {box_item} игроку {user_id}: {e}")
+            return False
+
+    async def open_boxes(self, user_id: int, box_item: str, count: int, open_id: str) -> Dict[str, Any]:
+        """
+        Открыть count коробок одним запросом.
+        open_id - ключ идемпотентности от вызывающего (id нажатия кнопки):
+        повтор с тем же open_id ничего не списывает и возвращает награды
+        первого открытия (boxes_left при этом None).
+        Возвращает status (ok / not_enough_boxes / unknown_box / error),
+        rewards (награда -> количество, RBTC - Money) и rbtc_capped
+        """
+        table = LOOT_TABLES.get(box_item)
+        if table is None or not 0 < count <= MAX_BOXES_PER_OPEN:
+            return {"status": "unknown_box"}
+
+        try:
+            await self._ensure_client()
+            drawn = table.draw(count, self.rng)
+            items = {reward: amount for reward, amount in drawn.items() if reward not in USER_COLUMNS}
+
+            response = await self.client.execute_rpc(OPEN_FUNCTION, {
+                "p_open_id": str(uuid.uuid5(OPEN_ID_NAMESPACE, f"{user_id}:{open_id}")),
+                "p_user_id": user_id,
+                "p_box_item": box_item,
+                "p_count": count,
+                "p_ryabucks": drawn.get(RYABUCKS, 0),
+                "p_rbtc": str(Money(drawn.get(RBTC, 0))),
+                "p_items": items
+            })
+            if isinstance(response, list):
+                response = response[0] if response else {}
+            response = response or {}
+
+            status = response.get("status", "error")
+            if status == "ok":
+                stored = {**items, RYABUCKS: drawn.get(RYABUCKS, 0)}
+            elif status == "duplicate":
+                # Повтор нажатия - награды уже начислены первым вызовом
+                stored = response.get("rewards") or {}
+                logger.info(f"📦 Повтор открытия {open_id} игроком {user_id}")
+            else:
+                return {"status": status, "available": response.get("available", 0)}
+
+            rewards: Dict[str, Any] = {reward: amount for reward, amount in stored.items() if amount}
+            rbtc = Money.of(response.get("rbtc") or 0)
+            if rbtc:
+                rewards[RBTC] = rbtc
+
+            if status == "ok":
+                if response.get("rbtc_capped"):
+                    logger.warning(
+                        f"Пул лутбоксов исчерпан: игроку {user_id} выдано {rbtc} из {Money(drawn[RBTC])} RBTC"
+                    )
+                logger.info(f"📦 Игрок {user_id} открыл {count} x {box_item}")
+            return {
+                "status": "ok",
+                "rewards": rewards,
+                "boxes_left": response.get("boxes_left"),
+                "rbtc_capped": bool(response.get("rbtc_capped"))
+            }
+
+        except Exception as e:
+            logger.error(f"Ошибка открытия коробок {box_item} игроком {user_id}: {e}")
+            return {"status": "error"}
+
+
+# Глобальный экземпляр
+lootbox_service = LootboxService()
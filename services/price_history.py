@@ -0,0 +1,326 @@
+# services/price_history.py
+"""
+История курса RBTC - свечи OHLC и объём
+
+Свечи 1m / 1h / 1d обновляются в памяти при каждой сделке банка (O(1) на
+интервал), изменённые свечи периодически сохраняются в price_candles
+одним upsert. История восстанавливается из pool_transactions потоковым
+обходом (keyset по id), графики отдаются из памяти за O(свечей).
+"""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from adapters.database.supabase.client import get_supabase_client
+from core.domain.money import Money
+
+logger = logging.getLogger(__name__)
+
+INTERVALS = {"1m": 60, "1h": 3600, "1d": 86400}
+RETENTION = {"1m": 1440, "1h": 720, "1d": 365}   # сутки минуток, месяц часовых, год дневных
+
+FLUSH_INTERVAL_SECONDS = 30
+BACKFILL_PAGE_SIZE = 1000
+TRADE_TYPES = ["buy_rbtc", "sell_rbtc"]
+
+
+class Candle:
+    """Свеча за один интервал"""
+
+    __slots__ = ("bucket_start", "open", "high", "low", "close",
+                 "volume_rbtc", "volume_ryabucks", "trades")
+
+    def __init__(self, bucket_start: int, price: Decimal):
+        self.bucket_start = bucket_start
+        self.open = self.high = self.low = self.close = price
+        self.volume_rbtc = Money()
+        self.volume_ryabucks = 0
+        self.trades = 0
+
+    def add(self, price: Decimal, rbtc_amount: Money, ryabucks_amount: int) -> None:
+        if price > self.high:
+            self.high = price
+        if price < self.low:
+            self.low = price
+        self.close = price
+        self.volume_rbtc += rbtc_amount
+        self.volume_ryabucks += ryabucks_amount
+        self.trades += 1
+
+    def to_row(self, interval: str) -> Dict[str, Any]:
+        return {
+            "interval": interval,
+            "bucket_start": datetime.fromtimestamp(self.bucket_start, timezone.utc).isoformat(),
+            "open": str(self.open),
+            "high": str(self.high),
+            "low": str(self.low),
+            "close": str(self.close),
+            "volume_rbtc": str(self.volume_rbtc),
+            "volume_ryabucks": self.volume_ryabucks,
+            "trades": self.trades,
+            "updated_at": datetime.now(timezone.utc).isoformat()
+        }
+
+    @classmethod
+    def from_row(cls, row: Dict[str, Any]) -> "Candle":
+        candle = cls(_timestamp(row["bucket_start"]), Decimal(str(row["open"])))
+        candle.high = Decimal(str(row["high"]))
+        candle.low = Decimal(str(row["low"]))
+        candle.close = Decimal(str(row["close"]))
+        candle.volume_rbtc = Money.of(row.get("volume_rbtc"))
+        candle.volume_ryabucks = int(row.get("volume_ryabucks") or 0)
+        candle.trades = int(row.get("trades") or 0)
+        return candle
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "time": self.bucket_start,
+            "open": self.open,
+            "high": self.high,
+            "low": self.low,
+            "close": self.close,
+            "volume_rbtc": self.volume_rbtc,
+            "volume_ryabucks": self.volume_ryabucks,
+            "trades": self.trades
+        }
+
+
+def _timestamp(value: Any) -> int:
+    if isinstance(value, datetime):
+        dt = value
+    else:
+        dt = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return int(dt.timestamp())
+
+
+class CandleSeries:
+    """Свечи одного интервала по возрастанию времени, ограниченные retention"""
+
+    def __init__(self, seconds: int, retention: int):
+        self.seconds = seconds
+        self.retention = retention
+        self._candles: "OrderedDict[int, Candle]" = OrderedDict()
+
+    def bucket(self, ts: int) -> int:
+        return ts - ts % self.seconds
+
+    def add(self, ts: int, price: Decimal, rbtc_amount: Money, ryabucks_amount: int) -> int:
+        bucket = self.bucket(ts)
+        candle = self._candles.get(bucket)
+        if candle is None:
+            candle = Candle(bucket, price)
+            self.put(candle)
+        candle.add(price, rbtc_amount, ryabucks_amount)
+        return bucket
+
+    def put(self, candle: Candle) -> None:
+        late = self._candles and candle.bucket_start < next(reversed(self._candles))
+        self._candles[candle.bucket_start] = candle
+        if late:
+            # Редкий случай: сделка из прошлого интервала
+            self._candles = OrderedDict(sorted(self._candles.items()))
+        while len(self._candles) > self.retention:
+            self._candles.popitem(last=False)
+
+    def get(self, bucket: int) -> Optional[Candle]:
+        return self._candles.get(bucket)
+
+    def drop_before(self, bucket: Optional[int]) -> None:
+        """Выбросить свечи старше bucket (None - все)"""
+        while self._candles:
+            oldest = next(iter(self._candles))
+            if bucket is not None and oldest >= bucket:
+                break
+            self._candles.popitem(last=False)
+
+    def last(self, limit: int) -> List[Candle]:
+        result = []
+        for bucket in reversed(self._candles):
+            if len(result) >= limit:
+                break
+            result.append(self._candles[bucket])
+        result.reverse()
+        return result
+
+    def __len__(self) -> int:
+        return len(self._candles)
+
+
+class PriceHistory:
+    """Свечи курса: инкрементально в памяти, периодически в price_candles"""
+
+    def __init__(self, intervals: Dict[str, int] = INTERVALS, retention: Dict[str, int] = RETENTION):
+        self.client = None
+        self.series = {name: CandleSeries(seconds, retention[name]) for name, seconds in intervals.items()}
+        self._dirty: Set[Tuple[str, int]] = set()
+        self._flush_task: Optional[asyncio.Task] = None
+
+        self.stats = {
+            'trades': 0,
+            'flushes': 0,
+            'rows_written': 0,
+            'backfilled': 0
+        }
+
+    async def _ensure_client(self):
+        if not self.client:
+            self.client = await get_supabase_client()
+
+    def record_trade(self, price: Decimal, rbtc_amount, ryabucks_amount: int, at: Optional[float] = None) -> None:
+        """Учесть сделку во всех интервалах"""
+        ts = int(at if at is not None else time.time())
+        rbtc_amount = Money.of(rbtc_amount)
+        for name, series in self.series.items():
+            bucket = series.add(ts, price, rbtc_amount, ryabucks_amount)
+            self._dirty.add((name, bucket))
+        self.stats['trades'] += 1
+
+    async def get_candles(self, interval: str, limit: int = 60) -> List[Dict[str, Any]]:
+        """Последние limit свечей интервала (из памяти, при пустой памяти - из БД)"""
+        if interval not in self.series:
+            raise ValueError(f"Неизвестный интервал: {interval}")
+
+        series = self.series[interval]
+        if not len(series):
+            await self._load_series(interval, series)
+        return [candle.as_dict() for candle in series.last(limit)]
+
+    async def flush(self) -> int:
+        """Сохранить изменённые свечи одним upsert"""
+        if not self._dirty:
+            return 0
+
+        dirty, self._dirty = self._dirty, set()
+        rows = []
+        for name, bucket in dirty:
+            candle = self.series[name].get(bucket)
+            if candle is not None:
+                rows.append(candle.to_row(name))
+
+        try:
+            await self._ensure_client()
+            if rows:
+                await self.client.execute_query(table="price_candles", operation="upsert", data=rows)
+            self.stats['flushes'] += 1
+            self.stats['rows_written'] += len(rows)
+            return len(rows)
+
+        except Exception as e:
+            logger.error(f"Ошибка сохранения свечей ({len(rows)} шт.): {e}")
+            self._dirty |= dirty
+            return 0
+
+    async def load_recent(self) -> None:
+        """Загрузить последние свечи каждого интервала (продолжение после рестарта)"""
+        for name, series in self.series.items():
+            await self._load_series(name, series)
+
+    async def _load_series(self, name: str, series: CandleSeries) -> None:
+        try:
+            await self._ensure_client()
+            rows = await self.client.execute_query(
+                table="price_candles",
+                operation="select",
+                filters={"interval": name},
+                order="-bucket_start",
+                limit=series.retention
+            )
+            for row in reversed(rows or []):
+                series.put(Candle.from_row(row))
+        except Exception as e:
+            logger.error(f"Ошибка загрузки свечей {name}: {e}")
+
+    async def backfill(self, page_size: int = BACKFILL_PAGE_SIZE) -> int:
+        """
+        Пересобрать свечи из pool_transactions.
+        Журнал читается страницами по id; завершённые свечи пишутся после
+        каждой страницы и не держатся в памяти.
+        """
+        await self._ensure_client()
+        building = {name: CandleSeries(series.seconds, retention=10 ** 9) for name, series in self.series.items()}
+        last_id = 0
+        processed = 0
+
+        while True:
+            page = await self.client.execute_query(
+                table="pool_transactions",
+                operation="select",
+                columns=["id", "transaction_type", "rbtc_amount", "ryabucks_amount", "created_at"],
+                filters={"id": {"gt": last_id}, "transaction_type": {"in": TRADE_TYPES}},
+                order="id",
+                limit=page_size
+            )
+            if not page:
+                break
+
+            current = {}
+            for row in page:
+                last_id = row["id"]
+                rbtc = Money.of(row.get("rbtc_amount"))
+                ryabucks = int(row.get("ryabucks_amount") or 0)
+                if rbtc <= 0 or not row.get("created_at"):
+                    continue
+                ts = _timestamp(row["created_at"])
+                price = Decimal(ryabucks) / rbtc.to_decimal()
+                for name, series in building.items():
+                    current[name] = series.add(ts, price, rbtc, ryabucks)
+                processed += 1
+
+            await self._write_completed(building, current)
+            if len(page) < page_size:
+                break
+
+        await self._write_completed(building, {})
+        self.stats['backfilled'] += processed
+
+        # Память заново из БД - в ней уже полная история
+        self.series = {name: CandleSeries(s.seconds, s.retention) for name, s in self.series.items()}
+        self._dirty.clear()
+        await self.load_recent()
+
+        logger.info(f"📈 Свечи пересобраны из {processed} сделок")
+        return processed
+
+    async def _write_completed(self, building: Dict[str, CandleSeries], current: Dict[str, int]) -> None:
+        """Записать свечи; все, кроме текущих (ещё пополняемых), выбросить из памяти"""
+        rows = []
+        for name, series in building.items():
+            rows.extend(candle.to_row(name) for candle in series.last(len(series)))
+            series.drop_before(current.get(name))
+        for i in range(0, len(rows), BACKFILL_PAGE_SIZE):
+            await self.client.execute_query(table="price_candles", operation="upsert", data=rows[i:i + BACKFILL_PAGE_SIZE])
+        self.stats['rows_written'] += len(rows)
+
+    async def _flush_loop(self, interval: float):
+        while True:
+            await asyncio.sleep(interval)
+            await self.flush()
+
+    async def start(self, flush_interval: float = FLUSH_INTERVAL_SECONDS) -> None:
+        await self.load_recent()
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_loop(flush_interval))
+
+    async def stop(self) -> None:
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+        await self.flush()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            'pending': len(self._dirty),
+            'candles': {name: len(series) for name, series in self.series.items()}
+        }
+
+
+# Глобальный экземпляр
+price_history = PriceHistory()
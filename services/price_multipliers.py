@@ -0,0 +1,157 @@
+# services/price_multipliers.py
+"""
+Мультипликаторы цен лицензий и специалистов
+
+Мультипликаторы зависят только от счётчиков экономики (общий банк
+рябаксов и сожжённые RBTC), поэтому держатся в памяти готовым снимком
+и пересчитываются, когда счётчики изменились (проверка не чаще TTL).
+Каждый пересчёт получает новый номер версии; экран цен передаёт версию
+в callback, и покупка считается по тому же снимку без запросов к БД.
+Версия из callback не доверенная (её задаёт клиент), поэтому принимаются
+только текущая версия и предыдущая - недолго после смены, чтобы цена не
+менялась между показом и нажатием. Любая другая версия - текущий снимок.
+"""
+
+import logging
+import time
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Any, Dict, Optional, Tuple
+
+from services.economy_counters import economy_counters
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL_SECONDS = 5.0
+PREVIOUS_VERSION_GRACE_SECONDS = 60     # сколько после смены принимается предыдущая версия
+
+INITIAL_BANK_RYABUCKS = Decimal("1050000000")
+TOTAL_RBTC_POOL = Decimal("18480000")
+SMOOTHING_COEFFICIENT = 0.7
+
+
+@dataclass(frozen=True)
+class PriceMultipliers:
+    """Снимок мультипликаторов"""
+    version: int
+    ryabucks: float
+    rbtc: float
+    bank_ryabucks: float
+    burned_rbtc: float
+    computed_at: float
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "ryabucks": self.ryabucks,
+            "rbtc": self.rbtc,
+            "bank_ryabucks": self.bank_ryabucks,
+            "burned_rbtc": self.burned_rbtc,
+            "version": self.version
+        }
+
+
+def compute_multipliers(bank_ryabucks: Decimal, burned_rbtc: Decimal) -> Tuple[float, float]:
+    """Мультипликаторы (рябаксы, RBTC) по общему банку и сожжённым RBTC"""
+    ryabucks_multiplier = max(0.2, min(5.0, float(bank_ryabucks / INITIAL_BANK_RYABUCKS)))
+    burn_ratio = min(1.0, float(burned_rbtc / TOTAL_RBTC_POOL))
+    rbtc_multiplier = max(0.1, 1.0 - (burn_ratio ** SMOOTHING_COEFFICIENT))
+    return round(ryabucks_multiplier, 2), round(rbtc_multiplier, 2)
+
+
+class PriceMultiplierEngine:
+    """Текущие мультипликаторы с версией и предыдущий снимок"""
+
+    def __init__(self, ttl_seconds: float = DEFAULT_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self._current: Optional[PriceMultipliers] = None
+        self._inputs: Optional[Tuple[Decimal, Decimal]] = None
+        self._checked_at = 0.0
+        self._version = 0
+        self._previous: Optional[PriceMultipliers] = None
+
+        self.stats = {
+            'hits': 0,
+            'checks': 0,
+            'recomputes': 0,
+            'snapshot_hits': 0,
+            'snapshot_misses': 0
+        }
+
+    async def current(self) -> PriceMultipliers:
+        """Актуальный снимок; счётчики проверяются не чаще TTL"""
+        now = time.monotonic()
+        if self._current is not None and now - self._checked_at < self.ttl_seconds:
+            self.stats['hits'] += 1
+            return self._current
+
+        self.stats['checks'] += 1
+        try:
+            counters = await economy_counters.get()
+            inputs = (
+                Decimal(counters["total_bank_ryabucks"] or INITIAL_BANK_RYABUCKS),
+                counters["total_rbtc_burned"].to_decimal()
+            )
+        except Exception as e:
+            logger.error(f"Ошибка чтения счётчиков для мультипликаторов: {e}")
+            if self._current is not None:
+                return self._current
+            inputs = (INITIAL_BANK_RYABUCKS, Decimal("0"))
+
+        self._checked_at = now
+        if inputs != self._inputs:
+            self._publish(inputs)
+        return self._current
+
+    def _publish(self, inputs: Tuple[Decimal, Decimal]) -> None:
+        bank_ryabucks, burned_rbtc = inputs
+        ryabucks, rbtc = compute_multipliers(bank_ryabucks, burned_rbtc)
+        self._inputs = inputs
+
+        # Новая версия - только если изменились сами мультипликаторы
+        if self._current is not None and (ryabucks, rbtc) == (self._current.ryabucks, self._current.rbtc):
+            return
+
+        self._version += 1
+        snapshot = PriceMultipliers(
+            version=self._version,
+            ryabucks=ryabucks,
+            rbtc=rbtc,
+            bank_ryabucks=float(bank_ryabucks),
+            burned_rbtc=float(burned_rbtc),
+            computed_at=time.time()
+        )
+        self._previous = self._current
+        self._current = snapshot
+        self.stats['recomputes'] += 1
+
+    async def snapshot(self, version: Optional[int] = None) -> PriceMultipliers:
+        """
+        Снимок по версии, показанной игроку: текущая версия или предыдущая
+        в течение PREVIOUS_VERSION_GRACE_SECONDS после смены; любая другая
+        версия - текущий снимок
+        """
+        current = await self.current()
+        if version is None:
+            return current
+        if version == current.version:
+            self.stats['snapshot_hits'] += 1
+            return current
+
+        previous = self._previous
+        if (previous is not None and version == previous.version
+                and time.time() - current.computed_at <= PREVIOUS_VERSION_GRACE_SECONDS):
+            self.stats['snapshot_hits'] += 1
+            return previous
+        self.stats['snapshot_misses'] += 1
+        return current
+
+    def invalidate(self) -> None:
+        """Проверить счётчики при следующем обращении"""
+        self._checked_at = 0.0
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self.stats, 'version': self._version}
+
+
+# Глобальный экземпляр
+price_multipliers = PriceMultiplierEngine()
@@ -0,0 +1,173 @@
+# services/price_tables.py
+"""
+Таблицы цен лицензий и специалистов
+
+Цены зависят только от конфигурации и снимка мультипликаторов, поэтому
+на каждую версию мультипликаторов все строки (тип, уровень) считаются
+один раз: цены - в компактных массивах, строки каталога - готовые
+неизменяемые словари для экранов. Рендер каталога - выбор строки по
+уровню игрока и фильтр по лицензиям, без арифметики и сборки словарей.
+"""
+
+import logging
+from array import array
+from collections import OrderedDict
+from decimal import Decimal
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Generic, List, Mapping, Optional, Sequence, Tuple, TypeVar
+
+from core.domain.money import Money
+
+logger = logging.getLogger(__name__)
+
+TABLES_KEPT = 4
+
+T = TypeVar("T")
+Row = Mapping[str, Any]
+
+
+def _freeze(value: Any) -> Any:
+    """Неизменяемая копия конфигурации для строки каталога"""
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def license_price(config: Dict[str, Any], level: int, multipliers: Mapping[str, Any]) -> Tuple[int, Decimal]:
+    """Цена уровня лицензии: база * 2^(уровень-1) * мультипликатор"""
+    base_ryabucks = config["base_price_ryabucks"] * (2 ** (level - 1))
+    base_rbtc = config["base_price_rbtc"] * (2 ** (level - 1))
+    return int(base_ryabucks * multipliers["ryabucks"]), base_rbtc * Decimal(str(multipliers["rbtc"]))
+
+
+class LicensePriceTable:
+    """Цены всех уровней всех лицензий для одной версии мультипликаторов"""
+
+    def __init__(self, license_config: Dict[str, Dict[str, Any]], multipliers: Mapping[str, Any]):
+        self.version = multipliers.get("version")
+        self.types: Tuple[str, ...] = tuple(license_config)
+        self._ryabucks: Dict[str, array] = {}
+        self._rbtc: Dict[str, Tuple[Decimal, ...]] = {}
+        self._rows: Dict[str, Tuple[Row, ...]] = {}
+
+        for license_type, config in license_config.items():
+            max_level = config["max_level"]
+            prices = [license_price(config, level, multipliers) for level in range(1, max_level + 1)]
+            # Индекс = уровень - 1
+            self._ryabucks[license_type] = array("q", (ryabucks for ryabucks, _ in prices))
+            self._rbtc[license_type] = tuple(rbtc for _, rbtc in prices)
+            # Индекс = текущий уровень игрока (строка показывает цену следующего)
+            self._rows[license_type] = tuple(
+                self._display_row(license_type, config, current, prices)
+                for current in range(max_level + 1)
+            )
+
+    @staticmethod
+    def _display_row(license_type: str, config: Dict[str, Any], current_level: int,
+                     prices: Sequence[Tuple[int, Decimal]]) -> Row:
+        row = {
+            "type": license_type,
+            "icon": config["icon"],
+            "name": config["name"],
+            "current_level": current_level,
+            "max_level": config["max_level"],
+            "telegra_link": config["telegra_link"]
+        }
+        if current_level >= config["max_level"]:
+            row.update({"ryabucks_price": "MAX", "rbtc_price": "MAX", "is_max": True})
+        else:
+            ryabucks_price, rbtc_price = prices[current_level]
+            row.update({
+                "ryabucks_price": f"{ryabucks_price:,}",
+                "rbtc_price": f"{float(rbtc_price):.2f}",
+                "ryabucks_price_raw": ryabucks_price,
+                "rbtc_price_raw": float(rbtc_price),
+                "is_max": False
+            })
+        return MappingProxyType(row)
+
+    def price(self, license_type: str, level: int) -> Tuple[int, Decimal]:
+        """Цена уровня level; (0, 0) для неизвестного типа или уровня"""
+        rbtc = self._rbtc.get(license_type)
+        if rbtc is None or not 1 <= level <= len(rbtc):
+            return 0, Decimal("0")
+        return self._ryabucks[license_type][level - 1], rbtc[level - 1]
+
+    def display_row(self, license_type: str, current_level: int) -> Row:
+        rows = self._rows[license_type]
+        return rows[min(max(current_level, 0), len(rows) - 1)]
+
+
+class SpecialistPriceTable:
+    """Цены найма и строки каталога специалистов для одной версии мультипликаторов"""
+
+    def __init__(self, specialist_config: Dict[Any, Dict[str, Any]], multipliers: Mapping[str, Any]):
+        self.version = multipliers.get("version")
+        self._ryabucks: Dict[str, int] = {}
+        self._rbtc: Dict[str, Optional[Money]] = {}
+        # (лицензия, нужный уровень, строка каталога) в порядке конфигурации
+        self._catalog: List[Tuple[str, int, Row]] = []
+
+        for spec_type, config in specialist_config.items():
+            key = getattr(spec_type, "value", spec_type)
+            ryabucks = int(config["base_price_ryabucks"] * multipliers["ryabucks"])
+            rbtc = None
+            if "cost_rbtc" in config["base_stats"]:
+                rbtc = Money.of(config["base_stats"]["cost_rbtc"]) * multipliers["rbtc"]
+            self._ryabucks[key] = ryabucks
+            self._rbtc[key] = rbtc
+
+            row = MappingProxyType({
+                "type": key,
+                "name": config["name"],
+                "icon": config["icon"],
+                "price_ryabucks": ryabucks,
+                "price_rbtc": float(rbtc) if rbtc is not None else None,
+                "price_experience": config["base_price_experience"],
+                "energy_cost": config["energy_cost"],
+                "description": config["description"],
+                "work_locations": _freeze(config["work_locations"]),
+                "base_income": _freeze(config["base_income"]),
+                "training_time_hours": config["training_time_hours"],
+                "expedition_suitable": config.get("expedition_suitable", False),
+                "max_hp": config["max_hp"],
+                "base_stats": _freeze(config["base_stats"]),
+                "multipliers_version": self.version,
+                "can_afford": True  # Проверим при найме
+            })
+            self._catalog.append((config["license_required"], config["license_level"], row))
+
+    def price(self, specialist_type: str) -> Tuple[int, Optional[Money]]:
+        """(рябаксы, RBTC или None) за найм"""
+        return self._ryabucks[specialist_type], self._rbtc[specialist_type]
+
+    def available(self, license_level: Callable[[str], int]) -> List[Row]:
+        """Строки каталога, доступные по уровням лицензий игрока"""
+        return [row for license_type, required, row in self._catalog if license_level(license_type) >= required]
+
+
+class PriceTableCache(Generic[T]):
+    """Таблицы по версии мультипликаторов (последние несколько версий)"""
+
+    def __init__(self, builder: Callable[[Mapping[str, Any]], T], kept: int = TABLES_KEPT):
+        self.builder = builder
+        self.kept = kept
+        self._tables: "OrderedDict[Any, T]" = OrderedDict()
+        self.stats = {'hits': 0, 'builds': 0}
+
+    def get(self, multipliers: Mapping[str, Any]) -> T:
+        version = multipliers.get("version")
+        table = self._tables.get(version) if version is not None else None
+        if table is not None:
+            self.stats['hits'] += 1
+            return table
+
+        table = self.builder(multipliers)
+        self.stats['builds'] += 1
+        if version is not None:
+            self._tables[version] = table
+            while len(self._tables) > self.kept:
+                self._tables.popitem(last=False)
+        return table
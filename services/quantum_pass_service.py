@@ -1,10 +1,12 @@
 # services/quantum_pass_service.py
 import logging
-from decimal import Decimal
+from core.domain.money import Money
 from datetime import datetime, timedelta, timezone
 from typing import Tuple, Optional
 from adapters.database.supabase.client import get_supabase_client
 from config.settings import settings
+from services.user_lanes import user_lanes
+from services.economy_counters import economy_counters
 
 logger = logging.getLogger(__name__)
 
@@ -137,7 +139,7 @@ class QuantumPassService:
             return {
                 'has_quantum_pass': has_quantum_pass,
                 'time_left': time_left,
-                'user_rbtc': Decimal(str(user.get('rbtc', 0)))
+                'user_rbtc': Money.of(user.get('rbtc'))
             }
 
         except Exception as e:
@@ -145,7 +147,7 @@ class QuantumPassService:
             return {
                 'has_quantum_pass': False,
                 'time_left': None,
-                'user_rbtc': Decimal('0')
+                'user_rbtc': Money()
             }
 
     def format_time_left(self, time_left: dict) -> str:
@@ -170,6 +172,7 @@ class QuantumPassService:
         else:
             return f"{minutes} мин."
 
+    @user_lanes.serialized
     async def purchase_quantum_pass(self, user_id: int, duration_key: str) -> Tuple[bool, str]:
         """Покупка Quantum Pass"""
         try:
@@ -193,7 +196,7 @@ class QuantumPassService:
             if not user:
                 return False, "Пользователь не найден"
 
-            user_rbtc = Decimal(str(user.get('rbtc', 0)))
+            user_rbtc = Money.of(user.get('rbtc'))
 
             if user_rbtc < price:
                 return False, f"Недостаточно RBTC. Нужно: {price} 💠, есть: {user_rbtc:.4f} 💠"
@@ -226,7 +229,7 @@ class QuantumPassService:
                 new_expiry = now + timedelta(days=duration_days)
 
             # Списать RBTC (сжечь)
-            new_rbtc = float(user_rbtc - price)
+            new_rbtc = str(user_rbtc - price)
 
             # Обновить пользователя
             await self.client.execute_query(
@@ -240,21 +243,9 @@ class QuantumPassService:
                 filters={"user_id": user_id}
             )
 
-            # Записать транзакцию в аудит (опционально)
+            # Записать сжигание в аудит и счётчики экономики (журнал операций, в БД - пакетом)
             try:
-                await self.client.execute_query(
-                    table="bank_transactions",
-                    operation="insert",
-                    data={
-                        "user_id": user_id,
-                        "transaction_type": "quantum_pass_purchase",
-                        "amount_from": float(price),
-                        "amount_to": 0,  # Сжигание
-                        "currency_from": "rbtc",
-                        "currency_to": "burned",
-                        "exchange_rate": 1
-                    }
-                )
+                await economy_counters.record_burn(user_id, price, "quantum_pass_purchase", qpass=True)
             except Exception as audit_error:
                 logger.warning(f"Не удалось записать аудит покупки Q-Pass: {audit_error}")
 
@@ -0,0 +1,102 @@
+# services/roster_summary.py
+"""
+Сводка команды игрока
+
+Количество специалистов по типу и статусу хранится готовой строкой
+user_roster_summary, которую ведёт триггер на user_specialists
+(007_roster_summary.sql). Меню работ, биржа труда, лимит найма и админка
+читают одну строку вместо выборки всех специалистов.
+"""
+
+import logging
+from typing import Any, Dict, Mapping, Optional
+
+from adapters.database.supabase.client import get_supabase_client
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_TABLE = "user_roster_summary"
+TOTALS_FUNCTION = "roster_summary_totals"
+
+INACTIVE_STATUSES = frozenset({"dead"})
+
+
+class RosterSummary:
+    """Количество специалистов по типу и статусу"""
+
+    __slots__ = ("counts", "active", "users")
+
+    def __init__(self, counts: Optional[Mapping[str, Mapping[str, int]]] = None,
+                 active: int = 0, users: int = 0):
+        self.counts = {
+            specialist_type: {status: int(n) for status, n in statuses.items() if n}
+            for specialist_type, statuses in (counts or {}).items()
+        }
+        self.active = int(active or 0)
+        self.users = int(users or 0)
+
+    @classmethod
+    def from_row(cls, row: Optional[Mapping[str, Any]]) -> "RosterSummary":
+        if not row:
+            return cls()
+        return cls(row.get("counts"), row.get("active", 0), row.get("users", 0))
+
+    def count(self, specialist_type: Optional[str] = None, status: Optional[str] = None) -> int:
+        """Количество по типу и/или статусу (None - все)"""
+        if specialist_type is not None:
+            groups = [self.counts.get(specialist_type, {})]
+        else:
+            groups = self.counts.values()
+        if status is not None:
+            return sum(statuses.get(status, 0) for statuses in groups)
+        return sum(sum(statuses.values()) for statuses in groups)
+
+    def active_by_type(self) -> Dict[str, int]:
+        """{тип: живых специалистов}"""
+        return {
+            specialist_type: sum(n for status, n in statuses.items() if status not in INACTIVE_STATUSES)
+            for specialist_type, statuses in self.counts.items()
+        }
+
+
+class RosterSummaryReader:
+    """Чтение сводок команды"""
+
+    def __init__(self):
+        self.client = None
+
+    async def _ensure_client(self):
+        if not self.client:
+            self.client = await get_supabase_client()
+
+    async def get(self, user_id: int) -> RosterSummary:
+        """Сводка игрока; пустая при ошибке или отсутствии специалистов"""
+        try:
+            await self._ensure_client()
+            row = await self.client.execute_query(
+                table=SUMMARY_TABLE,
+                operation="select",
+                columns=["counts", "active"],
+                filters={"user_id": user_id},
+                single=True
+            )
+            return RosterSummary.from_row(row)
+        except Exception as e:
+            logger.error(f"Ошибка чтения сводки команды {user_id}: {e}")
+            return RosterSummary()
+
+    async def totals(self) -> RosterSummary:
+        """Сводка по всем игрокам (users - игроков с живыми специалистами)"""
+        try:
+            await self._ensure_client()
+            data = await self.client.execute_rpc(TOTALS_FUNCTION)
+            if isinstance(data, list):
+                data = data[0] if data else {}
+            return RosterSummary.from_row(data)
+        except Exception as e:
+            logger.error(f"Ошибка чтения общей сводки команд: {e}")
+            return RosterSummary()
+
+
+# Глобальный экземпляр
+roster_summaries = RosterSummaryReader()
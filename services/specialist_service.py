@@ -4,18 +4,26 @@ Specialist Service - система найма и управления спец
 Интегрирована с энергией, лицензиями и EventTracker
 """
 
+import asyncio
 import logging
+import random
 from datetime import datetime, timezone, timedelta
 from typing import Optional, List, Dict, Any, Tuple
-from decimal import Decimal
 from enum import Enum
 
 from core.domain.entities import User, Specialist
+from core.domain.money import Money
 from core.ports.repositories import UserRepository
 from services.event_tracker import get_event_tracker, EventType, EventSignificance
 from services.license_service import LicenseService, LicenseType
-from services.energy_service import EnergyService
+from services.energy_service import EnergyService, MAX_ENERGY, ENERGY_REGEN_INTERVAL_MINUTES
 from adapters.database.supabase.client import get_supabase_client
+from services.user_lanes import user_lanes
+from services.economy_counters import economy_counters
+from services.price_tables import PriceTableCache, SpecialistPriceTable
+from services.roster_summary import RosterSummary, roster_summaries
+from services.job_scheduler import job_scheduler
+from config.settings import settings
 
 logger = logging.getLogger(__name__)
 
@@ -296,6 +304,33 @@ SPECIALIST_CONFIG = {
     }
 }
 
+HIRE_FUNCTION = "hire_specialist"
+HEAL_ALL_FUNCTION = "heal_all_specialists"
+
+# Опыт за пройденное обучение в академии
+TRAINING_EXPERIENCE = 1
+
+
+def max_specialists_for(employer_level: int) -> int:
+    """Лимит специалистов по уровню лицензии работодателя (из GDD)"""
+    if employer_level >= 10:
+        return 999  # Безлимит
+    elif employer_level >= 5:
+        return 25   # Q-Солдаты доступны
+    elif employer_level >= 3:
+        return 10
+    elif employer_level >= 2:
+        return 6
+    elif employer_level >= 1:
+        return 3
+    else:
+        return 0    # Нет лицензии
+
+
+# Глобальный экземпляр
+specialist_price_tables = PriceTableCache(lambda multipliers: SpecialistPriceTable(SPECIALIST_CONFIG, multipliers))
+
+
 class SpecialistService:
     """Сервис управления специалистами (версия GDD)"""
 
@@ -322,61 +357,29 @@ class SpecialistService:
         try:
             await self._ensure_dependencies()
 
-            # Получаем лицензии пользователя
-            user_licenses = await self.license_service.get_user_licenses(user_id)
-
-            # Получаем мультипликаторы цен
+            # Лицензии пользователя и таблица цен текущей версии мультипликаторов
+            user_licenses = await self.license_service.get_license_levels(user_id)
             multipliers = await self.license_service.calculate_price_multipliers()
+            table = specialist_price_tables.get(multipliers)
 
-            available = []
-
-            for spec_type, config in SPECIALIST_CONFIG.items():
-                # Проверяем лицензию
-                license_type = config["license_required"]
-                required_level = config["license_level"]
-                current_level = user_licenses.get(license_type.value, 0)
-
-                if current_level >= required_level:
-                    # Рассчитываем цену с мультипликатором
-                    base_price = config["base_price_ryabucks"]
-                    final_price = int(base_price * multipliers["ryabucks"])
-
-                    # Рассчитываем цену в RBTC если есть
-                    rbtc_price = None
-                    if "cost_rbtc" in config["base_stats"]:
-                        base_rbtc = Decimal(str(config["base_stats"]["cost_rbtc"]))
-                        final_rbtc = base_rbtc * Decimal(str(multipliers["rbtc"]))
-                        rbtc_price = float(final_rbtc)
-
-                    available.append({
-                        "type": spec_type.value,
-                        "name": config["name"],
-                        "icon": config["icon"],
-                        "price_ryabucks": final_price,
-                        "price_rbtc": rbtc_price,
-                        "price_experience": config["base_price_experience"],
-                        "energy_cost": config["energy_cost"],
-                        "description": config["description"],
-                        "work_locations": config["work_locations"],
-                        "base_income": config["base_income"],
-                        "training_time_hours": config["training_time_hours"],
-                        "expedition_suitable": config.get("expedition_suitable", False),
-                        "max_hp": config["max_hp"],
-                        "base_stats": config["base_stats"],
-                        "can_afford": True  # Проверим при найме
-                    })
-
-            return available
+            return table.available(user_licenses.level)
 
         except Exception as e:
             logger.error(f"Ошибка получения доступных специалистов для {user_id}: {e}")
             return []
 
-    async def hire_specialist(self, user_id: int, specialist_type: str, currency: str = "ryabucks") -> Tuple[bool, str]:
+    @user_lanes.serialized
+    async def hire_specialist(self, user_id: int, specialist_type: str, currency: str = "ryabucks",
+                              multipliers_version: Optional[int] = None) -> Tuple[bool, str]:
         """
         Нанять специалиста
         currency: 'ryabucks' или 'rbtc'
+        multipliers_version: снимок мультипликаторов, по которому игрок видел цену
         Возвращает (успех, сообщение)
+
+        Этапы: чтения (кэш лицензий и мультипликаторы - параллельно, обычно
+        из памяти) -> проверки без запросов -> все записи одной транзакцией
+        (RPC hire_specialist) -> журнал сжигания и события параллельно.
         """
         try:
             await self._ensure_dependencies()
@@ -389,97 +392,81 @@ class SpecialistService:
 
             config = SPECIALIST_CONFIG[spec_enum]
 
-            # Проверяем лицензию
+            # Этап 1: независимые чтения
+            levels, multipliers = await asyncio.gather(
+                self.license_service.get_license_levels(user_id),
+                self.license_service.calculate_price_multipliers(multipliers_version)
+            )
+
+            # Этап 2: проверки по прочитанному
             license_type = config["license_required"]
             required_level = config["license_level"]
-            current_level = await self.license_service.get_license_level(user_id, license_type)
+            current_level = levels.level(license_type)
 
             if current_level < required_level:
                 from services.license_service import LICENSE_CONFIG
                 license_name = LICENSE_CONFIG[license_type]["name"]
                 return False, f"Требуется {license_name} уровня {required_level}. У вас уровень {current_level}"
 
-            # Проверяем энергию
-            energy_cost = config["energy_cost"]
-            can_afford_energy, energy_msg = await self.energy_service.can_perform_action(user_id, energy_cost)
-
-            if not can_afford_energy:
-                return False, f"Недостаточно энергии. {energy_msg}"
-
-            # Получаем пользователя и проверяем ресурсы
-            user = await self.user_repository.get_by_id(user_id)
-            if not user:
-                return False, "Пользователь не найден"
-
-            # Рассчитываем цены
-            multipliers = await self.license_service.calculate_price_multipliers()
-            ryabucks_cost = int(config["base_price_ryabucks"] * multipliers["ryabucks"])
+            ryabucks_cost, rbtc_cost = specialist_price_tables.get(multipliers).price(spec_enum.value)
             experience_cost = config["base_price_experience"]
+            energy_cost = config["energy_cost"]
 
-            # Определяем валюту и стоимость
             if currency == "ryabucks":
-                if user.resources.ryabucks < ryabucks_cost:
-                    return False, f"Недостаточно рябаксов. Нужно: {ryabucks_cost:,}, есть: {user.resources.ryabucks:,}"
                 cost_to_pay = ryabucks_cost
             elif currency == "rbtc":
-                if "cost_rbtc" not in config["base_stats"]:
+                if rbtc_cost is None:
                     return False, "Этого специалиста нельзя купить за RBTC"
-
-                base_rbtc = Decimal(str(config["base_stats"]["cost_rbtc"]))
-                rbtc_cost = base_rbtc * Decimal(str(multipliers["rbtc"]))
-
-                if user.resources.rbtc.amount < rbtc_cost:
-                    return False, f"Недостаточно RBTC. Нужно: {rbtc_cost:.2f}, есть: {user.resources.rbtc.amount}"
                 cost_to_pay = rbtc_cost
             else:
                 return False, "Неизвестная валюта"
 
-            # Проверяем жидкий опыт
-            if user.resources.liquid_experience < experience_cost:
-                return False, f"Недостаточно жидкого опыта. Нужно: {experience_cost}, есть: {user.resources.liquid_experience}"
-
-            # Проверяем лимиты найма
-            current_specialists = await self._get_user_specialists_count(user_id)
-            max_specialists = await self._get_max_specialists(user_id)
-
-            if current_specialists >= max_specialists:
-                return False, f"Достигнут лимит специалистов: {max_specialists}. Улучшите лицензию работодателя."
-
-            # Выполняем найм в транзакции
-            async with self.client.transaction() as tx:
-                # Списываем ресурсы
-                updates = {"liquid_experience": user.resources.liquid_experience - experience_cost}
-
-                if currency == "ryabucks":
-                    updates["ryabucks"] = user.resources.ryabucks - ryabucks_cost
-                elif currency == "rbtc":
-                    updates["rbtc"] = user.resources.rbtc.amount - cost_to_pay
-                    # Записываем сжигание RBTC
-                    await self._record_rbtc_burn(user_id, cost_to_pay, f"hire_{specialist_type}")
-
-                await self.user_repository.update_resources(user_id=user_id, updates=updates)
-
-                # Списываем энергию
-                energy_consumed = await self.energy_service.consume_energy(user_id, energy_cost)
-                if not energy_consumed:
-                    return False, "Не удалось списать энергию"
-
-                # Создаём специалиста
-                specialist_id = await self._create_specialist(user_id, spec_enum, config)
+            max_specialists = max_specialists_for(levels.level(LicenseType.EMPLOYER))
+
+            # Этап 3: списание и создание специалиста одной транзакцией
+            result = await self.client.execute_rpc(HIRE_FUNCTION, {
+                "p_user_id": user_id,
+                "p_currency": currency,
+                "p_ryabucks_cost": ryabucks_cost,
+                "p_rbtc_cost": str(rbtc_cost or 0),
+                "p_experience_cost": experience_cost,
+                "p_energy_cost": energy_cost,
+                "p_max_specialists": max_specialists,
+                "p_energy_max": MAX_ENERGY,
+                "p_energy_regen_minutes": ENERGY_REGEN_INTERVAL_MINUTES,
+                "p_specialist": self._build_specialist_row(user_id, spec_enum, config)
+            })
+            if isinstance(result, list):
+                result = result[0] if result else {}
+            result = result or {}
+
+            status = result.get("status")
+            if status != "ok":
+                return False, self._hire_error_message(
+                    result, currency, cost_to_pay, experience_cost, energy_cost, max_specialists
+                )
 
-            # Трекаем события
-            await self.event_tracker.track_currency_spent(
-                user_id=user_id,
-                currency_type=currency,
-                amount=cost_to_pay,
-                reason=f"hire_{specialist_type}"
-            )
+            self.user_repository.invalidate_cached(user_id)
 
-            await self.event_tracker.track_specialist_hiring(
-                user_id=user_id,
-                specialist_type=specialist_type,
-                cost=int(cost_to_pay) if currency == "ryabucks" else float(cost_to_pay)
-            )
+            # Этап 4: учёт после коммита
+            bookkeeping = [
+                self.event_tracker.track_currency_spent(
+                    user_id=user_id,
+                    currency_type=currency,
+                    amount=float(cost_to_pay),
+                    reason=f"hire_{specialist_type}"
+                ),
+                self.event_tracker.track_specialist_hiring(
+                    user_id=user_id,
+                    specialist_type=specialist_type,
+                    cost=int(cost_to_pay) if currency == "ryabucks" else float(cost_to_pay)
+                )
+            ]
+            if currency == "rbtc":
+                bookkeeping.append(self._record_rbtc_burn(user_id, cost_to_pay, f"hire_{specialist_type}"))
+            for outcome in await asyncio.gather(*bookkeeping, return_exceptions=True):
+                if isinstance(outcome, Exception):
+                    logger.error(f"Ошибка учёта найма для {user_id}: {outcome}")
 
             logger.info(f"👷 Специалист нанят для {user_id}: {config['name']} за {cost_to_pay} {currency}")
 
@@ -489,18 +476,35 @@ class SpecialistService:
             logger.error(f"Ошибка найма специалиста {specialist_type} для {user_id}: {e}")
             return False, "Техническая ошибка при найме"
 
-    async def _create_specialist(self, user_id: int, spec_type: SpecialistType, config: Dict) -> int:
-        """Создать специалиста в БД с характеристиками из GDD"""
-        import random
-
+    @staticmethod
+    def _hire_error_message(result: Dict[str, Any], currency: str, cost_to_pay, experience_cost: int,
+                            energy_cost: int, max_specialists: int) -> str:
+        """Текст отказа по статусу hire_specialist"""
+        status = result.get("status")
+        if status == "user_not_found":
+            return "Пользователь не найден"
+        if status == "insufficient_energy":
+            return f"Недостаточно энергии! Есть: {result.get('energy', 0)}, нужно: {energy_cost}"
+        if status == "insufficient_funds":
+            if currency == "ryabucks":
+                return f"Недостаточно рябаксов. Нужно: {cost_to_pay:,}, есть: {int(result.get('user_ryabucks') or 0):,}"
+            return f"Недостаточно RBTC. Нужно: {cost_to_pay:.2f}, есть: {Money.of(result.get('user_rbtc'))}"
+        if status == "insufficient_experience":
+            return f"Недостаточно жидкого опыта. Нужно: {experience_cost}, есть: {result.get('liquid_experience', 0)}"
+        if status == "limit_reached":
+            return f"Достигнут лимит специалистов: {max_specialists}. Улучшите лицензию работодателя."
+        logger.error(f"Неожиданный ответ {HIRE_FUNCTION}: {result}")
+        return "Техническая ошибка при найме"
+
+    @staticmethod
+    def _build_specialist_row(user_id: int, spec_type: SpecialistType, config: Dict) -> Dict[str, Any]:
+        """Строка user_specialists с характеристиками из GDD"""
         base_stats = config["base_stats"]
 
         # Генерируем характеристики на основе GDD
         efficiency = base_stats.get("efficiency", 100) + random.randint(-10, 10)  # ±10%
         loyalty = random.randint(85, 100)
-        experience = 0
         max_hp = config["max_hp"]
-        current_hp = max_hp
 
         # Боевые характеристики
         combat_stats = {
@@ -510,15 +514,14 @@ class SpecialistService:
             "max_health": max_hp
         } if config.get("expedition_suitable") else {}
 
-        # Сохраняем в БД
-        specialist_data = {
+        return {
             "user_id": user_id,
             "specialist_type": spec_type.value,
             "name": f"{config['name']} #{random.randint(1000, 9999)}",
             "efficiency": efficiency,
             "loyalty": loyalty,
-            "experience": experience,
-            "current_hp": current_hp,
+            "experience": 0,
+            "current_hp": max_hp,
             "max_hp": max_hp,
             "combat_stats": combat_stats if combat_stats else None,
             "hired_at": datetime.now(timezone.utc).isoformat(),
@@ -528,16 +531,9 @@ class SpecialistService:
             "healing_time_hours": base_stats.get("healing_time", 4)
         }
 
-        result = await self.client.execute_query(
-            table="user_specialists",
-            operation="insert",
-            data=specialist_data
-        )
-
-        return result[0]["id"] if result else None
-
-    async def _record_rbtc_burn(self, user_id: int, amount: Decimal, reason: str):
-        """Записать сжигание RBTC в audit_log"""
+    async def _record_rbtc_burn(self, user_id: int, amount: Money, reason: str):
+        """Записать сжигание RBTC в audit_log и счётчики экономики"""
+        await economy_counters.record_burn(user_id, amount, reason)
         await self.event_tracker.track_event(
             user_id=user_id,
             event_type=EventType.RBTC_TRANSACTION,
@@ -550,39 +546,14 @@ class SpecialistService:
             significance=EventSignificance.IMPORTANT
         )
 
-    async def _get_user_specialists_count(self, user_id: int) -> int:
-        """Получить количество специалистов пользователя"""
-        try:
-            specialists = await self.client.execute_query(
-                table="user_specialists",
-                operation="select",
-                columns=["id"],
-                filters={
-                    "user_id": user_id, 
-                    "status": ["available", "working", "training", "injured"]
-                }
-            )
-            return len(specialists)
-        except:
-            return 0
-
     async def _get_max_specialists(self, user_id: int) -> int:
         """Получить максимальное количество специалистов по лицензии"""
         employer_level = await self.license_service.get_license_level(user_id, LicenseType.EMPLOYER)
+        return max_specialists_for(employer_level)
 
-        # Лимиты по уровням лицензии работодателя (из GDD)
-        if employer_level >= 10:
-            return 999  # Безлимит
-        elif employer_level >= 5:
-            return 25   # Q-Солдаты доступны
-        elif employer_level >= 3:
-            return 10
-        elif employer_level >= 2:
-            return 6
-        elif employer_level >= 1:
-            return 3
-        else:
-            return 0    # Нет лицензии
+    async def get_roster_summary(self, user_id: int) -> RosterSummary:
+        """Сводка команды: количество по типу и статусу одной строкой"""
+        return await roster_summaries.get(user_id)
 
     async def get_user_specialists(self, user_id: int) -> List[Dict]:
         """Получить список специалистов пользователя"""
@@ -623,6 +594,7 @@ class SpecialistService:
             logger.error(f"Ошибка получения специалистов для {user_id}: {e}")
             return []
 
+    @user_lanes.serialized
     async def heal_specialist(self, user_id: int, specialist_id: int) -> Tuple[bool, str]:
         """Вылечить раненого специалиста"""
         try:
@@ -688,14 +660,133 @@ class SpecialistService:
             logger.error(f"Ошибка лечения специалиста {specialist_id} для {user_id}: {e}")
             return False, "Техническая ошибка при лечении"
 
-    # Заглушки для функций в разработке
+    @user_lanes.serialized
+    async def heal_all(self, user_id: int) -> Tuple[bool, str, List[Dict[str, Any]]]:
+        """
+        Вылечить всех раненых специалистов
+        Возвращает (успех, сообщение, вылеченные: id, тип, имя, HP до/после, стоимость)
+
+        Стоимость считается одной агрегацией, списание и восстановление HP -
+        одна транзакция (RPC heal_all_specialists).
+        """
+        try:
+            await self._ensure_dependencies()
+
+            result = await self.client.execute_rpc(HEAL_ALL_FUNCTION, {"p_user_id": user_id})
+            if isinstance(result, list):
+                result = result[0] if result else {}
+            result = result or {}
+
+            status = result.get("status")
+            if status == "nothing_to_heal":
+                return False, "Раненых специалистов нет", []
+            if status == "insufficient_funds":
+                return False, (
+                    f"Недостаточно рябаксов для лечения {result.get('count', 0)} специалистов. "
+                    f"Нужно: {result.get('total_cost', 0):,}, у вас: {result.get('user_ryabucks', 0):,}"
+                ), []
+            if status == "user_not_found":
+                return False, "Пользователь не найден", []
+            if status != "ok":
+                logger.error(f"Лечение специалистов {user_id}: неожиданный статус {status}")
+                return False, "Техническая ошибка при лечении", []
+
+            self.user_repository.invalidate_cached(user_id)
+
+            healed = []
+            for patient in result.get("healed") or []:
+                try:
+                    icon = SPECIALIST_CONFIG[SpecialistType(patient["specialist_type"])]["icon"]
+                except (KeyError, ValueError):
+                    icon = "👤"
+                healed.append({
+                    "id": patient["id"],
+                    "type": patient["specialist_type"],
+                    "name": patient["name"],
+                    "icon": icon,
+                    "hp_before": patient["hp_before"],
+                    "hp_after": patient["max_hp"],
+                    "healing_cost": patient["healing_cost"]
+                })
+
+            total_cost = result.get("total_cost", 0)
+            await self.event_tracker.track_currency_spent(
+                user_id=user_id,
+                currency_type="ryabucks",
+                amount=total_cost,
+                reason="heal_all_specialists"
+            )
+
+            logger.info(f"🏥 Вылечено {len(healed)} специалистов для {user_id} за {total_cost} рябаксов")
+
+            return True, f"✅ Вылечено специалистов: {len(healed)} за {total_cost:,} рябаксов", healed
+
+        except Exception as e:
+            logger.error(f"Ошибка массового лечения для {user_id}: {e}")
+            return False, "Техническая ошибка при лечении", []
+
+    async def _start_job(self, user_id: int, specialist_id: int, kind: str, from_status: str, to_status: str,
+                         durations: Dict[str, float], payload: Optional[Dict[str, Any]] = None) -> Tuple[bool, str]:
+        """Запуск задачи специалиста в планировщике; (успех, текст отказа или '' при успехе)"""
+        result = await job_scheduler.schedule(user_id, specialist_id, kind, from_status, to_status, durations, payload)
+        status = result.get("status")
+        if status == "ok":
+            return True, ""
+        if status == "not_found":
+            return False, "Специалист не найден"
+        if status == "not_allowed":
+            return False, "Этот специалист не может этим заниматься"
+        if status == "busy":
+            return False, "Специалист уже занят"
+        return False, f"Специалист сейчас недоступен ({result.get('current', status)})"
+
+    @user_lanes.serialized
     async def train_specialist(self, user_id: int, specialist_id: int) -> Tuple[bool, str]:
         """Отправить специалиста на обучение в академию"""
-        return False, "🚧 Академия в разработке"
+        try:
+            durations = {
+                spec_type.value: config["training_time_hours"] * 3600
+                for spec_type, config in SPECIALIST_CONFIG.items()
+            }
+            success, error = await self._start_job(
+                user_id, specialist_id, "training", "available", "training",
+                durations, {"experience": TRAINING_EXPERIENCE}
+            )
+            if not success:
+                return False, error
+
+            logger.info(f"🎓 Специалист {specialist_id} отправлен на обучение для {user_id}")
+            return True, "🎓 Специалист отправлен на обучение"
 
+        except Exception as e:
+            logger.error(f"Ошибка обучения специалиста {specialist_id} для {user_id}: {e}")
+            return False, "Техническая ошибка при отправке на обучение"
+
+    @user_lanes.serialized
     async def assign_work(self, user_id: int, specialist_id: int, location: str) -> Tuple[bool, str]:
         """Отправить специалиста на работу"""
-        return False, "🚧 Система работ в разработке"
+        try:
+            shift_seconds = settings.WORK_SHIFT_HOURS * 3600
+            durations = {
+                spec_type.value: shift_seconds
+                for spec_type, config in SPECIALIST_CONFIG.items()
+                if location in config["work_locations"]
+            }
+            if not durations:
+                return False, "Неизвестная локация"
+
+            success, error = await self._start_job(
+                user_id, specialist_id, "work", "available", "working", durations, {"location": location}
+            )
+            if not success:
+                return False, error
+
+            logger.info(f"💼 Специалист {specialist_id} отправлен на работу ({location}) для {user_id}")
+            return True, f"💼 Специалист отправлен на работу на {settings.WORK_SHIFT_HOURS:g} ч"
+
+        except Exception as e:
+            logger.error(f"Ошибка отправки на работу специалиста {specialist_id} для {user_id}: {e}")
+            return False, "Техническая ошибка при отправке на работу"
 
 
 logger.info("✅ SpecialistService (GDD версия) загружен")
\ No newline at end of file
@@ -0,0 +1,147 @@
+# services/swap_engine.py
+"""
+Swap Engine - атомарный обмен RBTC <-> рябаксы в игровом банке
+
+Вся сделка (котировка по x*y=k, обновление пулов, баланса и запись
+в pool_transactions) выполняется серверной функцией bank_swap
+(adapters/database/supabase/migrations/001_bank_swap.sql) за один запрос.
+Пул защищён версией: если между чтением и записью резервов прошла другая
+сделка, функция возвращает conflict и вызов повторяется.
+"""
+
+import logging
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Any, Dict, Optional
+
+from adapters.database.supabase.client import get_supabase_client
+from core.domain.money import Money
+from services.bank_pool_cache import bank_pool_cache
+
+logger = logging.getLogger(__name__)
+
+SWAP_FUNCTION = "bank_swap"
+MAX_CONFLICT_RETRIES = 3
+
+SIDE_BUY = "buy"
+SIDE_SELL = "sell"
+
+
+@dataclass
+class SwapResult:
+    """Результат обмена (status = 'ok' или причина отказа)"""
+    status: str
+    side: str
+    rbtc_amount: Decimal
+    ryabucks_amount: int = 0
+    price: Decimal = Decimal("0")
+    rate_after: Decimal = Decimal("0")
+    rbtc_pool: Optional[Money] = None
+    ryabucks_pool: Optional[Money] = None
+    version: Optional[int] = None
+    user_ryabucks: Optional[int] = None
+    user_rbtc: Optional[Money] = None
+
+    @property
+    def success(self) -> bool:
+        return self.status == "ok"
+
+
+def _decimal(value: Any) -> Optional[Decimal]:
+    return None if value is None else Decimal(str(value))
+
+
+def _money(value: Any) -> Optional[Money]:
+    return None if value is None else Money.of(value)
+
+
+class SwapEngine:
+    """Исполнение сделок с пулом банка одним вызовом bank_swap"""
+
+    def __init__(self):
+        self.client = None
+        self.stats = {
+            'swaps': 0,
+            'rejected': 0,
+            'conflicts': 0
+        }
+
+    async def _ensure_client(self):
+        if not self.client:
+            self.client = await get_supabase_client()
+
+    async def swap(self, user_id: int, side: str, rbtc_amount: Decimal,
+                   ryabucks_limit: Optional[int] = None,
+                   expected_version: Optional[int] = None,
+                   quote_id: Optional[str] = None) -> SwapResult:
+        """
+        Выполнить обмен.
+        ryabucks_limit - защита от проскальзывания: для покупки максимальная
+        стоимость, для продажи минимальная выручка (котировка, которую видел игрок).
+        expected_version - версия пула, по которой считалась котировка; при
+        расхождении сделка не исполняется (status = 'conflict').
+        quote_id - id подписанной котировки; повторное исполнение отклоняется
+        (status = 'duplicate').
+        """
+        if side not in (SIDE_BUY, SIDE_SELL):
+            raise ValueError(f"Неизвестная сторона сделки: {side}")
+
+        await self._ensure_client()
+
+        params = {
+            "p_user_id": user_id,
+            "p_side": side,
+            "p_rbtc_amount": str(rbtc_amount),
+            "p_ryabucks_limit": ryabucks_limit,
+            "p_expected_version": expected_version,
+            "p_quote_id": quote_id
+        }
+
+        # Повтор имеет смысл только для гонки внутри функции: версия не задана,
+        # резервы прочитаны заново на каждой попытке
+        attempts = 1 if expected_version is not None else MAX_CONFLICT_RETRIES
+        result = None
+        for _ in range(attempts):
+            data = await self.client.execute_rpc(SWAP_FUNCTION, params)
+            result = self._parse(side, rbtc_amount, data)
+            if result.rbtc_pool is not None and result.ryabucks_pool is not None and result.version is not None:
+                # Свежие резервы из ответа - кэш пулов обновляется без запроса
+                bank_pool_cache.apply_reserves(result.rbtc_pool, result.ryabucks_pool, result.version)
+            if result.status != "conflict":
+                break
+            self.stats['conflicts'] += 1
+            logger.info(f"🔁 Конфликт версии пула при обмене user {user_id}, повтор")
+
+        if result.success:
+            self.stats['swaps'] += 1
+        else:
+            self.stats['rejected'] += 1
+        return result
+
+    @staticmethod
+    def _parse(side: str, rbtc_amount: Decimal, data: Any) -> SwapResult:
+        if isinstance(data, list):
+            data = data[0] if data else {}
+        if not isinstance(data, dict):
+            data = {}
+
+        return SwapResult(
+            status=data.get("status", "error"),
+            side=side,
+            rbtc_amount=rbtc_amount,
+            ryabucks_amount=int(data.get("ryabucks_amount") or 0),
+            price=_decimal(data.get("price")) or Decimal("0"),
+            rate_after=_decimal(data.get("rate_after")) or Decimal("0"),
+            rbtc_pool=_money(data.get("rbtc_pool")),
+            ryabucks_pool=_money(data.get("ryabucks_pool")),
+            version=data.get("version"),
+            user_ryabucks=data.get("user_ryabucks"),
+            user_rbtc=_money(data.get("user_rbtc"))
+        )
+
+    def get_stats(self) -> Dict[str, Any]:
+        return dict(self.stats)
+
+
+# Глобальный экземпляр
+swap_engine = SwapEngine()
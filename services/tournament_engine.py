@@ -0,0 +1,285 @@
+# services/tournament_engine.py
+"""
+Турниры петушиных боёв и скачек: посев, пары, раунды, места, призы
+
+Участники - массивы NumPy в порядке посева (рейтинг по убыванию), поэтому
+посев и пары любого раунда - сортировки, O(n log n). Форматы:
+- single_elimination: сетка на ближайшую степень двойки, сильнейшие
+  получают свободный проход, посев 1-n, 2-(n-1) ... разводит фаворитов;
+- swiss: ceil(log2 n) раундов, пары соседей по таблице внутри группы
+  очков, повторные встречи разводятся обменом с соседней парой,
+  нечётному - свободный проход.
+Раунд разыгрывается одной векторной операцией по всем парам: шанс
+победы по формуле Эло. Генератор раунда - default_rng((seed, раунд)),
+поэтому турнир воспроизводим и продолжается после перезапуска без
+хранения состояния генератора. Состояние сериализуется в сжатый npz.
+"""
+
+import io
+import logging
+from dataclasses import dataclass
+from typing import Sequence, Tuple
+
+import numpy as np
+
+from core.domain.money import Money
+
+logger = logging.getLogger(__name__)
+
+SINGLE_ELIMINATION = "single_elimination"
+SWISS = "swiss"
+FORMATS = (SINGLE_ELIMINATION, SWISS)
+
+# Вид турнира: пул наград (config/global_pools.py) и разброс исходов Эло
+TOURNAMENT_KINDS = {
+    "cockfights": {"pool": "cockfights", "elo_scale": 400.0},
+    "races": {"pool": "races", "elo_scale": 300.0}
+}
+
+ELO_K = 32.0
+BYE = -1
+
+# Призовой фонд по местам: (последнее место группы, доля фонда на группу)
+PRIZE_TIERS: Tuple[Tuple[int, float], ...] = (
+    (1, 0.25),
+    (2, 0.15),
+    (4, 0.15),
+    (8, 0.15),
+    (16, 0.10),
+    (32, 0.10),
+    (64, 0.10)
+)
+
+
+def bracket_order(size: int) -> np.ndarray:
+    """Номера посева по слотам сетки size (степень двойки): 0,7,3,4,1,6,2,5 для 8"""
+    order = np.zeros(1, dtype=np.int32)
+    while len(order) < size:
+        mirrored = 2 * len(order) - 1 - order
+        order = np.stack([order, mirrored], axis=1).ravel()
+    return order
+
+
+@dataclass
+class Tournament:
+    """Состояние турнира; индексы участников - номера посева"""
+    kind: str
+    format: str
+    seed: int
+    user_ids: np.ndarray                  # int64, по посеву
+    ratings: np.ndarray                   # float32, рейтинг на старте
+    round: int = 0
+    total_rounds: int = 0
+    rating_delta: np.ndarray = None       # float32, изменение рейтинга
+    eliminated_round: np.ndarray = None   # int16, single_elimination: раунд вылета, 0 - в игре
+    bracket: np.ndarray = None            # int32, single_elimination: слоты текущего раунда (BYE - пусто)
+    score: np.ndarray = None              # int16, swiss: очки
+    opponents: np.ndarray = None          # int32 (n, раунды), swiss: соперники (BYE - проход)
+
+    def __len__(self) -> int:
+        return len(self.user_ids)
+
+    # ---------- создание ----------
+
+    @classmethod
+    def create(cls, kind: str, format: str, entrants: Sequence[Tuple[int, float]], seed: int) -> "Tournament":
+        """entrants: (user_id, рейтинг); посев - по рейтингу, при равенстве по user_id"""
+        if kind not in TOURNAMENT_KINDS:
+            raise ValueError(f"Неизвестный вид турнира: {kind}")
+        if format not in FORMATS:
+            raise ValueError(f"Неизвестный формат турнира: {format}")
+        if len(entrants) < 2:
+            raise ValueError("Нужно минимум 2 участника")
+
+        user_ids = np.fromiter((user_id for user_id, _ in entrants), dtype=np.int64, count=len(entrants))
+        ratings = np.fromiter((rating for _, rating in entrants), dtype=np.float32, count=len(entrants))
+        order = np.lexsort((user_ids, -ratings))
+        n = len(order)
+
+        tournament = cls(
+            kind=kind,
+            format=format,
+            seed=seed,
+            user_ids=user_ids[order],
+            ratings=ratings[order],
+            rating_delta=np.zeros(n, dtype=np.float32)
+        )
+        rounds = max(1, int(np.ceil(np.log2(n))))
+        tournament.total_rounds = rounds
+        if format == SINGLE_ELIMINATION:
+            slots = bracket_order(1 << rounds)
+            tournament.bracket = np.where(slots < n, slots, BYE).astype(np.int32)
+            tournament.eliminated_round = np.zeros(n, dtype=np.int16)
+        else:
+            tournament.score = np.zeros(n, dtype=np.int16)
+            tournament.opponents = np.full((n, rounds), BYE, dtype=np.int32)
+        return tournament
+
+    @property
+    def finished(self) -> bool:
+        return self.round >= self.total_rounds
+
+    # ---------- раунды ----------
+
+    def _play(self, a: np.ndarray, b: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+        """Разыграть пары (a[i], b[i]); True - победил a. Обновляет рейтинг Эло"""
+        scale = TOURNAMENT_KINDS[self.kind]["elo_scale"]
+        current = self.ratings + self.rating_delta
+        expected_a = 1.0 / (1.0 + 10.0 ** ((current[b] - current[a]) / scale))
+        a_wins = rng.random(len(a)) < expected_a
+
+        change = (ELO_K * (a_wins - expected_a)).astype(np.float32)
+        np.add.at(self.rating_delta, a, change)
+        np.add.at(self.rating_delta, b, -change)
+        return a_wins
+
+    def play_round(self) -> int:
+        """Сыграть следующий раунд; возвращает число матчей"""
+        if self.finished:
+            return 0
+        rng = np.random.default_rng((self.seed, self.round))
+        self.round += 1
+        if self.format == SINGLE_ELIMINATION:
+            return self._play_elimination_round(rng)
+        return self._play_swiss_round(rng)
+
+    def play_all(self) -> None:
+        while not self.finished:
+            self.play_round()
+
+    def _play_elimination_round(self, rng: np.random.Generator) -> int:
+        a, b = self.bracket[0::2], self.bracket[1::2]
+        matched = (a != BYE) & (b != BYE)
+
+        winners = np.where(a != BYE, a, b)
+        a_wins = self._play(a[matched], b[matched], rng)
+        winners[matched] = np.where(a_wins, a[matched], b[matched])
+        losers = np.where(a_wins, b[matched], a[matched])
+
+        self.eliminated_round[losers] = self.round
+        self.bracket = winners
+        return int(matched.sum())
+
+    def _pair_swiss(self, rng: np.random.Generator) -> Tuple[np.ndarray, np.ndarray, int]:
+        """Пары текущего раунда: (a, b, участник со свободным проходом или BYE)"""
+        n = len(self)
+        # Внутри группы очков - случайный порядок, иначе одни и те же соседи встречаются снова
+        standings = np.lexsort((rng.random(n), -self.score))
+        played = self.opponents[:, :self.round - 1]
+
+        bye = BYE
+        if n % 2:
+            # Свободный проход - нижнему в таблице, у кого его ещё не было
+            had_bye = (played == BYE).any(axis=1)
+            candidates = standings[::-1][~had_bye[standings[::-1]]]
+            bye = int(candidates[0]) if len(candidates) else int(standings[-1])
+            standings = standings[standings != bye]
+
+        a, b = standings[0::2].copy(), standings[1::2].copy()
+
+        # Повторная встреча: b меняется с b ближайшей пары, где обмен не даёт новых повторов
+        rematch = np.flatnonzero((played[a] == b[:, None]).any(axis=1))
+        for i in rematch:
+            for j in (i + 1, i - 1, i + 2, i - 2):
+                if 0 <= j < len(b) and not (played[a[i]] == b[j]).any() and not (played[a[j]] == b[i]).any():
+                    b[i], b[j] = b[j], b[i]
+                    break
+        return a, b, bye
+
+    def _play_swiss_round(self, rng: np.random.Generator) -> int:
+        a, b, bye = self._pair_swiss(rng)
+        column = self.round - 1
+
+        a_wins = self._play(a, b, rng)
+        self.opponents[a, column] = b
+        self.opponents[b, column] = a
+        self.score[a] += a_wins
+        self.score[b] += ~a_wins
+        if bye != BYE:
+            self.opponents[bye, column] = BYE
+            self.score[bye] += 1
+        return len(a)
+
+    # ---------- итоги ----------
+
+    def standings(self) -> np.ndarray:
+        """Номера посева по местам (первое место - первый элемент)"""
+        n = len(self)
+        seeds = np.arange(n)
+        if self.format == SINGLE_ELIMINATION:
+            # Позже вылетел - выше; оставшиеся в сетке выше всех; внутри раунда - по посеву
+            reached = np.where(self.eliminated_round == 0, self.total_rounds + 1, self.eliminated_round)
+            return np.lexsort((seeds, -reached))
+
+        # Swiss: очки, затем Бухгольц (сумма очков соперников), затем посев
+        opponents = self.opponents[:, :self.round]
+        buchholz = np.where(opponents != BYE, self.score[np.maximum(opponents, 0)], 0).sum(axis=1)
+        return np.lexsort((seeds, -buchholz, -self.score))
+
+    def prizes(self, fund: Money) -> Tuple[np.ndarray, np.ndarray]:
+        """(user_id, приз в микро-RBTC) по PRIZE_TIERS; сумма равна фонду"""
+        places = self.standings()
+        n = len(places)
+
+        tiers = []
+        first = 0
+        for last, share in PRIZE_TIERS:
+            if first >= n:
+                break
+            last = min(last, n)
+            tiers.append((first, last, share))
+            first = last
+        total_share = sum(share for _, _, share in tiers)
+
+        amounts = np.zeros(first, dtype=np.int64)
+        for start, end, share in tiers:
+            amounts[start:end] = int(fund.micro * share / total_share) // (end - start)
+        amounts[0] += fund.micro - int(amounts.sum())
+
+        paid = amounts > 0
+        return self.user_ids[places[:first][paid]], amounts[paid]
+
+    # ---------- хранение ----------
+
+    def to_bytes(self) -> bytes:
+        """Сжатое состояние турнира (npz)"""
+        arrays = {
+            "meta": np.array([self.seed, self.round, self.total_rounds], dtype=np.int64),
+            "user_ids": self.user_ids,
+            "ratings": self.ratings,
+            "rating_delta": self.rating_delta
+        }
+        for name in ("eliminated_round", "score"):
+            value = getattr(self, name)
+            if value is not None:
+                arrays[name] = value
+        # Номера посева - в самом узком беззнаковом типе (BYE -> 0): случайные
+        # номера почти не сжимаются, а uint16 вдвое меньше int32
+        index_dtype = np.min_scalar_type(len(self))
+        for name in ("bracket", "opponents"):
+            value = getattr(self, name)
+            if value is not None:
+                arrays[name] = (value + 1).astype(index_dtype)
+        buffer = io.BytesIO()
+        np.savez_compressed(buffer, **arrays)
+        return buffer.getvalue()
+
+    @classmethod
+    def from_bytes(cls, kind: str, format: str, data: bytes) -> "Tournament":
+        with np.load(io.BytesIO(data)) as arrays:
+            seed, current_round, total_rounds = (int(v) for v in arrays["meta"])
+            optional = {name: arrays[name] for name in ("eliminated_round", "score") if name in arrays}
+            for name in ("bracket", "opponents"):
+                if name in arrays:
+                    optional[name] = arrays[name].astype(np.int32) - 1
+            return cls(
+                kind=kind,
+                format=format,
+                seed=seed,
+                user_ids=arrays["user_ids"],
+                ratings=arrays["ratings"],
+                round=current_round,
+                total_rounds=total_rounds,
+                rating_delta=arrays["rating_delta"],
+                **optional
+            )
@@ -0,0 +1,190 @@
+# services/tournament_service.py
+"""
+Турниры: создание, раунды и призы с хранением в таблице tournaments
+
+Состояние турнира (services/tournament_engine.py) хранится одной
+строкой - сжатый npz в base64 - и сохраняется после каждого раунда
+вызовом tournament_save_round с проверкой номера раунда. Призы всем
+призёрам выплачиваются одним вызовом tournament_payout (011_tournaments.sql).
+"""
+
+import base64
+import logging
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from adapters.database.supabase.client import get_supabase_client
+from core.domain.money import Money
+from services.tournament_engine import TOURNAMENT_KINDS, Tournament
+
+logger = logging.getLogger(__name__)
+
+SAVE_ROUND_FUNCTION = "tournament_save_round"
+PAYOUT_FUNCTION = "tournament_payout"
+
+
+def _encode_state(tournament: Tournament) -> str:
+    return base64.b64encode(tournament.to_bytes()).decode("ascii")
+
+
+def _decode_state(row: Dict[str, Any]) -> Tournament:
+    return Tournament.from_bytes(row["kind"], row["format"], base64.b64decode(row["state"]))
+
+
+class TournamentService:
+    """Турниры петушиных боёв и скачек"""
+
+    def __init__(self):
+        self.client = None
+
+    async def _ensure_client(self):
+        if not self.client:
+            self.client = await get_supabase_client()
+
+    async def create_tournament(self, kind: str, format: str, entrants: Sequence[Tuple[int, float]],
+                                prize_fund: Money, seed: Optional[int] = None) -> Optional[int]:
+        """Создать турнир; entrants - (user_id, рейтинг). Возвращает id турнира"""
+        try:
+            await self._ensure_client()
+            if seed is None:
+                seed = int(np.random.SeedSequence().generate_state(1)[0])
+            tournament = Tournament.create(kind, format, entrants, seed)
+
+            rows = await self.client.execute_query(
+                table="tournaments",
+                operation="insert",
+                data={
+                    "kind": kind,
+                    "format": format,
+                    "entrants": len(tournament),
+                    "total_rounds": tournament.total_rounds,
+                    "seed": seed,
+                    "prize_fund": str(prize_fund),
+                    "state": _encode_state(tournament)
+                }
+            )
+            tournament_id = rows[0]["id"] if rows else None
+            logger.info(f"🏆 Турнир #{tournament_id} ({kind}, {format}): {len(tournament)} участников")
+            return tournament_id
+
+        except ValueError as e:
+            logger.warning(f"Турнир не создан: {e}")
+            return None
+        except Exception as e:
+            logger.error(f"Ошибка создания турнира {kind}: {e}")
+            return None
+
+    async def load(self, tournament_id: int) -> Optional[Tuple[Dict[str, Any], Tournament]]:
+        """Строка турнира и его состояние"""
+        try:
+            await self._ensure_client()
+            row = await self.client.execute_query(
+                table="tournaments",
+                operation="select",
+                filters={"id": tournament_id},
+                single=True
+            )
+            if not row:
+                return None
+            return row, _decode_state(row)
+
+        except Exception as e:
+            logger.error(f"Ошибка загрузки турнира {tournament_id}: {e}")
+            return None
+
+    async def play_round(self, tournament_id: int) -> Dict[str, Any]:
+        """Сыграть следующий раунд и сохранить состояние"""
+        loaded = await self.load(tournament_id)
+        if not loaded:
+            return {"status": "not_found"}
+        row, tournament = loaded
+        if row.get("status") != "running" or tournament.finished:
+            return {"status": "finished"}
+
+        try:
+            expected_round = tournament.round
+            matches = tournament.play_round()
+            response = await self.client.execute_rpc(SAVE_ROUND_FUNCTION, {
+                "p_tournament_id": tournament_id,
+                "p_expected_round": expected_round,
+                "p_round": tournament.round,
+                "p_state": _encode_state(tournament),
+                "p_finished": tournament.finished
+            })
+            if isinstance(response, list):
+                response = response[0] if response else {}
+            response = response or {}
+            if response.get("status") != "ok":
+                # Раунд уже сыгран другим процессом
+                return {"status": response.get("status", "error")}
+
+            return {
+                "status": "ok",
+                "round": tournament.round,
+                "total_rounds": tournament.total_rounds,
+                "matches": matches,
+                "finished": tournament.finished
+            }
+
+        except Exception as e:
+            logger.error(f"Ошибка раунда турнира {tournament_id}: {e}")
+            return {"status": "error"}
+
+    async def get_standings(self, tournament_id: int, limit: int = 10) -> List[Dict[str, Any]]:
+        """Верх таблицы: место, игрок, рейтинг с учётом турнира"""
+        loaded = await self.load(tournament_id)
+        if not loaded:
+            return []
+        _, tournament = loaded
+
+        places = tournament.standings()[:limit]
+        rating = tournament.ratings + tournament.rating_delta
+        standings = []
+        for place, seed in enumerate(places, start=1):
+            entry = {
+                "place": place,
+                "user_id": int(tournament.user_ids[seed]),
+                "rating": round(float(rating[seed]))
+            }
+            if tournament.score is not None:
+                entry["score"] = int(tournament.score[seed])
+            standings.append(entry)
+        return standings
+
+    async def distribute_prizes(self, tournament_id: int) -> Dict[str, Any]:
+        """Выплатить призы завершённого турнира одним вызовом"""
+        loaded = await self.load(tournament_id)
+        if not loaded:
+            return {"status": "not_found"}
+        row, tournament = loaded
+        if not tournament.finished:
+            return {"status": "not_finished"}
+
+        try:
+            user_ids, amounts = tournament.prizes(Money.of(row["prize_fund"]))
+            response = await self.client.execute_rpc(PAYOUT_FUNCTION, {
+                "p_tournament_id": tournament_id,
+                "p_pool_name": TOURNAMENT_KINDS[tournament.kind]["pool"],
+                "p_user_ids": user_ids.tolist(),
+                "p_amounts": [str(Money(int(amount))) for amount in amounts]
+            })
+            if isinstance(response, list):
+                response = response[0] if response else {}
+            response = response or {}
+
+            if response.get("status") == "ok":
+                logger.info(
+                    f"🏆 Турнир #{tournament_id}: {len(user_ids)} призёров, {response.get('total')} RBTC"
+                )
+            elif response.get("status") == "pool_exhausted":
+                logger.warning(f"Турнир #{tournament_id}: пул {tournament.kind} исчерпан")
+            return response
+
+        except Exception as e:
+            logger.error(f"Ошибка выплаты призов турнира {tournament_id}: {e}")
+            return {"status": "error"}
+
+
+# Глобальный экземпляр
+tournament_service = TournamentService()
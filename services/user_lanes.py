@@ -0,0 +1,122 @@
+# services/user_lanes.py
+"""
+Очереди операций по пользователю
+
+Операции, которые читают баланс и записывают пересчитанный
+(покупка/продажа RBTC, найм, Q-Pass), для одного user_id выполняются
+строго по очереди, а для разных пользователей - параллельно.
+Замки хранятся в WeakValueDictionary: замок живёт, пока его держат
+или ждут, и исчезает сам, когда у пользователя нет операций.
+"""
+
+import asyncio
+import functools
+import logging
+import time
+import weakref
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Ожидание дольше этого порога пишется в лог
+SLOW_WAIT_SECONDS = 1.0
+
+
+class _Lane(asyncio.Lock):
+    """Замок пользователя с владельцем (повторный вход из той же задачи разрешён)"""
+
+    def __init__(self):
+        super().__init__()
+        self.owner: Optional[asyncio.Task] = None
+        self.depth = 0
+        self.waiters_count = 0
+
+
+class UserLaneManager:
+    """Последовательное выполнение операций одного пользователя"""
+
+    def __init__(self):
+        self._lanes: "weakref.WeakValueDictionary[int, _Lane]" = weakref.WeakValueDictionary()
+        self.stats = {
+            'acquired': 0,
+            'contended': 0,
+            'reentered': 0,
+            'wait_time_total': 0.0,
+            'wait_time_max': 0.0,
+            'max_queue': 0
+        }
+
+    def _get_lane(self, user_id: int) -> _Lane:
+        lane = self._lanes.get(user_id)
+        if lane is None:
+            lane = _Lane()
+            self._lanes[user_id] = lane
+        return lane
+
+    @asynccontextmanager
+    async def lane(self, user_id: int) -> AsyncIterator[None]:
+        """async with user_lanes.lane(user_id): ... - операции пользователя по очереди"""
+        # Сильная ссылка на замок держится до выхода из блока
+        lane = self._get_lane(user_id)
+        task = asyncio.current_task()
+
+        if lane.owner is task and task is not None:
+            # Вложенный вызов из той же операции (например, покупка внутри найма)
+            self.stats['reentered'] += 1
+            lane.depth += 1
+            try:
+                yield
+            finally:
+                lane.depth -= 1
+            return
+
+        if lane.locked():
+            self.stats['contended'] += 1
+            lane.waiters_count += 1
+            self.stats['max_queue'] = max(self.stats['max_queue'], lane.waiters_count)
+            started = time.perf_counter()
+            try:
+                await lane.acquire()
+            finally:
+                lane.waiters_count -= 1
+            waited = time.perf_counter() - started
+            self.stats['wait_time_total'] += waited
+            self.stats['wait_time_max'] = max(self.stats['wait_time_max'], waited)
+            if waited > SLOW_WAIT_SECONDS:
+                logger.warning(f"⏳ Операция пользователя {user_id} ждала очереди {waited:.2f} сек")
+        else:
+            await lane.acquire()
+
+        self.stats['acquired'] += 1
+        lane.owner = task
+        lane.depth = 1
+        try:
+            yield
+        finally:
+            lane.owner = None
+            lane.depth = 0
+            lane.release()
+
+    def serialized(self, method: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+        """Декоратор метода сервиса с сигнатурой (self, user_id, ...)"""
+        @functools.wraps(method)
+        async def wrapper(service: Any, user_id: int, *args: Any, **kwargs: Any) -> T:
+            async with self.lane(user_id):
+                return await method(service, user_id, *args, **kwargs)
+        return wrapper
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Статистика конкуренции за очереди"""
+        contended = self.stats['contended']
+        return {
+            **self.stats,
+            'active_lanes': len(self._lanes),
+            'wait_time_avg': round(self.stats['wait_time_total'] / contended, 4) if contended else 0.0
+        }
+
+
+# Глобальный экземпляр
+user_lanes = UserLaneManager()